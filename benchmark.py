@@ -0,0 +1,207 @@
+"""Banc d'essai: taille du modèle et temps jusqu'à la première solution."""
+
+import argparse
+import contextlib
+import io
+import time
+
+from contraintes import CONTRAINTES_REDONDANTES
+from salle_cours import ChoixSalles
+from main import (
+    EmploiDuTemps,
+    charger_cours,
+    charger_enseignants,
+    charger_groupes,
+    charger_salles,
+    configurer_journal,
+    generer_seance,
+)
+
+# Configurations comparées: aucune contrainte redondante, chacune seule, toutes
+CONFIGURATIONS = {"aucune": []}
+CONFIGURATIONS.update({nom: [nom] for nom in CONTRAINTES_REDONDANTES})
+CONFIGURATIONS["toutes"] = list(CONTRAINTES_REDONDANTES)
+
+
+def charger_instance(nb_cours=None):
+    """
+    Charge les données du dossier data/.
+
+    Args:
+        nb_cours: (optionnel) Ne garder que les nb_cours premiers cours
+
+    Returns:
+        tuple: (seances, salles, enseignants, groupes)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        salles = charger_salles()
+        enseignants = charger_enseignants()
+        groupes = charger_groupes()
+        cours = charger_cours(enseignants=enseignants, groupes=groupes)
+        if nb_cours:
+            cours = cours[:nb_cours]
+        seances = generer_seance(cours, groupes)
+    return seances, salles, enseignants, groupes
+
+
+def mesurer_premiere_solution(
+    instance,
+    semaines,
+    redondantes,
+    temps_max=300,
+    nb_workers=8,
+    graine=0,
+    salle_par_cours=False,
+):
+    """
+    Construit le modèle puis le résout jusqu'à la première solution.
+
+    Returns:
+        dict: Configuration, statut, taille du modèle, temps de construction,
+              temps de résolution et temps jusqu'à la première solution (None si
+              aucune) en secondes
+    """
+    import holidays
+    from ortools.sat.python import cp_model
+
+    seances, salles, enseignants, groupes = instance
+    scheduler = EmploiDuTemps(
+        annee=2025,
+        semaines=semaines,
+        jours_feries=holidays.France(years=[2025, 2026]),
+        contraintes_redondantes=redondantes,
+        salle_par_cours=salle_par_cours,
+    )
+
+    debut = time.monotonic()
+    model = cp_model.CpModel()
+    # Les messages de construction masqueraient le tableau de résultats
+    with contextlib.redirect_stdout(io.StringIO()):
+        seance_vars = scheduler._creer_variables(model, seances, salles)
+        choix_salles = ChoixSalles(model, seances, salles) if salle_par_cours else None
+        scheduler._ajouter_contraintes(
+            model,
+            seance_vars,
+            seances,
+            salles,
+            enseignants,
+            groupes,
+            choix_salles=choix_salles,
+        )
+    construction = time.monotonic() - debut
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = temps_max
+    solver.parameters.num_workers = nb_workers
+    solver.parameters.random_seed = graine
+    solver.parameters.stop_after_first_solution = True
+    statut = solver.Solve(model)
+
+    proto = model.Proto()
+    trouve = statut in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        "redondantes": list(redondantes),
+        "statut": solver.StatusName(statut),
+        "variables": len(proto.variables),
+        "contraintes": len(proto.constraints),
+        "construction": construction,
+        "resolution": solver.WallTime(),
+        "premiere_solution": solver.WallTime() if trouve else None,
+    }
+
+
+def afficher_entete():
+    """En-tête du tableau récapitulatif du banc."""
+    print(
+        f"{'configuration':<20} {'graine':>6} {'variables':>10} {'contraintes':>12} "
+        f"{'construction':>13} {'résolution':>11} {'1re solution':>13} statut"
+    )
+
+
+def afficher_resultat(resultat):
+    """Ligne du tableau récapitulatif pour un résultat de executer_banc."""
+    premiere = resultat["premiere_solution"]
+    print(
+        f"{resultat['configuration']:<20} {resultat['graine']:>6} "
+        f"{resultat['variables']:>10} "
+        f"{resultat['contraintes']:>12} {resultat['construction']:>12.1f}s "
+        f"{resultat['resolution']:>10.1f}s "
+        f"{(f'{premiere:.1f}s' if premiere is not None else '-'):>13} "
+        f"{resultat['statut']}"
+    )
+
+
+def executer_banc(
+    instance,
+    semaines,
+    configurations,
+    repetitions=1,
+    temps_max=300,
+    nb_workers=8,
+    salle_par_cours=False,
+):
+    """
+    Mesure chaque configuration `repetitions` fois (graines différentes) et
+    affiche un tableau récapitulatif.
+
+    Returns:
+        list: Résultats de mesurer_premiere_solution, avec le nom de la configuration
+    """
+    resultats = []
+    afficher_entete()
+    for nom, redondantes in configurations.items():
+        for graine in range(repetitions):
+            resultat = mesurer_premiere_solution(
+                instance,
+                semaines,
+                redondantes,
+                temps_max=temps_max,
+                nb_workers=nb_workers,
+                graine=graine,
+                salle_par_cours=salle_par_cours,
+            )
+            resultat["configuration"] = nom
+            resultat["graine"] = graine
+            resultats.append(resultat)
+            afficher_resultat(resultat)
+    return resultats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--cours", type=int, default=6, help="Nombre de cours (0: tous)"
+    )
+    parser.add_argument(
+        "--semaines",
+        type=int,
+        nargs="+",
+        default=[38, 39, 41, 42],
+        help="Numéros de semaine à planifier",
+    )
+    parser.add_argument(
+        "--configurations",
+        nargs="+",
+        choices=sorted(CONFIGURATIONS),
+        default=list(CONFIGURATIONS),
+    )
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--temps-max", type=float, default=300)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--salle-par-cours",
+        action="store_true",
+        help="Une seule salle par cours et groupe (variables horaires seulement)",
+    )
+    args = parser.parse_args()
+
+    configurer_journal()
+    executer_banc(
+        charger_instance(args.cours),
+        args.semaines,
+        {nom: CONFIGURATIONS[nom] for nom in args.configurations},
+        repetitions=args.repetitions,
+        temps_max=args.temps_max,
+        nb_workers=args.workers,
+        salle_par_cours=args.salle_par_cours,
+    )
@@ -0,0 +1,156 @@
+"""Calendrier académique: correspondance (semaine ISO, jour) -> date, précalculée."""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+
+def _en_date(valeur):
+    """Convertit une date, un datetime ou une chaîne 'YYYY-MM-DD' en date."""
+    if isinstance(valeur, datetime):
+        return valeur.date()
+    if isinstance(valeur, date):
+        return valeur
+    return datetime.strptime(valeur, "%Y-%m-%d").date()
+
+
+def _normaliser_feries(jours_feries):
+    """
+    Retourne un objet supportant `date in jours_feries`.
+
+    Les listes de dates ou de chaînes sont converties en ensemble de dates; les
+    objets du module holidays sont conservés tels quels (ils acceptent les
+    dates directement et chargent les années manquantes à la demande).
+    """
+    if not jours_feries:
+        return set()
+    if isinstance(jours_feries, (list, tuple, set, frozenset)):
+        return {_en_date(j) for j in jours_feries}
+    return jours_feries
+
+
+class CalendrierAcademique:
+    """
+    Index des jours ouvrables d'une période pouvant chevaucher deux années civiles.
+
+    Les semaines ISO qui suivent `date_debut` sont parcourues une seule fois et
+    chaque date est obtenue avec `date.fromisocalendar`, ce qui donne directement
+    l'année ISO de chaque semaine (les semaines 1 à 6 d'un semestre commencé en septembre
+    tombent l'année suivante). Les structures obtenues sont indexées par
+    (indice de semaine, jour) dans l'ordre de `semaines`:
+
+    - `dates`: tableau d'objets date
+    - `ouvrable`: masque booléen des jours utilisables
+    - `feries`: masque booléen des jours fériés
+    - `index_temps`: indice dense des jours ouvrables (-1 sinon), utilisé par le modèle
+    - `paire`: parité de chaque semaine ISO
+    """
+
+    def __init__(
+        self, date_debut, date_fin, jours_feries=None, semaines=None, nb_jours=5
+    ):
+        """
+        Initialise le calendrier.
+
+        Args:
+            date_debut: Premier jour utilisable (date, datetime ou 'YYYY-MM-DD')
+            date_fin: Dernier jour utilisable (date, datetime ou 'YYYY-MM-DD')
+            jours_feries: (optionnel) Dates fériées (liste de dates/chaînes ou objet holidays)
+            semaines: (optionnel) Numéros de semaine à conserver, dans l'ordre du modèle.
+                      Par défaut, toutes les semaines de la période. Une semaine
+                      hors période est conservée, sans jour ouvrable.
+            nb_jours: Nombre de jours ouvrés par semaine (5 = lundi à vendredi)
+
+        Raises:
+            ValueError: Si une semaine demandée n'existe pas dans l'année qui suit date_debut
+        """
+        self.date_debut = _en_date(date_debut)
+        self.date_fin = _en_date(date_fin)
+        self.nb_jours = nb_jours
+        feries = _normaliser_feries(jours_feries)
+
+        # Numéro de semaine -> année ISO, sur les 52 semaines qui suivent date_debut
+        # (un numéro y apparaît au plus une fois)
+        annee_par_semaine = {}
+        semaines_periode = []
+        annee_iso, semaine_iso, _ = self.date_debut.isocalendar()
+        lundi = date.fromisocalendar(annee_iso, semaine_iso, 1)
+        for _ in range(52):
+            annee_iso, semaine_iso, _ = lundi.isocalendar()
+            annee_par_semaine[semaine_iso] = annee_iso
+            if lundi <= self.date_fin:
+                semaines_periode.append(semaine_iso)
+            lundi += timedelta(weeks=1)
+
+        if semaines is None:
+            semaines = semaines_periode
+        inconnues = [s for s in semaines if s not in annee_par_semaine]
+        if inconnues:
+            raise ValueError(
+                f"Semaines inexistantes dans l'année qui suit le {self.date_debut}: {inconnues}"
+            )
+
+        self.semaines = list(semaines)
+        self.indice_semaine = {s: s_idx for s_idx, s in enumerate(self.semaines)}
+        self.annees = [annee_par_semaine[s] for s in self.semaines]
+        self.paire = np.array([s % 2 == 0 for s in self.semaines], dtype=bool)
+
+        forme = (len(self.semaines), nb_jours)
+        self.dates = np.empty(forme, dtype=object)
+        self.feries = np.zeros(forme, dtype=bool)
+        self.ouvrable = np.zeros(forme, dtype=bool)
+        for s_idx, (semaine, annee) in enumerate(zip(self.semaines, self.annees)):
+            for j in range(nb_jours):
+                jour = date.fromisocalendar(annee, semaine, j + 1)
+                self.dates[s_idx, j] = jour
+                self.feries[s_idx, j] = jour in feries
+                self.ouvrable[s_idx, j] = (
+                    self.date_debut <= jour <= self.date_fin
+                    and not self.feries[s_idx, j]
+                )
+
+        # Indice dense des jours ouvrables, dans l'ordre chronologique du modèle
+        self.index_temps = np.full(forme, -1, dtype=np.int32)
+        self.jours_ouvrables = np.argwhere(self.ouvrable)
+        self.index_temps[self.ouvrable] = np.arange(len(self.jours_ouvrables))
+
+        self.index_dates = {
+            (annee, semaine, j + 1): self.dates[s_idx, j]
+            for s_idx, (semaine, annee) in enumerate(zip(self.semaines, self.annees))
+            for j in range(nb_jours)
+        }
+
+    @property
+    def nb_jours_ouvrables(self):
+        return len(self.jours_ouvrables)
+
+    def date(self, semaine, jour_idx):
+        """Date du jour `jour_idx` (0 = lundi) de la semaine `semaine`."""
+        return self.dates[self.indice_semaine[semaine], jour_idx]
+
+    def date_iso(self, annee, semaine, jour_semaine):
+        """Date d'un triplet ISO (jour_semaine: 1 = lundi), None hors calendrier."""
+        return self.index_dates.get((annee, semaine, jour_semaine))
+
+    def est_ouvrable(self, semaine, jour_idx):
+        return bool(self.ouvrable[self.indice_semaine[semaine], jour_idx])
+
+    def est_semaine_paire(self, semaine):
+        return bool(self.paire[self.indice_semaine[semaine]])
+
+    def calendrier_par_semaine(self):
+        """
+        Vue {semaine: {jour_idx: datetime ou None}} attendue par le module contraintes
+        et les exports (None pour un jour férié ou hors période).
+        """
+        return {
+            semaine: {
+                j: (
+                    datetime(jour.year, jour.month, jour.day)
+                    if self.ouvrable[s_idx, j]
+                    else None
+                )
+                for j, jour in enumerate(self.dates[s_idx])
+            }
+            for s_idx, semaine in enumerate(self.semaines)
+        }
@@ -0,0 +1,104 @@
+"""Classement des séances par degré de contrainte."""
+
+JOURS_OUVRES = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+PERIODES = ["matin", "apres_midi"]
+
+
+def variables_fixees_a_zero(model):
+    """
+    Indices des variables que le modèle fixe à 0: domaine [0, 0] ou ligne
+    sans condition portant sur une seule variable (model.Add(var == 0) des
+    contraintes de disponibilité et de type de salle).
+    """
+    proto = model.Proto()
+    fixees = {i for i, var in enumerate(proto.variables) if list(var.domain) == [0, 0]}
+    for ct in proto.constraints:
+        if ct.enforcement_literal or ct.WhichOneof("constraint") != "linear":
+            continue
+        lineaire = ct.linear
+        if len(lineaire.vars) == 1 and list(lineaire.domain) == [0, 0]:
+            if lineaire.coeffs[0] != 0 and lineaire.vars[0] >= 0:
+                fixees.add(lineaire.vars[0])
+    return fixees
+
+
+def compter_candidats(seance_vars, model=None):
+    """
+    Nombre de placements restant possibles par séance: {id_seance: nb}.
+
+    Args:
+        seance_vars: Variables de placement {(id_seance, s_idx, j, cr, salle_id): var}
+        model: (optionnel) Modèle contenant déjà les contraintes: les placements
+               qu'il fixe à 0 (voir variables_fixees_a_zero) ne sont pas comptés
+    """
+    fixees = variables_fixees_a_zero(model) if model is not None else set()
+    candidats = {}
+    for cle, var in seance_vars.items():
+        nb = candidats.get(cle[0], 0)
+        candidats[cle[0]] = nb if var.Index() in fixees else nb + 1
+    return candidats
+
+
+def densite_disponibilite(enseignant):
+    """
+    Part des demi-journées ouvrées où l'enseignant est disponible (entre 0 et 1),
+    pondérée par la parité des semaines où il enseigne.
+    """
+    parite = (enseignant.semaine_paire + enseignant.semaine_impaire) / 2
+    if enseignant.disponibilite is None:
+        return parite
+    disponibles = sum(
+        bool(enseignant.disponibilite.get(jour, {}).get(periode, False))
+        for jour in JOURS_OUVRES
+        for periode in PERIODES
+    )
+    return parite * disponibles / (len(JOURS_OUVRES) * len(PERIODES))
+
+
+def indicateurs_contrainte(seance, candidats=None):
+    """
+    Indicateurs du degré de contrainte d'une séance.
+
+    Args:
+        seance: Séance à évaluer
+        candidats: (optionnel) {id_seance: nombre de placements} après élagage
+                   (voir compter_candidats)
+
+    Returns:
+        dict: candidats (None si inconnu), densite_enseignant, hierarchie (groupes
+              et sous-groupes concernés), etendue (groupes d'un CM)
+    """
+    hierarchie = 0
+    for g in seance.groupes:
+        hierarchie += 1 + len(getattr(g, "sous_groupes", None) or [])
+        if getattr(g, "id_parent", None):
+            hierarchie += 1
+    return {
+        "candidats": candidats.get(seance.id_seance, 0) if candidats else None,
+        "densite_enseignant": densite_disponibilite(seance.cours.enseignant),
+        "hierarchie": hierarchie,
+        "etendue": len(seance.groupes) if seance.type_seance == "CM" else 1,
+    }
+
+
+def classer_seances(seances, candidats=None):
+    """
+    Classe les séances de la plus contrainte à la moins contrainte: moins de
+    placements possibles, enseignant le moins disponible, hiérarchie de groupes
+    la plus large, CM couvrant le plus de groupes. L'ordre est déterministe
+    (départage par id_seance).
+
+    Returns:
+        list: [(seance, indicateurs)], de la plus contrainte à la moins contrainte
+    """
+    classement = [(s, indicateurs_contrainte(s, candidats)) for s in seances]
+    classement.sort(
+        key=lambda item: (
+            item[1]["candidats"] if item[1]["candidats"] is not None else 0,
+            item[1]["densite_enseignant"],
+            -item[1]["hierarchie"],
+            -item[1]["etendue"],
+            item[0].id_seance,
+        )
+    )
+    return classement
@@ -0,0 +1,249 @@
+"""
+Export de l'emploi du temps en classeur Excel (openpyxl).
+
+Le classeur contient une feuille par semaine, une par groupe et une par
+enseignant (séances triées par date et heure), et une matrice d'occupation
+des salles (une ligne par créneau d'affichage, une colonne par salle).
+
+Les feuilles sont en mode écriture seule (Workbook(write_only=True)): les
+lignes sont écrites au fil de l'eau depuis la solution en colonnes et les
+index de flux_ics.index_flux, sans garder les cellules en mémoire. Les
+cellules mises en forme utilisent quelques styles nommés enregistrés une
+fois dans le classeur, jamais un style par cellule.
+"""
+
+import time
+from datetime import time as heure
+
+from flux_ics import index_flux, noms_flux
+from manifeste import fichier_atomique
+
+COLONNES = (
+    ("Date", 12),
+    ("Jour", 10),
+    ("Début", 8),
+    ("Fin", 8),
+    ("Durée (min)", 11),
+    ("Cours", 45),
+    ("Type", 6),
+    ("Séance", 12),
+    ("Groupes", 40),
+    ("Enseignant", 25),
+    ("Salle", 10),
+)
+
+# Couleurs des types de cours, comme dans la page HTML
+COULEURS_TYPES = {"CM": "E3F2FD", "TD": "FFF9C4"}
+
+# Caractères interdits dans un nom de feuille Excel
+INTERDITS = str.maketrans({c: "_" for c in "[]:*?/\\"})
+
+
+def _styles(classeur):
+    """Enregistre les styles nommés du classeur: en-tête, date, heure et types."""
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+
+    entete = NamedStyle(name="edt_entete")
+    entete.font = Font(bold=True, color="FFFFFF")
+    entete.fill = PatternFill("solid", fgColor="4CAF50")
+    entete.alignment = Alignment(horizontal="center")
+    date = NamedStyle(name="edt_date", number_format="DD/MM/YYYY")
+    horaire = NamedStyle(name="edt_heure", number_format="HH:MM")
+    styles = [entete, date, horaire]
+    for type_cours, couleur in COULEURS_TYPES.items():
+        style = NamedStyle(name=f"edt_{type_cours}")
+        style.fill = PatternFill("solid", fgColor=couleur)
+        styles.append(style)
+    for style in styles:
+        classeur.add_named_style(style)
+
+
+def _nom_feuille(nom, utilises):
+    """Nom de feuille valide (31 caractères, sans []:*?/\\) et unique."""
+    base = str(nom).translate(INTERDITS).strip("'")[:31] or "Feuille"
+    candidat, n = base, 2
+    while candidat.lower() in utilises:
+        suffixe = f" ({n})"
+        candidat = base[: 31 - len(suffixe)] + suffixe
+        n += 1
+    utilises.add(candidat.lower())
+    return candidat
+
+
+class _Lignes:
+    """
+    Lignes de séances d'une solution.SolutionColonnaire, les colonnes de la
+    table converties une fois en listes Python.
+    """
+
+    def __init__(self, solution):
+        table = solution.table
+        self.solution = solution
+        self.seances = table["seance"].tolist()
+        self.salles = table["salle"].tolist()
+        self.jours = table["jour"].tolist()
+        self.debuts = table["debut"].tolist()
+        self.fins = table["fin"].tolist()
+        self.dates = table["date"].tolist()
+        self.semaines = table["semaine"].tolist()
+        # Lignes dans l'ordre (date, heure de début, séance), et rang de chacune
+        self.ordre = sorted(
+            range(len(self.seances)),
+            key=lambda i: (self.dates[i], self.debuts[i], self.seances[i]),
+        )
+        self.rang = [0] * len(self.ordre)
+        for r, i in enumerate(self.ordre):
+            self.rang[i] = r
+
+    def trier(self, indices):
+        return sorted(indices, key=self.rang.__getitem__)
+
+    def ligne(self, feuille, i):
+        """Cellules de la ligne i (voir COLONNES)."""
+        from openpyxl.cell import WriteOnlyCell
+
+        solution = self.solution
+        k = self.seances[i]
+        seance = solution.seances[k]
+        cours = seance.cours
+        debut, fin = self.debuts[i], self.fins[i]
+        date = WriteOnlyCell(feuille, value=self.dates[i])
+        date.style = "edt_date"
+        cellule_debut = WriteOnlyCell(feuille, value=heure(debut // 60, debut % 60))
+        cellule_debut.style = "edt_heure"
+        cellule_fin = WriteOnlyCell(feuille, value=heure(fin // 60, fin % 60))
+        cellule_fin.style = "edt_heure"
+        type_cours = WriteOnlyCell(feuille, value=cours.type_cours)
+        if cours.type_cours in COULEURS_TYPES:
+            type_cours.style = f"edt_{cours.type_cours}"
+        return [
+            date,
+            solution.jours[self.jours[i]],
+            cellule_debut,
+            cellule_fin,
+            fin - debut,
+            cours.nom,
+            type_cours,
+            seance.id_seance,
+            solution.groupes(k),
+            cours.enseignant.nom,
+            solution.salles[self.salles[i]].nom,
+        ]
+
+
+def _entete(feuille, titres):
+    from openpyxl.cell import WriteOnlyCell
+
+    cellules = []
+    for titre in titres:
+        cellule = WriteOnlyCell(feuille, value=titre)
+        cellule.style = "edt_entete"
+        cellules.append(cellule)
+    feuille.append(cellules)
+
+
+def _feuille_seances(classeur, nom, lignes, indices, utilises):
+    from openpyxl.utils import get_column_letter
+
+    feuille = classeur.create_sheet(_nom_feuille(nom, utilises))
+    # Largeurs et volets figés: à définir avant la première ligne
+    for numero, (_, largeur) in enumerate(COLONNES, start=1):
+        feuille.column_dimensions[get_column_letter(numero)].width = largeur
+    feuille.freeze_panes = "A2"
+    _entete(feuille, [titre for titre, _ in COLONNES])
+    for i in lignes.trier(indices):
+        feuille.append(lignes.ligne(feuille, i))
+
+
+def _feuille_occupation(classeur, lignes, creneaux, utilises):
+    """
+    Matrice d'occupation: une ligne par (date, créneau d'affichage) ayant au
+    moins une séance, une colonne par salle; une case donne le cours et les
+    groupes des séances qui chevauchent le créneau. Les lignes sont écrites
+    jour par jour.
+    """
+    from openpyxl.cell import WriteOnlyCell
+
+    solution = lignes.solution
+    salles = sorted(solution.salles.values(), key=lambda s: str(s.nom))
+    colonne = {salle.id: c for c, salle in enumerate(salles)}
+    feuille = classeur.create_sheet(_nom_feuille("Occupation salles", utilises))
+    feuille.freeze_panes = "D2"
+    _entete(feuille, ["Date", "Jour", "Créneau"] + [s.nom for s in salles])
+
+    def ecrire_jour(date, jour, occupations):
+        for c in sorted(occupations):
+            cellule_date = WriteOnlyCell(feuille, value=date)
+            cellule_date.style = "edt_date"
+            ligne = [cellule_date, jour, creneaux[c]] + [None] * len(salles)
+            for position, textes in occupations[c].items():
+                ligne[3 + position] = "\n".join(textes)
+            feuille.append(ligne)
+
+    # Créneaux d'affichage de deux heures à partir de 8h (voir rendu_html)
+    date_courante, occupations = None, {}
+    for i in lignes.ordre:
+        if lignes.dates[i] != date_courante:
+            if occupations:
+                ecrire_jour(date_courante, jour, occupations)
+            date_courante, occupations = lignes.dates[i], {}
+            jour = solution.jours[lignes.jours[i]]
+        k = lignes.seances[i]
+        texte = f"{solution.seances[k].cours.nom} ({solution.groupes(k)})"
+        premier = max(0, (lignes.debuts[i] - 8 * 60) // 120)
+        dernier = min(len(creneaux) - 1, (lignes.fins[i] - 1 - 8 * 60) // 120)
+        for c in range(premier, dernier + 1):
+            case = occupations.setdefault(c, {})
+            case.setdefault(colonne[lignes.salles[i]], []).append(texte)
+    if occupations:
+        ecrire_jour(date_courante, jour, occupations)
+
+
+def exporter_classeur(solution, chemin, groupes=()):
+    """
+    Écrit le classeur Excel d'une solution.
+
+    Args:
+        solution: solution.SolutionColonnaire
+        chemin: Fichier .xlsx à écrire (remplacé d'un coup)
+        groupes: Groupes chargés: la feuille d'un groupe contient aussi les
+                 séances de ses groupes parents et sous-groupes (voir
+                 flux_ics.index_flux)
+
+    Returns:
+        int: Nombre de feuilles écrites
+    """
+    from openpyxl import Workbook
+
+    debut = time.perf_counter()
+    classeur = Workbook(write_only=True)
+    _styles(classeur)
+    lignes = _Lignes(solution)
+    index = index_flux(solution, groupes)
+    noms = noms_flux(solution, groupes)
+    utilises = set()
+
+    par_semaine = {}
+    for i, semaine in enumerate(lignes.semaines):
+        par_semaine.setdefault(semaine, []).append(i)
+    for semaine in sorted(par_semaine):
+        _feuille_seances(
+            classeur, f"Semaine {semaine}", lignes, par_semaine[semaine], utilises
+        )
+    for type_flux, prefixe in (("groupes", "G"), ("enseignants", "E")):
+        cles = sorted(
+            (cle for cle in index if cle[0] == type_flux),
+            key=lambda cle: str(noms.get(cle, cle[1])),
+        )
+        for cle in cles:
+            nom = noms.get(cle, str(cle[1])).removeprefix("Groupe ")
+            _feuille_seances(classeur, f"{prefixe} {nom}", lignes, index[cle], utilises)
+    _feuille_occupation(classeur, lignes, solution.creneaux_affichage, utilises)
+
+    with fichier_atomique(chemin, "wb") as f:
+        classeur.save(f)
+    print(
+        f"Classeur Excel écrit dans {chemin} ({len(utilises)} feuilles, "
+        f"{len(lignes.seances)} séances) en {time.perf_counter() - debut:.2f}s"
+    )
+    return len(utilises)
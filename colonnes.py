@@ -0,0 +1,466 @@
+"""
+Chargement des données depuis des tables en colonnes (Parquet, Feather ou
+DataFrame pandas).
+
+Les tables ont les colonnes des fichiers CSV de data/ et produisent les mêmes
+objets du modèle que les chargeurs de main.py. Les colonnes sont converties et
+validées d'un bloc: types, identifiants en double, disponibilités hors {0, 1}
+et références vers des enseignants, groupes ou parents inconnus. Toutes les
+erreurs sont signalées ensemble par ErreurDonnees au lieu d'être affichées
+ligne par ligne.
+
+Les disponibilités sont codées en masques de bits: le bit 2 * j + p vaut 1 si
+la ressource est disponible le jour j (0 = lundi) pour la période p (0 = matin,
+1 = après-midi).
+
+Parquet et Feather nécessitent pyarrow; un DataFrame ou un CSV n'en ont pas
+besoin.
+"""
+
+import os
+
+import model
+from main import relier_groupes
+
+JOURS = ("lundi", "mardi", "mercredi", "jeudi", "vendredi")
+PERIODES = ("matin", "apres_midi")
+
+# Colonnes de disponibilité, dans l'ordre des bits des masques
+COLONNES_SALLES = [
+    f"{jour.capitalize()}_{suffixe}"
+    for jour in JOURS
+    for suffixe in ("Matin", "ApresMidi")
+]
+COLONNES_ENSEIGNANTS = [f"{jour}_{periode}" for jour in JOURS for periode in PERIODES]
+
+
+class ErreurDonnees(ValueError):
+    """Données invalides; `erreurs` liste chaque problème trouvé."""
+
+    def __init__(self, erreurs):
+        self.erreurs = list(erreurs)
+        super().__init__(
+            f"{len(self.erreurs)} erreur(s) dans les données:\n  "
+            + "\n  ".join(self.erreurs)
+        )
+
+
+def lire_table(source):
+    """
+    Lit une table depuis un DataFrame ou un fichier .parquet, .feather ou .csv.
+
+    Les CSV sont lus en texte, comme par csv.DictReader.
+
+    Returns:
+        pandas.DataFrame
+    """
+    import pandas as pd
+
+    if isinstance(source, pd.DataFrame):
+        return source
+    extension = os.path.splitext(str(source))[1].lower()
+    if extension in (".parquet", ".feather"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                f"pyarrow est nécessaire pour lire {source}; "
+                "installer pyarrow ou fournir un CSV ou un DataFrame"
+            ) from None
+        if extension == ".parquet":
+            return pd.read_parquet(source)
+        return pd.read_feather(source)
+    if extension == ".csv":
+        return pd.read_csv(source, dtype=str, keep_default_na=False)
+    raise ValueError(f"Format de table non pris en charge: {source}")
+
+
+def _texte(colonne):
+    """Colonne convertie en texte sans espaces autour (valeurs manquantes: "")."""
+    import pandas as pd
+
+    if pd.api.types.is_integer_dtype(colonne.dtype):
+        return colonne.astype(str)
+    return colonne.astype("string").fillna("").str.strip()
+
+
+def _nombres(colonne):
+    """Colonne convertie en nombres; les valeurs non numériques deviennent NaN."""
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(colonne.dtype) and not (
+        pd.api.types.is_bool_dtype(colonne.dtype)
+    ):
+        return colonne.astype(float)
+    return pd.to_numeric(_texte(colonne).replace("", None), errors="coerce").astype(
+        float
+    )
+
+
+def _lignes_de_donnees(table, colonne_id, en_tete):
+    """Table sans les lignes vides ou de commentaire, comme les chargeurs CSV."""
+    ids = _texte(table[colonne_id])
+    return table[(ids != "") & ~en_tete(ids)].reset_index(drop=True)
+
+
+def _colonnes_manquantes(table, colonnes, nom_table):
+    manquantes = [c for c in colonnes if c not in table.columns]
+    return [f"{nom_table}: colonne(s) manquante(s) {manquantes}"] if manquantes else []
+
+
+def _entiers(table, colonne, nom_table, ids, erreurs, defaut=None):
+    """
+    Colonne convertie en entiers numpy; les valeurs non entières sont ajoutées
+    à `erreurs`. Une colonne absente vaut `defaut` si fourni.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if colonne not in table.columns and defaut is not None:
+        return np.full(len(table), defaut, dtype=np.int64)
+    valeurs = _nombres(table[colonne]).to_numpy()
+    invalides = np.isnan(valeurs) | (valeurs != np.round(valeurs))
+    for i in np.flatnonzero(invalides):
+        erreurs.append(
+            f"{nom_table} {ids[i]}: {colonne} n'est pas un entier "
+            f"({table[colonne].iloc[i]!r})"
+        )
+    return np.where(invalides, 0, valeurs).astype(np.int64)
+
+
+def _doublons(ids, nom_table):
+    """Identifiants présents plusieurs fois."""
+    import pandas as pd
+
+    doublons = pd.Series(ids)
+    doublons = doublons[doublons.duplicated()].unique()
+    return [f"{nom_table}: identifiant {i} en double" for i in doublons]
+
+
+def _signaler(problemes, erreurs):
+    """Ajoute les problèmes à `erreurs`, ou lève ErreurDonnees sans liste."""
+    if erreurs is not None:
+        erreurs.extend(problemes)
+    elif problemes:
+        raise ErreurDonnees(problemes)
+
+
+def masques_disponibilite(table, colonnes, nom_table="table", ids=None, erreurs=None):
+    """
+    Masques de bits des colonnes de disponibilité (voir l'en-tête du module).
+
+    Args:
+        colonnes: Les 10 colonnes, du lundi matin au vendredi après-midi
+        erreurs: (optionnel) Liste recevant les valeurs hors {0, 1}; sans elle,
+                 une valeur invalide lève ErreurDonnees
+
+    Returns:
+        numpy.ndarray: Un masque entier par ligne
+    """
+    import numpy as np
+
+    valeurs = np.column_stack([_nombres(table[c]).to_numpy() for c in colonnes])
+    invalides = ~np.isin(valeurs, (0, 1))
+    problemes = [
+        f"{nom_table} {ids[i] if ids is not None else i}: {colonnes[k]} doit valoir "
+        f"0 ou 1 ({table[colonnes[k]].iloc[i]!r})"
+        for i, k in zip(*np.nonzero(invalides))
+    ]
+    if erreurs is None and problemes:
+        raise ErreurDonnees(problemes)
+    if erreurs is not None:
+        erreurs.extend(problemes)
+    bits = np.where(invalides, 0, valeurs).astype(np.int64)
+    return (bits << np.arange(len(colonnes), dtype=np.int64)).sum(axis=1)
+
+
+def disponibilite_depuis_masque(masque, valeur=bool):
+    """
+    Dictionnaire de disponibilité des objets du modèle pour un masque.
+
+    Args:
+        valeur: Conversion des bits (int pour les salles, bool pour les
+                enseignants, comme les chargeurs CSV)
+    """
+    return _disponibilites([masque], valeur)[0]
+
+
+def _disponibilites(masques, valeur):
+    """Dictionnaires de disponibilité de plusieurs masques, bits extraits d'un bloc."""
+    import numpy as np
+
+    bits = (np.asarray(masques, dtype=np.int64)[:, None] >> np.arange(10)) & 1
+    return [
+        {
+            "lundi": {"matin": b[0], "apres_midi": b[1]},
+            "mardi": {"matin": b[2], "apres_midi": b[3]},
+            "mercredi": {"matin": b[4], "apres_midi": b[5]},
+            "jeudi": {"matin": b[6], "apres_midi": b[7]},
+            "vendredi": {"matin": b[8], "apres_midi": b[9]},
+        }
+        for b in bits.astype(valeur).tolist()
+    ]
+
+
+def charger_salles_colonnes(source, erreurs=None):
+    """
+    Charge les salles depuis une table ayant les colonnes de data/salle.csv.
+
+    Args:
+        erreurs: (optionnel) Liste recevant les erreurs au lieu de lever
+                 ErreurDonnees (utilisé par charger_instance_colonnes)
+
+    Returns:
+        list: Objets Salle
+    """
+    table = lire_table(source)
+    problemes = _colonnes_manquantes(
+        table, ["id", "nom", "effectif_max", "type_salle"] + COLONNES_SALLES, "salles"
+    )
+    if problemes:
+        raise ErreurDonnees(problemes)
+    table = _lignes_de_donnees(table, "id", lambda ids: ids.str.contains("id"))
+    ids = _texte(table["id"]).tolist()
+
+    identifiants = _entiers(table, "id", "salles", ids, problemes)
+    effectifs = _entiers(table, "effectif_max", "salles", ids, problemes)
+    masques = masques_disponibilite(table, COLONNES_SALLES, "salles", ids, problemes)
+    problemes += _doublons(identifiants, "salles")
+    _signaler(problemes, erreurs)
+
+    return [
+        model.Salle(
+            id=i,
+            nom=nom,
+            effectif_max=effectif,
+            type_salle=type_salle,
+            disponibilite=disponibilite,
+        )
+        for i, nom, effectif, type_salle, disponibilite in zip(
+            identifiants.tolist(),
+            table["nom"].tolist(),
+            effectifs.tolist(),
+            table["type_salle"].tolist(),
+            _disponibilites(masques, int),
+        )
+    ]
+
+
+def charger_enseignants_colonnes(source, erreurs=None):
+    """
+    Charge les enseignants depuis une table ayant les colonnes de
+    data/enseignants.csv (semaine_paire et semaine_impaire valent 1 si absentes).
+
+    Returns:
+        list: Objets Enseignant
+    """
+    table = lire_table(source)
+    problemes = _colonnes_manquantes(
+        table, ["id", "nom", "besoin_salle"] + COLONNES_ENSEIGNANTS, "enseignants"
+    )
+    if problemes:
+        raise ErreurDonnees(problemes)
+    table = _lignes_de_donnees(table, "id", lambda ids: ids.str.contains("id"))
+    ids = _texte(table["id"]).tolist()
+
+    identifiants = _entiers(table, "id", "enseignants", ids, problemes)
+    paires = _entiers(table, "semaine_paire", "enseignants", ids, problemes, defaut=1)
+    impaires = _entiers(
+        table, "semaine_impaire", "enseignants", ids, problemes, defaut=1
+    )
+    masques = masques_disponibilite(
+        table, COLONNES_ENSEIGNANTS, "enseignants", ids, problemes
+    )
+    problemes += _doublons(identifiants, "enseignants")
+    _signaler(problemes, erreurs)
+
+    return [
+        model.Enseignant(
+            id=i,
+            nom=nom,
+            besoin_salle=besoin,
+            semaine_paire=paire,
+            semaine_impaire=impaire,
+            disponibilite=disponibilite,
+        )
+        for i, nom, besoin, paire, impaire, disponibilite in zip(
+            identifiants.tolist(),
+            table["nom"].tolist(),
+            table["besoin_salle"].tolist(),
+            paires.tolist(),
+            impaires.tolist(),
+            _disponibilites(masques, bool),
+        )
+    ]
+
+
+def charger_groupes_colonnes(source, erreurs=None):
+    """
+    Charge les groupes depuis une table ayant les colonnes de data/groupe.csv,
+    avec les relations parent-enfant de main.relier_groupes. Les lignes
+    identiques ne comptent qu'une fois.
+
+    Returns:
+        list: Objets Groupe
+    """
+    table = lire_table(source)
+    problemes = _colonnes_manquantes(table, ["id_groupe", "nom"], "groupes")
+    if problemes:
+        raise ErreurDonnees(problemes)
+    table = _lignes_de_donnees(table, "id_groupe", lambda ids: ids.str.contains("id"))
+    # Une ligne répétée à l'identique donne le même groupe (main.charger_groupes
+    # range les groupes par ID): seules les définitions divergentes sont des doublons
+    table = table[~table.astype("string").duplicated()].reset_index(drop=True)
+    ids = _texte(table["id_groupe"]).tolist()
+
+    if "effectif" in table.columns:
+        effectifs = table["effectif"].where(_texte(table["effectif"]) != "", 0)
+        table = table.assign(effectif=effectifs)
+    effectifs = _entiers(table, "effectif", "groupes", ids, problemes, defaut=0)
+    parents = (
+        _texte(table["parent_id"]).tolist()
+        if "parent_id" in table.columns
+        else [""] * len(ids)
+    )
+    problemes += _doublons(ids, "groupes")
+    connus = set(ids)
+    problemes += [
+        f"groupes {i}: groupe parent {p} inconnu"
+        for i, p in zip(ids, parents)
+        if p and p not in connus
+    ]
+    _signaler(problemes, erreurs)
+
+    groupes_dict = {
+        i: model.Groupe(
+            id_groupe=i, nom=nom, effectif=int(effectif), id_parent=parent or None
+        )
+        for i, nom, effectif, parent in zip(
+            ids, _texte(table["nom"]).tolist(), effectifs, parents
+        )
+    }
+    return relier_groupes(groupes_dict)
+
+
+def charger_cours_colonnes(source, enseignants, groupes, erreurs=None):
+    """
+    Charge les cours depuis une table ayant les colonnes de data/cours.csv.
+    Les durées sont en heures et converties en minutes.
+
+    Contrairement à main.charger_cours, un cours dont l'enseignant ou un
+    groupe est inconnu n'est pas ignoré: il est signalé avec les autres erreurs.
+
+    Returns:
+        list: Objets Cours sans séances associées, avec `ids_groupes`
+    """
+    import numpy as np
+    import pandas as pd
+
+    table = lire_table(source)
+    problemes = _colonnes_manquantes(
+        table,
+        [
+            "id_cours",
+            "nom",
+            "enseignant",
+            "groupes",
+            "duree_total",
+            "max_duration",
+            "type_cours",
+        ],
+        "cours",
+    )
+    if problemes:
+        raise ErreurDonnees(problemes)
+    table = _lignes_de_donnees(
+        table, "id_cours", lambda ids: ids.str.lower() == "id_cours"
+    )
+    ids = _texte(table["id_cours"]).tolist()
+
+    id_enseignants = _entiers(table, "enseignant", "cours", ids, problemes)
+    durees = {}
+    for colonne in ("duree_total", "max_duration"):
+        heures = pd.to_numeric(_texte(table[colonne]), errors="coerce")
+        for i in np.flatnonzero(heures.isna().to_numpy()):
+            problemes.append(
+                f"cours {ids[i]}: {colonne} n'est pas un nombre d'heures "
+                f"({table[colonne].iloc[i]!r})"
+            )
+        durees[colonne] = (heures.fillna(0) * 60).astype(np.int64).to_numpy()
+    ids_groupes = [
+        [g.strip() for g in valeur.split(",")]
+        for valeur in _texte(table["groupes"]).tolist()
+    ]
+    debuts = (
+        _texte(table["debuts"]).tolist()
+        if "debuts" in table.columns
+        else [""] * len(ids)
+    )
+    problemes += _doublons(ids, "cours")
+
+    enseignants_dict = {e.id: e for e in enseignants}
+    groupes_connus = {g.id_groupe for g in groupes}
+    problemes += [
+        f"cours {i}: enseignant {e} inconnu"
+        for i, e in zip(ids, id_enseignants)
+        if e not in enseignants_dict
+    ]
+    problemes += [
+        f"cours {i}: groupe {g} inconnu"
+        for i, groupes_cours in zip(ids, ids_groupes)
+        for g in groupes_cours
+        if g not in groupes_connus
+    ]
+    _signaler(problemes, erreurs)
+
+    cours_liste = []
+    for i, nom, e, duree_total, max_duration, type_cours, debut, groupes_cours in zip(
+        ids,
+        _texte(table["nom"]).tolist(),
+        id_enseignants,
+        durees["duree_total"],
+        durees["max_duration"],
+        _texte(table["type_cours"]).str.upper().tolist(),
+        debuts,
+        ids_groupes,
+    ):
+        if e not in enseignants_dict:
+            continue
+        cours = model.Cours(
+            id_cours=i,
+            nom=nom,
+            enseignant=enseignants_dict[e],
+            groupes=None,  # Sera rempli par generer_seance
+            duree_total=int(duree_total),
+            max_duration=int(max_duration),
+            type_cours=type_cours,
+            debuts=debut or None,
+        )
+        cours.ids_groupes = groupes_cours
+        cours_liste.append(cours)
+    return cours_liste
+
+
+def charger_instance_colonnes(salles, enseignants, groupes, cours):
+    """
+    Charge les quatre tables et signale toutes leurs erreurs en une fois.
+
+    Args:
+        salles, enseignants, groupes, cours: DataFrames ou chemins de fichiers
+
+    Returns:
+        tuple: (salles, enseignants, groupes, cours), objets du modèle
+
+    Raises:
+        ErreurDonnees: Si une table contient au moins une erreur
+    """
+    erreurs = []
+    objets_salles = charger_salles_colonnes(salles, erreurs)
+    objets_enseignants = charger_enseignants_colonnes(enseignants, erreurs)
+    objets_groupes = charger_groupes_colonnes(groupes, erreurs)
+    objets_cours = charger_cours_colonnes(
+        cours, objets_enseignants, objets_groupes, erreurs
+    )
+    if erreurs:
+        raise ErreurDonnees(erreurs)
+    return objets_salles, objets_enseignants, objets_groupes, objets_cours
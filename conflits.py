@@ -0,0 +1,156 @@
+"""Graphe de conflits entre séances et couverture par cliques maximales."""
+
+import time
+
+# Graphes déjà construits, par signature des données (voir graphe_conflits)
+_CACHE_GRAPHES = {}
+
+
+def salles_admissibles(seance, salles):
+    """
+    Salles pouvant accueillir une séance, indépendamment du créneau: capacité
+    suffisante, pas d'amphithéâtre pour un TD, et salle du type exigé par
+    l'enseignant pour un TD (mêmes règles que _creer_variables et contraintes.py).
+    """
+    effectif_total = sum(g.effectif for g in seance.groupes)
+    enseignant = seance.cours.enseignant
+    admissibles = []
+    for sa in salles:
+        if sa.effectif_max < effectif_total:
+            continue
+        if seance.cours.type_cours == "TD" and sa.type_salle == "Amphi":
+            continue
+        if (
+            seance.type_seance == "TD"
+            and enseignant.besoin_salle != "standard"
+            and sa.type_salle != enseignant.besoin_salle
+        ):
+            continue
+        admissibles.append(sa)
+    return admissibles
+
+
+def _ressources(seances, enseignants, groupes, salles):
+    """
+    Ressources exclusives de chaque séance, dont les ensembles de séances forment
+    des cliques du graphe de conflits:
+
+    - ("enseignant", id): séances de l'enseignant;
+    - ("groupe", id_sous_groupe): séances du sous-groupe et de son groupe parent
+      (le groupe parent occupe tous ses sous-groupes);
+    - ("groupe", id): séances d'un groupe sans sous-groupe;
+    - ("salle", id): séances dont la seule salle admissible est cette salle.
+
+    Returns:
+        dict: {id_seance: tuple de ressources}
+    """
+    sous_groupes = {
+        g.id_groupe: [sg.id_groupe for sg in g.sous_groupes]
+        for g in groupes
+        if getattr(g, "sous_groupes", None)
+    }
+    ids_enseignants = {e.id for e in enseignants}
+    ressources = {}
+    for s in seances:
+        cles = []
+        if s.cours.enseignant.id in ids_enseignants:
+            cles.append(("enseignant", s.cours.enseignant.id))
+        for g in s.groupes:
+            # Un groupe parent est en conflit avec chacun de ses sous-groupes
+            for id_groupe in sous_groupes.get(g.id_groupe) or [g.id_groupe]:
+                cles.append(("groupe", id_groupe))
+        admissibles = salles_admissibles(s, salles)
+        if len(admissibles) == 1:
+            cles.append(("salle", admissibles[0].id))
+        ressources[s.id_seance] = tuple(sorted(set(cles), key=str))
+    return ressources
+
+
+class GrapheConflits:
+    """
+    Graphe dont les sommets sont les séances et les arêtes relient deux séances
+    qui ne peuvent pas se chevaucher (enseignant commun, groupes liés par la
+    hiérarchie, même salle imposée).
+
+    Les arêtes sont couvertes par des cliques maximales: pour chaque clique et
+    chaque créneau, une seule contrainte AddAtMostOne remplace les contraintes
+    d'unicité par enseignant et par groupe, qui répètent les mêmes littéraux.
+    """
+
+    def __init__(self, ressources):
+        """
+        Construit le graphe et sa couverture par cliques.
+
+        Args:
+            ressources: {id_seance: ressources exclusives} (voir _ressources)
+        """
+        debut = time.perf_counter()
+        self.seances = sorted(ressources)
+
+        # Les séances d'une même ressource forment une clique
+        par_ressource = {}
+        for s_id in self.seances:
+            for cle in ressources[s_id]:
+                par_ressource.setdefault(cle, []).append(s_id)
+
+        self.voisins = {s_id: set() for s_id in self.seances}
+        for membres in par_ressource.values():
+            for s_id in membres:
+                self.voisins[s_id].update(membres)
+        for s_id in self.seances:
+            self.voisins[s_id].discard(s_id)
+        self.nb_aretes = sum(len(v) for v in self.voisins.values()) // 2
+
+        # Étendre chaque clique de ressource en clique maximale, puis retirer
+        # les doublons et les cliques contenues dans une autre
+        cliques = {
+            self._etendre(membres)
+            for membres in par_ressource.values()
+            if len(membres) > 1
+        }
+        cliques = sorted(cliques, key=lambda c: (-len(c), sorted(c)))
+        self.cliques = []
+        for clique in cliques:
+            if not any(clique <= autre for autre in self.cliques):
+                self.cliques.append(clique)
+
+        self.duree_construction = time.perf_counter() - debut
+
+    def _etendre(self, membres):
+        """Ajoute à une clique les séances voisines de tous ses membres."""
+        clique = set(membres)
+        candidats = set.intersection(*(self.voisins[s_id] for s_id in clique))
+        # Ajouter d'abord les séances les plus contraintes, dans un ordre déterministe
+        for s_id in sorted(candidats, key=lambda s: (-len(self.voisins[s]), s)):
+            if clique <= self.voisins[s_id]:
+                clique.add(s_id)
+        return frozenset(clique)
+
+    def statistiques(self):
+        """Métriques du graphe, pour les journaux et la télémétrie."""
+        tailles = [len(c) for c in self.cliques]
+        return {
+            "conflits_seances": len(self.seances),
+            "conflits_aretes": self.nb_aretes,
+            "conflits_cliques": len(self.cliques),
+            "conflits_clique_max": max(tailles, default=0),
+            "conflits_duree": round(self.duree_construction, 3),
+        }
+
+
+def graphe_conflits(seances, enseignants, groupes, salles):
+    """
+    Graphe de conflits des séances, mis en cache: les sous-modèles (LNS,
+    résolution hiérarchique, réparation) qui portent sur les mêmes séances
+    réutilisent le graphe déjà construit.
+
+    Returns:
+        GrapheConflits
+    """
+    ressources = _ressources(seances, enseignants, groupes, salles)
+    signature = tuple(sorted(ressources.items()))
+    graphe = _CACHE_GRAPHES.get(signature)
+    if graphe is None:
+        graphe = GrapheConflits(ressources)
+        _CACHE_GRAPHES[signature] = graphe
+    return graphe
@@ -0,0 +1,235 @@
+"""Construction des familles de contraintes dans des processus séparés."""
+
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+# Variables du modèle partagées par les processus: (modèle ne contenant que
+# les variables, [(clé de placement, indice)]), initialisées une fois par
+# processus
+_PARTAGE = None
+
+# Contraintes dont les champs portent des littéraux ou des variables
+_LITTERAUX = ("bool_or", "bool_and", "at_most_one", "exactly_one")
+
+
+def _initialiser(proto_variables, indices):
+    """Initialisation d'un processus: numérotation commune des variables."""
+    global _PARTAGE
+    variables = cp_model.CpModel()
+    variables.Proto().ParseFromString(proto_variables)
+    _PARTAGE = (variables, indices)
+
+
+def _champs(contrainte):
+    """
+    Champs d'une contrainte qui portent des indices de variables, puis ceux qui
+    portent des indices de contraintes intervalles.
+
+    Raises:
+        ValueError: Pour un type de contrainte que la fusion ne sait pas renuméroter
+    """
+    type_contrainte = contrainte.WhichOneof("constraint")
+    variables = [contrainte.enforcement_literal]
+    intervalles = []
+    if type_contrainte in _LITTERAUX:
+        variables.append(getattr(contrainte, type_contrainte).literals)
+    elif type_contrainte == "linear":
+        variables.append(contrainte.linear.vars)
+    elif type_contrainte == "interval":
+        intervalle = contrainte.interval
+        variables += [intervalle.start.vars, intervalle.end.vars, intervalle.size.vars]
+    elif type_contrainte == "lin_max":
+        variables.append(contrainte.lin_max.target.vars)
+        variables += [expr.vars for expr in contrainte.lin_max.exprs]
+    elif type_contrainte == "no_overlap":
+        intervalles.append(contrainte.no_overlap.intervals)
+    elif type_contrainte is not None:
+        raise ValueError(f"Contrainte {type_contrainte} non prise en charge")
+    return variables, intervalles
+
+
+def _construire_fragment(familles):
+    """
+    Pose un lot de familles de contraintes sur un modèle qui ne contient que
+    les variables partagées.
+
+    Args:
+        familles: [(fonction, args)] dans l'ordre de construction
+
+    Returns:
+        tuple: (fragment sérialisé, indices des contraintes à renuméroter,
+                sortie de chaque famille)
+    """
+    variables, indices = _PARTAGE
+    # clone() recrée les variables accessibles par leur indice
+    model = variables.clone()
+    seance_vars = {cle: model.GetBoolVarFromProtoIndex(i) for cle, i in indices}
+
+    sorties = []
+    for fonction, args in familles:
+        sortie = io.StringIO()
+        with contextlib.redirect_stdout(sortie):
+            fonction(model, seance_vars, *args)
+        sorties.append(sortie.getvalue())
+
+    # Le fragment: variables auxiliaires créées par le lot et contraintes
+    base = len(variables.Proto().variables)
+    proto = model.Proto()
+    fragment = cp_model_pb2.CpModelProto()
+    fragment.variables.extend(proto.variables[base:])
+    fragment.constraints.extend(proto.constraints)
+
+    # Sans variable auxiliaire, seules les références aux intervalles changent
+    auxiliaires = len(fragment.variables) > 0
+    a_renumeroter = []
+    for k, contrainte in enumerate(fragment.constraints):
+        champs_variables, champs_intervalles = _champs(contrainte)
+        if champs_intervalles or (
+            auxiliaires
+            and any(
+                (ref if ref >= 0 else -ref - 1) >= base
+                for champ in champs_variables
+                for ref in champ
+            )
+        ):
+            a_renumeroter.append(k)
+    return fragment.SerializeToString(), a_renumeroter, sorties
+
+
+def _renumeroter(contrainte, base, decalage_variables, decalage_contraintes):
+    """Décale les variables auxiliaires et les intervalles d'une contrainte du fragment."""
+
+    def decaler(ref):
+        if ref >= base:
+            return ref + decalage_variables
+        if ref < 0 and -ref - 1 >= base:
+            return ref - decalage_variables
+        return ref
+
+    champs_variables, champs_intervalles = _champs(contrainte)
+    for champ in champs_variables:
+        champ[:] = [decaler(ref) for ref in champ]
+    for champ in champs_intervalles:
+        champ[:] = [k + decalage_contraintes for k in champ]
+
+
+def fusionner_fragment(model, fragment, base, a_renumeroter):
+    """
+    Ajoute au modèle les variables et contraintes d'un fragment construit sur
+    les `base` premières variables du modèle.
+
+    Les variables auxiliaires du fragment sont numérotées à partir de `base`:
+    elles sont décalées après les variables déjà présentes, de même que les
+    références aux intervalles, qui sont des indices de contraintes.
+    """
+    proto = model.Proto()
+    decalage_variables = len(proto.variables) - base
+    decalage_contraintes = len(proto.constraints)
+    for k in a_renumeroter:
+        _renumeroter(
+            fragment.constraints[k], base, decalage_variables, decalage_contraintes
+        )
+
+    # Les variables auxiliaires sont recréées par l'API du modèle, dans le même
+    # ordre: elles restent accessibles par leur indice
+    for variable in fragment.variables:
+        model.NewIntVarFromDomain(
+            cp_model.Domain.FromFlatIntervals(list(variable.domain)), variable.name
+        )
+    proto.constraints.extend(fragment.constraints)
+
+
+def _lots(etapes, nb_processus):
+    """
+    Découpe les étapes en blocs: chaque étape locale seule, et chaque suite
+    d'étapes non locales en au plus `nb_processus` lots contigus de tailles
+    voisines, construits chacun par un processus.
+
+    Returns:
+        list: [(locale, [étapes])]
+    """
+    blocs = []
+    suite = []
+    for etape in list(etapes) + [None]:
+        if etape is not None and not etape[3]:
+            suite.append(etape)
+            continue
+        nb_lots = min(nb_processus, len(suite))
+        for k in range(nb_lots):
+            blocs.append(
+                (
+                    False,
+                    suite[k * len(suite) // nb_lots : (k + 1) * len(suite) // nb_lots],
+                )
+            )
+        suite = []
+        if etape is not None:
+            blocs.append((True, [etape]))
+    return blocs
+
+
+def construire_en_parallele(model, seance_vars, etapes, nb_processus):
+    """
+    Construit les familles de contraintes dans `nb_processus` processus.
+
+    Chaque processus reçoit une copie des variables du modèle, avec la même
+    numérotation, construit un lot contigu de familles et le renvoie sous forme
+    de fragment de CpModelProto. Les fragments sont fusionnés dans l'ordre des
+    étapes, si bien que le modèle obtenu est celui de la construction
+    séquentielle. Les étapes locales (voir contraintes.etapes_contraintes)
+    sont posées dans ce processus.
+
+    Args:
+        etapes: [(message, fonction, args, locale)] de contraintes.etapes_contraintes
+        nb_processus: Nombre de processus de construction
+
+    Returns:
+        float: Durée de la construction en secondes
+    """
+    debut = time.perf_counter()
+    variables = cp_model_pb2.CpModelProto()
+    variables.variables.extend(model.Proto().variables)
+    base = len(variables.variables)
+    indices = [(cle, var.Index()) for cle, var in seance_vars.items()]
+
+    with ProcessPoolExecutor(
+        max_workers=nb_processus,
+        initializer=_initialiser,
+        initargs=(variables.SerializeToString(), indices),
+    ) as executeur:
+        blocs = _lots(etapes, nb_processus)
+        fragments = [
+            (
+                None
+                if locale
+                else executeur.submit(
+                    _construire_fragment, [(etape[1], etape[2]) for etape in lot]
+                )
+            )
+            for locale, lot in blocs
+        ]
+        for (locale, lot), futur in zip(blocs, fragments):
+            if locale:
+                message, fonction, args, _ = lot[0]
+                print(message)
+                fonction(model, seance_vars, *args)
+                continue
+            donnees, a_renumeroter, sorties = futur.result()
+            for etape, sortie in zip(lot, sorties):
+                print(etape[0])
+                print(sortie, end="")
+            fragment = cp_model_pb2.CpModelProto()
+            fragment.ParseFromString(donnees)
+            fusionner_fragment(model, fragment, base, a_renumeroter)
+
+    duree = time.perf_counter() - debut
+    print(
+        f"Construction parallèle: {len(etapes)} familles en {len(fragments)} lots "
+        f"sur {nb_processus} processus en {duree:.2f}s"
+    )
+    return duree
@@ -1,19 +1,64 @@
 """Module contenant les contraintes pour la génération d'emploi du temps."""
 
+from grille import GrilleHoraire
+
+# Grille utilisée quand aucune n'est fournie: créneaux de 30 minutes de 8h à 20h
+GRILLE_DEFAUT = GrilleHoraire()
+
+# Salle des variables de placement quand la salle est choisie une fois par cours
+# (voir salle_cours.ChoixSalles): les contraintes de salle ne la voient pas
+SALLE_DU_COURS = None
+
+JOURS_SEMAINE = [
+    "lundi",
+    "mardi",
+    "mercredi",
+    "jeudi",
+    "vendredi",
+    "samedi",
+    "dimanche",
+]
+
+
+def _duree_creneaux(seance, grille=None):
+    """Durée d'une séance en créneaux de la grille horaire."""
+    return (grille or GRILLE_DEFAUT).duree_creneaux(seance.duree)
+
+
+def _variables_par_seance(seance_vars):
+    """
+    Regroupe les variables de placement par séance.
+
+    Les familles de contraintes parcourent ainsi uniquement les variables
+    existantes, ce qui rend la construction proportionnelle à la taille du
+    modèle (utile pour les sous-modèles où la plupart des séances sont figées).
+
+    Returns:
+        dict: {id_seance: [(s_idx, j, cr_debut, salle_id, var), ...]}
+    """
+    index = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        index.setdefault(s_id, []).append((s_idx, j, cr_debut, sa_id, var))
+    return index
+
 
 def ajouter_contrainte_seance_unique(
-    model, seance_vars, seances, salles, nb_semaines, nb_jours, nb_creneaux_30min
+    model, seance_vars, seances, salles, nb_semaines, nb_jours, nb_creneaux
 ):
     """Contrainte 1: Chaque séance doit être planifiée exactement une fois dans le mois."""
+    ids_salles = {sa.id for sa in salles} | {SALLE_DU_COURS}
+    vars_par_seance = _variables_par_seance(seance_vars)
     for s in seances:
         model.Add(
             sum(
-                seance_vars.get((s.id_seance, s_idx, j, cr_debut, sa.id), 0)
-                for s_idx in range(nb_semaines)
-                for j in range(nb_jours)
-                for cr_debut in range(nb_creneaux_30min)
-                for sa in salles
-                if (s.id_seance, s_idx, j, cr_debut, sa.id) in seance_vars
+                var
+                for s_idx, j, cr_debut, sa_id, var in vars_par_seance.get(
+                    s.id_seance, []
+                )
+                if s_idx < nb_semaines
+                and j < nb_jours
+                and cr_debut < nb_creneaux
+                and sa_id in ids_salles
             )
             == 1  # Chaque séance est planifiée exactement une fois
         )
@@ -26,43 +71,35 @@ def ajouter_contrainte_enseignant_unicite(
     salles,
     nb_semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
     enseignants,
+    grille=None,
 ):
     """Contrainte: Un enseignant ne peut pas donner deux cours qui se chevauchent."""
-    for e in enseignants:
-        for s_idx in range(nb_semaines):
-            for j in range(nb_jours):
-                for cr in range(nb_creneaux_30min):
-                    # Trouver toutes les séances de cet enseignant qui utilisent ce créneau
-                    seances_utilisant_creneau = []
-
-                    for s in seances:
-                        if s.cours.enseignant.id == e.id:
-                            duree_creneaux = int(
-                                s.duree * 60 / 30
-                            )  # Convertir heures en créneaux de 30 min
-
-                            for cr_debut in range(
-                                max(0, cr - duree_creneaux + 1), cr + 1
-                            ):
-                                for sa in salles:
-                                    if (
-                                        s.id_seance,
-                                        s_idx,
-                                        j,
-                                        cr_debut,
-                                        sa.id,
-                                    ) in seance_vars:
-                                        seances_utilisant_creneau.append(
-                                            seance_vars[
-                                                (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                            ]
-                                        )
-
-                    # Ajouter la contrainte : un enseignant ne peut pas donner plus d'un cours en même temps
-                    if len(seances_utilisant_creneau) > 1:
-                        model.Add(sum(seances_utilisant_creneau) <= 1)
+    ids_enseignants = {e.id for e in enseignants}
+    ids_salles = {sa.id for sa in salles} | {SALLE_DU_COURS}
+    seances_dict = {s.id_seance: s for s in seances}
+
+    # Regrouper les variables par (enseignant, semaine, jour, créneau occupé)
+    seances_utilisant_creneau = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        s = seances_dict.get(s_id)
+        if (
+            s is None
+            or s.cours.enseignant.id not in ids_enseignants
+            or sa_id not in ids_salles
+            or s_idx >= nb_semaines
+        ):
+            continue
+        duree_creneaux = _duree_creneaux(s, grille)
+        for cr in range(cr_debut, min(cr_debut + duree_creneaux, nb_creneaux)):
+            cle = (s.cours.enseignant.id, s_idx, j, cr)
+            seances_utilisant_creneau.setdefault(cle, []).append(var)
+
+    # Ajouter la contrainte : un enseignant ne peut pas donner plus d'un cours en même temps
+    for vars_list in seances_utilisant_creneau.values():
+        if len(vars_list) > 1:
+            model.Add(sum(vars_list) <= 1)
 
 
 def ajouter_contrainte_groupe_unicite(
@@ -72,15 +109,17 @@ def ajouter_contrainte_groupe_unicite(
     calendrier,
     semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
     groupes,
     salles,
+    grille=None,
 ):
     """
     Version optimisée avec moins de contraintes en mémoire,
     tenant compte des relations parent-enfant entre les groupes.
     """
     contraintes_ajoutees = 0
+    seances_dict = {s.id_seance: s for s in seances}
 
     # Créer un dictionnaire pour retrouver rapidement les sous-groupes d'un groupe
     sous_groupes_par_parent = {}
@@ -90,51 +129,39 @@ def ajouter_contrainte_groupe_unicite(
                 sg.id_groupe for sg in groupe.sous_groupes
             ]
 
-    # Regrouper les variables par créneau horaire pour chaque groupe
-    for s_idx in range(len(semaines)):
-        for j in range(nb_jours):
-            if calendrier[semaines[s_idx]][j] is None:
-                continue
+    # Créer un dictionnaire indexé par (groupe_id, semaine, jour, créneau)
+    groupe_creneau_vars = {}
+
+    # Remplir le dictionnaire en un seul passage sur les variables
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        if calendrier[semaines[s_idx]][j] is None:
+            continue
+        s = seances_dict.get(s_id)
+        if s is None:
+            continue
+
+        duree_creneaux = _duree_creneaux(s, grille)
+        groupes_seance = s.groupes if isinstance(s.groupes, list) else [s.groupes]
+
+        for g in groupes_seance:
+            # Pour chaque créneau occupé par la séance
+            for cr in range(cr_debut, cr_debut + duree_creneaux):
+                # Ajouter une contrainte pour le groupe lui-même
+                groupe_creneau_vars.setdefault((g.id_groupe, s_idx, j, cr), []).append(
+                    var
+                )
 
-            # Créer un dictionnaire indexé par (groupe_id, créneau)
-            groupe_creneau_vars = {}
-
-            # Remplir le dictionnaire
-            for (s_id, si, jour, cr_debut, sa_id), var in seance_vars.items():
-                if si == s_idx and jour == j:
-                    s = next(
-                        (seance for seance in seances if seance.id_seance == s_id), None
-                    )
-                    if s:
-                        duree_creneaux = int(s.duree * 60 / 30)
-                        groupes_seance = (
-                            s.groupes if isinstance(s.groupes, list) else [s.groupes]
-                        )
-
-                        for g in groupes_seance:
-                            # Pour chaque créneau occupé par la séance
-                            for cr in range(cr_debut, cr_debut + duree_creneaux):
-                                # Ajouter une contrainte pour le groupe lui-même
-                                key = (g.id_groupe, cr)
-                                if key not in groupe_creneau_vars:
-                                    groupe_creneau_vars[key] = []
-                                groupe_creneau_vars[key].append(var)
-
-                                # Si le groupe a des sous-groupes, ajouter aussi la contrainte pour eux
-                                if g.id_groupe in sous_groupes_par_parent:
-                                    for sous_groupe_id in sous_groupes_par_parent[
-                                        g.id_groupe
-                                    ]:
-                                        key_sous_groupe = (sous_groupe_id, cr)
-                                        if key_sous_groupe not in groupe_creneau_vars:
-                                            groupe_creneau_vars[key_sous_groupe] = []
-                                        groupe_creneau_vars[key_sous_groupe].append(var)
-
-            # Ajouter une contrainte pour chaque groupe/créneau avec plusieurs variables
-            for (g_id, cr), vars_list in groupe_creneau_vars.items():
-                if len(vars_list) > 1:
-                    model.Add(sum(vars_list) <= 1)
-                    contraintes_ajoutees += 1
+                # Si le groupe a des sous-groupes, ajouter aussi la contrainte pour eux
+                for sous_groupe_id in sous_groupes_par_parent.get(g.id_groupe, []):
+                    groupe_creneau_vars.setdefault(
+                        (sous_groupe_id, s_idx, j, cr), []
+                    ).append(var)
+
+    # Ajouter une contrainte pour chaque groupe/créneau avec plusieurs variables
+    for vars_list in groupe_creneau_vars.values():
+        if len(vars_list) > 1:
+            model.Add(sum(vars_list) <= 1)
+            contraintes_ajoutees += 1
 
     print(
         f"Contraintes d'unicité optimisées pour les groupes: {contraintes_ajoutees} contraintes ajoutées"
@@ -150,35 +177,126 @@ def ajouter_contrainte_salle_unicite(
     calendrier,
     semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
+    grille=None,
 ):
     """Contrainte 4: Une salle ne peut pas accueillir deux séances qui se chevauchent."""
-    for sa in salles:
-        for s_idx in range(len(semaines)):
-            for j in range(nb_jours):
-                # Vérifier si le jour est disponible (non férié)
+    ids_salles = {sa.id for sa in salles}
+    seances_dict = {s.id_seance: s for s in seances}
+
+    # Regrouper les variables par (salle, semaine, jour, créneau occupé)
+    seances_utilisant_creneau = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        s = seances_dict.get(s_id)
+        if s is None or sa_id not in ids_salles:
+            continue
+        # Vérifier si le jour est disponible (non férié)
+        if calendrier[semaines[s_idx]][j] is None:
+            continue
+        duree_creneaux = _duree_creneaux(s, grille)
+        for cr in range(cr_debut, min(cr_debut + duree_creneaux, nb_creneaux)):
+            seances_utilisant_creneau.setdefault((sa_id, s_idx, j, cr), []).append(var)
+
+    for vars_list in seances_utilisant_creneau.values():
+        if len(vars_list) > 1:
+            model.Add(sum(vars_list) <= 1)
+
+
+def ajouter_contrainte_cliques_exclusivite(
+    model, seance_vars, seances, graphe, calendrier, semaines, nb_creneaux, grille=None
+):
+    """
+    Contrainte: deux séances en conflit (enseignant commun, groupes liés, même
+    salle imposée) ne peuvent pas se chevaucher.
+
+    Remplace les contraintes d'unicité des enseignants et des groupes: pour
+    chaque clique du graphe de conflits (voir conflits.GrapheConflits) et chaque
+    créneau, une seule contrainte AddAtMostOne porte sur tous les placements
+    des séances de la clique qui occupent ce créneau.
+    """
+    contraintes_ajoutees = 0
+    seances_dict = {s.id_seance: s for s in seances}
+    vars_par_seance = _variables_par_seance(seance_vars)
+
+    for clique in graphe.cliques:
+        vars_par_creneau = {}
+        for s_id in sorted(clique):
+            s = seances_dict.get(s_id)
+            if s is None:
+                continue
+            duree_creneaux = _duree_creneaux(s, grille)
+            for s_idx, j, cr_debut, sa_id, var in vars_par_seance.get(s_id, []):
                 if calendrier[semaines[s_idx]][j] is None:
                     continue
+                for cr in range(cr_debut, min(cr_debut + duree_creneaux, nb_creneaux)):
+                    vars_par_creneau.setdefault((s_idx, j, cr), []).append(var)
 
-                for cr in range(nb_creneaux_30min):
-                    # Trouver toutes les séances dans cette salle qui utilisent ce créneau
-                    seances_utilisant_creneau = []
+        for vars_list in vars_par_creneau.values():
+            if len(vars_list) > 1:
+                model.AddAtMostOne(vars_list)
+                contraintes_ajoutees += 1
 
-                    for s in seances:
-                        duree_creneaux = int(
-                            s.duree * 60 / 30
-                        )  # Convertir heures en créneaux de 30 min
+    stats = graphe.statistiques()
+    print(
+        f"Graphe de conflits: {stats['conflits_seances']} séances, "
+        f"{stats['conflits_aretes']} arêtes, {stats['conflits_cliques']} cliques "
+        f"(taille max {stats['conflits_clique_max']})"
+    )
+    print(
+        f"Contraintes d'exclusivité par cliques: {contraintes_ajoutees} contraintes ajoutées"
+    )
+    return contraintes_ajoutees
 
-                        for cr_debut in range(max(0, cr - duree_creneaux + 1), cr + 1):
-                            if (s.id_seance, s_idx, j, cr_debut, sa.id) in seance_vars:
-                                seances_utilisant_creneau.append(
-                                    seance_vars[
-                                        (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                    ]
-                                )
 
-                    if len(seances_utilisant_creneau) > 1:
-                        model.Add(sum(seances_utilisant_creneau) <= 1)
+def _ajouter_pause_dejeuner(
+    model, utilisation_par_creneau, pause_debut, pause_fin, nom, nb_creneaux_pause=2
+):
+    """
+    Impose une pause libre de nb_creneaux_pause créneaux consécutifs
+    (1h sur la grille de 30 minutes) entre pause_debut et pause_fin.
+
+    Args:
+        utilisation_par_creneau: {créneau: [variables occupant ce créneau]}
+        nom: Suffixe utilisé pour nommer les variables auxiliaires
+        nb_creneaux_pause: Nombre de créneaux libres consécutifs exigés
+    """
+    # Variables pour indiquer si un créneau est utilisé
+    creneau_utilise = {}
+    for cr in range(pause_debut, pause_fin + 1):
+        utilisation = utilisation_par_creneau.get(cr, [])
+        if utilisation:
+            creneau_utilise[cr] = model.NewBoolVar(f"{nom}_creneau_{cr}_utilise")
+            model.Add(sum(utilisation) >= 1).OnlyEnforceIf(creneau_utilise[cr])
+            model.Add(sum(utilisation) == 0).OnlyEnforceIf(creneau_utilise[cr].Not())
+        else:
+            creneau_utilise[cr] = model.NewConstant(0)
+
+    # Nous avons besoin d'au moins nb_creneaux_pause créneaux consécutifs libres
+    pause_valide = model.NewBoolVar(f"pause_dejeuner_valide_{nom}")
+
+    # Différentes possibilités pour la pause
+    options_pause = []
+    for start in range(pause_debut, pause_fin + 2 - nb_creneaux_pause):
+        option = model.NewBoolVar(f"pause_option_{nom}_{start}")
+        creneaux_pause = [
+            creneau_utilise[cr] for cr in range(start, start + nb_creneaux_pause)
+        ]
+        # Les créneaux consécutifs doivent être libres
+        model.AddBoolAnd([cr.Not() for cr in creneaux_pause]).OnlyEnforceIf(option)
+
+        # Si cette option n'est pas choisie, au moins un des créneaux est utilisé
+        model.AddBoolOr(creneaux_pause).OnlyEnforceIf(option.Not())
+
+        options_pause.append(option)
+
+    # Au moins une des options de pause doit être valide
+    model.AddBoolOr(options_pause).OnlyEnforceIf(pause_valide)
+    model.AddBoolAnd([option.Not() for option in options_pause]).OnlyEnforceIf(
+        pause_valide.Not()
+    )
+
+    # Rendre la pause obligatoire
+    model.Add(pause_valide == 1)
 
 
 def ajouter_contrainte_pause_dejeuner_enseignant(
@@ -192,91 +310,41 @@ def ajouter_contrainte_pause_dejeuner_enseignant(
     enseignants,
     pause_debut,
     pause_fin,
+    grille=None,
 ):
     """Contrainte 5: Pause déjeuner pour chaque enseignant - OBLIGATOIRE 1h entre 12h et 14h."""
-    for e in enseignants:
-        for s_idx in range(len(semaines)):
-            for j in range(nb_jours):
-                # Vérifier si le jour est disponible (non férié)
-                if calendrier[semaines[s_idx]][j] is None:
-                    continue
-
-                # Variables pour indiquer si un créneau est utilisé par l'enseignant
-                creneau_utilise = {}
-                for cr in range(pause_debut, pause_fin + 1):
-                    utilisation = []
-                    for s in seances:
-                        if s.cours.enseignant.id == e.id:
-                            duree_creneaux = int(
-                                s.duree * 60 / 30
-                            )  # Convertir heures en créneaux de 30 min
-
-                            for cr_debut in range(
-                                max(0, cr - duree_creneaux + 1), cr + 1
-                            ):
-                                for sa in salles:
-                                    if (
-                                        s.id_seance,
-                                        s_idx,
-                                        j,
-                                        cr_debut,
-                                        sa.id,
-                                    ) in seance_vars:
-                                        utilisation.append(
-                                            seance_vars[
-                                                (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                            ]
-                                        )
-
-                    # Si aucune séance n'utilise ce créneau, il est libre
-                    if utilisation:
-                        creneau_utilise[cr] = model.NewBoolVar(
-                            f"enseignant_{e.id}_semaine_{s_idx}_jour_{j}_creneau_{cr}_utilise"
-                        )
-                        model.Add(sum(utilisation) >= 1).OnlyEnforceIf(
-                            creneau_utilise[cr]
-                        )
-                        model.Add(sum(utilisation) == 0).OnlyEnforceIf(
-                            creneau_utilise[cr].Not()
-                        )
-                    else:
-                        creneau_utilise[cr] = model.NewConstant(0)
-
-                # Nous avons besoin d'au moins 2 créneaux consécutifs libres (1h)
-                # Vérifier toutes les possibilités de 2 créneaux consécutifs
-                pause_valide = model.NewBoolVar(
-                    f"pause_dejeuner_valide_{e.id}_{s_idx}_{j}"
-                )
-
-                # Différentes possibilités pour 1h de pause
-                options_pause = []
-                for start in range(pause_debut, pause_fin):
-                    option = model.NewBoolVar(
-                        f"pause_option_{e.id}_{s_idx}_{j}_{start}"
-                    )
-                    # Deux créneaux consécutifs doivent être libres
-                    model.AddBoolAnd(
-                        [
-                            creneau_utilise[start].Not(),
-                            creneau_utilise[start + 1].Not(),
-                        ]
-                    ).OnlyEnforceIf(option)
-
-                    # Si cette option n'est pas choisie, au moins un des créneaux est utilisé
-                    model.AddBoolOr(
-                        [creneau_utilise[start], creneau_utilise[start + 1]]
-                    ).OnlyEnforceIf(option.Not())
-
-                    options_pause.append(option)
-
-                # Au moins une des options de pause doit être valide
-                model.AddBoolOr(options_pause).OnlyEnforceIf(pause_valide)
-                model.AddBoolAnd(
-                    [option.Not() for option in options_pause]
-                ).OnlyEnforceIf(pause_valide.Not())
-
-                # Rendre la pause obligatoire
-                model.Add(pause_valide == 1)
+    grille = grille or GRILLE_DEFAUT
+    ids_enseignants = {e.id for e in enseignants}
+    ids_salles = {sa.id for sa in salles} | {SALLE_DU_COURS}
+    seances_dict = {s.id_seance: s for s in seances}
+
+    # Variables occupant la plage du déjeuner, par (enseignant, semaine, jour)
+    utilisation = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        s = seances_dict.get(s_id)
+        if s is None or s.cours.enseignant.id not in ids_enseignants:
+            continue
+        # Vérifier si le jour est disponible (non férié)
+        if sa_id not in ids_salles or calendrier[semaines[s_idx]][j] is None:
+            continue
+        duree_creneaux = _duree_creneaux(s, grille)
+        for cr in range(
+            max(cr_debut, pause_debut), min(cr_debut + duree_creneaux, pause_fin + 1)
+        ):
+            utilisation.setdefault((s.cours.enseignant.id, s_idx, j), {}).setdefault(
+                cr, []
+            ).append(var)
+
+    # Un jour sans aucune séance possible pendant le déjeuner laisse la pause libre
+    for (e_id, s_idx, j), utilisation_par_creneau in utilisation.items():
+        _ajouter_pause_dejeuner(
+            model,
+            utilisation_par_creneau,
+            pause_debut,
+            pause_fin,
+            f"{e_id}_{s_idx}_{j}",
+            grille.nb_creneaux_pause,
+        )
 
 
 def ajouter_contrainte_pause_dejeuner_groupe(
@@ -290,106 +358,45 @@ def ajouter_contrainte_pause_dejeuner_groupe(
     groupes,
     pause_debut,
     pause_fin,
+    grille=None,
 ):
     """Contrainte 6: Pause déjeuner pour chaque groupe - OBLIGATOIRE 1h entre 12h et 14h."""
-    for g in groupes:
-        for s_idx in range(len(semaines)):
-            for j in range(nb_jours):
-                # Vérifier si le jour est disponible (non férié)
-                if calendrier[semaines[s_idx]][j] is None:
-                    continue
-
-                # Variables pour indiquer si un créneau est utilisé par le groupe
-                creneau_utilise = {}
-                for cr in range(pause_debut, pause_fin + 1):
-                    utilisation = []
-                    for s in seances:
-                        # Vérifier si le groupe fait partie des groupes de la séance
-                        groupe_present = False
-
-                        if isinstance(s.groupes, list):
-                            # Si c'est une liste, vérifier si le groupe est dans la liste
-                            for groupe_seance in s.groupes:
-                                if groupe_seance.id_groupe == g.id_groupe:
-                                    groupe_present = True
-                                    break
-                        else:
-                            # Si c'est un objet unique, comparer les ID
-                            if (
-                                hasattr(s.groupes, "id_groupe")
-                                and s.groupes.id_groupe == g.id_groupe
-                            ):
-                                groupe_present = True
-
-                        if groupe_present:
-                            duree_creneaux = int(
-                                s.duree * 60 / 30
-                            )  # Convertir heures en créneaux de 30 min
-
-                            for cr_debut in range(
-                                max(0, cr - duree_creneaux + 1), cr + 1
-                            ):
-                                for sa in salles:
-                                    if (
-                                        s.id_seance,
-                                        s_idx,
-                                        j,
-                                        cr_debut,
-                                        sa.id,
-                                    ) in seance_vars:
-                                        utilisation.append(
-                                            seance_vars[
-                                                (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                            ]
-                                        )
-
-                    if utilisation:
-                        creneau_utilise[cr] = model.NewBoolVar(
-                            f"groupe_{g.id_groupe}_semaine_{s_idx}_jour_{j}_creneau_{cr}_utilise"
-                        )
-                        model.Add(sum(utilisation) >= 1).OnlyEnforceIf(
-                            creneau_utilise[cr]
-                        )
-                        model.Add(sum(utilisation) == 0).OnlyEnforceIf(
-                            creneau_utilise[cr].Not()
-                        )
-                    else:
-                        creneau_utilise[cr] = model.NewConstant(0)
-
-                # Nous avons besoin d'au moins 2 créneaux consécutifs libres (1h)
-                pause_valide = model.NewBoolVar(
-                    f"pause_dejeuner_valide_groupe_{g.id_groupe}_{s_idx}_{j}"
+    grille = grille or GRILLE_DEFAUT
+    ids_groupes = {g.id_groupe for g in groupes}
+    ids_salles = {sa.id for sa in salles} | {SALLE_DU_COURS}
+    seances_dict = {s.id_seance: s for s in seances}
+
+    # Variables occupant la plage du déjeuner, par (groupe, semaine, jour)
+    utilisation = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        s = seances_dict.get(s_id)
+        if s is None:
+            continue
+        # Vérifier si le jour est disponible (non férié)
+        if sa_id not in ids_salles or calendrier[semaines[s_idx]][j] is None:
+            continue
+        groupes_seance = s.groupes if isinstance(s.groupes, list) else [s.groupes]
+        duree_creneaux = _duree_creneaux(s, grille)
+        # Vérifier si le groupe fait partie des groupes de la séance
+        for g_id in {g.id_groupe for g in groupes_seance} & ids_groupes:
+            for cr in range(
+                max(cr_debut, pause_debut),
+                min(cr_debut + duree_creneaux, pause_fin + 1),
+            ):
+                utilisation.setdefault((g_id, s_idx, j), {}).setdefault(cr, []).append(
+                    var
                 )
 
-                # Différentes possibilités pour 1h de pause
-                options_pause = []
-                for start in range(pause_debut, pause_fin):
-                    option = model.NewBoolVar(
-                        f"pause_option_groupe_{g.id_groupe}_{s_idx}_{j}_{start}"
-                    )
-                    # Deux créneaux consécutifs doivent être libres
-                    model.AddBoolAnd(
-                        [
-                            creneau_utilise[start].Not(),
-                            creneau_utilise[start + 1].Not(),
-                        ]
-                    ).OnlyEnforceIf(option)
-
-                    # Si cette option n'est pas choisie, au moins un des créneaux est utilisé
-                    model.AddBoolOr(
-                        [creneau_utilise[start], creneau_utilise[start + 1]]
-                    ).OnlyEnforceIf(option.Not())
-
-                    options_pause.append(option)
-
-                # Au moins une des options de pause doit être valide
-                model.AddBoolOr(options_pause).OnlyEnforceIf(pause_valide)
-                model.AddBoolAnd(
-                    [option.Not() for option in options_pause]
-                ).OnlyEnforceIf(pause_valide.Not())
-
-                # Rendre la pause obligatoire
-                model.Add(pause_valide == 1)
+    # Un jour sans aucune séance possible pendant le déjeuner laisse la pause libre
+    for (g_id, s_idx, j), utilisation_par_creneau in utilisation.items():
+        _ajouter_pause_dejeuner(
+            model,
+            utilisation_par_creneau,
+            pause_debut,
+            pause_fin,
+            f"groupe_{g_id}_{s_idx}_{j}",
+            grille.nb_creneaux_pause,
+        )
 
 
 def ajouter_contrainte_capacite_salle(
@@ -400,12 +407,14 @@ def ajouter_contrainte_capacite_salle(
     calendrier,
     semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
 ):
     """
     Contrainte: La capacité de la salle doit être suffisante pour accueillir tous les groupes participant à la séance.
     """
     contraintes_ajoutees = 0
+    salles_dict = {sa.id: sa for sa in salles}
+    vars_par_seance = _variables_par_seance(seance_vars)
 
     for s in seances:
         # Calculer l'effectif total des groupes participant à la séance
@@ -413,21 +422,13 @@ def ajouter_contrainte_capacite_salle(
         for groupe in s.groupes:
             effectif_total += groupe.effectif
 
-        for sa in salles:
+        for s_idx, j, cr_debut, sa_id, var in vars_par_seance.get(s.id_seance, []):
             # Si la capacité de la salle est inférieure à l'effectif total,
             # on empêche l'affectation de cette séance à cette salle
-            if sa.effectif_max < effectif_total:
-                for s_idx in range(len(semaines)):
-                    for j in range(nb_jours):
-                        for cr_debut in range(nb_creneaux_30min):
-                            if (s.id_seance, s_idx, j, cr_debut, sa.id) in seance_vars:
-                                model.Add(
-                                    seance_vars[
-                                        (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                    ]
-                                    == 0
-                                )
-                                contraintes_ajoutees += 1
+            sa = salles_dict.get(sa_id)
+            if sa is not None and sa.effectif_max < effectif_total:
+                model.Add(var == 0)
+                contraintes_ajoutees += 1
 
     print(
         f"Contraintes de capacité des salles: {contraintes_ajoutees} contraintes ajoutées"
@@ -443,40 +444,30 @@ def ajouter_contrainte_type_salle_td(
     calendrier,
     semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
 ):
     """
     Contrainte: Pour les cours en TD, si l'enseignant a un besoin spécifique de salle,
     seules les salles correspondantes peuvent être utilisées.
     """
     contraintes_ajoutees = 0
+    salles_dict = {sa.id: sa for sa in salles}
+    vars_par_seance = _variables_par_seance(seance_vars)
 
     for s in seances:
         # Appliquer la contrainte uniquement aux séances de type TD
-        if s.type_seance == "TD":
-            enseignant = s.cours.enseignant
-            # Vérifier si l'enseignant a un besoin spécifique de salle
-            if enseignant.besoin_salle != "standard":
-                for sa in salles:
-                    # Si la salle ne correspond pas au besoin de l'enseignant
-                    if sa.type_salle != enseignant.besoin_salle:
-                        for s_idx in range(len(semaines)):
-                            for j in range(nb_jours):
-                                for cr_debut in range(nb_creneaux_30min):
-                                    if (
-                                        s.id_seance,
-                                        s_idx,
-                                        j,
-                                        cr_debut,
-                                        sa.id,
-                                    ) in seance_vars:
-                                        model.Add(
-                                            seance_vars[
-                                                (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                            ]
-                                            == 0
-                                        )
-                                        contraintes_ajoutees += 1
+        if s.type_seance != "TD":
+            continue
+        enseignant = s.cours.enseignant
+        # Vérifier si l'enseignant a un besoin spécifique de salle
+        if enseignant.besoin_salle == "standard":
+            continue
+        for s_idx, j, cr_debut, sa_id, var in vars_par_seance.get(s.id_seance, []):
+            # Si la salle ne correspond pas au besoin de l'enseignant
+            sa = salles_dict.get(sa_id)
+            if sa is not None and sa.type_salle != enseignant.besoin_salle:
+                model.Add(var == 0)
+                contraintes_ajoutees += 1
 
     print(
         f"Contraintes de type de salle pour TD: {contraintes_ajoutees} contraintes ajoutées"
@@ -484,6 +475,22 @@ def ajouter_contrainte_type_salle_td(
     return contraintes_ajoutees
 
 
+def _salle_disponible(sa, j, cr_debut, duree_creneaux, fin_matin):
+    """
+    Une séance commençant au créneau `cr_debut` du jour `j` peut-elle occuper la
+    salle: salle disponible sur la période du début, sans déborder du matin.
+    """
+    # Déterminer si le créneau de début est le matin ou l'après-midi
+    periode = "matin" if cr_debut < fin_matin else "apres_midi"
+
+    # Vérifier si la salle est disponible pendant cette période
+    if not sa.est_disponible(JOURS_SEMAINE[j], periode):
+        return False
+
+    # Vérifier si la séance dépasse la période de disponibilité
+    return not (periode == "matin" and cr_debut + duree_creneaux > fin_matin)
+
+
 def ajouter_contrainte_disponibilite_salle(
     model,
     seance_vars,
@@ -492,79 +499,33 @@ def ajouter_contrainte_disponibilite_salle(
     calendrier,
     semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
+    grille=None,
 ):
     """
     Contrainte: Vérifie si une salle est disponible en fonction de la période (matin/après-midi)
     et empêche l'affectation si la séance dépasse la disponibilité de la salle.
     """
     contraintes_ajoutees = 0
+    salles_dict = {sa.id: sa for sa in salles}
+    vars_par_seance = _variables_par_seance(seance_vars)
+    # Premier créneau de l'après-midi (13h)
+    fin_matin = (grille or GRILLE_DEFAUT).fin_matin
 
     for s in seances:
-        duree_creneaux = int(s.duree * 60 / 30)  # Durée de la séance en créneaux
-
-        for sa in salles:
-            for s_idx in range(len(semaines)):
-                for j in range(nb_jours):
-                    # Vérifier si le jour est disponible (non férié)
-                    if calendrier[semaines[s_idx]][j] is None:
-                        continue
-
-                    for cr_debut in range(nb_creneaux_30min - duree_creneaux + 1):
-                        # Déterminer si le créneau de début est le matin ou l'après-midi
-                        if cr_debut < 10:  # 10 correspond à 13h (8h + 5h)
-                            periode = "matin"
-                        else:
-                            periode = "apres_midi"
-
-                        # Vérifier si la salle est disponible pendant cette période
-                        JOURS_SEMAINE = [
-                            "lundi",
-                            "mardi",
-                            "mercredi",
-                            "jeudi",
-                            "vendredi",
-                            "samedi",
-                            "dimanche",
-                        ]
-                        if not sa.est_disponible(
-                            JOURS_SEMAINE[j], periode
-                        ):  # JOURS_SEMAINE doit être défini
-                            if (
-                                s.id_seance,
-                                s_idx,
-                                j,
-                                cr_debut,
-                                sa.id,
-                            ) in seance_vars:
-                                model.Add(
-                                    seance_vars[
-                                        (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                    ]
-                                    == 0
-                                )
-                                contraintes_ajoutees += 1
-                                continue  # Passer à la prochaine itération
-
-                        # Vérifier si la séance dépasse la période de disponibilité
-                        heure_fin_creneau = cr_debut + duree_creneaux
-                        if (
-                            periode == "matin" and heure_fin_creneau > 10
-                        ):  # Si la salle est dispo que le matin
-                            if (
-                                s.id_seance,
-                                s_idx,
-                                j,
-                                cr_debut,
-                                sa.id,
-                            ) in seance_vars:
-                                model.Add(
-                                    seance_vars[
-                                        (s.id_seance, s_idx, j, cr_debut, sa.id)
-                                    ]
-                                    == 0
-                                )
-                                contraintes_ajoutees += 1
+        duree_creneaux = _duree_creneaux(s, grille)  # Durée de la séance en créneaux
+
+        for s_idx, j, cr_debut, sa_id, var in vars_par_seance.get(s.id_seance, []):
+            sa = salles_dict.get(sa_id)
+            # Vérifier si le jour est disponible (non férié)
+            if sa is None or calendrier[semaines[s_idx]][j] is None:
+                continue
+            if cr_debut > nb_creneaux - duree_creneaux:
+                continue
+
+            if not _salle_disponible(sa, j, cr_debut, duree_creneaux, fin_matin):
+                model.Add(var == 0)
+                contraintes_ajoutees += 1
 
     print(
         f"Contraintes de disponibilité des salles: {contraintes_ajoutees} contraintes ajoutées"
@@ -572,13 +533,92 @@ def ajouter_contrainte_disponibilite_salle(
     return contraintes_ajoutees
 
 
+def ajouter_contrainte_salles_par_cours(
+    model,
+    seance_vars,
+    seances,
+    choix_salles,
+    calendrier,
+    semaines,
+    nb_jours,
+    nb_creneaux,
+    grille=None,
+):
+    """
+    Contrainte: quand la salle est choisie une fois par cours et groupe (voir
+    salle_cours.ChoixSalles), une salle n'accueille pas deux séances qui se
+    chevauchent et n'est utilisée que pendant ses disponibilités.
+
+    Chaque séance a un intervalle optionnel par salle admissible, présent si
+    cette salle est choisie pour son cours; un NoOverlap par salle remplace les
+    contraintes d'unicité des salles créneau par créneau.
+    """
+    contraintes_ajoutees = 0
+    fin_matin = (grille or GRILLE_DEFAUT).fin_matin
+    vars_par_seance = _variables_par_seance(seance_vars)
+    horizon = len(semaines) * nb_jours * nb_creneaux
+
+    intervalles_par_salle = {}
+    for s in seances:
+        placements = [
+            p
+            for p in vars_par_seance.get(s.id_seance, [])
+            if calendrier[semaines[p[0]]][p[1]] is not None
+        ]
+        if not placements:
+            continue
+        duree_creneaux = _duree_creneaux(s, grille)
+
+        # Temps absolu du début de la séance (une seule variable de placement vraie)
+        debut = model.NewIntVar(0, horizon, f"debut_{s.id_seance}")
+        model.Add(
+            debut
+            == sum(
+                ((s_idx * nb_jours + j) * nb_creneaux + cr_debut) * var
+                for s_idx, j, cr_debut, _, var in placements
+            )
+        )
+
+        for sa, choix in choix_salles.salles_possibles(s):
+            intervalles_par_salle.setdefault(sa.id, []).append(
+                model.NewOptionalFixedSizeIntervalVar(
+                    debut, duree_creneaux, choix, f"intervalle_{s.id_seance}_{sa.id}"
+                )
+            )
+            # Placement interdit dans cette salle: pas les deux à la fois
+            for s_idx, j, cr_debut, _, var in placements:
+                if not _salle_disponible(sa, j, cr_debut, duree_creneaux, fin_matin):
+                    model.AddBoolOr([var.Not(), choix.Not()])
+                    contraintes_ajoutees += 1
+
+    for intervalles in intervalles_par_salle.values():
+        if len(intervalles) > 1:
+            model.AddNoOverlap(intervalles)
+            contraintes_ajoutees += 1
+
+    print(
+        f"Contraintes de salle par cours: {contraintes_ajoutees} contraintes ajoutées"
+    )
+    return contraintes_ajoutees
+
+
+def get_seance_order(seance):
+    """Numéro de la séance dans son cours (dernier élément de l'id_seance)."""
+    parts = seance.id_seance.split("_")
+    if len(parts) >= 3 and parts[-1].isdigit():
+        return int(parts[-1])
+    return 0  # Par défaut si le format ne correspond pas
+
+
 def ajouter_contrainte_ordre_seances(
-    model, seance_vars, seances, salles, nb_semaines, nb_jours, nb_creneaux_30min
+    model, seance_vars, seances, salles, nb_semaines, nb_jours, nb_creneaux
 ):
     """
     Contrainte: Assure que les séances d'un même cours sont placées dans l'ordre chronologique.
     """
     contraintes_ajoutees = 0
+    ids_salles = {sa.id for sa in salles} | {SALLE_DU_COURS}
+    vars_par_seance = _variables_par_seance(seance_vars)
 
     # Regrouper les séances par cours
     cours_seances = {}
@@ -589,14 +629,6 @@ def ajouter_contrainte_ordre_seances(
 
     # Pour chaque cours, ajouter des contraintes pour ordonner les séances
     for id_cours, seances_cours in cours_seances.items():
-        # Extraire l'ordre numérique des séances à partir de l'id_seance
-        def get_seance_order(seance):
-            # Extraire le numéro de séance à partir de l'id_seance
-            parts = seance.id_seance.split("_")
-            if len(parts) >= 3 and parts[-1].isdigit():
-                return int(parts[-1])
-            return 0  # Par défaut si le format ne correspond pas
-
         # Trier les séances par numéro de séance
         seances_cours.sort(key=get_seance_order)
 
@@ -607,35 +639,23 @@ def ajouter_contrainte_ordre_seances(
         for seance in seances_cours:
             seance_time_vars[seance.id_seance] = model.NewIntVar(
                 0,
-                nb_semaines * nb_jours * nb_creneaux_30min - 1,
+                nb_semaines * nb_jours * nb_creneaux - 1,
                 f"time_seance_{seance.id_seance}",
             )
 
             # Lier cette variable aux variables de décision de placement
-            for s_idx in range(nb_semaines):
-                for j in range(nb_jours):
-                    for cr_debut in range(nb_creneaux_30min):
-                        for sa in salles:
-                            if (
-                                seance.id_seance,
-                                s_idx,
-                                j,
-                                cr_debut,
-                                sa.id,
-                            ) in seance_vars:
-                                # Calcul du temps absolu (semaine, jour, créneau)
-                                temps_absolu = (
-                                    s_idx * nb_jours * nb_creneaux_30min
-                                    + j * nb_creneaux_30min
-                                    + cr_debut
-                                )
-                                model.Add(
-                                    seance_time_vars[seance.id_seance] == temps_absolu
-                                ).OnlyEnforceIf(
-                                    seance_vars[
-                                        (seance.id_seance, s_idx, j, cr_debut, sa.id)
-                                    ]
-                                )
+            for s_idx, j, cr_debut, sa_id, var in vars_par_seance.get(
+                seance.id_seance, []
+            ):
+                if sa_id not in ids_salles:
+                    continue
+                # Calcul du temps absolu (semaine, jour, créneau)
+                temps_absolu = (
+                    s_idx * nb_jours * nb_creneaux + j * nb_creneaux + cr_debut
+                )
+                model.Add(
+                    seance_time_vars[seance.id_seance] == temps_absolu
+                ).OnlyEnforceIf(var)
 
         # Ajouter des contraintes pour l'ordre des séances
         for i in range(len(seances_cours) - 1):
@@ -663,235 +683,591 @@ def ajouter_contrainte_disponibilite_enseignant(
     calendrier,
     semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
     enseignants,
+    grille=None,
 ):
     """Contrainte: Vérifie que les enseignants sont disponibles pour leurs cours."""
-    for e in enseignants:  # Parcourir les enseignants
-        for s_idx, semaine in enumerate(semaines):  # Parcourir les semaines
+    fin_matin = (grille or GRILLE_DEFAUT).fin_matin
+    enseignants_dict = {e.id: e for e in enseignants}
+    ids_salles = {sa.id for sa in salles} | {SALLE_DU_COURS}
+    vars_par_seance = _variables_par_seance(seance_vars)
+
+    # Disponibilités déjà consultées, par (enseignant, jour, période)
+    disponibilites = {}
+
+    def est_disponible(e, jour_semaine, periode):
+        cle = (e.id, jour_semaine, periode)
+        if cle not in disponibilites:
+            disponibilites[cle] = e.est_disponible(jour_semaine, periode)
+        return disponibilites[cle]
+
+    for s in seances:  # Parcourir les séances
+        e = enseignants_dict.get(s.cours.enseignant.id)
+        if e is None:
+            continue
+        duree_creneaux = _duree_creneaux(s, grille)
+
+        for s_idx, j, cr_debut, sa_id, var in vars_par_seance.get(s.id_seance, []):
+            if sa_id not in ids_salles:
+                continue
+
             # Vérifier si la semaine est paire ou impaire
-            est_semaine_paire = semaine % 2 == 0
+            est_semaine_paire = semaines[s_idx] % 2 == 0
 
             # Vérifier la disponibilité de l'enseignant pour cette semaine
             if (est_semaine_paire and not e.semaine_paire) or (
                 not est_semaine_paire and not e.semaine_impaire
             ):
                 # Si l'enseignant n'est pas disponible pour cette semaine, le rendre indisponible pour toute la semaine
-                for j in range(nb_jours):
-                    for cr in range(nb_creneaux_30min):
-                        for s in seances:
-                            if s.cours.enseignant.id == e.id:
-                                for sa in salles:
-                                    if (
-                                        s.id_seance,
-                                        s_idx,
-                                        j,
-                                        cr,
-                                        sa.id,
-                                    ) in seance_vars:
-                                        model.Add(
-                                            seance_vars[
-                                                (s.id_seance, s_idx, j, cr, sa.id)
-                                            ]
-                                            == 0
-                                        )
-            else:
-                # Si l'enseignant est disponible pour cette semaine, vérifier les jours et créneaux
-                for j in range(nb_jours):
-                    # Vérifier si le jour est disponible (non férié)
-                    if calendrier[semaines[s_idx]][j] is None:
-                        continue
-
-                    JOURS_SEMAINE = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
-                    jour_semaine = JOURS_SEMAINE[j].lower()
-
-                    for cr in range(nb_creneaux_30min):
-                        # Déterminer si le créneau est le matin ou l'après-midi
-                        periode = "matin" if cr < 10 else "apres_midi"
-
-                        # Vérifier si l'enseignant est disponible pendant cette période
-                        if not e.est_disponible(jour_semaine, periode):
-                            for s in seances:
-                                if s.cours.enseignant.id == e.id:
-                                    duree_creneaux = int(s.duree * 60 / 30)
-
-                                    for cr_debut in range(
-                                        max(0, cr - duree_creneaux + 1), cr + 1
-                                    ):
-                                        for sa in salles:
-                                            if (
-                                                s.id_seance,
-                                                s_idx,
-                                                j,
-                                                cr_debut,
-                                                sa.id,
-                                            ) in seance_vars:
-                                                # Empêcher l'affectation de la séance à ce créneau
-                                                model.Add(
-                                                    seance_vars[
-                                                        (
-                                                            s.id_seance,
-                                                            s_idx,
-                                                            j,
-                                                            cr_debut,
-                                                            sa.id,
-                                                        )
-                                                    ]
-                                                    == 0
-                                                )
+                model.Add(var == 0)
+                continue
 
+            # Vérifier si le jour est disponible (non férié)
+            if calendrier[semaines[s_idx]][j] is None:
+                continue
 
-def ajouter_toutes_contraintes(
-    model,
-    seance_vars,
+            jour_semaine = JOURS_SEMAINE[j]
+
+            # Vérifier que l'enseignant est disponible sur tous les créneaux occupés
+            for cr in range(cr_debut, min(cr_debut + duree_creneaux, nb_creneaux)):
+                # Déterminer si le créneau est le matin ou l'après-midi
+                periode = "matin" if cr < fin_matin else "apres_midi"
+
+                if not est_disponible(e, jour_semaine, periode):
+                    # Empêcher l'affectation de la séance à ce créneau
+                    model.Add(var == 0)
+                    break
+
+
+def ajouter_redondance_salles_par_type(
+    model, seance_vars, seances, salles, calendrier, semaines, nb_creneaux, grille=None
+):
+    """
+    Contrainte redondante: à chaque créneau, le nombre de séances placées dans
+    une salle d'un type donné ne dépasse pas le nombre de salles de ce type.
+    """
+    contraintes_ajoutees = 0
+    type_par_salle = {sa.id: sa.type_salle for sa in salles}
+    nb_salles_par_type = {}
+    for sa in salles:
+        nb_salles_par_type[sa.type_salle] = nb_salles_par_type.get(sa.type_salle, 0) + 1
+    seances_dict = {s.id_seance: s for s in seances}
+
+    # Regrouper les variables par (type de salle, semaine, jour, créneau occupé)
+    utilisation = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        s = seances_dict.get(s_id)
+        if s is None or sa_id not in type_par_salle:
+            continue
+        if calendrier[semaines[s_idx]][j] is None:
+            continue
+        duree_creneaux = _duree_creneaux(s, grille)
+        for cr in range(cr_debut, min(cr_debut + duree_creneaux, nb_creneaux)):
+            utilisation.setdefault((type_par_salle[sa_id], s_idx, j, cr), []).append(
+                var
+            )
+
+    for (type_salle, _, _, _), vars_list in utilisation.items():
+        if len(vars_list) > nb_salles_par_type[type_salle]:
+            model.Add(sum(vars_list) <= nb_salles_par_type[type_salle])
+            contraintes_ajoutees += 1
+
+    print(
+        f"Contraintes redondantes de salles par type: {contraintes_ajoutees} contraintes ajoutées"
+    )
+    return contraintes_ajoutees
+
+
+def ajouter_redondance_minutes_groupe(
+    model, seance_vars, seances, salles, calendrier, semaines, groupes, grille=None
+):
+    """
+    Contrainte redondante: les séances d'un groupe dans une journée tiennent
+    dans la journée, pause déjeuner comprise.
+
+    Seules les séances couvertes par la pause déjeuner du groupe sont
+    comptées (séances du groupe lui-même, comme dans
+    ajouter_contrainte_pause_dejeuner_groupe): les séances d'un groupe parent
+    peuvent occuper la pause d'un sous-groupe, les compter rendrait la ligne
+    plus forte que le modèle.
+    """
+    grille = grille or GRILLE_DEFAUT
+    capacite = grille.nb_creneaux - grille.nb_creneaux_pause
+    ids_groupes = {g.id_groupe for g in groupes}
+    ids_salles = {sa.id for sa in salles} | {SALLE_DU_COURS}
+    seances_dict = {s.id_seance: s for s in seances}
+
+    # Durée pondérée des variables, par (groupe, semaine, jour)
+    charge = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        s = seances_dict.get(s_id)
+        if s is None or sa_id not in ids_salles:
+            continue
+        if calendrier[semaines[s_idx]][j] is None:
+            continue
+        duree_creneaux = _duree_creneaux(s, grille)
+        for g_id in {g.id_groupe for g in s.groupes} & ids_groupes:
+            charge.setdefault((g_id, s_idx, j), []).append(duree_creneaux * var)
+
+    contraintes_ajoutees = 0
+    for termes in charge.values():
+        model.Add(sum(termes) <= capacite)
+        contraintes_ajoutees += 1
+
+    print(
+        f"Contraintes redondantes de durée journalière des groupes: {contraintes_ajoutees} contraintes ajoutées"
+    )
+    return contraintes_ajoutees
+
+
+def ajouter_redondance_charge_enseignant(
+    model, seance_vars, seances, calendrier, semaines, enseignants, grille=None
+):
+    """
+    Contrainte redondante: la charge hebdomadaire d'un enseignant ne dépasse pas
+    la durée de ses demi-journées disponibles (jours ouvrables, parité de la semaine).
+    """
+    grille = grille or GRILLE_DEFAUT
+    enseignants_dict = {e.id: e for e in enseignants}
+    seances_dict = {s.id_seance: s for s in seances}
+    creneaux_par_periode = {
+        "matin": grille.fin_matin,
+        "apres_midi": grille.nb_creneaux - grille.fin_matin,
+    }
+
+    def capacite_semaine(e, s_idx):
+        semaine = semaines[s_idx]
+        est_semaine_paire = semaine % 2 == 0
+        if (est_semaine_paire and not e.semaine_paire) or (
+            not est_semaine_paire and not e.semaine_impaire
+        ):
+            return 0
+        return sum(
+            nb
+            for j, date_jour in calendrier[semaine].items()
+            if date_jour is not None
+            for periode, nb in creneaux_par_periode.items()
+            if e.est_disponible(JOURS_SEMAINE[j], periode)
+        )
+
+    # Durée pondérée des variables, par (enseignant, semaine)
+    charge = {}
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        s = seances_dict.get(s_id)
+        if s is None or s.cours.enseignant.id not in enseignants_dict:
+            continue
+        charge.setdefault((s.cours.enseignant.id, s_idx), []).append(
+            _duree_creneaux(s, grille) * var
+        )
+
+    contraintes_ajoutees = 0
+    for (e_id, s_idx), termes in charge.items():
+        model.Add(sum(termes) <= capacite_semaine(enseignants_dict[e_id], s_idx))
+        contraintes_ajoutees += 1
+
+    print(
+        f"Contraintes redondantes de charge hebdomadaire des enseignants: {contraintes_ajoutees} contraintes ajoutées"
+    )
+    return contraintes_ajoutees
+
+
+# Contraintes redondantes activables, par nom (voir ajouter_toutes_contraintes)
+CONTRAINTES_REDONDANTES = (
+    "salles_par_type",
+    "minutes_groupe",
+    "charge_enseignant",
+)
+
+
+def etapes_contraintes(
     seances,
     salles,
     calendrier,
     semaines,
     nb_jours,
-    nb_creneaux_30min,
+    nb_creneaux,
     enseignants,
     groupes,
-    pause_debut=8,  # 12h00 (=8h00 + 4h00)
-    pause_fin=12,  # 14h00 (=8h00 + 6h00)
+    pause_debut=None,
+    pause_fin=None,
+    grille=None,
+    redondantes=None,
+    graphe=None,
+    exclusivite=True,
+    choix_salles=None,
 ):
+    """
+    Familles de contraintes de ajouter_toutes_contraintes, dans l'ordre où elles
+    sont posées.
+
+    Chaque étape est un tuple (message, fonction, args, locale): la famille est
+    posée par `fonction(model, seance_vars, *args)`. Une étape `locale` porte
+    sur des variables créées hors de seance_vars (choix de salle par cours) et
+    ne peut pas être construite dans un autre processus (voir
+    construction_parallele).
+    """
+    redondantes = set(redondantes or [])
+    inconnues = redondantes - set(CONTRAINTES_REDONDANTES)
+    if inconnues:
+        raise ValueError(f"Contraintes redondantes inconnues: {sorted(inconnues)}")
+    grille = grille or GRILLE_DEFAUT
+    if pause_debut is None:
+        pause_debut = grille.pause_debut
+    if pause_fin is None:
+        pause_fin = grille.pause_fin
+
+    etapes = []
+
     # 1. Chaque séance doit être planifiée exactement une fois
-    print("Ajout de la contrainte de séance unique...")
-    ajouter_contrainte_seance_unique(
-        model, seance_vars, seances, salles, len(semaines), nb_jours, nb_creneaux_30min
+    etapes.append(
+        (
+            "Ajout de la contrainte de séance unique...",
+            ajouter_contrainte_seance_unique,
+            (seances, salles, len(semaines), nb_jours, nb_creneaux),
+            False,
+        )
     )
 
     # 2. Un enseignant ne peut pas donner deux séances qui se chevauchent
-    print("Ajout de la contrainte d'unicité pour les enseignants...")
-    ajouter_contrainte_enseignant_unicite(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        len(semaines),
-        nb_jours,
-        nb_creneaux_30min,
-        enseignants,
-    )
+    if not exclusivite:
+        print("Contraintes d'exclusivité différées (génération paresseuse)")
+    elif graphe is not None:
+        # Enseignants et groupes à la fois, par cliques du graphe de conflits
+        etapes.append(
+            (
+                "Ajout des contraintes d'exclusivité par cliques...",
+                ajouter_contrainte_cliques_exclusivite,
+                (seances, graphe, calendrier, semaines, nb_creneaux, grille),
+                False,
+            )
+        )
+    else:
+        etapes.append(
+            (
+                "Ajout de la contrainte d'unicité pour les enseignants...",
+                ajouter_contrainte_enseignant_unicite,
+                (
+                    seances,
+                    salles,
+                    len(semaines),
+                    nb_jours,
+                    nb_creneaux,
+                    enseignants,
+                    grille,
+                ),
+                False,
+            )
+        )
 
     # 3. Vérifier les disponibilités des enseignants
-    print("Ajout de la contrainte de disponibilité des enseignants...")
-    ajouter_contrainte_disponibilite_enseignant(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        calendrier,
-        semaines,
-        nb_jours,
-        nb_creneaux_30min,
-        enseignants,
+    etapes.append(
+        (
+            "Ajout de la contrainte de disponibilité des enseignants...",
+            ajouter_contrainte_disponibilite_enseignant,
+            (
+                seances,
+                salles,
+                calendrier,
+                semaines,
+                nb_jours,
+                nb_creneaux,
+                enseignants,
+                grille,
+            ),
+            False,
+        )
     )
 
-    # (Ajoutez les autres contraintes ici comme avant)
     # 3. Un groupe ne peut pas suivre deux séances qui se chevauchent
-    print("Ajout de la contrainte d'unicité pour les groupes...")
-    ajouter_contrainte_groupe_unicite(
-        model,
-        seance_vars,
-        seances,
-        calendrier,  # Modifier l'ordre ici
-        semaines,
-        nb_jours,
-        nb_creneaux_30min,
-        groupes,
-        salles,  # Mettre salles en dernier
-    )
+    if exclusivite and graphe is None:
+        etapes.append(
+            (
+                "Ajout de la contrainte d'unicité pour les groupes...",
+                ajouter_contrainte_groupe_unicite,
+                (
+                    seances,
+                    calendrier,
+                    semaines,
+                    nb_jours,
+                    nb_creneaux,
+                    groupes,
+                    salles,
+                    grille,
+                ),
+                False,
+            )
+        )
 
     # 4. Une salle ne peut pas accueillir deux séances qui se chevauchent
-    print("Ajout de la contrainte d'unicité pour les salles...")
-    ajouter_contrainte_salle_unicite(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        calendrier,
-        semaines,
-        nb_jours,
-        nb_creneaux_30min,
-    )
+    if choix_salles is not None:
+        # Capacité, type et disponibilité sont aussi traités au niveau du cours
+        etapes.append(
+            (
+                "Ajout des contraintes de salle par cours...",
+                ajouter_contrainte_salles_par_cours,
+                (
+                    seances,
+                    choix_salles,
+                    calendrier,
+                    semaines,
+                    nb_jours,
+                    nb_creneaux,
+                    grille,
+                ),
+                True,
+            )
+        )
+    elif exclusivite:
+        etapes.append(
+            (
+                "Ajout de la contrainte d'unicité pour les salles...",
+                ajouter_contrainte_salle_unicite,
+                (seances, salles, calendrier, semaines, nb_jours, nb_creneaux, grille),
+                False,
+            )
+        )
 
     # 5. Pause déjeuner pour chaque enseignant
-    print("Ajout de la contrainte de pause déjeuner pour les enseignants...")
-    ajouter_contrainte_pause_dejeuner_enseignant(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        calendrier,
-        semaines,
-        nb_jours,
-        enseignants,
-        pause_debut,
-        pause_fin,
+    etapes.append(
+        (
+            "Ajout de la contrainte de pause déjeuner pour les enseignants...",
+            ajouter_contrainte_pause_dejeuner_enseignant,
+            (
+                seances,
+                salles,
+                calendrier,
+                semaines,
+                nb_jours,
+                enseignants,
+                pause_debut,
+                pause_fin,
+                grille,
+            ),
+            False,
+        )
     )
 
-    # 6. Pause déjeuner pour chaque groupe*
-    print("Ajout de la contrainte de pause déjeuner pour les groupes...")
-    ajouter_contrainte_pause_dejeuner_groupe(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        calendrier,
-        semaines,
-        nb_jours,
-        groupes,
-        pause_debut,
-        pause_fin,
+    # 6. Pause déjeuner pour chaque groupe
+    etapes.append(
+        (
+            "Ajout de la contrainte de pause déjeuner pour les groupes...",
+            ajouter_contrainte_pause_dejeuner_groupe,
+            (
+                seances,
+                salles,
+                calendrier,
+                semaines,
+                nb_jours,
+                groupes,
+                pause_debut,
+                pause_fin,
+                grille,
+            ),
+            False,
+        )
     )
     # 7. Contrainte de capacité des salles
-    print("Ajout de la contrainte de capacité des salles...")
-    ajouter_contrainte_capacite_salle(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        calendrier,
-        semaines,
-        nb_jours,
-        nb_creneaux_30min,
+    etapes.append(
+        (
+            "Ajout de la contrainte de capacité des salles...",
+            ajouter_contrainte_capacite_salle,
+            (seances, salles, calendrier, semaines, nb_jours, nb_creneaux),
+            False,
+        )
     )
     # 8. Contrainte de type de salle pour TD
-    print("Ajout de la contrainte de type de salle pour TD...")
-    ajouter_contrainte_type_salle_td(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        calendrier,
-        semaines,
-        nb_jours,
-        nb_creneaux_30min,
+    etapes.append(
+        (
+            "Ajout de la contrainte de type de salle pour TD...",
+            ajouter_contrainte_type_salle_td,
+            (seances, salles, calendrier, semaines, nb_jours, nb_creneaux),
+            False,
+        )
     )
     # 9. Contrainte de disponibilité des salles
-    print("Ajout de la contrainte de disponibilité des salles...")
-    ajouter_contrainte_disponibilite_salle(
-        model,
-        seance_vars,
-        seances,
-        salles,
-        calendrier,
-        semaines,
-        nb_jours,
-        nb_creneaux_30min,
+    etapes.append(
+        (
+            "Ajout de la contrainte de disponibilité des salles...",
+            ajouter_contrainte_disponibilite_salle,
+            (seances, salles, calendrier, semaines, nb_jours, nb_creneaux, grille),
+            False,
+        )
     )
 
     # 10. Contrainte d'ordre des séances
-    print("Ajout de la contrainte d'ordre des séances...")
-    ajouter_contrainte_ordre_seances(
-        model,
-        seance_vars,
+    etapes.append(
+        (
+            "Ajout de la contrainte d'ordre des séances...",
+            ajouter_contrainte_ordre_seances,
+            (seances, salles, len(semaines), nb_jours, nb_creneaux),
+            False,
+        )
+    )
+
+    # 11. Contraintes redondantes (optionnelles)
+    if "salles_par_type" in redondantes:
+        etapes.append(
+            (
+                "Ajout de la contrainte redondante de salles par type...",
+                ajouter_redondance_salles_par_type,
+                (seances, salles, calendrier, semaines, nb_creneaux, grille),
+                False,
+            )
+        )
+    if "minutes_groupe" in redondantes:
+        etapes.append(
+            (
+                "Ajout de la contrainte redondante de durée journalière des groupes...",
+                ajouter_redondance_minutes_groupe,
+                (seances, salles, calendrier, semaines, groupes, grille),
+                False,
+            )
+        )
+    if "charge_enseignant" in redondantes:
+        etapes.append(
+            (
+                "Ajout de la contrainte redondante de charge des enseignants...",
+                ajouter_redondance_charge_enseignant,
+                (seances, calendrier, semaines, enseignants, grille),
+                False,
+            )
+        )
+    return etapes
+
+
+def ajouter_toutes_contraintes(
+    model,
+    seance_vars,
+    seances,
+    salles,
+    calendrier,
+    semaines,
+    nb_jours,
+    nb_creneaux,
+    enseignants,
+    groupes,
+    pause_debut=None,
+    pause_fin=None,
+    grille=None,
+    redondantes=None,
+    graphe=None,
+    exclusivite=True,
+    choix_salles=None,
+    nb_processus=None,
+):
+    """
+    Ajoute toutes les contraintes au modèle.
+
+    Les indices de créneau sont ceux de `grille` (créneaux de 30 minutes de 8h
+    à 20h par défaut); la pause déjeuner vaut par défaut celle de la grille.
+    `redondantes` liste les contraintes redondantes à ajouter (noms de
+    CONTRAINTES_REDONDANTES): elles ne changent pas les solutions mais peuvent
+    aider le solveur à élaguer plus tôt.
+
+    Si `graphe` (conflits.GrapheConflits) est fourni, l'exclusivité des
+    enseignants et des groupes est posée par cliques du graphe de conflits au
+    lieu de contraintes séparées par enseignant et par groupe. Avec
+    `exclusivite=False`, aucune contrainte d'exclusivité (enseignants, groupes,
+    salles) n'est posée: elles sont ajoutées à la demande par
+    paresseux.GenerationParesseuse. Avec `choix_salles`
+    (salle_cours.ChoixSalles), les variables de placement ne portent que sur
+    l'horaire et les contraintes de salle sont posées au niveau du cours.
+
+    Avec `nb_processus` > 1, les familles de contraintes sont construites en
+    parallèle dans des processus séparés puis fusionnées dans le modèle (voir
+    construction_parallele); le modèle obtenu est le même.
+    """
+    etapes = etapes_contraintes(
         seances,
         salles,
-        len(semaines),
+        calendrier,
+        semaines,
         nb_jours,
-        nb_creneaux_30min,
+        nb_creneaux,
+        enseignants,
+        groupes,
+        pause_debut=pause_debut,
+        pause_fin=pause_fin,
+        grille=grille,
+        redondantes=redondantes,
+        graphe=graphe,
+        exclusivite=exclusivite,
+        choix_salles=choix_salles,
     )
+    if nb_processus and nb_processus > 1:
+        from construction_parallele import construire_en_parallele
+
+        construire_en_parallele(model, seance_vars, etapes, nb_processus)
+    else:
+        for message, fonction, args, _ in etapes:
+            print(message)
+            fonction(model, seance_vars, *args)
 
     print("Toutes les contraintes ont été ajoutées au modèle.")
+
+
+def cout_preference(seance, cr_debut, salle, grille=None):
+    """
+    Coût souple d'un placement (0 = placement idéal).
+
+    - Un CM placé hors amphithéâtre coûte 3.
+    - Une séance se terminant après 18h coûte 1.
+
+    Avec `salle` à None (salle choisie par cours), seul le coût horaire est compté.
+    """
+    grille = grille or GRILLE_DEFAUT
+    cout = 0 if salle is None else cout_salle(seance, salle)
+    if cr_debut + _duree_creneaux(seance, grille) > grille.fin_souhaitee:
+        cout += 1
+    return cout
+
+
+def cout_salle(seance, salle):
+    """Part du coût de préférence due à la salle (CM hors amphithéâtre)."""
+    if seance.cours.type_cours == "CM" and salle.type_salle.lower() != "amphi":
+        return 3
+    return 0
+
+
+def ajouter_objectif_preferences(
+    model, seance_vars, seances, salles, grille=None, choix_salles=None
+):
+    """
+    Objectif: minimiser la somme des coûts de préférence des placements choisis.
+
+    Avec `choix_salles` (salle choisie par cours), le coût de salle porte sur
+    les variables de choix de salle, pondéré par le nombre de séances du cours.
+    """
+    seances_dict = {s.id_seance: s for s in seances}
+    salles_dict = {sa.id: sa for sa in salles}
+    termes = []
+    for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+        cout = cout_preference(
+            seances_dict[s_id], cr_debut, salles_dict.get(sa_id), grille
+        )
+        if cout:
+            termes.append(cout * var)
+    if choix_salles is not None:
+        for s in seances:
+            for sa, choix in choix_salles.salles_possibles(s):
+                cout = cout_salle(s, sa)
+                if cout:
+                    termes.append(cout * choix)
+    model.Minimize(sum(termes))
+    print(f"Objectif de préférences: {len(termes)} placements pénalisés")
+
+
+def evaluer_preferences(affectation, seances, salles, grille=None):
+    """Calcule le coût de préférences d'une affectation {id_seance: (s_idx, j, cr_debut, salle_id)}."""
+    salles_dict = {sa.id: sa for sa in salles}
+    return sum(
+        cout_preference(
+            s,
+            affectation[s.id_seance][2],
+            salles_dict[affectation[s.id_seance][3]],
+            grille,
+        )
+        for s in seances
+        if s.id_seance in affectation
+    )
@@ -0,0 +1,235 @@
+"""Estimation de la taille du modèle avant construction et choix de la stratégie de résolution."""
+
+from conflits import graphe_conflits, salles_admissibles
+from contraintes import JOURS_SEMAINE, _salle_disponible
+
+# Coûts mémoire mesurés sur les données du département (CP-SAT 9.12, Python 3.11):
+# construction ≈ 1500 octets par variable + 18 octets par terme de contrainte,
+# et la résolution multiplie ce volume par ≈ 1 + 0,5 par worker (5x avec 8 workers)
+OCTETS_PAR_VARIABLE = 1500
+OCTETS_PAR_TERME = 18
+FACTEUR_PAR_WORKER = 0.5
+
+# Stratégies, de la plus fidèle à la plus économe en mémoire
+STRATEGIES = ("monolithique", "salle_par_cours", "hierarchique")
+
+
+def _salles_creees(seance, salles):
+    """Salles pour lesquelles _creer_variables crée des variables (capacité, TD hors amphi)."""
+    effectif_total = sum(g.effectif for g in seance.groupes)
+    return [
+        sa
+        for sa in salles
+        if sa.effectif_max >= effectif_total
+        and not (seance.cours.type_cours == "TD" and sa.type_salle == "Amphi")
+    ]
+
+
+def memoire_mo(variables, termes, nb_workers=8):
+    """Mémoire estimée (Mo) pour construire puis résoudre un modèle."""
+    construction = variables * OCTETS_PAR_VARIABLE + termes * OCTETS_PAR_TERME
+    return construction * (1 + FACTEUR_PAR_WORKER * nb_workers) / 2**20
+
+
+def _jours_par_semaine_type(emploi_du_temps):
+    """Nombre de jours ouvrables par (semaine paire, jour de la semaine)."""
+    calendrier = emploi_du_temps.calendrier_academique
+    comptes = {}
+    for s_idx, j in calendrier.jours_ouvrables.tolist():
+        cle = (bool(calendrier.paire[s_idx]), j)
+        comptes[cle] = comptes.get(cle, 0) + 1
+    return comptes
+
+
+def _disponible(ressource, j, periode):
+    """Disponibilité sans les traces de Enseignant.est_disponible."""
+    if ressource.disponibilite is None:
+        return True
+    return bool(ressource.disponibilite.get(JOURS_SEMAINE[j], {}).get(periode, False))
+
+
+def estimer_modele(
+    emploi_du_temps, seances, salles, enseignants, groupes, nb_workers=8
+):
+    """
+    Estime, sans construire le modèle, le nombre de variables, de contraintes
+    et de termes ainsi que la mémoire de chaque stratégie.
+
+    Le nombre de variables de placement est celui de _creer_variables (jours
+    ouvrables du calendrier, heures de début permises par la grille, salles de
+    capacité suffisante). Les masques de disponibilité (enseignant, parité des
+    semaines, salle, type de salle) donnent le nombre de contraintes unaires
+    `var == 0`; les autres familles de contraintes.py (unicité, exclusivité par
+    cliques, salles, pause déjeuner, ordre) sont comptées par placement et par
+    ressource.
+
+    Returns:
+        dict: {stratégie: {"variables", "contraintes", "termes", "memoire_mo"}}
+    """
+    edt = emploi_du_temps
+    edt._configurer_grille(seances)
+    grille = edt.grille
+    jours_types = _jours_par_semaine_type(edt)
+    nb_jours = sum(jours_types.values())
+    graphe = graphe_conflits(seances, enseignants, groupes, salles)
+    nb_cliques = {}
+    for clique in graphe.cliques:
+        for s_id in clique:
+            nb_cliques[s_id] = nb_cliques.get(s_id, 0) + 1
+
+    def periode(cr):
+        return "matin" if cr < grille.fin_matin else "apres_midi"
+
+    placements = unaires = termes_placements = 0
+    placements_horaires = unaires_horaires = termes_horaires = clauses_salles = 0
+    # Salles admissibles par unité de salle_cours (cours et groupes)
+    unites = {}
+    for s in seances:
+        duree = grille.duree_creneaux(s.duree)
+        debuts = grille.creneaux_debut(duree, s.cours.debuts)
+        creees = _salles_creees(s, salles)
+        enseignant = s.cours.enseignant
+
+        # Termes par placement: unicité, ordre (égalité conditionnelle), cliques
+        # et salle sur chaque créneau occupé, sommes de la pause déjeuner
+        # (deux par ressource et par créneau de la plage occupé)
+        ressources_pause = 1 + len(s.groupes)
+        termes_par_jour = 0
+        for cr in debuts:
+            dans_pause = max(
+                0, min(cr + duree, grille.pause_fin + 1) - max(cr, grille.pause_debut)
+            )
+            termes_par_jour += (
+                3
+                + duree * (nb_cliques.get(s.id_seance, 0) + 1)
+                + 2 * ressources_pause * dans_pause
+            )
+
+        # Masques de disponibilité par (parité, jour de la semaine, début)
+        horaires = 0
+        indisponibles = 0
+        salles_indisponibles = 0
+        for (paire, j), nb in jours_types.items():
+            horaires += nb * len(debuts)
+            semaine_exclue = not (
+                enseignant.semaine_paire if paire else enseignant.semaine_impaire
+            )
+            for cr in debuts:
+                occupees = {periode(c) for c in range(cr, cr + duree)}
+                if semaine_exclue or not all(
+                    _disponible(enseignant, j, p) for p in occupees
+                ):
+                    indisponibles += nb
+                for sa in creees:
+                    if not _salle_disponible(sa, j, cr, duree, grille.fin_matin):
+                        salles_indisponibles += nb
+        mauvais_type = 0
+        if s.type_seance == "TD" and enseignant.besoin_salle != "standard":
+            mauvais_type = sum(
+                1 for sa in creees if sa.type_salle != enseignant.besoin_salle
+            )
+
+        placements += horaires * len(creees)
+        unaires += (
+            indisponibles * len(creees) + salles_indisponibles + mauvais_type * horaires
+        )
+        termes_placements += termes_par_jour * nb_jours * len(creees)
+
+        # Salle par cours: une variable de placement par horaire, le lien avec le
+        # temps de début, un intervalle et des clauses de disponibilité par salle
+        admissibles = salles_admissibles(s, salles)
+        placements_horaires += horaires
+        unaires_horaires += indisponibles
+        clauses_salles += salles_indisponibles
+        termes_horaires += (
+            termes_par_jour * nb_jours
+            + horaires
+            + 4 * len(admissibles)
+            + 2 * salles_indisponibles
+        )
+        unite = (s.cours.id_cours, tuple(g.id_groupe for g in s.groupes))
+        unites[unite] = len(admissibles)
+
+    # Variables auxiliaires et contraintes par ressource: temps absolu de chaque
+    # séance (ordre) et pause déjeuner de chaque enseignant et groupe, chaque jour
+    plage = grille.pause_fin - grille.pause_debut + 1
+    options = plage + 1 - grille.nb_creneaux_pause
+    ressources_jour = (
+        len({s.cours.enseignant.id for s in seances})
+        + len({g.id_groupe for s in seances for g in s.groupes})
+    ) * nb_jours
+    auxiliaires = len(seances) + ressources_jour * (plage + options + 1)
+    contraintes_pause = ressources_jour * (2 * plage + 2 * options + 3)
+    termes_pause = ressources_jour * (4 * plage + 4 * options + 2 * options)
+
+    # Lignes d'exclusivité: une par clique (ou salle) et par créneau de chaque jour
+    lignes_cliques = len(graphe.cliques) * nb_jours * grille.nb_creneaux
+    lignes_salles = len(salles) * nb_jours * grille.nb_creneaux
+
+    variables = placements + auxiliaires
+    contraintes = (
+        len(seances)
+        + placements
+        + unaires
+        + lignes_cliques
+        + lignes_salles
+        + contraintes_pause
+    )
+    termes = termes_placements + unaires + termes_pause
+
+    variables_horaires = placements_horaires + sum(unites.values()) + auxiliaires
+    contraintes_horaires = (
+        len(seances) * 2
+        + len(unites)
+        + placements_horaires
+        + unaires_horaires
+        + clauses_salles
+        + lignes_cliques
+        + contraintes_pause
+    )
+    termes_horaires += unaires_horaires + termes_pause
+
+    # Hiérarchique: le maître (jour et demi-journées par séance, charges par
+    # ressource) puis des sous-modèles d'une journée, chacun portant sur
+    # environ 1/nb_jours des séances et 1/nb_jours des placements de chacune
+    jours_maitre = 3 * nb_jours * len(seances)
+    diviseur = max(1, nb_jours) ** 2
+
+    estimations = {
+        "monolithique": {
+            "variables": variables,
+            "contraintes": contraintes,
+            "termes": termes,
+        },
+        "salle_par_cours": {
+            "variables": variables_horaires,
+            "contraintes": contraintes_horaires,
+            "termes": termes_horaires,
+        },
+        "hierarchique": {
+            "variables": jours_maitre + variables // diviseur,
+            "contraintes": 3 * len(seances)
+            + ressources_jour * 3
+            + contraintes // diviseur,
+            "termes": 4 * jours_maitre + termes // diviseur,
+        },
+    }
+    for estimation in estimations.values():
+        estimation["memoire_mo"] = memoire_mo(
+            estimation["variables"], estimation["termes"], nb_workers
+        )
+    return estimations
+
+
+def choisir_strategie(estimations, budget_mo):
+    """
+    Première stratégie (dans l'ordre de STRATEGIES) dont la mémoire estimée
+    tient dans le budget; la plus économe si aucune ne tient.
+
+    Returns:
+        str: Nom de la stratégie
+    """
+    for strategie in STRATEGIES:
+        if estimations[strategie]["memoire_mo"] <= budget_mo:
+            return strategie
+    return min(STRATEGIES, key=lambda nom: estimations[nom]["memoire_mo"])
@@ -0,0 +1,521 @@
+"""
+Écriture des calendriers ICS en flux, et d'un calendrier par groupe,
+enseignant et salle.
+
+Le texte des VEVENT est produit directement (RFC 5545: échappement, lignes
+pliées à 75 octets, fins de ligne CRLF) au lieu de construire un objet
+icalendar.Calendar en mémoire. Les heures sont écrites en UTC; le décalage
+du fuseau local est calculé une fois par date.
+
+Les séances d'un même cours revenant chaque semaine au même jour, à la même
+heure et dans la même salle (voir detecter_series) sont écrites en un seul
+VEVENT avec RRULE, les semaines sautées (vacances, fériés) en EXDATE. Ces
+événements sont en heure locale (TZID), pour que la récurrence suive le
+changement d'heure.
+
+Chaque séance placée est mise en forme une seule fois; les calendriers par
+ressource (voir index_flux) sont ensuite écrits par un groupe de processus
+qui ne reçoivent que des listes d'indices d'événements. Chaque fichier est
+écrit au fil de l'eau: la mémoire ne dépend pas du nombre de calendriers.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from manifeste import Manifeste, fichier_atomique
+
+PRODID = "-//Emploi du Temps IngeMedia//ingemedia.fr//"
+FUSEAU = "Europe/Paris"
+
+# Événements mis en forme, partagés par les processus d'écriture (initialisés
+# une fois par processus)
+_EVENEMENTS = None
+
+
+def echapper(texte):
+    """Échappe une valeur TEXT (RFC 5545, 3.3.11)."""
+    return (
+        texte.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def plier(ligne):
+    """Plie une ligne de contenu à 75 octets sans couper un caractère UTF-8."""
+    if len(ligne) <= 75 and ligne.isascii():
+        return ligne + "\r\n"
+    morceaux = []
+    courant = []
+    taille = 0
+    limite = 75
+    for caractere in ligne:
+        octets = len(caractere.encode("utf-8"))
+        if taille + octets > limite:
+            morceaux.append("".join(courant))
+            # Les lignes de continuation commencent par une espace
+            courant = [" "]
+            taille = 1
+        courant.append(caractere)
+        taille += octets
+    morceaux.append("".join(courant))
+    return "\r\n".join(morceaux) + "\r\n"
+
+
+class ConvertisseurUTC:
+    """Heures locales d'un fuseau vers UTC, avec le décalage mis en cache par date."""
+
+    def __init__(self, fuseau=FUSEAU):
+        import pytz
+
+        self.fuseau = pytz.timezone(fuseau)
+        self._decalages = {}
+
+    def decalage(self, jour):
+        """Décalage UTC du fuseau le jour `jour` (date), pris à midi."""
+        if jour not in self._decalages:
+            midi = datetime(jour.year, jour.month, jour.day, 12)
+            self._decalages[jour] = self.fuseau.localize(midi).utcoffset()
+        return self._decalages[jour]
+
+    def utc(self, moment):
+        """Texte DATE-TIME UTC ("20250915T060000Z") d'une heure locale naïve."""
+        return (moment - self.decalage(moment.date())).strftime("%Y%m%dT%H%M%SZ")
+
+
+def horodatage(moment=None):
+    """Valeur DTSTAMP: l'instant donné (défaut: maintenant), en UTC."""
+    moment = moment or datetime.now(timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+# Définition du fuseau pour les événements récurrents (TZID), règles de
+# l'Union européenne
+VTIMEZONE = (
+    "BEGIN:VTIMEZONE\r\n"
+    f"TZID:{FUSEAU}\r\n"
+    "BEGIN:DAYLIGHT\r\n"
+    "TZOFFSETFROM:+0100\r\n"
+    "TZOFFSETTO:+0200\r\n"
+    "TZNAME:CEST\r\n"
+    "DTSTART:19700329T020000\r\n"
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU\r\n"
+    "END:DAYLIGHT\r\n"
+    "BEGIN:STANDARD\r\n"
+    "TZOFFSETFROM:+0200\r\n"
+    "TZOFFSETTO:+0100\r\n"
+    "TZNAME:CET\r\n"
+    "DTSTART:19701025T030000\r\n"
+    "RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU\r\n"
+    "END:STANDARD\r\n"
+    "END:VTIMEZONE\r\n"
+)
+
+
+def local(moment):
+    """Texte DATE-TIME local ("20250915T080000"), à qualifier par TZID."""
+    return moment.strftime("%Y%m%dT%H%M%S")
+
+
+def entete(nom=None):
+    """Début d'un VCALENDAR, avec son nom affiché par les clients."""
+    lignes = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+    ]
+    if nom:
+        lignes.append(f"X-WR-CALNAME:{echapper(nom)}")
+    lignes.append(f"X-WR-TIMEZONE:{FUSEAU}")
+    return "".join(plier(ligne) for ligne in lignes) + VTIMEZONE
+
+
+PIED = "END:VCALENDAR\r\n"
+
+
+def detecter_series(solution, ecart_max=2):
+    """
+    Regroupe les séances d'un même cours placées chaque semaine au même jour,
+    aux mêmes heures, dans la même salle et pour les mêmes groupes.
+
+    Args:
+        solution: solution.SolutionColonnaire
+        ecart_max: Nombre maximal de semaines consécutives sans séance à
+                   l'intérieur d'une série (vacances); au-delà, une nouvelle
+                   série commence
+
+    Returns:
+        list: Séries d'indices de lignes de `solution.table`, par date
+              croissante; séries triées par première ligne. Une séance
+              isolée forme une série d'une ligne.
+    """
+    table = solution.table
+    dates = table["date"].tolist()
+    par_cle = {}
+    for i, (k, salle_id, jour, debut, fin) in enumerate(
+        zip(
+            table["seance"].tolist(),
+            table["salle"].tolist(),
+            table["jour"].tolist(),
+            table["debut"].tolist(),
+            table["fin"].tolist(),
+        )
+    ):
+        seance = solution.seances[k]
+        cle = (
+            seance.cours.id_cours,
+            tuple(g.id_groupe for g in seance.groupes),
+            salle_id,
+            jour,
+            debut,
+            fin,
+        )
+        par_cle.setdefault(cle, []).append(i)
+
+    series = []
+    for lignes in par_cle.values():
+        lignes.sort(key=lambda i: (dates[i], i))
+        serie = [lignes[0]]
+        for i in lignes[1:]:
+            semaines = (dates[i] - dates[serie[-1]]).days // 7
+            if semaines == 0 or semaines - 1 > ecart_max:
+                series.append(serie)
+                serie = []
+            serie.append(i)
+        series.append(serie)
+    series.sort(key=lambda serie: serie[0])
+    return series
+
+
+def evenements(solution, dtstamp=None, convertisseur=None, series=None):
+    """
+    Texte VEVENT de chaque ligne, ou de chaque série (voir detecter_series),
+    d'une solution.SolutionColonnaire.
+
+    Une série de plusieurs séances donne un seul VEVENT récurrent, d'UID
+    stable "R<clé de la première séance>", avec COUNT couvrant toutes les
+    semaines de la série et les semaines sans séance en EXDATE.
+
+    Returns:
+        list: Un bloc de texte par ligne de `solution.table`, ou par série
+    """
+    convertisseur = convertisseur or ConvertisseurUTC()
+    dtstamp = dtstamp or horodatage()
+    table = solution.table
+    if series is None:
+        series = [[i] for i in range(len(table))]
+    seances = table["seance"].tolist()
+    salles = table["salle"].tolist()
+    debuts = table["debut_dt"].tolist()
+    fins = table["fin_dt"].tolist()
+    blocs = []
+    for serie in series:
+        i = serie[0]
+        k, debut, fin = seances[i], debuts[i], fins[i]
+        seance = solution.seances[k]
+        cours = seance.cours
+        groupe = solution.groupes(k)
+        duree = int((fin - debut).total_seconds()) // 60
+        details = (
+            f"Enseignant: {cours.enseignant.nom}\n"
+            f"Groupe: {groupe}\n"
+            f"Type: {cours.type_cours}\n"
+            f"Durée: {duree} minutes"
+        )
+        fin_evenement = (
+            plier("LOCATION:" + echapper(f"Salle {solution.salles[salles[i]].nom}"))
+            + plier("CATEGORIES:" + echapper(cours.type_cours))
+            + "END:VEVENT\r\n"
+        )
+        if len(serie) == 1:
+            blocs.append(
+                "BEGIN:VEVENT\r\n"
+                + plier(f"UID:{solution.cle(i)}@ingemedia.fr")
+                + f"DTSTAMP:{dtstamp}\r\n"
+                + f"DTSTART:{convertisseur.utc(debut)}\r\n"
+                + f"DTEND:{convertisseur.utc(fin)}\r\n"
+                + plier(
+                    "SUMMARY:"
+                    + echapper(
+                        f"{cours.nom} ({cours.type_cours}) - {groupe} - "
+                        f"Séance: {seance.id_seance}"
+                    )
+                )
+                + plier(
+                    "DESCRIPTION:" + echapper(f"Séance: {seance.id_seance}\n{details}")
+                )
+                + fin_evenement
+            )
+            continue
+
+        # Semaines de la série sans séance
+        nb_semaines = (debuts[serie[-1]] - debut).days // 7 + 1
+        presentes = {(debuts[j] - debut).days // 7 for j in serie}
+        exclues = [
+            local(debut + timedelta(weeks=w))
+            for w in range(nb_semaines)
+            if w not in presentes
+        ]
+        ids = ", ".join(solution.seances[seances[j]].id_seance for j in serie)
+        blocs.append(
+            "BEGIN:VEVENT\r\n"
+            + plier(f"UID:R{solution.cle(i)}@ingemedia.fr")
+            + f"DTSTAMP:{dtstamp}\r\n"
+            + f"DTSTART;TZID={FUSEAU}:{local(debut)}\r\n"
+            + f"DTEND;TZID={FUSEAU}:{local(fin)}\r\n"
+            + f"RRULE:FREQ=WEEKLY;COUNT={nb_semaines}\r\n"
+            + (plier(f"EXDATE;TZID={FUSEAU}:" + ",".join(exclues)) if exclues else "")
+            + plier(
+                "SUMMARY:" + echapper(f"{cours.nom} ({cours.type_cours}) - {groupe}")
+            )
+            + plier("DESCRIPTION:" + echapper(f"Séances: {ids}\n{details}"))
+            + fin_evenement
+        )
+    return blocs
+
+
+def ecrire_calendrier(chemin, blocs, indices=None, nom=None):
+    """
+    Écrit un VCALENDAR au fil de l'eau.
+
+    Args:
+        blocs: Textes VEVENT (voir evenements)
+        indices: (optionnel) Indices des blocs à écrire, dans l'ordre; tous par défaut
+        nom: (optionnel) Nom du calendrier (X-WR-CALNAME)
+
+    Returns:
+        int: Nombre d'événements écrits
+    """
+    if indices is None:
+        indices = range(len(blocs))
+    with fichier_atomique(chemin, newline="") as f:
+        f.write(entete(nom))
+        for i in indices:
+            f.write(blocs[i])
+        f.write(PIED)
+    return len(indices)
+
+
+def condenser(blocs, dtstamp):
+    """
+    Empreinte (SHA-256 binaire) de chaque bloc VEVENT, sans sa ligne DTSTAMP:
+    un événement inchangé garde son empreinte d'un export à l'autre.
+    """
+    ligne = f"DTSTAMP:{dtstamp}\r\n"
+    return [
+        hashlib.sha256(bloc.replace(ligne, "", 1).encode("utf-8")).digest()
+        for bloc in blocs
+    ]
+
+
+def empreinte_calendrier(condenses, indices, nom=None):
+    """Empreinte du calendrier écrit par ecrire_calendrier(chemin, blocs, indices, nom)."""
+    sha = hashlib.sha256(entete(nom).encode("utf-8"))
+    for i in indices:
+        sha.update(condenses[i])
+    return sha.hexdigest()
+
+
+def exporter_calendrier(solution, chemin, nom=None, series=None, dtstamp=None):
+    """
+    Écrit toute une solution dans un calendrier, sauf si son contenu n'a pas
+    changé depuis le dernier export (voir manifeste.Manifeste du dossier).
+
+    Returns:
+        tuple: (nombre d'événements, True si le fichier a été écrit)
+    """
+    dtstamp = dtstamp or horodatage()
+    blocs = evenements(solution, dtstamp, series=series)
+    dossier, relatif = os.path.split(chemin)
+    manifeste = Manifeste(dossier or ".")
+    indices = range(len(blocs))
+    ecrit = manifeste.noter(
+        relatif,
+        empreinte_calendrier(condenser(blocs, dtstamp), indices, nom),
+        evenements=len(blocs),
+    )
+    if ecrit:
+        ecrire_calendrier(chemin, blocs, indices, nom)
+    manifeste.sauvegarder()
+    return len(blocs), ecrit
+
+
+def _membres(groupes):
+    """
+    Groupes dont les séances vont dans le calendrier de chaque groupe: le
+    groupe, ses ancêtres (cours communs) et ses descendants (cours de ses
+    sous-groupes).
+
+    Returns:
+        dict: {id_groupe: set(id_groupe)}
+    """
+    parents = {g.id_groupe: g.id_parent for g in groupes}
+    enfants = {g.id_groupe: [] for g in groupes}
+    for g in groupes:
+        if g.id_parent in enfants:
+            enfants[g.id_parent].append(g.id_groupe)
+
+    def ancetres(id_groupe):
+        vus = []
+        parent = parents.get(id_groupe)
+        while parent is not None and parent not in vus and parent != id_groupe:
+            vus.append(parent)
+            parent = parents.get(parent)
+        return vus
+
+    def descendants(id_groupe):
+        vus = []
+        a_voir = list(enfants.get(id_groupe, []))
+        while a_voir:
+            enfant = a_voir.pop()
+            if enfant not in vus and enfant != id_groupe:
+                vus.append(enfant)
+                a_voir.extend(enfants.get(enfant, []))
+        return vus
+
+    return {
+        g.id_groupe: {g.id_groupe, *ancetres(g.id_groupe), *descendants(g.id_groupe)}
+        for g in groupes
+    }
+
+
+def index_flux(solution, groupes, series=None):
+    """
+    Index inversé des calendriers par ressource.
+
+    Un groupe reçoit ses séances, celles de ses groupes parents et celles de
+    ses sous-groupes (voir _membres); un enseignant et une salle reçoivent
+    les séances qui les occupent.
+
+    Args:
+        series: (optionnel) Séries de detecter_series; les séances d'une
+                série ont les mêmes groupes, enseignant et salle
+
+    Returns:
+        dict: {(type, id): [indices]}, type valant "groupes", "enseignants"
+              ou "salles"; indices croissants des lignes de solution.table,
+              ou des séries si `series` est donné
+    """
+    # Calendriers de groupes touchés par chaque groupe d'une séance
+    membres = _membres(groupes)
+    destinataires = {}
+    for id_groupe, ids in membres.items():
+        for membre in ids:
+            destinataires.setdefault(membre, set()).add(id_groupe)
+
+    table = solution.table
+    seances = table["seance"].tolist()
+    salles = table["salle"].tolist()
+    enseignants = table["enseignant"].tolist()
+    if series is None:
+        representants = range(len(seances))
+    else:
+        representants = [serie[0] for serie in series]
+    index = {}
+    for i, ligne in enumerate(representants):
+        k, salle_id, enseignant_id = seances[ligne], salles[ligne], enseignants[ligne]
+        flux_groupes = set()
+        for g in solution.seances[k].groupes:
+            flux_groupes |= destinataires.get(g.id_groupe, {g.id_groupe})
+        for id_groupe in flux_groupes:
+            index.setdefault(("groupes", id_groupe), []).append(i)
+        index.setdefault(("enseignants", enseignant_id), []).append(i)
+        index.setdefault(("salles", salle_id), []).append(i)
+    return index
+
+
+def _initialiser(blocs):
+    global _EVENEMENTS
+    _EVENEMENTS = blocs
+
+
+def _ecrire_flux(chemin, indices, nom):
+    return ecrire_calendrier(chemin, _EVENEMENTS, indices, nom)
+
+
+def noms_flux(solution, groupes):
+    """Nom affiché de chaque calendrier: {(type, id): nom}."""
+    noms = {("groupes", g.id_groupe): f"Groupe {g.nom}" for g in groupes}
+    for s in solution.seances:
+        enseignant = s.cours.enseignant
+        noms[("enseignants", enseignant.id)] = enseignant.nom
+        for g in s.groupes:
+            noms.setdefault(("groupes", g.id_groupe), f"Groupe {g.nom}")
+    for salle in solution.salles.values():
+        noms[("salles", salle.id)] = f"Salle {salle.nom}"
+    return noms
+
+
+def exporter_flux(
+    solution, groupes, dossier, nb_processus=None, dtstamp=None, recurrences=True
+):
+    """
+    Écrit un calendrier par groupe, enseignant et salle:
+    `dossier`/groupes/<id>.ics, `dossier`/enseignants/<id>.ics et
+    `dossier`/salles/<id>.ics.
+
+    Seuls les calendriers dont le contenu a changé depuis le dernier export
+    sont réécrits; les versions sont tenues dans `dossier`/manifeste.json, et
+    les calendriers des ressources absentes de la solution sont supprimés.
+
+    Args:
+        solution: solution.SolutionColonnaire
+        groupes: Groupes chargés (relations parent-enfant)
+        nb_processus: Nombre de processus d'écriture (défaut: écriture dans
+                      ce processus)
+        dtstamp: (optionnel) Valeur DTSTAMP commune (voir horodatage)
+        recurrences: Regrouper les séances hebdomadaires en événements
+                     récurrents (voir detecter_series)
+
+    Returns:
+        dict: {(type, id): chemin du calendrier}, écrit ou inchangé
+    """
+    debut = time.perf_counter()
+    dtstamp = dtstamp or horodatage()
+    series = detecter_series(solution) if recurrences else None
+    blocs = evenements(solution, dtstamp, series=series)
+    condenses = condenser(blocs, dtstamp)
+    index = index_flux(solution, groupes, series)
+    noms = noms_flux(solution, groupes)
+    manifeste = Manifeste(dossier)
+
+    chemins = {}
+    taches = []
+    for cle in sorted(index, key=lambda cle: (cle[0], str(cle[1]))):
+        relatif = f"{cle[0]}/{cle[1]}.ics"
+        indices, nom = index[cle], noms.get(cle)
+        chemins[cle] = manifeste.chemin_fichier(relatif)
+        if manifeste.noter(
+            relatif,
+            empreinte_calendrier(condenses, indices, nom),
+            evenements=len(indices),
+        ):
+            taches.append((chemins[cle], indices, nom))
+    retires = manifeste.retirer_absents(f"{cle[0]}/{cle[1]}.ics" for cle in chemins)
+
+    if nb_processus and nb_processus > 1 and taches:
+        with ProcessPoolExecutor(
+            max_workers=nb_processus, initializer=_initialiser, initargs=(blocs,)
+        ) as executeur:
+            # Les résultats (nombre d'événements) sont consommés au fur et à
+            # mesure: seules les listes d'indices sont transmises
+            for _ in executeur.map(_ecrire_flux, *zip(*taches), chunksize=8):
+                pass
+    else:
+        for chemin, indices, nom in taches:
+            ecrire_calendrier(chemin, blocs, indices, nom)
+
+    manifeste.sauvegarder()
+
+    print(
+        f"{len(taches)} calendriers ICS écrits, {len(chemins) - len(taches)} "
+        f"inchangés, {len(retires)} supprimés ({len(blocs)} événements pour "
+        f"{len(solution.table)} séances) dans {dossier} en "
+        f"{time.perf_counter() - debut:.2f}s"
+    )
+    return chemins
@@ -0,0 +1,156 @@
+"""Grille horaire: pas des créneaux et politiques d'heures de début des cours."""
+
+import math
+from functools import reduce
+
+# Politique de début: uniquement à l'heure pile
+HEURE_PLEINE = "heure_pleine"
+
+
+def en_minutes(heure):
+    """Convertit une heure '13:30' (ou '13h30', '13h') en minutes depuis minuit."""
+    texte = heure.strip().lower().replace("h", ":")
+    heures, _, minutes = texte.partition(":")
+    return int(heures) * 60 + int(minutes or 0)
+
+
+def heures_de_politique(politique):
+    """
+    Heures de début explicites d'une politique ('8:00/10:30/13:30/16:00'), en minutes.
+
+    Returns:
+        list: Minutes depuis minuit, ou None si la politique n'énumère pas d'heures
+    """
+    if not politique or politique == HEURE_PLEINE:
+        return None
+    return [en_minutes(h) for h in politique.split("/") if h.strip()]
+
+
+class GrilleHoraire:
+    """
+    Découpage de la journée en créneaux de `pas` minutes.
+
+    Tous les indices de créneau du modèle (cr_debut, pause déjeuner, limite
+    matin/après-midi) sont exprimés dans cette grille. Une limite qui ne tombe
+    pas sur le début d'un créneau est arrondie au créneau suivant.
+    """
+
+    def __init__(
+        self,
+        pas=30,
+        debut_journee="8:00",
+        fin_journee="20:00",
+        pause_dejeuner=("12:00", "14:00"),
+        duree_pause=60,
+        fin_matin="13:00",
+        fin_souhaitee="18:00",
+    ):
+        """
+        Initialise la grille.
+
+        Args:
+            pas: Durée d'un créneau en minutes
+            debut_journee, fin_journee: Bornes de la journée ('H:MM')
+            pause_dejeuner: Plage où la pause doit être prise (début, début du dernier créneau)
+            duree_pause: Durée minimale de la pause déjeuner en minutes
+            fin_matin: Heure qui sépare le matin de l'après-midi (disponibilités)
+            fin_souhaitee: Heure après laquelle une séance est pénalisée (préférences)
+
+        Raises:
+            ValueError: Si la journée n'est pas un multiple du pas
+        """
+        self.debut_journee = en_minutes(debut_journee)
+        self.fin_journee = en_minutes(fin_journee)
+        if pas <= 0 or (self.fin_journee - self.debut_journee) % pas:
+            raise ValueError(
+                f"Pas de {pas} min incompatible avec la journée {debut_journee}-{fin_journee}"
+            )
+        self.pas = pas
+        self.nb_creneaux = (self.fin_journee - self.debut_journee) // pas
+        self.creneaux = [self.heure(cr) for cr in range(self.nb_creneaux)]
+
+        self.pause_debut = self.creneau(pause_dejeuner[0])
+        self.pause_fin = self.creneau(pause_dejeuner[1])
+        self.nb_creneaux_pause = math.ceil(duree_pause / pas)
+        self.fin_matin = self.creneau(fin_matin)
+        self.fin_souhaitee = self.creneau(fin_souhaitee)
+
+    @classmethod
+    def automatique(cls, seances, **options):
+        """
+        Grille la plus grossière compatible avec les données: le pas est le PGCD
+        des durées des séances, des heures de début imposées par les cours et des
+        limites de la journée (pause, matin, fin souhaitée), mesurées depuis le
+        début de la journée.
+        """
+        grille = cls(**options)
+        valeurs = [
+            grille.fin_journee,
+            grille.minutes(grille.pause_debut),
+            grille.minutes(grille.pause_fin),
+            grille.minutes(grille.fin_matin),
+            grille.minutes(grille.fin_souhaitee),
+        ]
+        valeurs = [v - grille.debut_journee for v in valeurs]
+        politiques = set()
+        for s in seances:
+            valeurs.append(round(s.duree * 60))
+            politiques.add(s.cours.debuts)
+        for politique in politiques:
+            if politique == HEURE_PLEINE:
+                valeurs.append(60 - grille.debut_journee % 60)
+            for minutes in heures_de_politique(politique) or []:
+                valeurs.append(minutes - grille.debut_journee)
+
+        pas = reduce(math.gcd, valeurs, 0)
+        print(f"Pas de la grille horaire: {pas} min")
+        return cls(pas=pas, **options)
+
+    def creneau(self, heure):
+        """Indice du premier créneau qui commence à `heure` ou après."""
+        return math.ceil((en_minutes(heure) - self.debut_journee) / self.pas)
+
+    def minutes(self, cr):
+        """Heure de début du créneau `cr`, en minutes depuis minuit."""
+        return self.debut_journee + cr * self.pas
+
+    def heure(self, cr):
+        """Heure de début du créneau `cr` au format 'H:MM'."""
+        minutes = self.minutes(cr)
+        return f"{minutes // 60}:{minutes % 60:02d}"
+
+    def duree_creneaux(self, duree_heures):
+        """Nombre de créneaux occupés par une séance de `duree_heures` heures."""
+        return max(1, math.ceil(round(duree_heures * 60) / self.pas))
+
+    def creneaux_debut(self, duree_creneaux, politique=None):
+        """
+        Créneaux de début possibles d'une séance.
+
+        Args:
+            duree_creneaux: Durée de la séance en créneaux
+            politique: None (tous les créneaux), HEURE_PLEINE, ou liste d'heures
+                       séparées par '/' ('8:00/10:30/13:30/16:00')
+
+        Returns:
+            list: Indices de créneau de début, la séance se terminant avant la fin de journée
+
+        Raises:
+            ValueError: Si une heure imposée ne tombe pas sur la grille
+        """
+        dernier = self.nb_creneaux - duree_creneaux
+        if not politique:
+            return list(range(dernier + 1))
+        if politique == HEURE_PLEINE:
+            return [cr for cr in range(dernier + 1) if self.minutes(cr) % 60 == 0]
+
+        debuts = []
+        for minutes in heures_de_politique(politique):
+            ecart = minutes - self.debut_journee
+            if ecart % self.pas:
+                raise ValueError(
+                    f"Heure de début {minutes // 60}:{minutes % 60:02d} hors de la grille de {self.pas} min"
+                )
+            if 0 <= ecart // self.pas <= dernier:
+                debuts.append(ecart // self.pas)
+        return sorted(set(debuts))
@@ -0,0 +1,412 @@
+"""Résolution hiérarchique: affectation des séances aux jours, puis placement jour par jour."""
+
+import concurrent.futures
+import multiprocessing
+import time
+
+from ortools.sat.python import cp_model
+
+from conflits import salles_admissibles
+from contraintes import JOURS_SEMAINE, ajouter_objectif_preferences, get_seance_order
+
+
+def _resoudre_journee(
+    emploi_du_temps,
+    seances_jour,
+    salles,
+    enseignants,
+    groupes,
+    jour,
+    avec_preferences,
+    temps_max,
+    nb_workers,
+):
+    """
+    Place les séances d'une journée (créneau et salle), exécuté dans un processus
+    du pool. Toutes les contraintes, hormis l'ordre entre jours déjà garanti par
+    le problème maître, portent sur une seule journée.
+
+    Returns:
+        tuple: (statut CP-SAT, affectation {id_seance: (s_idx, j, cr_debut, salle_id)}
+               ou None si échec)
+    """
+    model = cp_model.CpModel()
+    seance_vars = emploi_du_temps._creer_variables(
+        model, seances_jour, salles, jours_autorises={jour}
+    )
+    emploi_du_temps._ajouter_contraintes(
+        model, seance_vars, seances_jour, salles, enseignants, groupes
+    )
+    if avec_preferences:
+        ajouter_objectif_preferences(
+            model, seance_vars, seances_jour, salles, emploi_du_temps.grille
+        )
+    affectation = emploi_du_temps._resoudre(
+        model, seance_vars, temps_max=temps_max, nb_workers=nb_workers, journal=False
+    )
+    return emploi_du_temps.dernier_statut, affectation
+
+
+class ResolutionHierarchique:
+    """
+    Décomposition en deux niveaux:
+
+    1. Un problème maître affecte chaque séance à une journée (semaine, jour) en
+       respectant la charge maximale par enseignant, groupe et type de salle, les
+       disponibilités à la journée et l'ordre des séances d'un cours.
+    2. Chaque journée est ensuite résolue indépendamment (créneaux et salles)
+       dans un pool de processus. Une journée prouvée infaisable ajoute au
+       maître une coupe interdisant exactement cet ensemble de séances ce
+       jour-là; une journée arrêtée par la limite de temps sans conclusion
+       n'est pas coupée mais reprise avec deux fois plus de temps.
+    """
+
+    def __init__(
+        self,
+        emploi_du_temps,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        temps_maitre=120,
+        temps_par_jour=30,
+        nb_processus=None,
+        taux_remplissage=1.0,
+        avec_preferences=False,
+    ):
+        """
+        Initialise la résolution.
+
+        Args:
+            emploi_du_temps: Instance de EmploiDuTemps (calendrier, grille horaire)
+            seances, salles, enseignants, groupes: Données de l'instance
+            temps_maitre: Limite de temps de chaque résolution du maître (secondes)
+            temps_par_jour: Limite de temps de chaque sous-problème journalier
+            nb_processus: Nombre de journées résolues en parallèle
+            taux_remplissage: Part de la capacité journalière utilisable par le maître
+                              (une valeur < 1 laisse du jeu aux sous-problèmes)
+            avec_preferences: Minimiser les coûts de préférence dans chaque journée
+        """
+        self.emploi_du_temps = emploi_du_temps
+        self.seances = seances
+        self.salles = salles
+        self.enseignants = enseignants
+        self.groupes = groupes
+        self.temps_maitre = temps_maitre
+        self.temps_par_jour = temps_par_jour
+        self.nb_processus = nb_processus or multiprocessing.cpu_count()
+        self.taux_remplissage = taux_remplissage
+        self.avec_preferences = avec_preferences
+        self.emploi_du_temps._configurer_grille(seances)
+        self.grille = emploi_du_temps.grille
+
+        # Coupes des journées infaisables: (jour, ensemble d'IDs de séances)
+        self.coupes = []
+        # Limite de temps des journées non conclues, doublée à chaque reprise
+        self._temps_journees = {}
+        # Résultats déjà calculés: (jour, ensemble d'IDs) -> affectation ou None
+        self._cache_journees = {}
+
+    def _salles_compatibles(self, s):
+        """Salles admissibles pour une séance (capacité et type, comme _creer_variables)."""
+        return salles_admissibles(s, self.salles)
+
+    def _demi_journees(self):
+        """Demi-journées de la grille: [(période, premier créneau, fin exclue)]."""
+        grille = self.grille
+        return [
+            ("matin", 0, grille.fin_matin),
+            ("apres_midi", grille.fin_matin, grille.nb_creneaux),
+        ]
+
+    def _jours_possibles(self, s, compatibles, disponibilites):
+        """
+        Journées et demi-journées où la séance admet au moins un placement
+        respectant les contraintes unaires de contraintes.py (disponibilités de
+        l'enseignant et des salles, parité des semaines). Une séance commencée le
+        matin ne peut pas déborder sur l'après-midi: elle tient donc entièrement
+        dans une demi-journée.
+
+        Returns:
+            dict: {(s_idx, j): [indices de demi-journée]}
+        """
+        grille = self.grille
+        e = s.cours.enseignant
+        duree = grille.duree_creneaux(s.duree)
+        debuts = grille.creneaux_debut(duree, s.cours.debuts)
+
+        # Demi-journées possibles pour chaque jour de la semaine, indépendamment de la date
+        demis_par_jour_semaine = {}
+        for j in range(self.emploi_du_temps.NB_JOURS):
+            nom_jour = JOURS_SEMAINE[j]
+            for demi, (periode, debut, fin) in enumerate(self._demi_journees()):
+                if not any(debut <= cr and cr + duree <= fin for cr in debuts):
+                    continue
+                if not disponibilites(e, nom_jour, periode):
+                    continue
+                if any(sa.est_disponible(nom_jour, periode) for sa in compatibles):
+                    demis_par_jour_semaine.setdefault(j, []).append(demi)
+
+        calendrier = self.emploi_du_temps.calendrier_academique
+        jours = {}
+        for s_idx, j in calendrier.jours_ouvrables.tolist():
+            paire = bool(calendrier.paire[s_idx])
+            if (paire and not e.semaine_paire) or (not paire and not e.semaine_impaire):
+                continue
+            if j in demis_par_jour_semaine:
+                jours[(s_idx, j)] = demis_par_jour_semaine[j]
+        return jours
+
+    def _construire_maitre(self):
+        """
+        Construit le problème maître.
+
+        Chaque séance reçoit une journée et une demi-journée; la demi-journée ne
+        sert qu'à borner plus finement les charges et n'est pas imposée aux
+        sous-problèmes.
+
+        Returns:
+            tuple: (modèle, {(id_seance, jour): variable})
+        """
+        grille = self.grille
+        model = cp_model.CpModel()
+        calendrier = self.emploi_du_temps.calendrier_academique
+        taux = self.taux_remplissage
+        demi_journees = self._demi_journees()
+        # La pause déjeuner ne porte que sur les séances propres d'une ressource:
+        # les séances d'un groupe parent peuvent occuper celle d'un sous-groupe
+        capacite_journee = int((grille.nb_creneaux - grille.nb_creneaux_pause) * taux)
+        capacite_journee_totale = int(grille.nb_creneaux * taux)
+        capacite_demi = [int((fin - debut) * taux) for _, debut, fin in demi_journees]
+
+        disponibilites_cache = {}
+
+        def disponibilites(e, jour, periode):
+            cle = (e.id, jour, periode)
+            if cle not in disponibilites_cache:
+                disponibilites_cache[cle] = e.est_disponible(jour, periode)
+            return disponibilites_cache[cle]
+
+        # Groupes occupés par une séance: ses groupes et leurs sous-groupes
+        sous_groupes = {
+            g.id_groupe: [sg.id_groupe for sg in g.sous_groupes] for g in self.groupes
+        }
+
+        x = {}
+        jours_par_seance = {}
+        charge_ressource_jour = {}
+        charge_propre_jour = {}
+        charge_ressource_demi = {}
+        charge_type_salle = {}
+        charge_totale = {}
+        for s in self.seances:
+            compatibles = self._salles_compatibles(s)
+            duree = grille.duree_creneaux(s.duree)
+            jours = self._jours_possibles(s, compatibles, disponibilites)
+            jours_par_seance[s.id_seance] = list(jours)
+            if not jours:
+                print(f"Attention: aucune journée possible pour {s.id_seance}")
+            types_salle = {sa.type_salle for sa in compatibles}
+            propres = {("enseignant", s.cours.enseignant.id)}
+            propres.update(("groupe", g.id_groupe) for g in s.groupes)
+            ressources = set(propres)
+            for g in s.groupes:
+                for sg_id in sous_groupes.get(g.id_groupe, []):
+                    ressources.add(("groupe", sg_id))
+
+            for jour, demis in jours.items():
+                var = model.NewBoolVar(f"jour_{s.id_seance}_{jour[0]}_{jour[1]}")
+                x[(s.id_seance, jour)] = var
+                vars_demi = {}
+                for demi in demis:
+                    vars_demi[demi] = model.NewBoolVar(
+                        f"demi_{s.id_seance}_{jour[0]}_{jour[1]}_{demi}"
+                    )
+                model.Add(sum(vars_demi.values()) == var)
+
+                for ressource in ressources:
+                    charge_ressource_jour.setdefault((ressource, jour), []).append(
+                        duree * var
+                    )
+                for ressource in propres:
+                    charge_propre_jour.setdefault((ressource, jour), []).append(
+                        duree * var
+                    )
+                for demi, var_demi in vars_demi.items():
+                    for ressource in ressources:
+                        charge_ressource_demi.setdefault(
+                            (ressource, jour, demi), []
+                        ).append(duree * var_demi)
+                    # Séances dont toutes les salles admissibles sont d'un même type
+                    if len(types_salle) == 1:
+                        (type_salle,) = types_salle
+                        charge_type_salle.setdefault(
+                            (type_salle, jour, demi), []
+                        ).append(duree * var_demi)
+                    charge_totale.setdefault((jour, demi), []).append(duree * var_demi)
+
+            # Chaque séance est affectée à exactement une journée
+            model.AddExactlyOne(x[(s.id_seance, jour)] for jour in jours)
+
+        # Charge maximale par enseignant et par groupe, à la journée et à la demi-journée
+        for cle, charges in charge_ressource_jour.items():
+            propres = charge_propre_jour.get(cle, [])
+            if propres:
+                model.Add(sum(propres) <= capacite_journee)
+            if len(propres) < len(charges):
+                model.Add(sum(charges) <= capacite_journee_totale)
+        for (_, _, demi), charges in charge_ressource_demi.items():
+            model.Add(sum(charges) <= capacite_demi[demi])
+
+        # Capacité des salles: par type, puis toutes salles confondues
+        nb_salles_par_type = {}
+        for sa in self.salles:
+            nb_salles_par_type[sa.type_salle] = (
+                nb_salles_par_type.get(sa.type_salle, 0) + 1
+            )
+        for (type_salle, _, demi), charges in charge_type_salle.items():
+            model.Add(
+                sum(charges) <= nb_salles_par_type[type_salle] * capacite_demi[demi]
+            )
+        for (_, demi), charges in charge_totale.items():
+            model.Add(sum(charges) <= len(self.salles) * capacite_demi[demi])
+
+        # Ordre des séances d'un cours: l'indice de journée ne décroît pas
+        # (l'ordre dans une même journée est imposé par le sous-problème)
+        indice_jour = {}
+        for s in self.seances:
+            termes = [
+                int(calendrier.index_temps[jour]) * x[(s.id_seance, jour)]
+                for jour in jours_par_seance[s.id_seance]
+            ]
+            indice_jour[s.id_seance] = model.NewIntVar(
+                0, calendrier.nb_jours_ouvrables, f"indice_jour_{s.id_seance}"
+            )
+            model.Add(indice_jour[s.id_seance] == sum(termes))
+
+        seances_par_cours = {}
+        for s in self.seances:
+            seances_par_cours.setdefault(s.cours.id_cours, []).append(s)
+        for seances_cours in seances_par_cours.values():
+            seances_cours.sort(key=get_seance_order)
+            for s1, s2 in zip(seances_cours, seances_cours[1:]):
+                model.Add(indice_jour[s2.id_seance] >= indice_jour[s1.id_seance])
+
+        return model, x
+
+    def _ajouter_coupes(self, model, x):
+        """Interdit chaque ensemble de séances qui a rendu une journée infaisable."""
+        for jour, ids in self.coupes:
+            model.AddBoolOr(x[(s_id, jour)].Not() for s_id in ids)
+
+    def _resoudre_maitre(self, affectation_jours=None):
+        """
+        Résout le problème maître avec les coupes accumulées.
+
+        Args:
+            affectation_jours: (optionnel) Solution précédente {id_seance: jour}, utilisée comme indice
+
+        Returns:
+            dict: {id_seance: (s_idx, j)}, ou None si le maître est infaisable
+        """
+        model, x = self._construire_maitre()
+        self._ajouter_coupes(model, x)
+        if affectation_jours:
+            for (s_id, jour), var in x.items():
+                model.AddHint(var, 1 if affectation_jours.get(s_id) == jour else 0)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = self.temps_maitre
+        # Le portefeuille de stratégies (dont la recherche locale) compte plus
+        # que le nombre de cœurs pour trouver vite une première affectation
+        solver.parameters.num_workers = max(8, multiprocessing.cpu_count())
+        statut = solver.Solve(model)
+        if statut not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            print(f"Problème maître: {solver.StatusName(statut)}")
+            return None
+        return {s_id: jour for (s_id, jour), var in x.items() if solver.Value(var)}
+
+    def executer(self, nb_iterations=20, temps_total=3600):
+        """
+        Alterne résolution du maître et des journées jusqu'à ce que toutes les
+        journées soient résolues.
+
+        Args:
+            nb_iterations: Nombre maximum de résolutions du maître
+            temps_total: Limite de temps totale en secondes
+
+        Returns:
+            dict: Affectation complète {id_seance: (s_idx, j, cr_debut, salle_id)}, ou None
+        """
+        seances_dict = {s.id_seance: s for s in self.seances}
+        nb_workers = max(1, multiprocessing.cpu_count() // self.nb_processus)
+        debut = time.monotonic()
+        affectation_jours = None
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.nb_processus
+        ) as pool:
+            for iteration in range(nb_iterations):
+                if time.monotonic() - debut > temps_total:
+                    break
+                affectation_jours = self._resoudre_maitre(affectation_jours)
+                if affectation_jours is None:
+                    return None
+
+                par_jour = {}
+                for s_id, jour in affectation_jours.items():
+                    par_jour.setdefault(jour, set()).add(s_id)
+
+                # Seules les journées dont le contenu a changé (ou non conclues)
+                # sont résolues à nouveau
+                cles = [(jour, frozenset(ids)) for jour, ids in par_jour.items()]
+                futures = {}
+                for cle in cles:
+                    jour, ids = cle
+                    if cle in self._cache_journees:
+                        continue
+                    futures[cle] = pool.submit(
+                        _resoudre_journee,
+                        self.emploi_du_temps,
+                        [seances_dict[s_id] for s_id in sorted(ids)],
+                        self.salles,
+                        self.enseignants,
+                        self.groupes,
+                        jour,
+                        self.avec_preferences,
+                        self._temps_journees.get(cle, self.temps_par_jour),
+                        nb_workers,
+                    )
+                for cle, future in futures.items():
+                    statut, affectation_jour = future.result()
+                    if affectation_jour is not None or statut == cp_model.INFEASIBLE:
+                        self._cache_journees[cle] = affectation_jour
+                    else:
+                        # Limite atteinte sans conclure: ni coupe ni cache
+                        self._temps_journees[cle] = 2 * self._temps_journees.get(
+                            cle, self.temps_par_jour
+                        )
+
+                infaisables = [
+                    cle
+                    for cle in cles
+                    if cle in self._cache_journees and self._cache_journees[cle] is None
+                ]
+                non_conclues = [cle for cle in cles if cle not in self._cache_journees]
+                print(
+                    f"Itération {iteration}: {len(par_jour)} journées, "
+                    f"{len(futures)} résolues, {len(infaisables)} infaisables, "
+                    f"{len(non_conclues)} non conclues"
+                )
+                if not infaisables and not non_conclues:
+                    affectation = {}
+                    for jour, ids in par_jour.items():
+                        affectation.update(self._cache_journees[(jour, frozenset(ids))])
+                    print(
+                        f"Résolution hiérarchique terminée en {time.monotonic() - debut:.1f}s"
+                    )
+                    return affectation
+                self.coupes.extend(infaisables)
+
+        print("Résolution hiérarchique: limite atteinte sans solution complète")
+        return None
@@ -0,0 +1,280 @@
+"""Recherche à grand voisinage (LNS) autour du modèle CP-SAT de EmploiDuTemps."""
+
+import concurrent.futures
+import multiprocessing
+import random
+import time
+
+from ortools.sat.python import cp_model
+
+from contraintes import ajouter_objectif_preferences, evaluer_preferences
+from reparation import ids_groupes_lies
+from solution import sauvegarder_affectation
+
+
+class Voisinage:
+    """Ensemble de séances libérées autour de la solution courante."""
+
+    def __init__(self, nature, cle, seances_libres, semaines_autorisees=None):
+        """
+        Initialise un voisinage.
+
+        Args:
+            nature: Type de voisinage ("semaine", "enseignant", "groupe" ou "salle")
+            cle: Identifiant de la ressource ou de la semaine relâchée
+            seances_libres: IDs des séances qui peuvent être déplacées
+            semaines_autorisees: (optionnel) Indices de semaine où les séances
+                                 libres peuvent être replacées. None = toutes.
+        """
+        self.nature = nature
+        self.cle = cle
+        self.seances_libres = set(seances_libres)
+        self.semaines_autorisees = (
+            set(semaines_autorisees) if semaines_autorisees is not None else None
+        )
+
+    def est_independant(self, autre):
+        """
+        Deux voisinages sont indépendants s'ils sont restreints à des semaines
+        disjointes: toutes les contraintes (hors ordre, préservé par la
+        restriction) portent sur une seule journée, et l'objectif est additif.
+        """
+        return (
+            self.semaines_autorisees is not None
+            and autre.semaines_autorisees is not None
+            and not (self.semaines_autorisees & autre.semaines_autorisees)
+        )
+
+    def __str__(self):
+        return (
+            f"Voisinage {self.nature} {self.cle} ({len(self.seances_libres)} séances)"
+        )
+
+
+def _resoudre_voisinage(
+    emploi_du_temps,
+    seances,
+    salles,
+    enseignants,
+    groupes,
+    affectation,
+    voisinage,
+    temps_max,
+    nb_workers,
+):
+    """
+    Résout le sous-modèle d'un voisinage: les séances hors voisinage sont figées
+    à leur placement courant, les autres sont libres (exécuté dans un processus
+    du pool).
+
+    Returns:
+        dict: Nouvelle affectation complète, ou None si aucune solution
+    """
+    placements_fixes = {
+        id_seance: placement
+        for id_seance, placement in affectation.items()
+        if id_seance not in voisinage.seances_libres
+    }
+
+    model = cp_model.CpModel()
+    seance_vars = emploi_du_temps._creer_variables(
+        model, seances, salles, placements_fixes, voisinage.semaines_autorisees
+    )
+    emploi_du_temps._ajouter_contraintes(
+        model, seance_vars, seances, salles, enseignants, groupes
+    )
+    ajouter_objectif_preferences(
+        model, seance_vars, seances, salles, emploi_du_temps.grille
+    )
+
+    # Partir de la solution courante
+    for cle, var in seance_vars.items():
+        model.AddHint(var, 1 if affectation.get(cle[0]) == cle[1:] else 0)
+
+    return emploi_du_temps._resoudre(
+        model, seance_vars, temps_max=temps_max, nb_workers=nb_workers, journal=False
+    )
+
+
+class RechercheLNS:
+    """
+    Boucle LNS: relâche un voisinage structuré (une semaine, les séances d'un
+    enseignant, d'un groupe ou d'une salle), fige le reste à la solution courante,
+    résout ce petit modèle avec une courte limite de temps et conserve les
+    améliorations du coût de préférences.
+    """
+
+    def __init__(
+        self,
+        emploi_du_temps,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        temps_par_voisinage=20,
+        taille_max=30,
+        nb_processus=None,
+        fichier_solution="output/lns_solution.json",
+        graine=0,
+    ):
+        """
+        Initialise la recherche.
+
+        Args:
+            emploi_du_temps: Instance de EmploiDuTemps (calendrier, semaines)
+            seances, salles, enseignants, groupes: Données de l'instance
+            temps_par_voisinage: Limite de temps de chaque sous-modèle (secondes)
+            taille_max: Nombre maximum de séances libérées par voisinage
+            nb_processus: Nombre de voisinages indépendants résolus en parallèle
+            fichier_solution: Fichier où chaque solution améliorante est écrite
+            graine: Graine du générateur aléatoire
+        """
+        self.emploi_du_temps = emploi_du_temps
+        self.seances = seances
+        self.salles = salles
+        self.enseignants = enseignants
+        self.groupes = groupes
+        self.temps_par_voisinage = temps_par_voisinage
+        self.taille_max = taille_max
+        self.nb_processus = nb_processus or min(4, multiprocessing.cpu_count())
+        self.fichier_solution = fichier_solution
+        self.random = random.Random(graine)
+        self.emploi_du_temps._configurer_grille(seances)
+
+    def _cout(self, affectation):
+        return evaluer_preferences(
+            affectation, self.seances, self.salles, self.emploi_du_temps.grille
+        )
+
+    def _limiter(self, ids):
+        """Tire au plus taille_max séances parmi ids."""
+        ids = sorted(ids)
+        if len(ids) > self.taille_max:
+            ids = self.random.sample(ids, self.taille_max)
+        return ids
+
+    def generer_voisinages(self, affectation):
+        """Construit les voisinages structurés de la solution courante."""
+        par_semaine = {}
+        par_enseignant = {}
+        par_groupe = {}
+        par_salle = {}
+        for s in self.seances:
+            if s.id_seance not in affectation:
+                continue
+            s_idx, _, _, salle_id = affectation[s.id_seance]
+            par_semaine.setdefault(s_idx, []).append(s.id_seance)
+            par_enseignant.setdefault(s.cours.enseignant.id, []).append(s.id_seance)
+            par_salle.setdefault(salle_id, []).append(s.id_seance)
+            for g_id in ids_groupes_lies(s.groupes):
+                par_groupe.setdefault(g_id, []).append(s.id_seance)
+
+        voisinages = []
+        for s_idx, ids in par_semaine.items():
+            # Les séances d'une semaine restent dans cette semaine
+            voisinages.append(
+                Voisinage(
+                    "semaine", s_idx, self._limiter(ids), semaines_autorisees={s_idx}
+                )
+            )
+        for nature, index in [
+            ("enseignant", par_enseignant),
+            ("groupe", par_groupe),
+            ("salle", par_salle),
+        ]:
+            for cle, ids in index.items():
+                voisinages.append(Voisinage(nature, cle, self._limiter(ids)))
+        return voisinages
+
+    def _choisir_lot(self, voisinages):
+        """
+        Choisit un lot de voisinages deux à deux indépendants, à résoudre en parallèle.
+        Le premier voisinage est tiré au hasard.
+        """
+        candidats = list(voisinages)
+        self.random.shuffle(candidats)
+        lot = [candidats.pop()]
+        for v in candidats:
+            if len(lot) >= self.nb_processus:
+                break
+            if all(v.est_independant(choisi) for choisi in lot):
+                lot.append(v)
+        return lot
+
+    def executer(self, affectation_initiale, nb_iterations=100, temps_total=600):
+        """
+        Lance la recherche à partir d'une affectation réalisable.
+
+        Args:
+            affectation_initiale: Affectation {id_seance: (s_idx, j, cr_debut, salle_id)},
+                                  par exemple EmploiDuTemps.affectation après generer
+            nb_iterations: Nombre maximum de lots de voisinages
+            temps_total: Limite de temps totale en secondes
+
+        Returns:
+            dict: Meilleure affectation trouvée
+        """
+        meilleure = dict(affectation_initiale)
+        meilleur_cout = self._cout(meilleure)
+        print(f"LNS: coût initial {meilleur_cout}")
+        sauvegarder_affectation(
+            meilleure, self.emploi_du_temps.SEMAINES, self.fichier_solution
+        )
+
+        nb_workers = max(1, multiprocessing.cpu_count() // self.nb_processus)
+        debut = time.monotonic()
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.nb_processus
+        ) as pool:
+            for iteration in range(nb_iterations):
+                temps_restant = temps_total - (time.monotonic() - debut)
+                if temps_restant <= 0 or meilleur_cout == 0:
+                    break
+
+                lot = self._choisir_lot(self.generer_voisinages(meilleure))
+                futures = [
+                    pool.submit(
+                        _resoudre_voisinage,
+                        self.emploi_du_temps,
+                        self.seances,
+                        self.salles,
+                        self.enseignants,
+                        self.groupes,
+                        meilleure,
+                        voisinage,
+                        min(self.temps_par_voisinage, temps_restant),
+                        nb_workers,
+                    )
+                    for voisinage in lot
+                ]
+
+                # Les voisinages d'un lot sont indépendants: leurs améliorations se cumulent
+                ameliore = False
+                for voisinage, future in zip(lot, futures):
+                    resultat = future.result()
+                    if resultat is None:
+                        continue
+                    candidate = dict(meilleure)
+                    for id_seance in voisinage.seances_libres:
+                        if id_seance in resultat:
+                            candidate[id_seance] = resultat[id_seance]
+                    cout = self._cout(candidate)
+                    if cout < meilleur_cout:
+                        print(
+                            f"LNS itération {iteration}: {voisinage} -> coût {meilleur_cout} => {cout}"
+                        )
+                        meilleure, meilleur_cout = candidate, cout
+                        ameliore = True
+
+                if ameliore:
+                    sauvegarder_affectation(
+                        meilleure,
+                        self.emploi_du_temps.SEMAINES,
+                        self.fichier_solution,
+                    )
+
+        print(
+            f"LNS terminée en {time.monotonic() - debut:.1f}s: coût final {meilleur_cout}"
+        )
+        return meilleure
@@ -2,36 +2,32 @@
 
 import csv
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime
 import calendar
-from ortools.sat.python import cp_model
 import model
-import pandas as pd
-from icalendar import Calendar, Event
-import pytz
-from datetime import datetime
 from model import Salle, Enseignant, Groupe, Cours, Seance
+from grille import GrilleHoraire
+from contraintes import SALLE_DU_COURS
+from solution import EcrivainAsynchrone, SolutionColonnaire
+from telemetrie import (
+    JournalTelemetrie,
+    SurveillancePlateau,
+)
 import multiprocessing
 import traceback
 import logging
 import sys
-import holidays
-
 
-# Configuration de la journalisation
-logging.basicConfig(
-    level=logging.DEBUG,  # Niveau de journalisation (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Format des messages
-    filename="edt_ingemedia.log",  # Nom du fichier log
-    filemode="w",  # Mode d'ouverture du fichier ('w' pour écraser, 'a' pour ajouter)
-)
+# OR-Tools, numpy, icalendar et pytz sont importés dans les méthodes de
+# résolution et d'export: charger les données ne coûte que quelques
+# millisecondes et l'importation du module n'a aucun effet de bord.
 
 
 # Redirection de stdout et stderr vers le fichier log
 class Logger(object):
-    def __init__(self):
-        self.terminal = sys.stdout
-        self.log = open("edt_ingemedia.log", "w", encoding="utf-8")
+    def __init__(self, terminal, log):
+        self.terminal = terminal
+        self.log = log
 
     def write(self, message):
         self.terminal.write(message)
@@ -43,28 +39,21 @@ class Logger(object):
         self.log.flush()
 
 
-sys.stdout = Logger()
-sys.stderr = Logger()
-
-
-# Ajout de la classe de callback pour suivre les solutions
-class SolutionCallback(cp_model.CpSolverSolutionCallback):
-    """Callback pour suivre les solutions trouvées pendant la résolution."""
-
-    def __init__(self):
-        cp_model.CpSolverSolutionCallback.__init__(self)
-        self._solution_count = 0
-        self._start_time = datetime.now()
-
-    def on_solution_callback(self):
-        """Appelé à chaque solution trouvée."""
-        current_time = datetime.now()
-        elapsed = current_time - self._start_time
-        self._solution_count += 1
-        print(f"Solution #{self._solution_count} trouvée après {elapsed}")
+def configurer_journal(fichier="edt_ingemedia.log"):
+    """
+    Configure la journalisation et recopie stdout et stderr dans `fichier`.
 
-    def solution_count(self):
-        return self._solution_count
+    Appelée par les points d'entrée en ligne de commande uniquement: importer
+    ce module ne touche ni au fichier log ni aux flux standard.
+    """
+    journal = open(fichier, "w", encoding="utf-8")
+    logging.basicConfig(
+        level=logging.DEBUG,  # Niveau de journalisation (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        format="%(asctime)s - %(levelname)s - %(message)s",  # Format des messages
+        stream=journal,
+    )
+    sys.stdout = Logger(sys.stdout, journal)
+    sys.stderr = Logger(sys.stderr, journal)
 
 
 def charger_salles(fichier="data/salle.csv"):
@@ -228,7 +217,41 @@ def charger_groupes(fichier="data/groupe.csv"):
                     f"Erreur lors du chargement du groupe {row.get('id_groupe', 'inconnu')} - {row.get('nom', 'inconnu')}: {e}"
                 )
 
-    # Deuxième étape : établir les relations parent-enfant
+    # Deuxième et troisième étapes : relations parent-enfant et effectifs
+    groupes = relier_groupes(groupes_dict)
+
+    # Afficher la liste des groupes pour débogage
+    print(f"Liste des groupes chargés:")
+    for g in groupes:
+        sous_groupes_info = ""
+        if hasattr(g, "sous_groupes") and g.sous_groupes:
+            sous_groupes_info = (
+                f", sous-groupes: {[sg.id_groupe for sg in g.sous_groupes]}"
+            )
+        parent_info = (
+            f", parent: {g.id_parent}"
+            if hasattr(g, "id_parent") and g.id_parent
+            else ""
+        )
+        print(
+            f"  {g.nom} (ID: {g.id_groupe}, Effectif: {g.effectif}{parent_info}{sous_groupes_info})"
+        )
+
+    return groupes
+
+
+def relier_groupes(groupes_dict):
+    """
+    Établit les relations parent-enfant puis calcule l'effectif des groupes
+    parents sans effectif propre.
+
+    Args:
+        groupes_dict: Groupes par ID, dans l'ordre de chargement
+
+    Returns:
+        list: Les groupes, dans l'ordre de chargement
+    """
+    # Établir les relations parent-enfant
     for groupe_id, groupe in groupes_dict.items():
         if groupe.id_parent and groupe.id_parent in groupes_dict:
             parent = groupes_dict[groupe.id_parent]
@@ -240,7 +263,7 @@ def charger_groupes(fichier="data/groupe.csv"):
             # Ajouter ce groupe aux sous-groupes du parent
             parent.sous_groupes.append(groupe)
 
-    # Troisième étape : calculer les effectifs des groupes parents
+    # Calculer les effectifs des groupes parents
     for groupe in groupes_dict.values():
         if (
             hasattr(groupe, "sous_groupes")
@@ -251,26 +274,7 @@ def charger_groupes(fichier="data/groupe.csv"):
             groupe.effectif = groupe.total_effectif()
 
     # Convertir le dictionnaire en liste
-    groupes = list(groupes_dict.values())
-
-    # Afficher la liste des groupes pour débogage
-    print(f"Liste des groupes chargés:")
-    for g in groupes:
-        sous_groupes_info = ""
-        if hasattr(g, "sous_groupes") and g.sous_groupes:
-            sous_groupes_info = (
-                f", sous-groupes: {[sg.id_groupe for sg in g.sous_groupes]}"
-            )
-        parent_info = (
-            f", parent: {g.id_parent}"
-            if hasattr(g, "id_parent") and g.id_parent
-            else ""
-        )
-        print(
-            f"  {g.nom} (ID: {g.id_groupe}, Effectif: {g.effectif}{parent_info}{sous_groupes_info})"
-        )
-
-    return groupes
+    return list(groupes_dict.values())
 
 
 def charger_cours(fichier="data/cours.csv", enseignants=None, groupes=None):
@@ -324,6 +328,9 @@ def charger_cours(fichier="data/cours.csv", enseignants=None, groupes=None):
 
                 type_cours = row["type_cours"].strip().upper()
 
+                # Colonne optionnelle: heures de début permises ("heure_pleine", "8:00/10:30")
+                debuts = (row.get("debuts") or "").strip() or None
+
                 # Récupérer les IDs des groupes associés
                 ids_groupes = [g.strip() for g in row["groupes"].split(",")]
 
@@ -345,6 +352,7 @@ def charger_cours(fichier="data/cours.csv", enseignants=None, groupes=None):
                     duree_total=duree_total,
                     max_duration=max_duration,
                     type_cours=type_cours,
+                    debuts=debuts,
                 )
 
                 # Stocker temporairement la liste des IDs de groupe
@@ -530,6 +538,11 @@ class EmploiDuTemps:
         jours_feries=None,
         date_debut=None,
         date_fin=None,
+        pas_creneau=30,
+        contraintes_redondantes=None,
+        exclusivite_par_cliques=True,
+        salle_par_cours=False,
+        nb_processus_construction=None,
     ):
         """
         Initialise l'emploi du temps pour un mois et des semaines spécifiques.
@@ -541,224 +554,270 @@ class EmploiDuTemps:
             jours_feries: Liste des dates fériées au format 'YYYY-MM-DD'
             date_debut: Date de début au format 'YYYY-MM-DD' (pour ignorer les jours avant cette date)
             date_fin: Date de fin au format 'YYYY-MM-DD' (pour ignorer les jours après cette date)
+            pas_creneau: Durée d'un créneau en minutes, ou "auto" pour le plus grand pas
+                         compatible avec les séances (déterminé à la création des variables)
+            contraintes_redondantes: (optionnel) Noms des contraintes redondantes à ajouter
+                                     au modèle (voir contraintes.CONTRAINTES_REDONDANTES)
+            exclusivite_par_cliques: Poser l'exclusivité des enseignants et des groupes
+                                     par cliques du graphe de conflits des séances
+                                     (voir conflits.GrapheConflits)
+            salle_par_cours: Choisir une seule salle par cours et groupe pour tout le
+                             semestre; les variables de placement ne portent alors que
+                             sur l'horaire (voir salle_cours.ChoixSalles)
+            nb_processus_construction: (optionnel) Nombre de processus entre lesquels
+                                       répartir la construction des familles de
+                                       contraintes (voir construction_parallele)
         """
         self.annee = annee
         self.mois = mois
         self.jours_feries = jours_feries or []
         self.date_debut = date_debut
         self.date_fin = date_fin
+        self.contraintes_redondantes = contraintes_redondantes or []
+        self.exclusivite_par_cliques = exclusivite_par_cliques
+        self.salle_par_cours = salle_par_cours
+        self.nb_processus_construction = nb_processus_construction
+        # Stratégie choisie par generer_selon_budget
+        self.strategie_retenue = None
+        # Métriques du dernier graphe de conflits utilisé (voir _ajouter_contraintes)
+        self.statistiques_conflits = {}
+        # Statut CP-SAT de la dernière résolution (voir _resoudre)
+        self.dernier_statut = None
 
         # Constantes pour l'emploi du temps
         self.JOURS_SEMAINE = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi"]
 
-        # Déterminer les semaines du mois si non spécifiées
+        # Période couverte: dates explicites, sinon les semaines demandées
+        # (l'année avance quand les numéros repartent à 1), sinon le mois
         if semaines:
-            self.SEMAINES = semaines
-        else:
-            # Obtenir toutes les semaines du mois
-            premier_jour = datetime(annee, mois, 1)
-            dernier_jour = datetime(annee, mois, calendar.monthrange(annee, mois)[1])
-            self.SEMAINES = list(
-                set(
-                    [
-                        d.isocalendar()[1]
-                        for d in [
-                            premier_jour + timedelta(days=i)
-                            for i in range((dernier_jour - premier_jour).days + 1)
-                        ]
-                    ]
-                )
+            debut_periode = date.fromisocalendar(annee, semaines[0], 1)
+            annee_fin = annee + sum(
+                1 for prec, suiv in zip(semaines, semaines[1:]) if suiv < prec
             )
+            fin_periode = date.fromisocalendar(annee_fin, semaines[-1], 7)
+        else:
+            debut_periode = date(annee, mois, 1)
+            fin_periode = date(annee, mois, calendar.monthrange(annee, mois)[1])
 
-        # Créer le calendrier complet des jours ouvrables
-        self.calendrier = {}
-        for semaine in self.SEMAINES:
-            self.calendrier[semaine] = {}
-            for jour_idx, jour_nom in enumerate(self.JOURS_SEMAINE):
-                # Trouver la date correspondante
-                date = self._trouver_date(
-                    semaine, jour_idx + 1
-                )  # jour_idx + 1 car lundi = 1 dans isocalendar
-
-                # Vérifier si c'est un jour férié ou hors des limites de date_debut/date_fin
-                if (
-                    date.strftime("%Y-%m-%d") not in self.jours_feries
-                    and (
-                        not self.date_debut
-                        or date >= datetime.strptime(self.date_debut, "%Y-%m-%d")
-                    )
-                    and (
-                        not self.date_fin
-                        or date <= datetime.strptime(self.date_fin, "%Y-%m-%d")
-                    )
-                ):
-                    self.calendrier[semaine][jour_idx] = date
-                else:
-                    # Jour férié ou hors des limites = None
-                    self.calendrier[semaine][jour_idx] = None
-
-        # Si une date de début est spécifiée, ignorer les jours avant cette date
-        if self.date_debut:
-            date_debut_obj = datetime.strptime(self.date_debut, "%Y-%m-%d")
-            for semaine in self.SEMAINES:
-                for jour_idx in list(self.calendrier[semaine].keys()):
-                    if (
-                        self.calendrier[semaine][jour_idx]
-                        and self.calendrier[semaine][jour_idx] < date_debut_obj
-                    ):
-                        self.calendrier[semaine][jour_idx] = None
-
-        # Créneaux de 30 minutes de 8h à 20h
-        self.CRENEAUX_30MIN = []
-        for h in range(8, 20):
-            self.CRENEAUX_30MIN.append(f"{h}:00")
-            self.CRENEAUX_30MIN.append(f"{h}:30")
+        from calendrier import CalendrierAcademique
+
+        self.calendrier_academique = CalendrierAcademique(
+            date_debut or debut_periode,
+            date_fin or fin_periode,
+            jours_feries=self.jours_feries,
+            semaines=semaines or None,
+            nb_jours=len(self.JOURS_SEMAINE),
+        )
+        self.SEMAINES = self.calendrier_academique.semaines
+
+        # Vue {semaine: {jour_idx: date ou None}} des jours ouvrables
+        self.calendrier = self.calendrier_academique.calendrier_par_semaine()
 
         # Pour l'affichage, nous gardons les créneaux de 2h
         self.CRENEAUX_AFFICHAGE = [f"{h}h00" for h in range(8, 20, 2)]
 
         self.NB_JOURS = len(self.JOURS_SEMAINE)
         self.NB_SEMAINES = len(self.SEMAINES)
-        self.NB_CRENEAUX_30MIN = len(self.CRENEAUX_30MIN)
 
-        # Définir les créneaux de pause déjeuner (de 12h à 14h)
-        self.PAUSE_DEJEUNER_DEBUT = 8  # Index du créneau 12:00 (8 * 30min après 8h)
-        self.PAUSE_DEJEUNER_FIN = 12  # Index du créneau 14:00 (12 * 30min après 8h)
+        # Créneaux de 8h à 20h (30 minutes par défaut)
+        self.pas_creneau = pas_creneau
+        self.grille = None
+        if pas_creneau != "auto":
+            self._appliquer_grille(GrilleHoraire(pas=pas_creneau))
+
+    def _appliquer_grille(self, grille):
+        """Fixe la grille horaire et les indices de créneau qui en dépendent."""
+        self.grille = grille
+        self.CRENEAUX = grille.creneaux
+        self.NB_CRENEAUX = grille.nb_creneaux
+
+        # Créneaux de pause déjeuner (de 12h à 14h)
+        self.PAUSE_DEJEUNER_DEBUT = grille.pause_debut
+        self.PAUSE_DEJEUNER_FIN = grille.pause_fin
+
+    def _configurer_grille(self, seances):
+        """Détermine la grille automatique à partir des séances, une seule fois."""
+        if self.grille is None:
+            self._appliquer_grille(GrilleHoraire.automatique(seances))
 
-    def _trouver_date(self, semaine, jour_semaine):
+    def _creer_variables(
+        self,
+        model,
+        seances,
+        salles,
+        placements_fixes=None,
+        semaines_autorisees=None,
+        jours_autorises=None,
+    ):
         """
-        Trouve la date correspondant à un numéro de semaine et jour de la semaine.
+        Crée les variables de placement des séances.
 
         Args:
-            semaine: Numéro de semaine ISO
-            jour_semaine: Jour de la semaine (1=lundi, 7=dimanche)
+            model: Modèle CP-SAT
+            seances: Liste des séances à placer
+            salles: Liste des salles
+            placements_fixes: (optionnel) Dictionnaire {id_seance: (s_idx, j, cr_debut, salle_id)}.
+                              Pour ces séances, seule la variable du placement indiqué est créée.
+            semaines_autorisees: (optionnel) Indices de semaine où les séances non figées
+                                 peuvent être placées. Par défaut, toutes les semaines.
+            jours_autorises: (optionnel) Journées (s_idx, j) où les séances non figées
+                             peuvent être placées. Par défaut, toutes les journées.
 
         Returns:
-            datetime: La date correspondante
+            dict: Variables indexées par (id_seance, s_idx, j, cr_debut, salle_id)
         """
-        # Trouver une date dans la semaine spécifiée
-        jan1 = datetime(self.annee, 1, 1)
-        # Si le 1er janvier n'est pas un lundi, reculer pour trouver le lundi de la semaine
-        while jan1.isocalendar()[1] != semaine:
-            jan1 += timedelta(days=1)
-
-        # Trouver le jour spécifié dans cette semaine
-        date = jan1
-        while date.isocalendar()[2] != jour_semaine:
-            date += timedelta(days=1)
-
-        return date
-
-    def generer(self, seances, salles, enseignants, groupes):
-        """Génère un emploi du temps optimal pour les séances spécifiées."""
-        # Importation du module de contraintes
-        from contraintes import ajouter_toutes_contraintes
-
-        # Création du modèle
-        model = cp_model.CpModel()
+        placements_fixes = placements_fixes or {}
+        self._configurer_grille(seances)
 
         # Variables: pour chaque séance, on crée une variable pour chaque combinaison
         # (semaine, jour, créneau, salle) possible
         seance_vars = {}
 
-        # Pour chaque séance, on crée des variables pour tous les créneaux de début possibles
-        print("Création des variables de séance...")
-        # Pour chaque séance, on crée des variables pour tous les créneaux de début possibles
-
         print("Création des variables de séance...")
         for s in seances:
             # Récupérer les propriétés de la séance
             cours = s.cours
             groupe = s.groupes
+            placement_fixe = placements_fixes.get(s.id_seance)
+            nb_vars_avant = len(seance_vars)
 
-            # Durée de la séance en minutes (convertir les heures en minutes)
-            duree_minutes = int(s.duree * 60)
+            # Durée de la séance en créneaux et heures de début permises par le cours
+            duree_creneaux = self.grille.duree_creneaux(s.duree)
+            creneaux_debut = self.grille.creneaux_debut(duree_creneaux, cours.debuts)
 
             # Création des variables pour le placement des séances
-            for s_idx, semaine in enumerate(self.SEMAINES):
-                for j in range(self.NB_JOURS):
-                    # Vérifier si le jour est disponible (non férié)
-                    if self.calendrier[semaine][j] is None:
-                        continue
-
-                    # Convertir la durée en nombre de créneaux de 30 minutes
-                    duree_creneaux = int(duree_minutes / 30)
-                    if duree_creneaux == 0:  # Pour éviter les séances trop courtes
-                        duree_creneaux = 1
-
-                    # Pour chaque créneau de début possible
-                    for cr_debut in range(self.NB_CRENEAUX_30MIN - duree_creneaux + 1):
-                        # Vérifier que la séance ne dépasse pas 20h
-                        heure_fin_index = cr_debut + duree_creneaux - 1
-                        if heure_fin_index >= self.NB_CRENEAUX_30MIN:
+            # Parcours des jours ouvrables, dans l'ordre de l'indice temporel dense
+            for s_idx, j in self.calendrier_academique.jours_ouvrables.tolist():
+                if (
+                    placement_fixe is None
+                    and semaines_autorisees is not None
+                    and s_idx not in semaines_autorisees
+                ):
+                    continue
+                if (
+                    placement_fixe is None
+                    and jours_autorises is not None
+                    and (s_idx, j) not in jours_autorises
+                ):
+                    continue
+                semaine = self.SEMAINES[s_idx]
+
+                # Pour chaque créneau de début possible (la séance finit avant 20h)
+                for cr_debut in creneaux_debut:
+                    if self.salle_par_cours:
+                        # La salle est choisie une fois par cours (salle_cours.ChoixSalles)
+                        if placement_fixe is not None and placement_fixe[:3] != (
+                            s_idx,
+                            j,
+                            cr_debut,
+                        ):
                             continue
+                        seance_vars[
+                            (s.id_seance, s_idx, j, cr_debut, SALLE_DU_COURS)
+                        ] = model.NewBoolVar(
+                            f"seance_{s.id_seance}_semaine_{semaine}_jour_{j}_creneau_{cr_debut}"
+                        )
+                        continue
 
-                        # Convertir les indices en heures réelles pour débogage
-                        heure_debut = 8 + cr_debut // 2
-                        minute_debut = 30 if cr_debut % 2 else 0
-
-                        # Calculer l'heure de fin directement à partir de la durée
-                        heure_fin = heure_debut + (duree_minutes // 60)
-                        minute_fin = minute_debut + (duree_minutes % 60)
-                        if minute_fin >= 60:
-                            heure_fin += 1
-                            minute_fin -= 60
-
-                        # Si l'heure de fin est après 20h, on ne crée pas de variable
-                        if heure_fin > 20 or (heure_fin == 20 and minute_fin > 0):
+                    for salle in salles:
+                        # Séance figée: seul le placement imposé est conservé
+                        if placement_fixe is not None and placement_fixe != (
+                            s_idx,
+                            j,
+                            cr_debut,
+                            salle.id,
+                        ):
                             continue
 
-                        for salle in salles:
-                            # Calculer l'effectif total des groupes
-                            # Pour une liste de groupes (CM) ou un groupe unique (TD)
-                            effectif_total = 0
-                            if isinstance(groupe, list):
-                                # Si c'est une liste de groupes (cas des CM)
-                                for g in groupe:
-                                    effectif_total += g.effectif
-                            else:
-                                # Si c'est un seul groupe (cas des TD)
-                                effectif_total = groupe.effectif
-
-                            # Vérifier si la salle peut accueillir le groupe
-                            if salle.effectif_max >= effectif_total:
-                                # Pour les TD, vérifier que la salle n'est pas un amphi
-                                if (
-                                    cours.type_cours == "TD"
-                                    and salle.type_salle == "Amphi"
-                                ):
-                                    continue
-
-                                # Pour les CM, privilégier les amphis
-                                if (
-                                    cours.type_cours == "CM"
-                                    and salle.type_salle != "Amphi"
-                                ):
-                                    # Créer quand même la variable, mais avec une préférence moindre
-                                    pass
-
-                                seance_vars[
-                                    (s.id_seance, s_idx, j, cr_debut, salle.id)
-                                ] = model.NewBoolVar(
+                        # Calculer l'effectif total des groupes
+                        # Pour une liste de groupes (CM) ou un groupe unique (TD)
+                        effectif_total = 0
+                        if isinstance(groupe, list):
+                            # Si c'est une liste de groupes (cas des CM)
+                            for g in groupe:
+                                effectif_total += g.effectif
+                        else:
+                            # Si c'est un seul groupe (cas des TD)
+                            effectif_total = groupe.effectif
+
+                        # Vérifier si la salle peut accueillir le groupe
+                        if salle.effectif_max >= effectif_total:
+                            # Pour les TD, vérifier que la salle n'est pas un amphi
+                            if cours.type_cours == "TD" and salle.type_salle == "Amphi":
+                                continue
+
+                            # Pour les CM, privilégier les amphis
+                            if cours.type_cours == "CM" and salle.type_salle != "Amphi":
+                                # Créer quand même la variable, mais avec une préférence moindre
+                                pass
+
+                            seance_vars[(s.id_seance, s_idx, j, cr_debut, salle.id)] = (
+                                model.NewBoolVar(
                                     f"seance_{s.id_seance}_semaine_{semaine}_jour_{j}_creneau_{cr_debut}_salle_{salle.id}"
                                 )
+                            )
+
+            # Un placement figé devenu impossible (salle trop petite, jour férié...)
+            # libère la séance plutôt que de rendre le modèle infaisable
+            if placement_fixe is not None and len(seance_vars) == nb_vars_avant:
+                print(
+                    f"Attention: placement figé invalide pour {s.id_seance}, séance libérée"
+                )
+                placements_sans_seance = dict(placements_fixes)
+                del placements_sans_seance[s.id_seance]
+                seance_vars.update(
+                    self._creer_variables(
+                        model,
+                        [s],
+                        salles,
+                        placements_sans_seance,
+                        semaines_autorisees,
+                        jours_autorises,
+                    )
+                )
 
         print("Création des variables de séance terminée.")
-        # Ajouter toutes les contraintes au modèle
-        ajouter_toutes_contraintes(
-            model=model,
-            seance_vars=seance_vars,
-            seances=seances,
-            salles=salles,
-            calendrier=self.calendrier,
-            semaines=self.SEMAINES,
-            nb_jours=self.NB_JOURS,
-            nb_creneaux_30min=self.NB_CRENEAUX_30MIN,
-            enseignants=enseignants,
-            groupes=groupes,
-            pause_debut=self.PAUSE_DEJEUNER_DEBUT,
-            pause_fin=self.PAUSE_DEJEUNER_FIN,
-        )
+        return seance_vars
+
+    def _resoudre(
+        self,
+        model,
+        seance_vars,
+        temps_max=7200,
+        nb_workers=None,
+        journal=True,
+        fichier_checkpoint=None,
+        intervalle_checkpoint=60,
+        fichier_telemetrie=None,
+        politique_arret=None,
+        choix_salles=None,
+    ):
+        """
+        Résout le modèle et retourne l'affectation trouvée.
+
+        Args:
+            model: Modèle CP-SAT complet (variables, contraintes, objectif éventuel)
+            seance_vars: Variables de placement créées par _creer_variables
+            temps_max: Limite de temps du solveur en secondes
+            nb_workers: (optionnel) Nombre de workers de recherche du solveur
+            journal: Afficher les logs de progression du solveur
+            fichier_checkpoint: (optionnel) Fichier où la dernière solution trouvée
+                                est sauvegardée pendant la résolution
+            intervalle_checkpoint: Intervalle minimal entre deux sauvegardes (secondes)
+            fichier_telemetrie: (optionnel) Fichier JSONL recevant les événements de
+                                la résolution (solutions, objectif, borne, écart)
+            politique_arret: (optionnel) telemetrie.PolitiqueArret pour arrêter la
+                             recherche avant temps_max (plateau ou écart atteint)
+            choix_salles: (optionnel) salle_cours.ChoixSalles du modèle, pour
+                          retrouver la salle choisie pour chaque cours
+
+        Returns:
+            dict: Affectation {id_seance: (s_idx, j, cr_debut, salle_id)}, ou None
+                  si aucune solution n'a été trouvée. Si la résolution est
+                  interrompue, la meilleure solution trouvée jusque-là est retournée.
+        """
+        from ortools.sat.python import cp_model
+        from suivi import SolutionCallback
 
         # Résolution avec modifications pour améliorer le suivi
         # Réduire le nombre de threads si nécessaire
@@ -775,13 +834,22 @@ class EmploiDuTemps:
         solver.parameters.enumerate_all_solutions = (
             False  # Ne pas chercher toutes les solutions
         )
-        solver.parameters.log_search_progress = True  # Afficher les logs de progression
-        solver.parameters.max_time_in_seconds = 7200  # Timeout de 2 heures
+        solver.parameters.log_search_progress = (
+            journal  # Afficher les logs de progression
+        )
+        solver.parameters.max_time_in_seconds = (
+            temps_max  # Timeout (2 heures par défaut)
+        )
         solver.parameters.cp_model_presolve = (
             True  # Activer la simplification du modèle
         )
 
-        solver.parameters.log_search_progress = True
+        if nb_workers:
+            solver.parameters.num_workers = nb_workers
+            threads = nb_workers
+
+        if politique_arret is not None:
+            politique_arret.configurer(solver)
 
         print("\n" + "=" * 80)
         print(f"DÉMARRAGE DE LA RÉSOLUTION AVEC {threads} THREADS PARALLÈLES")
@@ -789,11 +857,43 @@ class EmploiDuTemps:
         print(f"Heure de début: {datetime.now().strftime('%H:%M:%S')}")
         print(f"Nombre de cœurs disponibles: {cores}")
 
+        ecrivain = None
+        if fichier_checkpoint:
+            ecrivain = EcrivainAsynchrone(fichier_checkpoint, self.SEMAINES)
+        telemetrie = None
+        if fichier_telemetrie:
+            telemetrie = JournalTelemetrie(fichier_telemetrie)
+            # Valeur transmise au solveur: 0 laisse CP-SAT choisir le nombre
+            # de workers selon la machine
+            telemetrie.evenement(
+                "debut",
+                workers=solver.parameters.num_workers,
+                temps_max=temps_max,
+                variables=len(model.Proto().variables),
+                contraintes=len(model.Proto().constraints),
+                **self.statistiques_conflits,
+            )
+            solver.best_bound_callback = lambda borne: telemetrie.evenement(
+                "borne", borne=borne
+            )
+        callback = SolutionCallback(
+            seance_vars, ecrivain, intervalle_checkpoint, telemetrie, choix_salles
+        )
+
+        surveillance = None
+        if politique_arret is not None and politique_arret.sans_amelioration:
+            surveillance = SurveillancePlateau(
+                solver, callback, politique_arret, telemetrie
+            )
+            surveillance.demarrer()
+
+        status = None
+        self.dernier_statut = None
         try:
             print("Lancement de la résolution...")
-            callback = SolutionCallback()
             start_time = datetime.now()
             status = solver.SolveWithSolutionCallback(model, callback)
+            self.dernier_statut = status
             end_time = datetime.now()
             duration = end_time - start_time
 
@@ -806,7 +906,9 @@ class EmploiDuTemps:
 
         except KeyboardInterrupt:
             print("\n⚠️ Résolution interrompue manuellement par l'utilisateur")
-            return None
+            if callback.meilleure_affectation is not None:
+                print("   La meilleure solution trouvée jusqu'ici est conservée.")
+            return callback.meilleure_affectation
         except MemoryError:
             print("\n❌ ERREUR: Mémoire insuffisante pour résoudre le problème")
             print(
@@ -817,6 +919,25 @@ class EmploiDuTemps:
             print(f"\n❌ ERREUR lors de la résolution: {str(e)}")
             traceback.print_exc()
             return None
+        finally:
+            if surveillance is not None:
+                surveillance.arreter()
+            if telemetrie is not None:
+                telemetrie.evenement(
+                    "fin",
+                    statut=(
+                        solver.StatusName(status)
+                        if status is not None
+                        else "INTERROMPU"
+                    ),
+                    solutions=callback.solution_count(),
+                )
+                telemetrie.fermer()
+            if ecrivain is not None:
+                # Toujours sauvegarder la dernière solution, même hors intervalle
+                if callback.meilleure_affectation is not None:
+                    ecrivain.soumettre(callback.meilleure_affectation)
+                ecrivain.fermer()
 
         # Afficher les statistiques du solveur
         print(f"Nombre de branches explorées: {solver.NumBranches()}")
@@ -842,362 +963,580 @@ class EmploiDuTemps:
             print("❌ Modèle INVALIDE - Le modèle contient des erreurs.")
         else:
             print("❓ Statut INCONNU - Le solveur n'a pas pu déterminer le statut.")
-            # Récupération des résultats
+
+        # Récupération des résultats
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            emploi_du_temps = {}
-            for s in seances:
-                cours = s.cours
-                groupe = s.groupes
-                duree_minutes = int(s.duree * 60)
-
-                for s_idx, semaine in enumerate(self.SEMAINES):
-                    for j in range(self.NB_JOURS):
-                        # Vérifier si le jour est disponible
-                        if self.calendrier[semaine][j] is None:
-                            continue
+            affectation = {
+                cle[0]: cle[1:]
+                for cle, var in seance_vars.items()
+                if solver.BooleanValue(var)
+            }
+            if choix_salles is not None:
+                affectation = choix_salles.completer(affectation, solver.BooleanValue)
+            return affectation
+        # Résolution arrêtée sans statut concluant: garder la dernière solution vue
+        return callback.meilleure_affectation
+
+    def _construire_emploi_du_temps(self, affectation, seances, salles):
+        """
+        Convertit une affectation {id_seance: (s_idx, j, cr_debut, salle_id)}
+        en solution.SolutionColonnaire, lue par les exports. C'est aussi un
+        Mapping {f"{id_seance}_{semaine}_{j}": enregistrement} dont les
+        enregistrements (heures "8:30", groupes séparés par ", ") sont
+        construits à la demande.
+        """
+        return SolutionColonnaire.construire(
+            affectation,
+            seances,
+            salles,
+            self.SEMAINES,
+            self.calendrier,
+            self.grille,
+            self.JOURS_SEMAINE,
+            self.CRENEAUX_AFFICHAGE,
+        )
 
-                        for cr_debut in range(self.NB_CRENEAUX_30MIN):
-                            for salle in salles:
-                                if (
-                                    s.id_seance,
-                                    s_idx,
-                                    j,
-                                    cr_debut,
-                                    salle.id,
-                                ) in seance_vars and solver.Value(
-                                    seance_vars[
-                                        (s.id_seance, s_idx, j, cr_debut, salle.id)
-                                    ]
-                                ):
-                                    # Calculer les heures de début et de fin
-                                    heure_debut = 8 + cr_debut // 2
-                                    minute_debut = 30 if cr_debut % 2 else 0
-
-                                    # Calculer directement l'heure de fin à partir de la durée en minutes
-                                    heure_fin = heure_debut + (duree_minutes // 60)
-                                    minute_fin = minute_debut + (duree_minutes % 60)
-                                    if minute_fin >= 60:
-                                        heure_fin += 1
-                                        minute_fin -= 60
-
-                                    # Pour l'affichage des créneaux par bloc de 2h
-                                    creneau_affichage = self.CRENEAUX_AFFICHAGE[
-                                        cr_debut // 4
-                                    ]
-
-                                    # Obtenir la date exacte
-                                    date = self.calendrier[semaine][j].strftime(
-                                        "%Y-%m-%d"
-                                    )
-
-                                    # Clé unique avec semaine et jour
-                                    cle = f"{s.id_seance}_{semaine}_{j}"
-
-                                    # Modifier pour gérer les listes de groupes
-                                    groupe_noms = (
-                                        ", ".join([g.nom for g in groupe])
-                                        if isinstance(groupe, list)
-                                        else groupe.nom
-                                    )
-
-                                    emploi_du_temps[cle] = {
-                                        "semaine": semaine,
-                                        "jour": self.JOURS_SEMAINE[j],
-                                        "date": date,
-                                        "creneau": creneau_affichage,
-                                        "salle": salle.nom,
-                                        "cours": cours.nom,
-                                        "seance": s.id_seance,
-                                        "enseignant": cours.enseignant.nom,
-                                        "groupe": groupe_noms,
-                                        "heure_debut": f"{heure_debut}:{minute_debut:02d}",
-                                        "heure_fin": f"{heure_fin}:{minute_fin:02d}",
-                                        "duree": duree_minutes,
-                                        "type": cours.type_cours,
-                                    }
-            return emploi_du_temps
-        else:
+    def _ajouter_contraintes(
+        self,
+        model,
+        seance_vars,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        exclusivite=True,
+        choix_salles=None,
+    ):
+        """
+        Ajoute toutes les contraintes du module contraintes au modèle.
+
+        Avec `exclusivite=False`, les contraintes d'exclusivité des enseignants,
+        groupes et salles sont omises (voir paresseux.GenerationParesseuse).
+        `choix_salles` est requis quand la salle est choisie par cours.
+
+        Raises:
+            ValueError: Si la salle est choisie par cours sans `choix_salles`
+                        (résolutions par sous-modèles, non prises en charge)
+        """
+        if self.salle_par_cours and choix_salles is None:
+            raise ValueError(
+                "Le choix de salle par cours n'est disponible qu'avec generer()"
+            )
+        # Importation du module de contraintes
+        from contraintes import ajouter_toutes_contraintes
+
+        graphe = None
+        if exclusivite and self.exclusivite_par_cliques:
+            from conflits import graphe_conflits
+
+            # Construit une seule fois pour des mêmes séances (mis en cache)
+            graphe = graphe_conflits(seances, enseignants, groupes, salles)
+            self.statistiques_conflits = graphe.statistiques()
+
+        ajouter_toutes_contraintes(
+            model=model,
+            seance_vars=seance_vars,
+            seances=seances,
+            salles=salles,
+            calendrier=self.calendrier,
+            semaines=self.SEMAINES,
+            nb_jours=self.NB_JOURS,
+            nb_creneaux=self.NB_CRENEAUX,
+            enseignants=enseignants,
+            groupes=groupes,
+            pause_debut=self.PAUSE_DEJEUNER_DEBUT,
+            pause_fin=self.PAUSE_DEJEUNER_FIN,
+            grille=self.grille,
+            redondantes=self.contraintes_redondantes,
+            graphe=graphe,
+            exclusivite=exclusivite,
+            choix_salles=choix_salles,
+            nb_processus=self.nb_processus_construction,
+        )
+
+    def generer(
+        self,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        avec_preferences=False,
+        temps_max=7200,
+        fichier_checkpoint=None,
+        intervalle_checkpoint=60,
+        fichier_telemetrie=None,
+        politique_arret=None,
+    ):
+        """
+        Génère un emploi du temps optimal pour les séances spécifiées.
+
+        Args:
+            seances, salles, enseignants, groupes: Données de l'instance
+            avec_preferences: Minimiser le coût des préférences souples
+                              (voir contraintes.ajouter_objectif_preferences)
+            temps_max: Limite de temps du solveur en secondes
+            fichier_checkpoint: (optionnel) Fichier de point de reprise, mis à jour
+                                en arrière-plan à chaque solution (voir _resoudre)
+            intervalle_checkpoint: Intervalle minimal entre deux points de reprise
+            fichier_telemetrie: (optionnel) Fichier JSONL de télémétrie de la résolution
+            politique_arret: (optionnel) telemetrie.PolitiqueArret (arrêt anticipé)
+        """
+        model, seance_vars, choix_salles = self._construire_modele(
+            seances, salles, enseignants, groupes, avec_preferences
+        )
+
+        affectation = self._resoudre(
+            model,
+            seance_vars,
+            temps_max=temps_max,
+            fichier_checkpoint=fichier_checkpoint,
+            intervalle_checkpoint=intervalle_checkpoint,
+            fichier_telemetrie=fichier_telemetrie,
+            politique_arret=politique_arret,
+            choix_salles=choix_salles,
+        )
+        if affectation is None:
             return None
 
-    def exporter_vers_ics(
+        # Conserver l'affectation pour une sauvegarde ou une réparation ultérieure
+        self.affectation = affectation
+        return self._construire_emploi_du_temps(affectation, seances, salles)
+
+    def _construire_modele(
+        self, seances, salles, enseignants, groupes, avec_preferences=False
+    ):
+        """
+        Construit le modèle complet: variables, contraintes et objectif éventuel.
+
+        Returns:
+            tuple: (model, seance_vars, choix_salles), choix_salles valant None
+                   sauf si la salle est choisie par cours
+        """
+        from ortools.sat.python import cp_model
+
+        # Création du modèle
+        model = cp_model.CpModel()
+
+        # Pour chaque séance, on crée des variables pour tous les créneaux de début possibles
+        seance_vars = self._creer_variables(model, seances, salles)
+
+        choix_salles = None
+        if self.salle_par_cours:
+            from salle_cours import ChoixSalles
+
+            choix_salles = ChoixSalles(model, seances, salles)
+
+        # Ajouter toutes les contraintes au modèle
+        self._ajouter_contraintes(
+            model,
+            seance_vars,
+            seances,
+            salles,
+            enseignants,
+            groupes,
+            choix_salles=choix_salles,
+        )
+
+        if avec_preferences:
+            from contraintes import ajouter_objectif_preferences
+
+            ajouter_objectif_preferences(
+                model, seance_vars, seances, salles, self.grille, choix_salles
+            )
+        return model, seance_vars, choix_salles
+
+    def generer_hierarchique(
         self,
-        emploi_du_temps,
-        cours,
-        chemin_fichier="output/emploi_du_temps_mensuel.ics",
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        avec_preferences=False,
+        temps_max=3600,
+        nb_processus=None,
     ):
-        """Exporte l'emploi du temps vers un fichier ICS (iCalendar)."""
-        if not emploi_du_temps:
-            print("Aucune solution trouvée, pas d'export ICS.")
-            return False
+        """
+        Génère l'emploi du temps en deux niveaux: affectation des séances aux
+        journées, puis placement de chaque journée en parallèle
+        (voir hierarchique.ResolutionHierarchique).
+
+        Returns:
+            dict: Emploi du temps, ou None si aucune solution n'a été trouvée
+        """
+        from hierarchique import ResolutionHierarchique
+
+        resolution = ResolutionHierarchique(
+            self,
+            seances,
+            salles,
+            enseignants,
+            groupes,
+            nb_processus=nb_processus,
+            avec_preferences=avec_preferences,
+        )
+        affectation = resolution.executer(temps_total=temps_max)
+        if affectation is None:
+            return None
+
+        self.affectation = affectation
+        return self._construire_emploi_du_temps(affectation, seances, salles)
 
+    def generer_selon_budget(
+        self,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        budget_memoire_mo,
+        avec_preferences=False,
+        temps_max=7200,
+        **options,
+    ):
+        """
+        Estime la taille du modèle avant de le construire, puis choisit la
+        stratégie la plus fidèle qui tient dans le budget mémoire: modèle
+        monolithique, salle unique par cours, ou résolution hiérarchique par
+        journées (voir estimation.estimer_modele). Le choix est journalisé.
+
+        Args:
+            budget_memoire_mo: Mémoire disponible pour la construction et la
+                               résolution, en mégaoctets
+            options: Options supplémentaires de generer (checkpoint, télémétrie,
+                     politique d'arrêt), ignorées par la résolution hiérarchique
+
+        Returns:
+            dict: Emploi du temps, ou None si aucune solution n'a été trouvée
+        """
+        strategie = self._strategie_selon_budget(
+            seances, salles, enseignants, groupes, budget_memoire_mo
+        )
+        salle_par_cours = self.salle_par_cours
+        if strategie == "hierarchique":
+            # Les sous-modèles journaliers choisissent la salle de chaque séance
+            # (comme Pipeline._emploi_du_temps)
+            if salle_par_cours:
+                print("Choix de salle par cours ignoré par la résolution hiérarchique")
+            self.salle_par_cours = False
+        else:
+            self.salle_par_cours = salle_par_cours or strategie == "salle_par_cours"
         try:
-            # Créer un calendrier
-            cal = Calendar()
-            cal.add("prodid", "-//Emploi du Temps IngeMedia//ingemedia.fr//")
-            cal.add("version", "2.0")
-
-            # Fuseau horaire local
-            local_tz = pytz.timezone("Europe/Paris")
-
-            # Ajouter chaque cours comme un événement
-            for c_key, details in emploi_du_temps.items():
-                event = Event()
-
-                # Informations de base
-                type_cours = details.get("type", "")
-                event.add(
-                    "summary",
-                    f"{details['cours']} ({type_cours}) - {details['groupe']} - Séance: {details['seance']}",
+            if strategie == "hierarchique":
+                return self.generer_hierarchique(
+                    seances,
+                    salles,
+                    enseignants,
+                    groupes,
+                    avec_preferences=avec_preferences,
+                    temps_max=temps_max,
                 )
-                event.add(
-                    "description",
-                    (
-                        f"Séance: {details['seance']}\n"
-                        f"Enseignant: {details['enseignant']}\n"
-                        f"Groupe: {details['groupe']}\n"
-                        f"Type: {type_cours}\n"
-                        f"Durée: {details['duree']} minutes"
-                    ),
-                )
-                event.add("location", f"Salle {details['salle']}")
+            return self.generer(
+                seances,
+                salles,
+                enseignants,
+                groupes,
+                avec_preferences=avec_preferences,
+                temps_max=temps_max,
+                **options,
+            )
+        finally:
+            self.salle_par_cours = salle_par_cours
 
-                # Date et heure
-                date_str = details["date"]
-                start_time_str = details["heure_debut"]
-                end_time_str = details["heure_fin"]
+    def _strategie_selon_budget(
+        self, seances, salles, enseignants, groupes, budget_memoire_mo
+    ):
+        """
+        Estime la taille du modèle de chaque stratégie, journalise l'estimation
+        et retourne la stratégie retenue pour le budget (voir generer_selon_budget).
+        """
+        from estimation import choisir_strategie, estimer_modele
 
-                # Parser la date et heure
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
+        # Même nombre de workers que _resoudre (au moins un)
+        nb_workers = max(1, min(16, multiprocessing.cpu_count() - 1))
+        estimations = estimer_modele(
+            self, seances, salles, enseignants, groupes, nb_workers
+        )
+        print("\nEstimation de la taille du modèle:")
+        for nom, estimation in estimations.items():
+            print(
+                f"  {nom:<16} {estimation['variables']:>12} variables "
+                f"{estimation['contraintes']:>12} contraintes "
+                f"{estimation['memoire_mo']:>10.0f} Mo"
+            )
+        strategie = choisir_strategie(estimations, budget_memoire_mo)
+        self.strategie_retenue = strategie
+        print(
+            f"Stratégie retenue: {strategie} "
+            f"({estimations[strategie]['memoire_mo']:.0f} Mo estimés, "
+            f"budget {budget_memoire_mo} Mo)"
+        )
+        if estimations[strategie]["memoire_mo"] > budget_memoire_mo:
+            print(
+                "⚠️ Aucune stratégie ne tient dans le budget: la plus économe est utilisée"
+            )
+        return strategie
 
-                # Heure de début
-                start_hour, start_minute = map(int, start_time_str.split(":"))
-                start_dt = datetime.combine(
-                    date_obj,
-                    datetime.min.time().replace(hour=start_hour, minute=start_minute),
-                )
-                start_dt = local_tz.localize(start_dt)
+    def generer_paresseux(
+        self,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        avec_preferences=False,
+        temps_max=3600,
+        nb_iterations=50,
+    ):
+        """
+        Génère l'emploi du temps en ajoutant les contraintes d'exclusivité
+        (enseignants, groupes, salles) à la demande, seulement là où la solution
+        courante les viole (voir paresseux.GenerationParesseuse).
 
-                # Heure de fin
-                end_hour, end_minute = map(int, end_time_str.split(":"))
-                end_dt = datetime.combine(
-                    date_obj,
-                    datetime.min.time().replace(hour=end_hour, minute=end_minute),
-                )
-                end_dt = local_tz.localize(end_dt)
+        Returns:
+            dict: Emploi du temps, ou None si aucune solution n'a été trouvée
+        """
+        from paresseux import GenerationParesseuse
+
+        generation = GenerationParesseuse(
+            self,
+            seances,
+            salles,
+            enseignants,
+            groupes,
+            avec_preferences=avec_preferences,
+        )
+        affectation = generation.executer(
+            nb_iterations=nb_iterations, temps_total=temps_max
+        )
+        if affectation is None:
+            return None
 
-                event.add("dtstart", start_dt)
-                event.add("dtend", end_dt)
+        self.affectation = affectation
+        return self._construire_emploi_du_temps(affectation, seances, salles)
 
-                # Générer un identifiant unique pour l'événement
-                event_id = f"{c_key}@ingemedia.fr"
-                event.add("uid", event_id)
+    def reparer(
+        self,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        affectation_precedente,
+        enseignants_modifies=None,
+        groupes_modifies=None,
+        salles_modifiees=None,
+        temps_max=60,
+    ):
+        """
+        Répare un emploi du temps existant en déplaçant le moins de séances possible.
 
-                # Ajouter l'événement au calendrier
-                cal.add_component(event)
+        Seules les séances touchant une ressource modifiée, et leur voisinage,
+        peuvent changer de place; toutes les autres sont figées à leur
+        placement précédent. Le solveur part de l'ancienne solution (hints)
+        et minimise le nombre de séances déplacées.
 
-            # Sauvegarder le calendrier dans un fichier en mode binaire (important pour ICS)
-            os.makedirs(os.path.dirname(chemin_fichier), exist_ok=True)
-            with open(chemin_fichier, "wb") as f:  # Utiliser "wb" au lieu de "w"
-                f.write(cal.to_ical())  # Ne pas faire de decode
+        Args:
+            seances, salles, enseignants, groupes: Données rechargées (avec les modifications)
+            affectation_precedente: Affectation {id_seance: (s_idx, j, cr_debut, salle_id)},
+                                    par exemple lue avec solution.charger_affectation
+            enseignants_modifies: IDs des enseignants dont les données ont changé
+            groupes_modifies: IDs des groupes dont les données ont changé
+            salles_modifiees: IDs des salles dont les données ont changé
+            temps_max: Limite de temps du solveur en secondes
 
-            print(f"Emploi du temps exporté vers {chemin_fichier} (format ICS)")
-            return True
+        Returns:
+            dict: Emploi du temps réparé, ou None si aucune solution n'a été trouvée
+        """
+        from ortools.sat.python import cp_model
+        from reparation import (
+            seances_touchees,
+            etendre_voisinage,
+            ajouter_objectif_reparation,
+        )
 
-        except Exception as e:
-            print(f"Erreur lors de l'export ICS: {e}")
-            return False
+        seances_libres = seances_touchees(
+            seances,
+            affectation_precedente,
+            enseignants_modifies=enseignants_modifies,
+            groupes_modifies=groupes_modifies,
+            salles_modifiees=salles_modifiees,
+        )
+        seances_libres = etendre_voisinage(
+            seances, affectation_precedente, seances_libres
+        )
+        print(f"Réparation: {len(seances_libres)} séances libérées sur {len(seances)}")
 
-    def exporter_vers_html(
+        placements_fixes = {
+            id_seance: placement
+            for id_seance, placement in affectation_precedente.items()
+            if id_seance not in seances_libres
+        }
+
+        model = cp_model.CpModel()
+        seance_vars = self._creer_variables(model, seances, salles, placements_fixes)
+        self._ajouter_contraintes(
+            model, seance_vars, seances, salles, enseignants, groupes
+        )
+        ajouter_objectif_reparation(model, seance_vars, affectation_precedente)
+
+        affectation = self._resoudre(model, seance_vars, temps_max=temps_max)
+        if affectation is None:
+            return None
+
+        deplacees = [
+            id_seance
+            for id_seance, placement in affectation.items()
+            if affectation_precedente.get(id_seance) != placement
+        ]
+        print(f"Réparation terminée: {len(deplacees)} séances déplacées")
+
+        self.affectation = affectation
+        return self._construire_emploi_du_temps(affectation, seances, salles)
+
+    def exporter_vers_ics(
         self,
         emploi_du_temps,
         cours,
-        chemin_fichier="output/emploi_du_temps.html",
+        chemin_fichier="output/emploi_du_temps_mensuel.ics",
+        recurrences=True,
     ):
-        """Exporte l'emploi du temps vers un fichier HTML interactif."""
+        """
+        Exporte l'emploi du temps vers un fichier ICS (iCalendar), écrit au
+        fil de l'eau par flux_ics. Avec `recurrences`, les séances d'un cours
+        revenant chaque semaine au même jour, à la même heure et dans la même
+        salle forment un seul événement récurrent (RRULE et EXDATE).
+        """
         if not emploi_du_temps:
-            print("Aucune solution trouvée, pas d'export HTML.")
+            print("Aucune solution trouvée, pas d'export ICS.")
             return False
 
-        try:
-            # Créer la structure de base HTML avec CSS
-            html = """
-            <!DOCTYPE html>
-            <html lang="fr">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Emploi du temps IngeMedia</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 20px; }
-                    .calendar { width: 100%; border-collapse: collapse; }
-                    .calendar th { background-color: #4CAF50; color: white; padding: 8px; text-align: center; }
-                    .calendar td { border: 1px solid #ddd; padding: 8px; height: 100px; vertical-align: top; }
-                    .event { margin-bottom: 5px; padding: 5px; border-radius: 4px; overflow: hidden; }
-                    .CM { background-color: #e3f2fd; }
-                    .TD { background-color: #fff9c4; }
-                    .filters { margin-bottom: 20px; }
-                    button { padding: 5px 10px; margin-right: 5px; }
-                    .hidden { display: none; }
-                    .header { background-color: #f5f5f5; position: sticky; top: 0; }
-                    @media print {
-                        .filters { display: none; }
-                        .calendar { font-size: 10px; }
-                        .event { page-break-inside: avoid; }
-                    }
-                </style>
-            </head>
-            <body>
-                <h1>Emploi du temps IngeMedia</h1>
-                
-                <div class="filters">
-                    <h3>Filtres :</h3>
-                    <div>
-                        <button onclick="filterByType('all')">Tous</button>
-                        <button onclick="filterByType('CM')">CM</button>
-                        <button onclick="filterByType('TD')">TD</button>
-                    </div>
-                    <div id="groupe-filters">
-                        <h4>Groupes :</h4>
-                        <!-- Sera rempli dynamiquement -->
-                    </div>
-                    <div id="enseignant-filters">
-                        <h4>Enseignants :</h4>
-                        <!-- Sera rempli dynamiquement -->
-                    </div>
-                </div>
-            """
-
-            # Organiser les données par semaine et jour
-            calendar_data = {}
-            groupes_uniques = set()
-            enseignants_uniques = set()
-
-            for details in emploi_du_temps.values():
-                semaine = details["semaine"]
-                jour = details["jour"]
-                groupe = details["groupe"]
-                enseignant = details["enseignant"]
-
-                if semaine not in calendar_data:
-                    calendar_data[semaine] = {}
-
-                if jour not in calendar_data[semaine]:
-                    calendar_data[semaine][jour] = []
-
-                calendar_data[semaine][jour].append(details)
-
-                for g in groupe.split(", "):
-                    groupes_uniques.add(g.strip())
-
-                enseignants_uniques.add(enseignant.strip())
-
-            # Créer les filtres de groupe
-            html += """<script>
-                function filterByType(type) {
-                    const events = document.querySelectorAll('.event');
-                    events.forEach(event => {
-                        if (type === 'all' || event.classList.contains(type)) {
-                            event.classList.remove('hidden');
-                        } else {
-                            event.classList.add('hidden');
-                        }
-                    });
-                }
-                
-                function filterByGroupe(groupe) {
-                    const events = document.querySelectorAll('.event');
-                    events.forEach(event => {
-                        if (groupe === 'all' || event.getAttribute('data-groupe').includes(groupe)) {
-                            event.classList.remove('hidden');
-                        } else {
-                            event.classList.add('hidden');
-                        }
-                    });
-                }
-
-                function filterByEnseignant(enseignant) {
-                    const events = document.querySelectorAll('.event');
-                    events.forEach(event => {
-                        if (enseignant === 'all' || event.getAttribute('data-enseignant') === enseignant) {
-                            event.classList.remove('hidden');
-                        } else {
-                            event.classList.add('hidden');
-                        }
-                    });
-                }
-            </script>"""
+        from flux_ics import detecter_series, exporter_calendrier
 
-            html += "<script>window.onload = function() {"
-            html += "const groupeFilters = document.getElementById('groupe-filters');"
-            html += "let filterHtml = '<button onclick=\"filterByGroupe(\\'all\\')\">Tous les groupes</button>';"
+        try:
+            series = detecter_series(emploi_du_temps) if recurrences else None
+            nombre, ecrit = exporter_calendrier(
+                emploi_du_temps,
+                chemin_fichier,
+                nom="Emploi du temps IngeMedia",
+                series=series,
+            )
+            print(
+                f"Emploi du temps exporté vers {chemin_fichier} "
+                f"(format ICS, {nombre} événements pour "
+                f"{len(emploi_du_temps)} séances"
+                f"{'' if ecrit else ', inchangé'})"
+            )
+            return True
 
-            for groupe in sorted(groupes_uniques):
-                html += f"filterHtml += '<button onclick=\"filterByGroupe(\\'{groupe}\\')\">{groupe}</button>';"
+        except Exception as e:
+            print(f"Erreur lors de l'export ICS: {e}")
+            return False
 
-            html += "groupeFilters.innerHTML = filterHtml;"
+    def exporter_flux_ics(
+        self, emploi_du_temps, groupes, dossier="output/ics", nb_processus=None
+    ):
+        """
+        Exporte un calendrier ICS par groupe (avec les cours des groupes
+        parents et des sous-groupes), par enseignant et par salle.
 
-            html += "const enseignantFilters = document.getElementById('enseignant-filters');"
-            html += "let enseignantFilterHtml = '<button onclick=\"filterByEnseignant(\\'all\\')\">Tous les enseignants</button>';"
+        Args:
+            emploi_du_temps: Solution retournée par generer
+            groupes: Groupes chargés, avec leurs relations parent-enfant
+            dossier: Dossier recevant groupes/, enseignants/ et salles/
+            nb_processus: (optionnel) Nombre de processus d'écriture
 
-            for enseignant in sorted(enseignants_uniques):
-                html += f"enseignantFilterHtml += '<button onclick=\"filterByEnseignant(\\'{enseignant}\\')\">{enseignant}</button>';"
+        Returns:
+            dict: {(type, id): chemin}, vide si aucune solution
+        """
+        if not emploi_du_temps:
+            print("Aucune solution trouvée, pas d'export ICS.")
+            return {}
 
-            html += "enseignantFilters.innerHTML = enseignantFilterHtml;"
-            html += "}</script>"
+        from flux_ics import exporter_flux
 
-            # Générer le tableau par semaine
-            for semaine in sorted(calendar_data.keys()):
-                html += f"<h2>Semaine {semaine}</h2>"
-                html += "<table class='calendar'>"
-                html += "<tr class='header'><th>Heure</th>"
+        return exporter_flux(emploi_du_temps, groupes, dossier, nb_processus)
 
-                for jour in self.JOURS_SEMAINE:
-                    if jour in calendar_data[semaine]:
-                        date = calendar_data[semaine][jour][0]["date"]
-                        html += f"<th>{jour}<br>{date}</th>"
-                    else:
-                        html += f"<th>{jour}</th>"
+    def exporter_vers_visionneuse(
+        self,
+        emploi_du_temps,
+        cours,
+        dossier="output/visionneuse",
+    ):
+        """
+        Exporte l'emploi du temps vers une visionneuse HTML qui charge les
+        séances semaine par semaine (voir visionneuse).
+        """
+        if not emploi_du_temps:
+            print("Aucune solution trouvée, pas d'export de la visionneuse.")
+            return False
 
-                html += "</tr>"
+        from visionneuse import exporter_visionneuse
 
-                # Créneaux horaires
-                for creneau in self.CRENEAUX_AFFICHAGE:
-                    html += f"<tr><td class='header'>{creneau}</td>"
+        try:
+            exporter_visionneuse(
+                emploi_du_temps, dossier, self.JOURS_SEMAINE, self.CRENEAUX_AFFICHAGE
+            )
+            return True
 
-                    for jour in self.JOURS_SEMAINE:
-                        html += "<td>"
+        except Exception as e:
+            print(f"Erreur lors de l'export de la visionneuse: {e}")
+            return False
 
-                        if jour in calendar_data[semaine]:
-                            for event in calendar_data[semaine][jour]:
-                                if event["creneau"] == creneau:
-                                    type_cours = event.get("type", "")
-                                    html += f"""<div class='event {type_cours}' data-groupe='{event["groupe"]}' data-enseignant='{event["enseignant"]}'>
-                                        <strong>{event["heure_debut"]}-{event["heure_fin"]}</strong>: {event["cours"]}<br>
-                                        <small>
-                                            Séance: {event["seance"]}<br>
-                                            {type_cours} - {event["salle"]}<br>
-                                            {event["enseignant"]}<br>
-                                            Groupe: {event["groupe"]}
-                                        </small>
-                                    </div>"""
+    def exporter_vers_excel(
+        self,
+        emploi_du_temps,
+        groupes,
+        chemin_fichier="output/emploi_du_temps.xlsx",
+    ):
+        """
+        Exporte l'emploi du temps vers un classeur Excel: une feuille par
+        semaine, par groupe et par enseignant, et l'occupation des salles
+        (voir classeur).
+        """
+        if not emploi_du_temps:
+            print("Aucune solution trouvée, pas d'export Excel.")
+            return False
 
-                        html += "</td>"
+        from classeur import exporter_classeur
 
-                    html += "</tr>"
+        try:
+            exporter_classeur(emploi_du_temps, chemin_fichier, groupes)
+            return True
 
-                html += "</table>"
+        except Exception as e:
+            print(f"Erreur lors de l'export Excel: {e}")
+            return False
 
-            html += """
-            </body>
-            </html>
-            """
+    def exporter_vers_html(
+        self,
+        emploi_du_temps,
+        cours,
+        chemin_fichier="output/emploi_du_temps.html",
+    ):
+        """
+        Exporte l'emploi du temps vers un fichier HTML interactif (voir
+        rendu_html).
+        """
+        if not emploi_du_temps:
+            print("Aucune solution trouvée, pas d'export HTML.")
+            return False
 
-            # Enregistrer le fichier HTML
-            os.makedirs(os.path.dirname(chemin_fichier), exist_ok=True)
-            with open(chemin_fichier, "w", encoding="utf-8") as f:
-                f.write(html)
+        try:
+            # Écrire la page au fil du rendu; le fichier n'est remplacé que
+            # s'il a changé depuis le dernier export
+            from manifeste import Manifeste
+            from rendu_html import ecrire_page
+
+            dossier, relatif = os.path.split(chemin_fichier)
+            manifeste = Manifeste(dossier or ".")
+            with manifeste.ecrire(relatif) as f:
+                ecrire_page(
+                    f, emploi_du_temps, self.JOURS_SEMAINE, self.CRENEAUX_AFFICHAGE
+                )
+            inchange = relatif in manifeste.inchanges
+            manifeste.sauvegarder()
 
-            print(f"Emploi du temps exporté vers {chemin_fichier} (format HTML)")
+            print(
+                f"Emploi du temps exporté vers {chemin_fichier} (format HTML"
+                f"{', inchangé' if inchange else ''})"
+            )
             return True
 
         except Exception as e:
@@ -1213,80 +1552,12 @@ def expliquer_infeasibilite(model, solver):
     print("=== Fin de l'analyse ===")
 
 
-# Exemple d'utilisation
+# Point d'entrée: génération par étapes avec cache (voir pipeline.py)
 if __name__ == "__main__":
-    # Chargement des données depuis les fichiers CSV
-    try:
-        salles = charger_salles()
-        print(f"Chargement de {len(salles)} salles")
-
-        enseignants = charger_enseignants()
-        print(f"Chargement de {len(enseignants)} enseignants")
-
-        groupes = charger_groupes()
-        print(f"Chargement de {len(groupes)} groupes")
-
-        cours = charger_cours(enseignants=enseignants, groupes=groupes)
-        print(f"Chargement de {len(cours)} cours")
-
-        # Générer les séances à partir des cours
-        seances = generer_seance(cours, groupes)
-        print(f"Génération de {len(seances)} séances")
-
-        # Jours fériés en septembre 2025 (aucun)
-        jours_feries = holidays.France(years=[2024, 2025])
-
-        # Pour afficher tous les jours fériés récupérés
-        print("Liste des jours fériés pour l'année scolaire:")
-        for date, nom in sorted(jours_feries.items()):
-            print(f"- {date.strftime('%d/%m/%Y')} : {nom}")
-
-        # Génération de l'emploi du temps à partir du 12 septembre 2025
-        scheduler = EmploiDuTemps(
-            annee=2025,
-            mois=9,
-            semaines=[
-                37,
-                38,
-                39,
-                41,
-                42,
-                43,
-                45,
-                46,
-                47,
-                48,
-                50,
-                51,
-                1,
-                2,
-                3,
-                4,
-                5,
-                6,
-            ],  # Semaines du 9 septembre 2025 au 16 janvier 2026 (exclusions appliquées)
-            jours_feries=jours_feries,
-            date_debut="2025-09-09",  # Commencer le 9 septembre
-            date_fin="2026-01-16",
-        )
-
-        print("Génération de l'emploi du temps à partir du 12 septembre 2025...")
-        # Utiliser les séances au lieu des cours directement
-        edt = scheduler.generer(seances, salles, enseignants, groupes)
-
-        print("Export de l'emploi du temps vers un fichier ICS...")
-        # Export vers ICS (iCalendar)
-        scheduler.exporter_vers_ics(
-            edt, cours, "output/emploi_du_temps_septembre2025.ics"
-        )
-        print("Export de l'emploi du temps vers un fichier HTML interactif...")
-        scheduler.exporter_vers_html(
-            edt, cours, "output/emploi_du_temps_septembre2025.html"
-        )
+    # pipeline importe ce module: réutiliser le module déjà exécuté plutôt que
+    # de le recharger sous le nom "main"
+    sys.modules.setdefault("main", sys.modules[__name__])
+    from pipeline import main as executer_pipeline
 
-        print("Fin de la génération de l'emploi du temps.")
-    except FileNotFoundError as e:
-        print(f"Erreur: Fichier non trouvé - {e}")
-    except Exception as e:
-        print(f"Erreur: {e}")
-        traceback.print_exc()
+    configurer_journal()
+    sys.exit(executer_pipeline())
@@ -0,0 +1,245 @@
+"""
+Écriture incrémentale des exports.
+
+Chaque dossier d'export tient un manifeste (manifeste.json) qui donne, pour
+chaque fichier, l'empreinte de son contenu et un numéro de version. Un
+fichier dont l'empreinte n'a pas changé n'est pas réécrit: sa date de
+modification, et donc le cache des clients abonnés (calendriers ICS), est
+préservée. Les fichiers modifiés sont écrits dans un fichier temporaire puis
+renommés: un lecteur ne voit jamais un fichier à moitié écrit.
+
+L'empreinte est fournie par l'exporteur (calculée sur la partie de la
+solution que le fichier contient, voir flux_ics.empreinte_calendrier), ou
+calculée sur le contenu écrit (Manifeste.ecrire).
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+NOM_MANIFESTE = "manifeste.json"
+
+
+def empreinte(*parties):
+    """Empreinte SHA-256 (hexadécimale) d'objets sérialisables en JSON."""
+    contenu = json.dumps(parties, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+
+def empreinte_fichier(chemin):
+    """Empreinte SHA-256 du contenu d'un fichier."""
+    sha = hashlib.sha256()
+    with open(chemin, "rb") as f:
+        for bloc in iter(lambda: f.read(1 << 20), b""):
+            sha.update(bloc)
+    return sha.hexdigest()
+
+
+def _temporaire(chemin):
+    return f"{chemin}.tmp-{os.getpid()}"
+
+
+@contextlib.contextmanager
+def fichier_atomique(chemin, mode="w", encoding="utf-8", newline=None):
+    """
+    Fichier ouvert sur un chemin temporaire, renommé en `chemin` si le bloc
+    réussit (supprimé sinon).
+    """
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    temporaire = _temporaire(chemin)
+    if "b" in mode:
+        f = open(temporaire, mode)
+    else:
+        f = open(temporaire, mode, encoding=encoding, newline=newline)
+    try:
+        with f:
+            yield f
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporaire)
+        raise
+    os.replace(temporaire, chemin)
+
+
+class Manifeste:
+    """
+    Empreintes et versions des fichiers d'un dossier d'export.
+
+    Les chemins sont relatifs au dossier, avec "/" comme séparateur
+    ("groupes/DASI.ics"). Les modifications sont enregistrées par
+    sauvegarder().
+    """
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        self.chemin = os.path.join(dossier, NOM_MANIFESTE)
+        self.version = 0
+        self.fichiers = {}
+        if os.path.isfile(self.chemin):
+            with open(self.chemin, encoding="utf-8") as f:
+                contenu = json.load(f)
+            self.version = contenu.get("version", 0)
+            self.fichiers = contenu.get("fichiers", {})
+        # Fichiers réécrits et inchangés depuis l'ouverture du manifeste
+        self.ecrits = []
+        self.inchanges = []
+
+    def chemin_fichier(self, relatif):
+        return os.path.join(self.dossier, *relatif.split("/"))
+
+    def inchange(self, relatif, empreinte):
+        """Le fichier existe et a déjà cette empreinte."""
+        entree = self.fichiers.get(relatif)
+        return (
+            entree is not None
+            and entree["empreinte"] == empreinte
+            and os.path.isfile(self.chemin_fichier(relatif))
+        )
+
+    def noter(self, relatif, empreinte, **infos):
+        """
+        Enregistre l'empreinte d'un fichier; sa version augmente si elle a
+        changé.
+
+        Args:
+            infos: Informations conservées dans l'entrée (nombre d'événements...)
+
+        Returns:
+            bool: True si le fichier a changé
+        """
+        if self.inchange(relatif, empreinte):
+            self.fichiers[relatif].update(infos)
+            self.inchanges.append(relatif)
+            return False
+        precedente = self.fichiers.get(relatif, {})
+        self.fichiers[relatif] = {
+            "empreinte": empreinte,
+            "version": precedente.get("version", 0) + 1,
+            "modifie": datetime.now().isoformat(timespec="seconds"),
+            **infos,
+        }
+        self.ecrits.append(relatif)
+        return True
+
+    @contextlib.contextmanager
+    def ecrire(self, relatif, **infos):
+        """
+        Écrit un fichier texte dont l'empreinte est celle du contenu écrit:
+        le fichier n'est remplacé que si le contenu a changé.
+        """
+        chemin = self.chemin_fichier(relatif)
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        temporaire = _temporaire(chemin)
+        try:
+            with open(temporaire, "w", encoding="utf-8") as f:
+                yield f
+            if self.noter(relatif, empreinte_fichier(temporaire), **infos):
+                os.replace(temporaire, chemin)
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(temporaire)
+
+    def retirer_absents(self, conserves):
+        """
+        Supprime les fichiers du manifeste qui ne sont pas dans `conserves`
+        (ressource disparue de la solution).
+
+        Returns:
+            list: Chemins relatifs retirés
+        """
+        conserves = set(conserves)
+        retires = sorted(
+            relatif for relatif in self.fichiers if relatif not in conserves
+        )
+        for relatif in retires:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.chemin_fichier(relatif))
+            del self.fichiers[relatif]
+        if retires:
+            self.ecrits.extend(retires)
+        return retires
+
+    def sauvegarder(self):
+        """Écrit le manifeste; sa version augmente si un fichier a changé."""
+        if self.ecrits or not os.path.isfile(self.chemin):
+            self.version += 1
+            with fichier_atomique(self.chemin) as f:
+                json.dump(
+                    {"version": self.version, "fichiers": self.fichiers},
+                    f,
+                    indent=1,
+                    sort_keys=True,
+                    ensure_ascii=False,
+                )
+        self.ecrits = []
+        self.inchanges = []
+
+
+def publier(source, destination, noms):
+    """
+    Copie des exports de `source` vers `destination` sans réécrire les
+    fichiers inchangés.
+
+    Les empreintes sont celles des manifestes de `source` quand ils en ont
+    une (elles ne dépendent pas du DTSTAMP des calendriers), sinon celles du
+    contenu. Les fichiers d'un dossier exporté qui ont disparu de la source
+    sont retirés de la destination.
+
+    Args:
+        noms: Fichiers ou dossiers de `source` à publier
+
+    Returns:
+        list: Chemins des fichiers copiés dans `destination`
+    """
+    # Manifestes (source, destination) par dossier relatif ("" pour la racine)
+    manifestes = {}
+
+    def manifestes_de(dossier):
+        if dossier not in manifestes:
+            manifestes[dossier] = (
+                Manifeste(os.path.join(source, dossier)),
+                Manifeste(os.path.join(destination, dossier)),
+            )
+        return manifestes[dossier]
+
+    copies = []
+    for nom in noms:
+        chemin = os.path.join(source, nom)
+        if os.path.isdir(chemin):
+            dossier, fichiers = nom, []
+            for racine, _, noms_fichiers in os.walk(chemin):
+                for nom_fichier in noms_fichiers:
+                    relatif = os.path.relpath(os.path.join(racine, nom_fichier), chemin)
+                    if relatif != NOM_MANIFESTE:
+                        fichiers.append(relatif.replace(os.sep, "/"))
+        else:
+            dossier, fichiers = "", [nom]
+        manifeste_source, manifeste = manifestes_de(dossier)
+
+        for relatif in sorted(fichiers):
+            entree = dict(manifeste_source.fichiers.get(relatif, {}))
+            empreinte = entree.pop("empreinte", None) or empreinte_fichier(
+                manifeste_source.chemin_fichier(relatif)
+            )
+            for cle in ("version", "modifie"):
+                entree.pop(cle, None)
+            if manifeste.inchange(relatif, empreinte):
+                manifeste.noter(relatif, empreinte, **entree)
+                continue
+            cible = manifeste.chemin_fichier(relatif)
+            with open(manifeste_source.chemin_fichier(relatif), "rb") as lu:
+                with fichier_atomique(cible, "wb") as f:
+                    shutil.copyfileobj(lu, f)
+            manifeste.noter(relatif, empreinte, **entree)
+            copies.append(cible)
+        if dossier:
+            manifeste.retirer_absents(fichiers)
+
+    for _, manifeste in manifestes.values():
+        manifeste.sauvegarder()
+    return copies
@@ -170,7 +170,15 @@ class Cours:
     """Représente un cours."""
 
     def __init__(
-        self, id_cours, nom, enseignant, groupes, duree_total, max_duration, type_cours
+        self,
+        id_cours,
+        nom,
+        enseignant,
+        groupes,
+        duree_total,
+        max_duration,
+        type_cours,
+        debuts=None,
     ):
         """
         Initialise un cours.
@@ -184,6 +192,9 @@ class Cours:
             duree_total: Durée totale du cours en heures
             max_duration: Durée maximale d'une séance (en heures)
             type_cours: Type de cours (TD, TP, CM, etc.)
+            debuts: Politique d'heures de début des séances (optionnel):
+                    "heure_pleine" ou heures séparées par '/' ("8:00/10:30/13:30/16:00").
+                    None = tous les créneaux de la grille.
         """
         self.id_cours = id_cours
         self.nom = nom
@@ -192,6 +203,7 @@ class Cours:
         self.duree_total = duree_total
         self.max_duration = max_duration
         self.type_cours = type_cours
+        self.debuts = debuts
 
     def __str__(self):
         groupes_str = ", ".join([g.nom for g in self.groupes])
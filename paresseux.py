@@ -0,0 +1,240 @@
+"""Génération paresseuse des contraintes d'exclusivité (enseignants, groupes, salles)."""
+
+import time
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from conflits import graphe_conflits
+from contraintes import GRILLE_DEFAUT, ajouter_objectif_preferences
+
+
+def verifier_chevauchements(
+    affectation, seances, graphe, nb_jours, nb_creneaux, grille=None
+):
+    """
+    Chevauchements d'une affectation, calculés de façon vectorisée: chaque
+    séance est dépliée en créneaux occupés pour chacune de ses ressources
+    (cliques du graphe de conflits et salle choisie), puis les couples
+    (ressource, créneau) occupés plus d'une fois sont comptés avec np.unique.
+
+    Args:
+        affectation: {id_seance: (s_idx, j, cr_debut, salle_id)}
+        seances: Séances de l'instance
+        graphe: conflits.GrapheConflits des séances
+        nb_jours, nb_creneaux: Dimensions d'une semaine de la grille
+
+    Returns:
+        list: Violations [(ressource, s_idx, j, cr)], où ressource vaut
+              ("clique", indice dans graphe.cliques) ou ("salle", salle_id)
+    """
+    grille = grille or GRILLE_DEFAUT
+    ids = [s.id_seance for s in seances if s.id_seance in affectation]
+    if not ids:
+        return []
+    position = {s_id: i for i, s_id in enumerate(ids)}
+    duree_seance = {s.id_seance: grille.duree_creneaux(s.duree) for s in seances}
+
+    placements = [affectation[s_id] for s_id in ids]
+    debut = np.array(
+        [(s_idx * nb_jours + j) * nb_creneaux + cr for s_idx, j, cr, _ in placements],
+        dtype=np.int64,
+    )
+    duree = np.array([duree_seance[s_id] for s_id in ids], dtype=np.int64)
+
+    # Couples (ressource, séance): cliques du graphe, puis salle affectée
+    ressources = [("clique", k) for k in range(len(graphe.cliques))]
+    indices_salles = {}
+    res, idx = [], []
+    for k, clique in enumerate(graphe.cliques):
+        for s_id in clique:
+            if s_id in position:
+                res.append(k)
+                idx.append(position[s_id])
+    for i, (_, _, _, salle_id) in enumerate(placements):
+        if salle_id not in indices_salles:
+            indices_salles[salle_id] = len(ressources)
+            ressources.append(("salle", salle_id))
+        res.append(indices_salles[salle_id])
+        idx.append(i)
+    res = np.array(res, dtype=np.int64)
+    idx = np.array(idx, dtype=np.int64)
+
+    # Déplier chaque couple en autant de lignes que de créneaux occupés
+    longueurs = duree[idx]
+    lignes = np.repeat(np.arange(len(idx)), longueurs)
+    decalages = np.arange(len(lignes)) - np.repeat(
+        np.cumsum(longueurs) - longueurs, longueurs
+    )
+    creneaux = debut[idx][lignes] + decalages
+    horizon = int(creneaux.max()) + 1
+    cles, comptes = np.unique(res[lignes] * horizon + creneaux, return_counts=True)
+
+    violations = []
+    for cle in cles[comptes > 1].tolist():
+        r, t = divmod(cle, horizon)
+        jour, cr = divmod(t, nb_creneaux)
+        s_idx, j = divmod(jour, nb_jours)
+        violations.append((ressources[r], s_idx, j, cr))
+    return violations
+
+
+class GenerationParesseuse:
+    """
+    Résolution itérative où les contraintes d'exclusivité ne sont posées qu'à
+    la demande: le modèle initial ne contient que l'unicité des séances, les
+    disponibilités et les autres contraintes; à chaque itération, la solution
+    est vérifiée, les lignes d'exclusivité violées sont ajoutées et le modèle
+    est résolu à nouveau en partant de la solution précédente.
+
+    Une violation d'une ressource un jour donné ajoute les lignes de tous les
+    créneaux de cette ressource ce jour-là: sinon le solveur décale souvent la
+    séance d'un créneau et recrée le même conflit à l'itération suivante.
+    """
+
+    def __init__(
+        self,
+        emploi_du_temps,
+        seances,
+        salles,
+        enseignants,
+        groupes,
+        avec_preferences=False,
+    ):
+        self.emploi_du_temps = emploi_du_temps
+        self.seances = seances
+        self.salles = salles
+        self.enseignants = enseignants
+        self.groupes = groupes
+        self.avec_preferences = avec_preferences
+        self.emploi_du_temps._configurer_grille(seances)
+        self.grille = emploi_du_temps.grille
+        self.graphe = graphe_conflits(seances, enseignants, groupes, salles)
+
+        # Lignes déjà posées: (ressource, s_idx, j)
+        self.lignes_posees = set()
+        # Une entrée par itération (taille du modèle, violations, durée)
+        self.historique = []
+
+    def _indexer(self, seance_vars):
+        """Variables par (séance, semaine, jour) et par (salle, semaine, jour)."""
+        self._vars_seance = {}
+        self._vars_salle = {}
+        for (s_id, s_idx, j, cr_debut, sa_id), var in seance_vars.items():
+            self._vars_seance.setdefault((s_id, s_idx, j), []).append((cr_debut, var))
+            self._vars_salle.setdefault((sa_id, s_idx, j), []).append(
+                (s_id, cr_debut, var)
+            )
+        self._duree = {
+            s.id_seance: self.grille.duree_creneaux(s.duree) for s in self.seances
+        }
+
+    def _ajouter_ligne(self, model, ressource, s_idx, j):
+        """Pose l'exclusivité d'une ressource sur tous les créneaux d'une journée."""
+        type_ressource, cle = ressource
+        if type_ressource == "clique":
+            placements = [
+                (s_id, cr_debut, var)
+                for s_id in self.graphe.cliques[cle]
+                for cr_debut, var in self._vars_seance.get((s_id, s_idx, j), [])
+            ]
+        else:
+            placements = self._vars_salle.get((cle, s_idx, j), [])
+
+        vars_par_creneau = {}
+        for s_id, cr_debut, var in placements:
+            for cr in range(cr_debut, cr_debut + self._duree[s_id]):
+                vars_par_creneau.setdefault(cr, []).append(var)
+        nb_lignes = 0
+        for vars_list in vars_par_creneau.values():
+            if len(vars_list) > 1:
+                model.AddAtMostOne(vars_list)
+                nb_lignes += 1
+        return nb_lignes
+
+    def executer(self, nb_iterations=50, temps_total=3600):
+        """
+        Résout jusqu'à obtenir une affectation sans chevauchement.
+
+        Args:
+            nb_iterations: Nombre maximum de résolutions
+            temps_total: Limite de temps totale en secondes
+
+        Returns:
+            dict: Affectation {id_seance: (s_idx, j, cr_debut, salle_id)}, ou None
+        """
+        edt = self.emploi_du_temps
+        debut = time.monotonic()
+
+        model = cp_model.CpModel()
+        seance_vars = edt._creer_variables(model, self.seances, self.salles)
+        edt._ajouter_contraintes(
+            model,
+            seance_vars,
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+            exclusivite=False,
+        )
+        if self.avec_preferences:
+            ajouter_objectif_preferences(
+                model, seance_vars, self.seances, self.salles, self.grille
+            )
+        self._indexer(seance_vars)
+
+        affectation = None
+        for iteration in range(nb_iterations):
+            restant = temps_total - (time.monotonic() - debut)
+            if restant <= 0:
+                break
+            if affectation is not None:
+                # Partir de la solution précédente
+                model.ClearHints()
+                for cle, var in seance_vars.items():
+                    model.AddHint(var, 1 if affectation.get(cle[0]) == cle[1:] else 0)
+
+            debut_iteration = time.monotonic()
+            affectation = edt._resoudre(
+                model, seance_vars, temps_max=restant, journal=False
+            )
+            if affectation is None:
+                # Le modèle relâché est infaisable ou sans solution à temps
+                return None
+
+            violations = verifier_chevauchements(
+                affectation,
+                self.seances,
+                self.graphe,
+                edt.NB_JOURS,
+                edt.NB_CRENEAUX,
+                self.grille,
+            )
+            nouvelles = {
+                (ressource, s_idx, j) for ressource, s_idx, j, _ in violations
+            } - self.lignes_posees
+            nb_lignes = sum(self._ajouter_ligne(model, *cle) for cle in nouvelles)
+            self.lignes_posees |= nouvelles
+
+            self.historique.append(
+                {
+                    "iteration": iteration,
+                    "contraintes": len(model.Proto().constraints) - nb_lignes,
+                    "violations": len(violations),
+                    "lignes_ajoutees": nb_lignes,
+                    "duree": time.monotonic() - debut_iteration,
+                }
+            )
+            print(
+                f"Itération {iteration}: {len(violations)} chevauchements, "
+                f"{nb_lignes} contraintes d'exclusivité ajoutées"
+            )
+            if not violations:
+                print(
+                    f"Génération paresseuse terminée en {time.monotonic() - debut:.1f}s "
+                    f"({len(model.Proto().constraints)} contraintes)"
+                )
+                return affectation
+
+        print("Génération paresseuse: limite atteinte avec des chevauchements")
+        return None
@@ -0,0 +1,718 @@
+"""
+Génération de l'emploi du temps par étapes, avec un cache des résultats.
+
+Étapes: load (lecture des CSV et génération des séances), build (modèle CP-SAT
+sérialisé), solve (affectation), export (fichiers ICS, HTML, Excel,
+visionneuse et JSON) et bench (banc d'essai). Chaque étape exécute d'abord
+celles dont elle dépend. Le résultat de chaque étape est rangé dans le cache
+sous l'empreinte de ses entrées: données et options de l'étape, empreinte de
+l'étape précédente et code des modules utilisés. Relancer un export avec
+d'autres options réutilise donc le modèle et la solution déjà calculés.
+
+Exemples:
+    python pipeline.py export --semaines 38 39 --temps-max 600
+    python pipeline.py build --salle-par-cours
+    python pipeline.py bench --cours 6 --semaines 38 39 41 42
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import traceback
+
+from benchmark import (
+    CONFIGURATIONS,
+    afficher_entete,
+    afficher_resultat,
+    executer_banc,
+)
+from contraintes import CONTRAINTES_REDONDANTES
+from main import (
+    EmploiDuTemps,
+    charger_cours,
+    charger_enseignants,
+    charger_groupes,
+    charger_salles,
+    configurer_journal,
+    generer_seance,
+)
+from manifeste import empreinte, empreinte_fichier, publier
+from salle_cours import ChoixSalles
+from solution import charger_affectation, sauvegarder_affectation
+from telemetrie import PolitiqueArret
+
+ETAPES = ("load", "build", "solve", "export", "bench")
+DOSSIER_CACHE = ".cache"
+
+# Fichiers de données, dans le dossier --donnees
+FICHIERS_DONNEES = {
+    "salles": "salle.csv",
+    "enseignants": "enseignants.csv",
+    "groupes": "groupe.csv",
+    "cours": "cours.csv",
+}
+
+# Semestre planifié par défaut: du 9 septembre 2025 au 16 janvier 2026, hors
+# semaines de vacances
+SEMAINES_DEFAUT = [37, 38, 39, 41, 42, 43, 45, 46, 47, 48, 50, 51, 1, 2, 3, 4, 5, 6]
+
+# Modules dont dépend le résultat de chaque étape: les modifier invalide le cache
+SOURCES = {
+    "load": ("main.py", "model.py"),
+    "build": (
+        "main.py",
+        "model.py",
+        "calendrier.py",
+        "grille.py",
+        "contraintes.py",
+        "conflits.py",
+        "salle_cours.py",
+        "estimation.py",
+    ),
+    "solve": (
+        "main.py",
+        "suivi.py",
+        "solution.py",
+        "telemetrie.py",
+        "hierarchique.py",
+    ),
+    "export": (
+        "main.py",
+        "solution.py",
+        "flux_ics.py",
+        "manifeste.py",
+        "rendu_html.py",
+        "visionneuse.py",
+        "classeur.py",
+    ),
+    "bench": ("benchmark.py", "main.py", "contraintes.py", "conflits.py"),
+}
+
+FORMATS = {
+    "ics": "emploi_du_temps_{nom}.ics",
+    "html": "emploi_du_temps_{nom}.html",
+    "affectation": "affectation_{nom}.json",
+    # Dossier: un calendrier par groupe, enseignant et salle
+    "flux": "ics_{nom}",
+    # Dossier: page chargeant les séances semaine par semaine
+    "visionneuse": "visionneuse_{nom}",
+    "excel": "emploi_du_temps_{nom}.xlsx",
+}
+FORMATS_DEFAUT = ["affectation", "html", "ics", "visionneuse"]
+
+
+def empreinte_sources(etape):
+    """Empreinte du code des modules dont dépend une étape (voir SOURCES)."""
+    dossier = os.path.dirname(os.path.abspath(__file__))
+    return empreinte(
+        *(empreinte_fichier(os.path.join(dossier, nom)) for nom in SOURCES[etape])
+    )
+
+
+class Cache:
+    """
+    Résultats des étapes, un dossier par (étape, empreinte des entrées).
+
+    Un résultat est écrit dans un dossier temporaire renommé à la fin: une
+    étape interrompue ne laisse jamais de résultat partiel dans le cache.
+    """
+
+    def __init__(self, racine=DOSSIER_CACHE, forcer=False):
+        """
+        Args:
+            racine: Dossier du cache
+            forcer: Ignorer les résultats existants (ils sont recalculés et remplacés)
+        """
+        self.racine = racine
+        self.forcer = forcer
+
+    def dossier(self, etape, cle):
+        return os.path.join(self.racine, etape, cle)
+
+    def lire(self, etape, cle):
+        """Dossier du résultat en cache, ou None s'il faut le calculer."""
+        dossier = self.dossier(etape, cle)
+        if self.forcer or not os.path.isdir(dossier):
+            return None
+        return dossier
+
+    @contextlib.contextmanager
+    def ecrire(self, etape, cle):
+        """Fournit un dossier temporaire, rangé sous la clé si le bloc réussit."""
+        dossier = self.dossier(etape, cle)
+        temporaire = f"{dossier}.tmp-{os.getpid()}"
+        shutil.rmtree(temporaire, ignore_errors=True)
+        os.makedirs(temporaire)
+        try:
+            yield temporaire
+        except BaseException:
+            shutil.rmtree(temporaire, ignore_errors=True)
+            raise
+        shutil.rmtree(dossier, ignore_errors=True)
+        os.replace(temporaire, dossier)
+
+
+class Pipeline:
+    """Exécution des étapes pour des options de la ligne de commande."""
+
+    def __init__(self, options, cache):
+        self.options = options
+        self.cache = cache
+        # Résultats déjà obtenus dans ce processus, par étape
+        self._resultats = {}
+
+    def _etape(self, etape, cle, calculer, relire):
+        """
+        Résultat d'une étape: relu depuis le cache si présent, sinon calculé
+        par `calculer(dossier)` dans un dossier rangé ensuite sous `cle`.
+        """
+        dossier = self.cache.lire(etape, cle)
+        if dossier is not None:
+            print(f"[{etape}] en cache ({cle[:12]})")
+            return relire(dossier)
+        print(f"[{etape}] calcul ({cle[:12]})...")
+        debut = time.monotonic()
+        with self.cache.ecrire(etape, cle) as temporaire:
+            resultat = calculer(temporaire)
+        print(f"[{etape}] terminé en {time.monotonic() - debut:.1f}s")
+        return resultat
+
+    def _emploi_du_temps(self, strategie="monolithique"):
+        """EmploiDuTemps configuré par les options de calendrier et de modèle."""
+        import holidays
+
+        o = self.options
+        return EmploiDuTemps(
+            annee=o.annee,
+            mois=o.mois,
+            semaines=o.semaines,
+            jours_feries=sorted(
+                str(jour) for jour in holidays.France(years=[o.annee, o.annee + 1])
+            ),
+            date_debut=o.date_debut,
+            date_fin=o.date_fin,
+            pas_creneau=o.pas,
+            contraintes_redondantes=o.redondantes,
+            salle_par_cours=strategie == "salle_par_cours",
+            nb_processus_construction=o.build_processes,
+        )
+
+    def charger(self):
+        """
+        Étape load.
+
+        Returns:
+            tuple: (clé, {"salles", "enseignants", "groupes", "cours", "seances"})
+        """
+        if "load" in self._resultats:
+            return self._resultats["load"]
+        o = self.options
+        chemins = {
+            nom: os.path.join(o.donnees, fichier)
+            for nom, fichier in FICHIERS_DONNEES.items()
+        }
+        cle = empreinte(
+            "load",
+            {nom: empreinte_fichier(chemin) for nom, chemin in chemins.items()},
+            o.cours,
+            empreinte_sources("load"),
+        )
+
+        def calculer(dossier):
+            salles = charger_salles(chemins["salles"])
+            enseignants = charger_enseignants(chemins["enseignants"])
+            groupes = charger_groupes(chemins["groupes"])
+            cours = charger_cours(chemins["cours"], enseignants, groupes)
+            if o.cours:
+                cours = cours[: o.cours]
+            instance = {
+                "salles": salles,
+                "enseignants": enseignants,
+                "groupes": groupes,
+                "cours": cours,
+                "seances": generer_seance(cours, groupes),
+            }
+            # Un seul pickle: les références partagées (enseignant d'un cours...) sont conservées
+            with open(os.path.join(dossier, "instance.pkl"), "wb") as f:
+                pickle.dump(instance, f, protocol=pickle.HIGHEST_PROTOCOL)
+            return instance
+
+        def relire(dossier):
+            with open(os.path.join(dossier, "instance.pkl"), "rb") as f:
+                return pickle.load(f)
+
+        instance = self._etape("load", cle, calculer, relire)
+        print(
+            f"Instance: {len(instance['salles'])} salles, "
+            f"{len(instance['enseignants'])} enseignants, "
+            f"{len(instance['groupes'])} groupes, {len(instance['cours'])} cours, "
+            f"{len(instance['seances'])} séances"
+        )
+        self._resultats["load"] = (cle, instance)
+        return self._resultats["load"]
+
+    def construire(self):
+        """
+        Étape build: modèle sérialisé (modele.pb), correspondance entre
+        placements et indices de variables (decodage.pkl) et stratégie retenue
+        (strategie.json). La stratégie hiérarchique n'a pas de modèle unique:
+        seule la stratégie est alors enregistrée.
+
+        Returns:
+            tuple: (clé, dossier du résultat)
+        """
+        if "build" in self._resultats:
+            return self._resultats["build"]
+        o = self.options
+        cle_load, instance = self.charger()
+        cle = empreinte(
+            "build",
+            cle_load,
+            {
+                "annee": o.annee,
+                "mois": o.mois,
+                "semaines": o.semaines,
+                "date_debut": o.date_debut,
+                "date_fin": o.date_fin,
+                "pas": o.pas,
+                "redondantes": sorted(o.redondantes),
+                "salle_par_cours": o.salle_par_cours,
+                "preferences": o.preferences,
+                "memory_budget": o.memory_budget,
+            },
+            empreinte_sources("build"),
+        )
+        donnees = (
+            instance["seances"],
+            instance["salles"],
+            instance["enseignants"],
+            instance["groupes"],
+        )
+
+        def calculer(dossier):
+            strategie = "salle_par_cours" if o.salle_par_cours else "monolithique"
+            if o.memory_budget is not None:
+                strategie = self._emploi_du_temps()._strategie_selon_budget(
+                    *donnees, o.memory_budget
+                )
+            description = {"strategie": strategie}
+            if strategie != "hierarchique":
+                edt = self._emploi_du_temps(strategie)
+                model, seance_vars, choix_salles = edt._construire_modele(
+                    *donnees, avec_preferences=o.preferences
+                )
+                with open(os.path.join(dossier, "modele.pb"), "wb") as f:
+                    f.write(model.Proto().SerializeToString())
+                decodage = {
+                    "variables": [(c, var.Index()) for c, var in seance_vars.items()],
+                    "choix_salles": choix_salles.indices() if choix_salles else None,
+                }
+                with open(os.path.join(dossier, "decodage.pkl"), "wb") as f:
+                    pickle.dump(decodage, f, protocol=pickle.HIGHEST_PROTOCOL)
+                description["variables"] = len(model.Proto().variables)
+                description["contraintes"] = len(model.Proto().constraints)
+            with open(os.path.join(dossier, "strategie.json"), "w") as f:
+                json.dump(description, f)
+
+        self._etape("build", cle, calculer, lambda dossier: None)
+        self._resultats["build"] = (cle, self.cache.dossier("build", cle))
+        return self._resultats["build"]
+
+    def resoudre(self):
+        """
+        Étape solve. Une résolution sans solution n'est pas mise en cache.
+
+        Returns:
+            tuple: (clé, affectation {id_seance: (s_idx, j, cr_debut, salle_id)}
+                    ou None)
+        """
+        if "solve" in self._resultats:
+            return self._resultats["solve"]
+        o = self.options
+        _, instance = self.charger()
+        cle_build, dossier_build = self.construire()
+        cle = empreinte(
+            "solve",
+            cle_build,
+            {
+                "temps_max": o.temps_max,
+                "workers": o.workers,
+                "sans_amelioration": o.sans_amelioration,
+                "ecart_max": o.ecart_max,
+            },
+            empreinte_sources("solve"),
+        )
+        with open(os.path.join(dossier_build, "strategie.json")) as f:
+            strategie = json.load(f)["strategie"]
+        edt = self._emploi_du_temps(strategie)
+        edt._configurer_grille(instance["seances"])
+
+        def calculer(dossier):
+            affectation = self._resoudre_modele(edt, strategie, dossier_build)
+            if affectation is None:
+                raise AucuneSolution()
+            sauvegarder_affectation(
+                affectation, edt.SEMAINES, os.path.join(dossier, "affectation.json")
+            )
+            return affectation
+
+        def relire(dossier):
+            return charger_affectation(
+                os.path.join(dossier, "affectation.json"), edt.SEMAINES
+            )
+
+        try:
+            affectation = self._etape("solve", cle, calculer, relire)
+        except AucuneSolution:
+            print("[solve] aucune solution trouvée (rien n'est mis en cache)")
+            affectation = None
+        if o.base and affectation is not None:
+            self._enregistrer(edt, instance, affectation, cle)
+        self._resultats["solve"] = (cle, affectation)
+        return self._resultats["solve"]
+
+    def _resoudre_modele(self, edt, strategie, dossier_build):
+        """Résout le modèle sérialisé par l'étape build."""
+        from ortools.sat.python import cp_model
+
+        o = self.options
+        _, instance = self.charger()
+        seances, salles = instance["seances"], instance["salles"]
+        if strategie == "hierarchique":
+            emploi = edt.generer_hierarchique(
+                seances,
+                salles,
+                instance["enseignants"],
+                instance["groupes"],
+                avec_preferences=o.preferences,
+                temps_max=o.temps_max,
+            )
+            return edt.affectation if emploi else None
+
+        modele = cp_model.CpModel()
+        with open(os.path.join(dossier_build, "modele.pb"), "rb") as f:
+            modele.Proto().ParseFromString(f.read())
+        # clone() recrée les variables accessibles par leur indice
+        model = modele.clone()
+        del modele
+        with open(os.path.join(dossier_build, "decodage.pkl"), "rb") as f:
+            decodage = pickle.load(f)
+        seance_vars = {
+            c: model.GetBoolVarFromProtoIndex(i) for c, i in decodage["variables"]
+        }
+        choix_salles = None
+        if decodage["choix_salles"] is not None:
+            choix_salles = ChoixSalles.restaurer(
+                model, seances, salles, decodage["choix_salles"]
+            )
+        politique_arret = None
+        if o.sans_amelioration or o.ecart_max:
+            politique_arret = PolitiqueArret(
+                sans_amelioration=o.sans_amelioration or None,
+                ecart_max=o.ecart_max or None,
+            )
+        return edt._resoudre(
+            model,
+            seance_vars,
+            temps_max=o.temps_max,
+            nb_workers=o.workers,
+            fichier_checkpoint=o.checkpoint,
+            fichier_telemetrie=o.telemetrie,
+            politique_arret=politique_arret,
+            choix_salles=choix_salles,
+        )
+
+    def _enregistrer(self, edt, instance, affectation, cle):
+        """Enregistre l'instance et la solution dans la base SQLite --base."""
+        from stockage import Stockage
+
+        with Stockage(self.options.base) as base:
+            base.enregistrer_instance(
+                instance["salles"],
+                instance["enseignants"],
+                instance["groupes"],
+                instance["cours"],
+                instance["seances"],
+            )
+            version = base.enregistrer_version(
+                edt,
+                affectation,
+                instance["seances"],
+                instance["salles"],
+                instance["groupes"],
+                cle=cle,
+            )
+        print(f"[solve] version {version} de {self.options.base}")
+
+    def exporter(self):
+        """
+        Étape export: fichiers des formats demandés, rangés dans le cache puis
+        publiés dans le dossier de sortie (voir manifeste.publier).
+
+        Returns:
+            tuple: (réussi, chemins des exports publiés dans le dossier de
+                   sortie); un export déjà à jour, sans fichier copié, est
+                   réussi, seule l'absence de solution fait échouer l'étape
+        """
+        o = self.options
+        _, instance = self.charger()
+        cle_solve, affectation = self.resoudre()
+        if affectation is None:
+            print("[export] aucune solution à exporter")
+            return False, []
+        noms = {fmt: FORMATS[fmt].format(nom=o.nom) for fmt in sorted(set(o.formats))}
+        cle = empreinte("export", cle_solve, noms, empreinte_sources("export"))
+
+        def calculer(dossier):
+            edt = self._emploi_du_temps()
+            edt._configurer_grille(instance["seances"])
+            emploi = edt._construire_emploi_du_temps(
+                affectation, instance["seances"], instance["salles"]
+            )
+            for fmt, nom in noms.items():
+                chemin = os.path.join(dossier, nom)
+                if fmt == "ics":
+                    reussi = edt.exporter_vers_ics(emploi, instance["cours"], chemin)
+                elif fmt == "html":
+                    reussi = edt.exporter_vers_html(emploi, instance["cours"], chemin)
+                elif fmt == "excel":
+                    reussi = edt.exporter_vers_excel(
+                        emploi, instance["groupes"], chemin
+                    )
+                elif fmt == "visionneuse":
+                    reussi = edt.exporter_vers_visionneuse(
+                        emploi, instance["cours"], chemin
+                    )
+                elif fmt == "flux":
+                    reussi = bool(
+                        edt.exporter_flux_ics(
+                            emploi,
+                            instance["groupes"],
+                            chemin,
+                            nb_processus=o.export_processes,
+                        )
+                    )
+                else:
+                    sauvegarder_affectation(affectation, edt.SEMAINES, chemin)
+                    reussi = True
+                if not reussi:
+                    raise RuntimeError(f"Échec de l'export {fmt}")
+
+        self._etape("export", cle, calculer, lambda dossier: None)
+        os.makedirs(o.sortie, exist_ok=True)
+        # Seuls les fichiers modifiés depuis la dernière publication sont copiés
+        copies = publier(self.cache.dossier("export", cle), o.sortie, noms.values())
+        for destination in copies:
+            print(f"[export] {destination}")
+        if not copies:
+            print(f"[export] {o.sortie} déjà à jour")
+        return True, [os.path.join(o.sortie, nom) for nom in noms.values()]
+
+    def banc(self):
+        """
+        Étape bench: banc d'essai de benchmark.executer_banc sur l'instance
+        chargée. Les mesures sont mises en cache comme les autres étapes
+        (--force pour mesurer à nouveau).
+
+        Returns:
+            list: Résultats de benchmark.executer_banc
+        """
+        o = self.options
+        cle_load, instance = self.charger()
+        configurations = {nom: CONFIGURATIONS[nom] for nom in o.configurations}
+        cle = empreinte(
+            "bench",
+            cle_load,
+            {
+                "semaines": o.semaines,
+                "configurations": configurations,
+                "repetitions": o.repetitions,
+                "temps_max": o.temps_max,
+                "workers": o.workers,
+                "salle_par_cours": o.salle_par_cours,
+            },
+            empreinte_sources("bench"),
+        )
+
+        def calculer(dossier):
+            resultats = executer_banc(
+                (
+                    instance["seances"],
+                    instance["salles"],
+                    instance["enseignants"],
+                    instance["groupes"],
+                ),
+                o.semaines,
+                configurations,
+                repetitions=o.repetitions,
+                temps_max=o.temps_max,
+                nb_workers=o.workers or 8,
+                salle_par_cours=o.salle_par_cours,
+            )
+            with open(os.path.join(dossier, "resultats.json"), "w") as f:
+                json.dump(resultats, f, indent=1)
+            return resultats
+
+        def relire(dossier):
+            with open(os.path.join(dossier, "resultats.json")) as f:
+                resultats = json.load(f)
+            afficher_entete()
+            for resultat in resultats:
+                afficher_resultat(resultat)
+            return resultats
+
+        return self._etape("bench", cle, calculer, relire)
+
+
+class AucuneSolution(Exception):
+    """La résolution n'a trouvé aucune solution: le résultat n'est pas mis en cache."""
+
+
+def _pas_creneau(valeur):
+    """Pas de la grille: nombre de minutes ou "auto"."""
+    return valeur if valeur == "auto" else int(valeur)
+
+
+def analyser_arguments(arguments=None):
+    """Options de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "etape",
+        nargs="?",
+        choices=ETAPES,
+        default="export",
+        help="Étape à exécuter, avec celles dont elle dépend (défaut: export)",
+    )
+    parser.add_argument("--cache", default=DOSSIER_CACHE, help="Dossier du cache")
+    parser.add_argument(
+        "--force", action="store_true", help="Recalculer les étapes déjà en cache"
+    )
+
+    donnees = parser.add_argument_group("load")
+    donnees.add_argument("--donnees", default="data", help="Dossier des fichiers CSV")
+    donnees.add_argument(
+        "--cours", type=int, default=0, help="Ne garder que les N premiers cours"
+    )
+
+    modele = parser.add_argument_group("build")
+    modele.add_argument("--annee", type=int, default=2025)
+    modele.add_argument("--mois", type=int, default=9)
+    modele.add_argument("--semaines", type=int, nargs="+", default=SEMAINES_DEFAUT)
+    modele.add_argument("--date-debut", default="2025-09-09")
+    modele.add_argument("--date-fin", default="2026-01-16")
+    modele.add_argument(
+        "--pas", type=_pas_creneau, default=30, help='Minutes par créneau, ou "auto"'
+    )
+    modele.add_argument(
+        "--redondantes",
+        nargs="*",
+        choices=sorted(CONTRAINTES_REDONDANTES),
+        default=[],
+        help="Contraintes redondantes à ajouter",
+    )
+    modele.add_argument(
+        "--salle-par-cours",
+        action="store_true",
+        help="Une seule salle par cours et groupe (variables horaires seulement)",
+    )
+    modele.add_argument(
+        "--preferences",
+        action="store_true",
+        help="Minimiser le coût des préférences souples",
+    )
+    modele.add_argument(
+        "--memory-budget",
+        type=float,
+        default=None,
+        help="Mémoire disponible en Mo: la stratégie de résolution est choisie "
+        "d'après la taille estimée du modèle (défaut: modèle monolithique)",
+    )
+    modele.add_argument(
+        "--build-processes",
+        type=int,
+        default=None,
+        help="Nombre de processus pour construire les familles de contraintes "
+        "(défaut: construction séquentielle)",
+    )
+
+    resolution = parser.add_argument_group("solve")
+    resolution.add_argument("--temps-max", type=float, default=7200)
+    resolution.add_argument("--workers", type=int, default=None)
+    # Arrêt après 5 min sans amélioration ou à 1% de l'optimum prouvé (0: désactivé)
+    resolution.add_argument("--sans-amelioration", type=float, default=300)
+    resolution.add_argument("--ecart-max", type=float, default=1.0)
+    resolution.add_argument(
+        "--checkpoint", default="output/checkpoint_septembre2025.json"
+    )
+    resolution.add_argument(
+        "--telemetrie", default="output/telemetrie_septembre2025.jsonl"
+    )
+    resolution.add_argument(
+        "--base",
+        default=None,
+        help="Base SQLite où enregistrer l'instance et chaque solution "
+        "(voir stockage.py)",
+    )
+
+    export = parser.add_argument_group("export")
+    export.add_argument(
+        "--formats", nargs="+", choices=sorted(FORMATS), default=FORMATS_DEFAUT
+    )
+    export.add_argument("--sortie", default="output", help="Dossier de sortie")
+    export.add_argument(
+        "--nom", default="septembre2025", help="Suffixe des noms de fichiers"
+    )
+    export.add_argument(
+        "--export-processes",
+        type=int,
+        default=None,
+        help="Nombre de processus écrivant les calendriers du format flux "
+        "(défaut: écriture séquentielle)",
+    )
+
+    banc = parser.add_argument_group("bench")
+    banc.add_argument(
+        "--configurations",
+        nargs="+",
+        choices=sorted(CONFIGURATIONS),
+        default=list(CONFIGURATIONS),
+    )
+    banc.add_argument("--repetitions", type=int, default=3)
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    """Point d'entrée de la ligne de commande; retourne le code de sortie."""
+    options = analyser_arguments(arguments)
+    pipeline = Pipeline(options, Cache(options.cache, forcer=options.force))
+    try:
+        if options.etape == "load":
+            pipeline.charger()
+        elif options.etape == "build":
+            pipeline.construire()
+        elif options.etape == "solve":
+            return 0 if pipeline.resoudre()[1] is not None else 1
+        elif options.etape == "export":
+            return 0 if pipeline.exporter()[0] else 1
+        else:
+            pipeline.banc()
+    except FileNotFoundError as e:
+        print(f"Erreur: Fichier non trouvé - {e}")
+        return 1
+    except Exception as e:
+        print(f"Erreur: {e}")
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    configurer_journal()
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Rendu de l'emploi du temps en page HTML (voir EmploiDuTemps.exporter_vers_html).
+
+Les séances sont rangées en une passe par (semaine, jour, créneau
+d'affichage), puis la page est écrite morceau par morceau dans le fichier:
+le temps de rendu est linéaire en nombre de séances et la page n'est jamais
+construite entière en mémoire.
+"""
+
+# Début de la page: styles et boutons de filtre (remplis par _script_onload)
+ENTETE = """
+            <!DOCTYPE html>
+            <html lang="fr">
+            <head>
+                <meta charset="UTF-8">
+                <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                <title>Emploi du temps IngeMedia</title>
+                <style>
+                    body { font-family: Arial, sans-serif; margin: 20px; }
+                    .calendar { width: 100%; border-collapse: collapse; }
+                    .calendar th { background-color: #4CAF50; color: white; padding: 8px; text-align: center; }
+                    .calendar td { border: 1px solid #ddd; padding: 8px; height: 100px; vertical-align: top; }
+                    .event { margin-bottom: 5px; padding: 5px; border-radius: 4px; overflow: hidden; }
+                    .CM { background-color: #e3f2fd; }
+                    .TD { background-color: #fff9c4; }
+                    .filters { margin-bottom: 20px; }
+                    button { padding: 5px 10px; margin-right: 5px; }
+                    .hidden { display: none; }
+                    .header { background-color: #f5f5f5; position: sticky; top: 0; }
+                    @media print {
+                        .filters { display: none; }
+                        .calendar { font-size: 10px; }
+                        .event { page-break-inside: avoid; }
+                    }
+                </style>
+            </head>
+            <body>
+                <h1>Emploi du temps IngeMedia</h1>
+                
+                <div class="filters">
+                    <h3>Filtres :</h3>
+                    <div>
+                        <button onclick="filterByType('all')">Tous</button>
+                        <button onclick="filterByType('CM')">CM</button>
+                        <button onclick="filterByType('TD')">TD</button>
+                    </div>
+                    <div id="groupe-filters">
+                        <h4>Groupes :</h4>
+                        <!-- Sera rempli dynamiquement -->
+                    </div>
+                    <div id="enseignant-filters">
+                        <h4>Enseignants :</h4>
+                        <!-- Sera rempli dynamiquement -->
+                    </div>
+                </div>
+            """
+
+# Filtres par type, groupe et enseignant
+SCRIPT_FILTRES = """<script>
+                function filterByType(type) {
+                    const events = document.querySelectorAll('.event');
+                    events.forEach(event => {
+                        if (type === 'all' || event.classList.contains(type)) {
+                            event.classList.remove('hidden');
+                        } else {
+                            event.classList.add('hidden');
+                        }
+                    });
+                }
+                
+                function filterByGroupe(groupe) {
+                    const events = document.querySelectorAll('.event');
+                    events.forEach(event => {
+                        if (groupe === 'all' || event.getAttribute('data-groupe').includes(groupe)) {
+                            event.classList.remove('hidden');
+                        } else {
+                            event.classList.add('hidden');
+                        }
+                    });
+                }
+
+                function filterByEnseignant(enseignant) {
+                    const events = document.querySelectorAll('.event');
+                    events.forEach(event => {
+                        if (enseignant === 'all' || event.getAttribute('data-enseignant') === enseignant) {
+                            event.classList.remove('hidden');
+                        } else {
+                            event.classList.add('hidden');
+                        }
+                    });
+                }
+            </script>"""
+
+PIED = """
+            </body>
+            </html>
+            """
+
+
+def ranger(emploi_du_temps):
+    """
+    Range les séances d'un emploi du temps en une seule passe.
+
+    Returns:
+        tuple: (cases, dates, groupes, enseignants) avec cases
+               {(semaine, jour, créneau d'affichage): [enregistrements]} dans
+               l'ordre de l'emploi du temps, dates {(semaine, jour): date de la
+               première séance}, et les ensembles des noms de groupes et
+               d'enseignants
+    """
+    cases = {}
+    dates = {}
+    groupes = set()
+    enseignants = set()
+    for details in emploi_du_temps.values():
+        semaine, jour = details["semaine"], details["jour"]
+        cases.setdefault((semaine, jour, details["creneau"]), []).append(details)
+        dates.setdefault((semaine, jour), details["date"])
+        for g in details["groupe"].split(", "):
+            groupes.add(g.strip())
+        enseignants.add(details["enseignant"].strip())
+    return cases, dates, groupes, enseignants
+
+
+def _evenement(event):
+    """Une séance dans sa case (enregistrement de l'emploi du temps)."""
+    type_cours = event.get("type", "")
+    return f"""<div class='event {type_cours}' data-groupe='{event["groupe"]}' data-enseignant='{event["enseignant"]}'>
+                                        <strong>{event["heure_debut"]}-{event["heure_fin"]}</strong>: {event["cours"]}<br>
+                                        <small>
+                                            Séance: {event["seance"]}<br>
+                                            {type_cours} - {event["salle"]}<br>
+                                            {event["enseignant"]}<br>
+                                            Groupe: {event["groupe"]}
+                                        </small>
+                                    </div>"""
+
+
+def _script_onload(groupes, enseignants):
+    """Script remplissant les boutons de filtre par groupe et par enseignant."""
+    morceaux = [
+        "<script>window.onload = function() {",
+        "const groupeFilters = document.getElementById('groupe-filters');",
+        "let filterHtml = '<button onclick=\"filterByGroupe(\\'all\\')\">Tous les groupes</button>';",
+    ]
+    for groupe in sorted(groupes):
+        morceaux.append(
+            f"filterHtml += '<button onclick=\"filterByGroupe(\\'{groupe}\\')\">{groupe}</button>';"
+        )
+    morceaux += [
+        "groupeFilters.innerHTML = filterHtml;",
+        "const enseignantFilters = document.getElementById('enseignant-filters');",
+        "let enseignantFilterHtml = '<button onclick=\"filterByEnseignant(\\'all\\')\">Tous les enseignants</button>';",
+    ]
+    for enseignant in sorted(enseignants):
+        morceaux.append(
+            f"enseignantFilterHtml += '<button onclick=\"filterByEnseignant(\\'{enseignant}\\')\">{enseignant}</button>';"
+        )
+    morceaux += ["enseignantFilters.innerHTML = enseignantFilterHtml;", "}</script>"]
+    return "".join(morceaux)
+
+
+def ecrire_page(f, emploi_du_temps, jours, creneaux):
+    """
+    Écrit la page HTML d'un emploi du temps dans le fichier texte `f`, une
+    semaine à la fois.
+
+    Args:
+        emploi_du_temps: Enregistrements {clé: séance} (voir
+                         solution.SolutionColonnaire)
+        jours: Noms des jours en colonnes ("Lundi"...)
+        creneaux: Créneaux d'affichage en lignes ("8h00"...)
+    """
+    cases, dates, groupes, enseignants = ranger(emploi_du_temps)
+    f.write(ENTETE)
+    f.write(SCRIPT_FILTRES)
+    f.write(_script_onload(groupes, enseignants))
+
+    for semaine in sorted({semaine for semaine, _ in dates}):
+        morceaux = [
+            f"<h2>Semaine {semaine}</h2>",
+            "<table class='calendar'>",
+            "<tr class='header'><th>Heure</th>",
+        ]
+        for jour in jours:
+            date = dates.get((semaine, jour))
+            if date is None:
+                morceaux.append(f"<th>{jour}</th>")
+            else:
+                morceaux.append(f"<th>{jour}<br>{date}</th>")
+        morceaux.append("</tr>")
+
+        for creneau in creneaux:
+            morceaux.append(f"<tr><td class='header'>{creneau}</td>")
+            for jour in jours:
+                morceaux.append("<td>")
+                for event in cases.get((semaine, jour, creneau), ()):
+                    morceaux.append(_evenement(event))
+                morceaux.append("</td>")
+            morceaux.append("</tr>")
+
+        morceaux.append("</table>")
+        f.write("".join(morceaux))
+
+    f.write(PIED)
@@ -0,0 +1,132 @@
+"""Outils pour réparer un emploi du temps existant avec un minimum de changements."""
+
+
+def ids_groupes_lies(groupes_seance):
+    """Retourne les IDs des groupes d'une séance, de leurs parents et de leurs sous-groupes."""
+    ids = set()
+    for g in groupes_seance:
+        ids.add(g.id_groupe)
+        if g.id_parent:
+            ids.add(g.id_parent)
+        for sg in g.sous_groupes or []:
+            ids.add(sg.id_groupe)
+    return ids
+
+
+def seances_touchees(
+    seances,
+    affectation,
+    enseignants_modifies=None,
+    groupes_modifies=None,
+    salles_modifiees=None,
+):
+    """
+    Détermine les séances concernées par une modification de ressources.
+
+    Une séance est touchée si son enseignant, l'un de ses groupes (ou un groupe
+    parent/enfant) ou la salle où elle était placée a été modifié. Les séances
+    absentes de l'affectation précédente (nouvelles séances) sont toujours touchées.
+
+    Args:
+        seances: Liste des séances
+        affectation: Affectation précédente {id_seance: (s_idx, j, cr_debut, salle_id)}
+        enseignants_modifies: IDs des enseignants modifiés
+        groupes_modifies: IDs des groupes modifiés
+        salles_modifiees: IDs des salles modifiées
+
+    Returns:
+        set: IDs des séances à libérer
+    """
+    enseignants_modifies = set(enseignants_modifies or [])
+    groupes_modifies = set(groupes_modifies or [])
+    salles_modifiees = set(salles_modifiees or [])
+
+    touchees = set()
+    for s in seances:
+        if s.id_seance not in affectation:
+            touchees.add(s.id_seance)
+        elif s.cours.enseignant.id in enseignants_modifies:
+            touchees.add(s.id_seance)
+        elif ids_groupes_lies(s.groupes) & groupes_modifies:
+            touchees.add(s.id_seance)
+        elif affectation[s.id_seance][3] in salles_modifiees:
+            touchees.add(s.id_seance)
+    return touchees
+
+
+def etendre_voisinage(seances, affectation, seances_libres):
+    """
+    Étend l'ensemble des séances libres à leur voisinage.
+
+    Le voisinage d'une séance libre comprend:
+    - les autres séances du même cours (contrainte d'ordre),
+    - les séances de la même semaine qui partagent son enseignant, l'un de ses
+      groupes ou sa salle, afin de laisser de la place pour la déplacer.
+
+    Returns:
+        set: IDs des séances libres, voisinage compris
+    """
+    seances_dict = {s.id_seance: s for s in seances}
+    libres = set(seances_libres)
+
+    cours_libres = {seances_dict[i].cours.id_cours for i in libres if i in seances_dict}
+
+    # Ressources occupées par les séances libres, par semaine
+    ressources_par_semaine = {}
+    for id_seance in libres:
+        if id_seance not in affectation or id_seance not in seances_dict:
+            continue
+        s = seances_dict[id_seance]
+        s_idx, _, _, salle_id = affectation[id_seance]
+        ressources = ressources_par_semaine.setdefault(s_idx, set())
+        ressources.add(("enseignant", s.cours.enseignant.id))
+        ressources.add(("salle", salle_id))
+        for g_id in ids_groupes_lies(s.groupes):
+            ressources.add(("groupe", g_id))
+
+    voisinage = set()
+    for s in seances:
+        if s.id_seance in libres:
+            continue
+        if s.cours.id_cours in cours_libres:
+            voisinage.add(s.id_seance)
+            continue
+        if s.id_seance not in affectation:
+            continue
+        s_idx, _, _, salle_id = affectation[s.id_seance]
+        ressources = ressources_par_semaine.get(s_idx)
+        if not ressources:
+            continue
+        if (
+            ("enseignant", s.cours.enseignant.id) in ressources
+            or ("salle", salle_id) in ressources
+            or any(
+                ("groupe", g_id) in ressources for g_id in ids_groupes_lies(s.groupes)
+            )
+        ):
+            voisinage.add(s.id_seance)
+
+    return libres | voisinage
+
+
+def ajouter_objectif_reparation(model, seance_vars, affectation):
+    """
+    Initialise le solveur avec l'affectation précédente et minimise le nombre
+    de séances déplacées.
+
+    Chaque variable reçoit un hint (1 pour le placement précédent, 0 sinon).
+    Une séance est considérée déplacée si son ancien placement (créneau et salle)
+    n'est plus choisi.
+    """
+    garde_placement = []
+    for (id_seance, s_idx, j, cr_debut, salle_id), var in seance_vars.items():
+        precedent = affectation.get(id_seance) == (s_idx, j, cr_debut, salle_id)
+        model.AddHint(var, 1 if precedent else 0)
+        if precedent:
+            garde_placement.append(var)
+
+    # Minimiser les déplacements revient à maximiser les placements conservés
+    model.Maximize(sum(garde_placement))
+    print(
+        f"Objectif de réparation: {len(garde_placement)} placements précédents à conserver"
+    )
@@ -0,0 +1,107 @@
+"""Choix d'une salle unique par cours et groupe, pour toutes ses séances."""
+
+from conflits import salles_admissibles
+
+
+def unite_salle(seance):
+    """Unité qui partage une salle: le cours et les groupes de la séance."""
+    return (seance.cours.id_cours, tuple(sorted(g.id_groupe for g in seance.groupes)))
+
+
+class ChoixSalles:
+    """
+    Une variable de choix par (unité, salle admissible), avec exactement une
+    salle par unité. Les variables de placement des séances ne portent alors
+    que sur l'horaire (salle contraintes.SALLE_DU_COURS), ce qui divise leur
+    nombre par le nombre de salles admissibles et garde chaque cours dans la
+    même salle tout le semestre.
+    """
+
+    def __init__(self, model, seances, salles):
+        """
+        Crée les variables de choix de salle.
+
+        Une unité sans salle admissible commune à toutes ses séances rend le
+        modèle infaisable, comme une séance sans variable de placement.
+        """
+        self.unite_par_seance = {}
+        seances_par_unite = {}
+        for s in seances:
+            unite = unite_salle(s)
+            self.unite_par_seance[s.id_seance] = unite
+            seances_par_unite.setdefault(unite, []).append(s)
+
+        # {unité: [(salle, variable de choix)]}
+        self.choix = {}
+        for unite, seances_unite in seances_par_unite.items():
+            communes = None
+            for s in seances_unite:
+                ids = {sa.id for sa in salles_admissibles(s, salles)}
+                communes = ids if communes is None else communes & ids
+            candidates = [sa for sa in salles if sa.id in communes]
+            if not candidates:
+                print(f"Attention: aucune salle admissible pour le cours {unite}")
+            self.choix[unite] = [
+                (sa, model.NewBoolVar(f"salle_{unite[0]}_{'_'.join(unite[1])}_{sa.id}"))
+                for sa in candidates
+            ]
+            model.AddExactlyOne(var for _, var in self.choix[unite])
+
+        nb_vars = sum(len(c) for c in self.choix.values())
+        print(
+            f"Choix de salle par cours: {len(self.choix)} unités, {nb_vars} variables"
+        )
+
+    def indices(self):
+        """Choix sous forme sérialisable: {unité: [(salle_id, indice de la variable)]}."""
+        return {
+            unite: [(sa.id, var.Index()) for sa, var in candidates]
+            for unite, candidates in self.choix.items()
+        }
+
+    @classmethod
+    def restaurer(cls, model, seances, salles, indices):
+        """
+        ChoixSalles d'un modèle rechargé depuis son CpModelProto, sans créer de
+        variable (voir indices).
+        """
+        choix_salles = cls.__new__(cls)
+        choix_salles.unite_par_seance = {s.id_seance: unite_salle(s) for s in seances}
+        salles_par_id = {sa.id: sa for sa in salles}
+        choix_salles.choix = {
+            unite: [
+                (salles_par_id[salle_id], model.GetBoolVarFromProtoIndex(i))
+                for salle_id, i in candidates
+            ]
+            for unite, candidates in indices.items()
+        }
+        return choix_salles
+
+    def salles_possibles(self, seance):
+        """Salles admissibles de la séance, avec leur variable de choix."""
+        return self.choix.get(self.unite_par_seance.get(seance.id_seance), [])
+
+    def completer(self, affectation, valeur):
+        """
+        Remplace la salle des placements par la salle choisie pour leur cours.
+
+        Args:
+            affectation: {id_seance: (s_idx, j, cr_debut, SALLE_DU_COURS)}
+            valeur: Fonction variable -> booléen (solver.BooleanValue par exemple)
+
+        Returns:
+            dict: {id_seance: (s_idx, j, cr_debut, salle_id)}
+        """
+        salle_par_unite = {
+            unite: sa.id
+            for unite, candidates in self.choix.items()
+            for sa, var in candidates
+            if valeur(var)
+        }
+        return {
+            s_id: (
+                *placement[:3],
+                salle_par_unite.get(self.unite_par_seance.get(s_id), placement[3]),
+            )
+            for s_id, placement in affectation.items()
+        }
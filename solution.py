@@ -0,0 +1,273 @@
+"""Sauvegarde et chargement des affectations de séances (solutions du solveur)."""
+
+import json
+import os
+import threading
+from collections.abc import Mapping
+
+
+def sauvegarder_affectation(affectation, semaines, fichier):
+    """
+    Sauvegarde une affectation dans un fichier JSON compact.
+
+    Les indices de semaine sont convertis en numéros de semaine afin que le
+    fichier reste lisible avec une autre liste de semaines.
+
+    Args:
+        affectation: Dictionnaire {id_seance: (s_idx, j, cr_debut, salle_id)}
+        semaines: Liste des numéros de semaine utilisée pour le modèle
+        fichier: Chemin du fichier JSON à écrire
+    """
+    contenu = {
+        id_seance: [semaines[s_idx], j, cr_debut, salle_id]
+        for id_seance, (s_idx, j, cr_debut, salle_id) in affectation.items()
+    }
+    dossier = os.path.dirname(fichier)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    # Écriture atomique: un lecteur ne voit jamais un fichier à moitié écrit
+    fichier_temporaire = f"{fichier}.tmp"
+    with open(fichier_temporaire, "w", encoding="utf-8") as f:
+        json.dump(contenu, f, separators=(",", ":"))
+    os.replace(fichier_temporaire, fichier)
+    print(f"Affectation de {len(contenu)} séances sauvegardée dans {fichier}")
+
+
+def charger_affectation(fichier, semaines):
+    """
+    Charge une affectation sauvegardée avec sauvegarder_affectation.
+
+    Args:
+        fichier: Chemin du fichier JSON
+        semaines: Liste des numéros de semaine du modèle courant
+
+    Returns:
+        dict: Affectation {id_seance: (s_idx, j, cr_debut, salle_id)}. Les séances
+              placées dans une semaine absente de `semaines` sont ignorées.
+    """
+    index_semaines = {semaine: s_idx for s_idx, semaine in enumerate(semaines)}
+    with open(fichier, "r", encoding="utf-8") as f:
+        contenu = json.load(f)
+
+    affectation = {}
+    for id_seance, (semaine, j, cr_debut, salle_id) in contenu.items():
+        if semaine not in index_semaines:
+            print(
+                f"Attention: semaine {semaine} de la séance {id_seance} hors planning, ignorée"
+            )
+            continue
+        affectation[id_seance] = (index_semaines[semaine], j, cr_debut, salle_id)
+    return affectation
+
+
+def dtype_solution():
+    """dtype numpy des lignes de SolutionColonnaire.table."""
+    import numpy as np
+
+    return np.dtype(
+        [
+            ("seance", np.int32),
+            ("salle", np.int64),
+            ("enseignant", np.int64),
+            ("semaine", np.int16),
+            ("s_idx", np.int16),
+            ("jour", np.int8),
+            ("creneau", np.int16),
+            ("debut", np.int16),
+            ("fin", np.int16),
+            ("date", "datetime64[D]"),
+            ("debut_dt", "datetime64[m]"),
+            ("fin_dt", "datetime64[m]"),
+        ]
+    )
+
+
+class EcrivainAsynchrone:
+    """
+    Écrit des affectations sur disque depuis un thread d'arrière-plan.
+
+    Seule la dernière affectation soumise est conservée: si le disque est plus
+    lent que le solveur, les instantanés intermédiaires sont abandonnés au
+    lieu de s'accumuler en mémoire.
+    """
+
+    def __init__(self, fichier, semaines):
+        self.fichier = fichier
+        self.semaines = semaines
+        self._condition = threading.Condition()
+        self._en_attente = None
+        self._ferme = False
+        self._thread = threading.Thread(target=self._boucle, daemon=True)
+        self._thread.start()
+
+    def soumettre(self, affectation):
+        """Programme l'écriture d'une affectation (retour immédiat)."""
+        with self._condition:
+            self._en_attente = affectation
+            self._condition.notify()
+
+    def _boucle(self):
+        while True:
+            with self._condition:
+                while self._en_attente is None and not self._ferme:
+                    self._condition.wait()
+                if self._en_attente is None:
+                    return
+                affectation, self._en_attente = self._en_attente, None
+            try:
+                sauvegarder_affectation(affectation, self.semaines, self.fichier)
+            except OSError as e:
+                print(f"Erreur lors de l'écriture du point de reprise: {e}")
+
+    def fermer(self):
+        """Écrit la dernière affectation en attente puis arrête le thread."""
+        with self._condition:
+            self._ferme = True
+            self._condition.notify()
+        self._thread.join()
+
+
+class SolutionColonnaire(Mapping):
+    """
+    Emploi du temps résolu, rangé en colonnes typées.
+
+    `table` est un tableau structuré numpy, une ligne par séance placée:
+
+        seance      indice de la séance dans `seances` (clé étrangère)
+        salle       ID de la salle (clé de `salles`)
+        enseignant  ID de l'enseignant du cours
+        semaine     numéro de semaine; s_idx son indice dans le planning
+        jour        indice du jour (0 = lundi)
+        creneau     créneau de début dans la grille
+        debut, fin  minutes depuis minuit
+        date        datetime64[D]
+        debut_dt, fin_dt  datetime64[m], heure locale
+
+    Les exports lisent ces colonnes directement. Pour les appelants de
+    l'ancien format, l'objet est aussi un Mapping en lecture seule
+    {f"{id_seance}_{semaine}_{j}": enregistrement}: chaque enregistrement
+    (heures "8:30", groupes séparés par ", ") est construit à la demande.
+    """
+
+    def __init__(self, table, seances, salles, jours, creneaux_affichage):
+        self.table = table
+        self.seances = seances
+        self.salles = salles
+        self.jours = list(jours)
+        self.creneaux_affichage = list(creneaux_affichage)
+        self._index = None
+
+    @classmethod
+    def construire(
+        cls,
+        affectation,
+        seances,
+        salles,
+        semaines,
+        calendrier,
+        grille,
+        jours,
+        creneaux_affichage,
+    ):
+        """
+        Range une affectation {id_seance: (s_idx, j, cr_debut, salle_id)} en
+        colonnes, dans l'ordre de `seances`.
+
+        Args:
+            semaines: Numéros de semaine du planning (EmploiDuTemps.SEMAINES)
+            calendrier: {semaine: {j: datetime}} (EmploiDuTemps.calendrier)
+            grille: GrilleHoraire du modèle
+            jours, creneaux_affichage: Libellés des enregistrements de l'ancien format
+        """
+        import numpy as np
+
+        lignes = []
+        for k, s in enumerate(seances):
+            if s.id_seance not in affectation:
+                continue
+            s_idx, j, cr_debut, salle_id = affectation[s.id_seance]
+            semaine = semaines[s_idx]
+            debut = grille.minutes(cr_debut)
+            lignes.append(
+                (
+                    k,
+                    salle_id,
+                    s.cours.enseignant.id,
+                    semaine,
+                    s_idx,
+                    j,
+                    cr_debut,
+                    debut,
+                    debut + int(s.duree * 60),
+                    calendrier[semaine][j].strftime("%Y-%m-%d"),
+                )
+            )
+        dtype = dtype_solution()
+        table = np.zeros(len(lignes), dtype=dtype)
+        if lignes:
+            for nom, valeurs in zip(dtype.names, zip(*lignes)):
+                table[nom] = valeurs
+            minutes = np.timedelta64(1, "m")
+            table["debut_dt"] = table["date"] + table["debut"] * minutes
+            table["fin_dt"] = table["date"] + table["fin"] * minutes
+        return cls(
+            table, seances, {sa.id: sa for sa in salles}, jours, creneaux_affichage
+        )
+
+    def groupes(self, k):
+        """Noms des groupes de la séance d'indice k, séparés par ", "."""
+        return ", ".join(g.nom for g in self.seances[k].groupes)
+
+    def cle(self, i):
+        """Clé de l'ancien format pour la ligne i."""
+        ligne = self.table[i]
+        return (
+            f"{self.seances[ligne['seance']].id_seance}_{ligne['semaine']}_"
+            f"{ligne['jour']}"
+        )
+
+    def enregistrement(self, i):
+        """Enregistrement de l'ancien format pour la ligne i."""
+        ligne = self.table[i]
+        s = self.seances[ligne["seance"]]
+        debut, fin = int(ligne["debut"]), int(ligne["fin"])
+        return {
+            "semaine": int(ligne["semaine"]),
+            "jour": self.jours[ligne["jour"]],
+            "date": str(ligne["date"]),
+            "creneau": self.creneaux_affichage[(debut - 8 * 60) // 120],
+            "salle": self.salles[int(ligne["salle"])].nom,
+            "cours": s.cours.nom,
+            "seance": s.id_seance,
+            "enseignant": s.cours.enseignant.nom,
+            "groupe": self.groupes(ligne["seance"]),
+            "heure_debut": f"{debut // 60}:{debut % 60:02d}",
+            "heure_fin": f"{fin // 60}:{fin % 60:02d}",
+            "duree": fin - debut,
+            "type": s.cours.type_cours,
+        }
+
+    def vers_dataframe(self):
+        """Colonnes de `table` dans un DataFrame pandas."""
+        import pandas as pd
+
+        return pd.DataFrame(self.table)
+
+    # Vue Mapping de l'ancien format
+
+    def _indices(self):
+        if self._index is None:
+            self._index = {self.cle(i): i for i in range(len(self.table))}
+        return self._index
+
+    def __getitem__(self, cle):
+        return self.enregistrement(self._indices()[cle])
+
+    def __iter__(self):
+        return iter(self._indices())
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, cle):
+        return cle in self._indices()
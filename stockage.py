@@ -0,0 +1,526 @@
+"""
+Stockage de l'instance et des emplois du temps résolus dans une base SQLite.
+
+La base conserve les salles, enseignants, groupes, cours et séances chargés,
+puis chaque emploi du temps résolu sous forme de version numérotée. Les
+placements d'une version sont dénormalisés (noms, date, minutes de début et
+de fin) et indexés par (enseignant, date), (groupe, date) et (salle, date):
+"la salle CO315 en semaine 42" ou "toutes les séances de DEDI" sont des
+requêtes indexées, sans relancer la génération ni parcourir le dictionnaire
+d'emploi du temps.
+
+Les écritures en masse (instance, version) se font dans une seule transaction.
+
+Exemple:
+    with Stockage("output/edt.sqlite") as base:
+        base.enregistrer_instance(salles, enseignants, groupes, cours, seances)
+        version = base.enregistrer_version(edt, affectation, seances, salles, groupes)
+        base.seances_salle("CO315", semaine=42)
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+from flux_ics import _membres
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS salles (
+    id INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL,
+    effectif_max INTEGER NOT NULL,
+    type_salle TEXT NOT NULL,
+    disponibilite TEXT
+);
+CREATE TABLE IF NOT EXISTS enseignants (
+    id INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL,
+    besoin_salle TEXT NOT NULL,
+    semaine_paire INTEGER NOT NULL,
+    semaine_impaire INTEGER NOT NULL,
+    disponibilite TEXT
+);
+CREATE TABLE IF NOT EXISTS groupes (
+    id_groupe TEXT PRIMARY KEY,
+    nom TEXT NOT NULL,
+    effectif INTEGER NOT NULL,
+    id_parent TEXT
+);
+CREATE TABLE IF NOT EXISTS cours (
+    id_cours TEXT PRIMARY KEY,
+    nom TEXT NOT NULL,
+    id_enseignant INTEGER NOT NULL,
+    duree_total INTEGER NOT NULL,
+    max_duration INTEGER NOT NULL,
+    type_cours TEXT NOT NULL,
+    debuts TEXT
+);
+CREATE TABLE IF NOT EXISTS cours_groupes (
+    id_cours TEXT NOT NULL,
+    id_groupe TEXT NOT NULL,
+    PRIMARY KEY (id_cours, id_groupe)
+);
+CREATE TABLE IF NOT EXISTS seances (
+    id_seance TEXT PRIMARY KEY,
+    id_cours TEXT NOT NULL,
+    duree REAL NOT NULL,
+    type_seance TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seances_groupes (
+    id_seance TEXT NOT NULL,
+    id_groupe TEXT NOT NULL,
+    PRIMARY KEY (id_seance, id_groupe)
+);
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cle TEXT UNIQUE,
+    cree_le TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS semaines (
+    version INTEGER NOT NULL,
+    semaine INTEGER NOT NULL,
+    debut TEXT NOT NULL,
+    fin TEXT NOT NULL,
+    PRIMARY KEY (version, semaine)
+);
+CREATE TABLE IF NOT EXISTS placements (
+    version INTEGER NOT NULL,
+    id_seance TEXT NOT NULL,
+    semaine INTEGER NOT NULL,
+    jour INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    creneau INTEGER NOT NULL,
+    minute_debut INTEGER NOT NULL,
+    minute_fin INTEGER NOT NULL,
+    id_salle INTEGER NOT NULL,
+    salle TEXT NOT NULL,
+    id_enseignant INTEGER NOT NULL,
+    enseignant TEXT NOT NULL,
+    id_cours TEXT NOT NULL,
+    cours TEXT NOT NULL,
+    groupes TEXT NOT NULL,
+    type TEXT NOT NULL,
+    PRIMARY KEY (version, id_seance)
+);
+CREATE TABLE IF NOT EXISTS placements_groupes (
+    version INTEGER NOT NULL,
+    id_seance TEXT NOT NULL,
+    id_groupe TEXT NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (version, id_seance, id_groupe)
+);
+CREATE INDEX IF NOT EXISTS placements_enseignant_date
+    ON placements (id_enseignant, date);
+CREATE INDEX IF NOT EXISTS placements_salle_date ON placements (id_salle, date);
+CREATE INDEX IF NOT EXISTS placements_groupe_date
+    ON placements_groupes (id_groupe, date);
+"""
+
+# Noms des jours des enregistrements, comme EmploiDuTemps.JOURS_SEMAINE
+JOURS_SEMAINE = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi"]
+
+
+class Stockage:
+    """Base SQLite de l'instance et des versions d'emploi du temps."""
+
+    def __init__(self, chemin):
+        """
+        Ouvre (ou crée) la base.
+
+        Args:
+            chemin: Fichier SQLite, ou ":memory:" pour une base temporaire
+        """
+        self.chemin = chemin
+        self.connexion = sqlite3.connect(chemin)
+        self.connexion.row_factory = sqlite3.Row
+        self.connexion.executescript(SCHEMA)
+
+    def fermer(self):
+        self.connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def enregistrer_instance(self, salles, enseignants, groupes, cours, seances):
+        """
+        Enregistre (ou remplace, à identifiant égal) les données chargées et les
+        séances générées, en une transaction.
+        """
+        with self.connexion:
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO salles VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        sa.id,
+                        sa.nom,
+                        sa.effectif_max,
+                        sa.type_salle,
+                        json.dumps(sa.disponibilite),
+                    )
+                    for sa in salles
+                ],
+            )
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO enseignants VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e.id,
+                        e.nom,
+                        e.besoin_salle,
+                        int(e.semaine_paire),
+                        int(e.semaine_impaire),
+                        json.dumps(e.disponibilite),
+                    )
+                    for e in enseignants
+                ],
+            )
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO groupes VALUES (?, ?, ?, ?)",
+                [(g.id_groupe, g.nom, g.effectif, g.id_parent) for g in groupes],
+            )
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO cours VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        c.id_cours,
+                        c.nom,
+                        c.enseignant.id,
+                        c.duree_total,
+                        c.max_duration,
+                        c.type_cours,
+                        c.debuts,
+                    )
+                    for c in cours
+                ],
+            )
+            self.connexion.executemany(
+                "DELETE FROM cours_groupes WHERE id_cours = ?",
+                [(c.id_cours,) for c in cours],
+            )
+            self.connexion.executemany(
+                "INSERT OR IGNORE INTO cours_groupes VALUES (?, ?)",
+                [
+                    (c.id_cours, id_groupe)
+                    for c in cours
+                    for id_groupe in getattr(c, "ids_groupes", [])
+                ],
+            )
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO seances VALUES (?, ?, ?, ?)",
+                [
+                    (s.id_seance, s.cours.id_cours, s.duree, s.type_seance)
+                    for s in seances
+                ],
+            )
+            self.connexion.executemany(
+                "DELETE FROM seances_groupes WHERE id_seance = ?",
+                [(s.id_seance,) for s in seances],
+            )
+            self.connexion.executemany(
+                "INSERT OR IGNORE INTO seances_groupes VALUES (?, ?)",
+                [(s.id_seance, g.id_groupe) for s in seances for g in s.groupes],
+            )
+        print(
+            f"Base {self.chemin}: {len(salles)} salles, {len(enseignants)} "
+            f"enseignants, {len(groupes)} groupes, {len(cours)} cours, "
+            f"{len(seances)} séances enregistrés"
+        )
+
+    def enregistrer_version(
+        self,
+        emploi_du_temps,
+        affectation,
+        seances,
+        salles,
+        groupes=None,
+        cle=None,
+        description="",
+    ):
+        """
+        Enregistre un emploi du temps résolu comme nouvelle version.
+
+        Une séance est rattachée (placements_groupes) à ses groupes, à leurs
+        groupes parents et à leurs sous-groupes, comme les calendriers de
+        flux_ics.index_flux: les séances de DEDI_1 comprennent les CM de DEDI.
+
+        Args:
+            emploi_du_temps: EmploiDuTemps ayant produit l'affectation (semaines,
+                             calendrier et grille configurés)
+            affectation: Affectation {id_seance: (s_idx, j, cr_debut, salle_id)}
+            groupes: (optionnel) Groupes chargés; par défaut, les groupes des
+                     séances et leurs sous-groupes
+            cle: (optionnel) Identifiant de la solution, par exemple l'empreinte
+                 de l'étape solve du pipeline: une solution déjà enregistrée
+                 sous cette clé n'est pas dupliquée
+            description: Texte libre
+
+        Returns:
+            int: Numéro de la version
+        """
+        if cle is not None:
+            ligne = self.connexion.execute(
+                "SELECT id FROM versions WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ligne is not None:
+                return ligne["id"]
+
+        edt = emploi_du_temps
+        salles_dict = {sa.id: sa for sa in salles}
+        if groupes is None:
+            groupes = {}
+            a_voir = [g for s in seances for g in s.groupes]
+            while a_voir:
+                g = a_voir.pop()
+                if g.id_groupe not in groupes:
+                    groupes[g.id_groupe] = g
+                    a_voir.extend(getattr(g, "sous_groupes", None) or [])
+            groupes = list(groupes.values())
+        # Groupes dont le calendrier reçoit les séances de chaque groupe
+        destinataires = {}
+        for id_groupe, membres in _membres(groupes).items():
+            for membre in membres:
+                destinataires.setdefault(membre, set()).add(id_groupe)
+        placements = []
+        placements_groupes = []
+        for s in seances:
+            if s.id_seance not in affectation:
+                continue
+            s_idx, j, cr_debut, salle_id = affectation[s.id_seance]
+            semaine = edt.SEMAINES[s_idx]
+            date = edt.calendrier[semaine][j].strftime("%Y-%m-%d")
+            debut = edt.grille.minutes(cr_debut)
+            placements.append(
+                (
+                    s.id_seance,
+                    semaine,
+                    j,
+                    date,
+                    cr_debut,
+                    debut,
+                    debut + int(s.duree * 60),
+                    salle_id,
+                    salles_dict[salle_id].nom,
+                    s.cours.enseignant.id,
+                    s.cours.enseignant.nom,
+                    s.cours.id_cours,
+                    s.cours.nom,
+                    ", ".join(g.nom for g in s.groupes),
+                    s.cours.type_cours,
+                )
+            )
+            ids_groupes = set()
+            for g in s.groupes:
+                ids_groupes.add(g.id_groupe)
+                ids_groupes.update(destinataires.get(g.id_groupe, ()))
+            placements_groupes += [
+                (s.id_seance, id_groupe, date) for id_groupe in sorted(ids_groupes)
+            ]
+
+        with self.connexion:
+            version = self.connexion.execute(
+                "INSERT INTO versions (cle, cree_le, description) VALUES (?, ?, ?)",
+                (cle, datetime.now().isoformat(timespec="seconds"), description),
+            ).lastrowid
+            self.connexion.executemany(
+                "INSERT INTO semaines VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        version,
+                        semaine,
+                        min(jours).strftime("%Y-%m-%d"),
+                        max(jours).strftime("%Y-%m-%d"),
+                    )
+                    for semaine in edt.SEMAINES
+                    for jours in [[d for d in edt.calendrier[semaine].values() if d]]
+                    if jours
+                ],
+            )
+            self.connexion.executemany(
+                "INSERT INTO placements VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(version,) + placement for placement in placements],
+            )
+            self.connexion.executemany(
+                "INSERT OR IGNORE INTO placements_groupes VALUES (?, ?, ?, ?)",
+                [(version,) + ligne for ligne in placements_groupes],
+            )
+        print(f"Base {self.chemin}: version {version} ({len(placements)} séances)")
+        return version
+
+    def versions(self):
+        """Versions enregistrées: [{"id", "cle", "cree_le", "description"}]."""
+        return [
+            dict(ligne)
+            for ligne in self.connexion.execute("SELECT * FROM versions ORDER BY id")
+        ]
+
+    def derniere_version(self):
+        """Numéro de la dernière version, ou None si la base n'en contient pas."""
+        return self.connexion.execute("SELECT MAX(id) FROM versions").fetchone()[0]
+
+    def _bornes(self, version, semaine, debut, fin):
+        """Version par défaut et dates limites (incluses) de la requête."""
+        if version is None:
+            version = self.derniere_version()
+        if semaine is not None:
+            ligne = self.connexion.execute(
+                "SELECT debut, fin FROM semaines WHERE version = ? AND semaine = ?",
+                (version, semaine),
+            ).fetchone()
+            if ligne is None:
+                return version, None, None
+            debut, fin = ligne["debut"], ligne["fin"]
+        return version, debut or "0000-00-00", fin or "9999-99-99"
+
+    def _placements(self, source, colonne, valeur, version, semaine, debut, fin):
+        """
+        Placements d'une version entre deux dates, triés par date et heure.
+
+        `colonne` (qualifiée par l'alias de sa table dans `source`) est la
+        ressource de l'index (ressource, date) de cette table.
+        """
+        version, debut, fin = self._bornes(version, semaine, debut, fin)
+        if debut is None:
+            return []
+        alias = colonne.split(".")[0]
+        lignes = self.connexion.execute(
+            f"SELECT p.* FROM {source} WHERE {colonne} = ? "
+            f"AND {alias}.date BETWEEN ? AND ? AND {alias}.version = ? "
+            "ORDER BY p.date, p.minute_debut, p.id_seance",
+            (valeur, debut, fin, version),
+        )
+        return [_enregistrement(ligne) for ligne in lignes]
+
+    def seances_salle(self, salle, version=None, semaine=None, debut=None, fin=None):
+        """
+        Séances placées dans une salle.
+
+        Args:
+            salle: ID de la salle, ou son nom ("CO315")
+            version: Version interrogée (défaut: la dernière)
+            semaine: (optionnel) Numéro de semaine
+            debut, fin: (optionnel) Dates ISO limites, incluses
+
+        Returns:
+            list: Enregistrements au format de EmploiDuTemps._construire_emploi_du_temps
+                  (heures "8:30"), avec les identifiants et la version
+        """
+        if isinstance(salle, str):
+            salle = self._identifiant("salles", salle)
+        return self._placements(
+            "placements p",
+            "p.id_salle",
+            salle,
+            version,
+            semaine,
+            debut,
+            fin,
+        )
+
+    def seances_enseignant(
+        self, enseignant, version=None, semaine=None, debut=None, fin=None
+    ):
+        """Séances d'un enseignant (ID ou nom); arguments de seances_salle."""
+        if isinstance(enseignant, str):
+            enseignant = self._identifiant("enseignants", enseignant)
+        return self._placements(
+            "placements p",
+            "p.id_enseignant",
+            enseignant,
+            version,
+            semaine,
+            debut,
+            fin,
+        )
+
+    def seances_groupe(
+        self, id_groupe, version=None, semaine=None, debut=None, fin=None
+    ):
+        """
+        Séances suivies par un groupe (ID, "DEDI"), y compris celles de ses
+        groupes parents et de ses sous-groupes; arguments de seances_salle.
+        """
+        return self._placements(
+            "placements_groupes g JOIN placements p USING (version, id_seance)",
+            "g.id_groupe",
+            id_groupe,
+            version,
+            semaine,
+            debut,
+            fin,
+        )
+
+    def _identifiant(self, table, nom):
+        """ID de la ligne de `table` portant ce nom (None si absente)."""
+        ligne = self.connexion.execute(
+            f"SELECT id FROM {table} WHERE nom = ?", (nom,)
+        ).fetchone()
+        return None if ligne is None else ligne[0]
+
+    def affectation(self, version=None, semaines=None):
+        """
+        Affectation d'une version, au format de solution.charger_affectation.
+
+        Args:
+            semaines: Numéros de semaine du modèle courant (défaut: ceux de la
+                      version); les séances placées hors de ces semaines sont ignorées
+
+        Returns:
+            dict: {id_seance: (s_idx, j, cr_debut, salle_id)}
+        """
+        if version is None:
+            version = self.derniere_version()
+        if semaines is None:
+            semaines = [
+                ligne[0]
+                for ligne in self.connexion.execute(
+                    "SELECT semaine FROM semaines WHERE version = ? ORDER BY debut",
+                    (version,),
+                )
+            ]
+        index_semaines = {semaine: s_idx for s_idx, semaine in enumerate(semaines)}
+        return {
+            ligne["id_seance"]: (
+                index_semaines[ligne["semaine"]],
+                ligne["jour"],
+                ligne["creneau"],
+                ligne["id_salle"],
+            )
+            for ligne in self.connexion.execute(
+                "SELECT id_seance, semaine, jour, creneau, id_salle "
+                "FROM placements WHERE version = ?",
+                (version,),
+            )
+            if ligne["semaine"] in index_semaines
+        }
+
+
+def _heure(minutes):
+    heure, minute = divmod(minutes, 60)
+    return f"{heure}:{minute:02d}"
+
+
+def _enregistrement(ligne):
+    """Ligne de placements au format des enregistrements d'emploi du temps."""
+    return {
+        "version": ligne["version"],
+        "semaine": ligne["semaine"],
+        "jour": JOURS_SEMAINE[ligne["jour"]],
+        "date": ligne["date"],
+        "salle": ligne["salle"],
+        "id_salle": ligne["id_salle"],
+        "cours": ligne["cours"],
+        "id_cours": ligne["id_cours"],
+        "seance": ligne["id_seance"],
+        "enseignant": ligne["enseignant"],
+        "id_enseignant": ligne["id_enseignant"],
+        "groupe": ligne["groupes"],
+        "heure_debut": _heure(ligne["minute_debut"]),
+        "heure_fin": _heure(ligne["minute_fin"]),
+        "duree": ligne["minute_fin"] - ligne["minute_debut"],
+        "type": ligne["type"],
+    }
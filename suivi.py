@@ -0,0 +1,102 @@
+"""Suivi des solutions trouvées pendant la résolution CP-SAT."""
+
+import time
+from datetime import datetime
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from telemetrie import ecart_relatif
+
+
+class SolutionCallback(cp_model.CpSolverSolutionCallback):
+    """Callback pour suivre les solutions trouvées pendant la résolution."""
+
+    def __init__(
+        self,
+        seance_vars=None,
+        ecrivain=None,
+        intervalle=60,
+        telemetrie=None,
+        choix_salles=None,
+    ):
+        """
+        Initialise le callback.
+
+        Args:
+            seance_vars: (optionnel) Variables de placement; si fourni, la dernière
+                         affectation trouvée est conservée dans `meilleure_affectation`
+            ecrivain: (optionnel) solution.EcrivainAsynchrone recevant un instantané
+                      de l'affectation au plus toutes les `intervalle` secondes
+            intervalle: Intervalle minimal entre deux instantanés (secondes)
+            telemetrie: (optionnel) telemetrie.JournalTelemetrie recevant un
+                        événement par solution (objectif, borne, écart)
+            choix_salles: (optionnel) salle_cours.ChoixSalles complétant la salle
+                          des placements quand elle est choisie par cours
+        """
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self._solution_count = 0
+        self._start_time = datetime.now()
+        self._dernier_instantane = None
+        self.ecrivain = ecrivain
+        self.intervalle = intervalle
+        self.meilleure_affectation = None
+        self.telemetrie = telemetrie
+        self.choix_salles = choix_salles
+        # Instant (time.monotonic) de la dernière solution améliorante
+        self.derniere_amelioration = None
+
+        if seance_vars is not None:
+            # Indices des variables dans le vecteur solution, calculés une seule fois
+            self._cles = list(seance_vars.keys())
+            self._indices = np.array(
+                [var.Index() for var in seance_vars.values()], dtype=np.int64
+            )
+        else:
+            self._cles = None
+
+    def on_solution_callback(self):
+        """Appelé à chaque solution trouvée."""
+        current_time = datetime.now()
+        elapsed = current_time - self._start_time
+        self._solution_count += 1
+        print(f"Solution #{self._solution_count} trouvée après {elapsed}")
+
+        # CP-SAT ne rapporte que des solutions strictement meilleures
+        self.derniere_amelioration = time.monotonic()
+        if self.telemetrie is not None:
+            objectif = self.ObjectiveValue()
+            borne = self.BestObjectiveBound()
+            self.telemetrie.evenement(
+                "solution",
+                numero=self._solution_count,
+                objectif=objectif,
+                borne=borne,
+                ecart=ecart_relatif(objectif, borne),
+            )
+
+        if self._cles is None:
+            return
+
+        # Lecture vectorisée du vecteur solution (bien plus rapide que Value() par variable)
+        valeurs = np.array(self.Response().solution, dtype=np.int64)
+        choisies = np.flatnonzero(valeurs[self._indices])
+        self.meilleure_affectation = {
+            self._cles[i][0]: self._cles[i][1:] for i in choisies
+        }
+        if self.choix_salles is not None:
+            self.meilleure_affectation = self.choix_salles.completer(
+                self.meilleure_affectation, lambda var: valeurs[var.Index()]
+            )
+
+        # L'écriture se fait dans un thread séparé pour ne pas bloquer le solveur
+        if self.ecrivain is not None and (
+            self._dernier_instantane is None
+            or (current_time - self._dernier_instantane).total_seconds()
+            >= self.intervalle
+        ):
+            self.ecrivain.soumettre(self.meilleure_affectation)
+            self._dernier_instantane = current_time
+
+    def solution_count(self):
+        return self._solution_count
@@ -0,0 +1,121 @@
+"""Télémétrie de la résolution (flux JSONL) et politique d'arrêt anticipé."""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+class JournalTelemetrie:
+    """Écrit des événements horodatés, un objet JSON par ligne."""
+
+    def __init__(self, fichier):
+        """
+        Ouvre le fichier de télémétrie (écrasé s'il existe).
+
+        Args:
+            fichier: Chemin du fichier JSONL
+        """
+        dossier = os.path.dirname(fichier)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        self.fichier = fichier
+        self._f = open(fichier, "w", encoding="utf-8")
+        self._verrou = threading.Lock()
+        self._debut = time.monotonic()
+
+    def evenement(self, type_evenement, **donnees):
+        """Ajoute un événement avec son horodatage et le temps écoulé depuis le début."""
+        ligne = {
+            "horodatage": datetime.now().isoformat(timespec="milliseconds"),
+            "ecoule": round(time.monotonic() - self._debut, 3),
+            "evenement": type_evenement,
+        }
+        ligne.update(donnees)
+        # Les événements viennent du thread du solveur et du thread de surveillance
+        with self._verrou:
+            self._f.write(json.dumps(ligne) + "\n")
+            self._f.flush()
+
+    def fermer(self):
+        with self._verrou:
+            self._f.close()
+
+
+def ecart_relatif(objectif, borne):
+    """Écart relatif entre l'objectif et la meilleure borne (0 = optimalité prouvée)."""
+    return abs(objectif - borne) / max(1.0, abs(objectif))
+
+
+class PolitiqueArret:
+    """
+    Politique d'arrêt anticipé de la recherche.
+
+    La recherche s'arrête dès que l'une des conditions est remplie:
+    - aucune amélioration de l'objectif depuis `sans_amelioration` secondes
+      (mesuré à partir de la première solution),
+    - écart relatif entre l'objectif et la borne inférieur à `ecart_max` %.
+    """
+
+    def __init__(self, sans_amelioration=None, ecart_max=None):
+        """
+        Args:
+            sans_amelioration: Durée maximale sans amélioration, en secondes (None = désactivé)
+            ecart_max: Écart relatif cible, en pourcentage (None = désactivé)
+        """
+        self.sans_amelioration = sans_amelioration
+        self.ecart_max = ecart_max
+
+    def configurer(self, solver):
+        """Transmet au solveur la partie de la politique qu'il gère nativement."""
+        if self.ecart_max is not None:
+            solver.parameters.relative_gap_limit = self.ecart_max / 100
+
+    def plateau_atteint(self, secondes_sans_amelioration):
+        return (
+            self.sans_amelioration is not None
+            and secondes_sans_amelioration >= self.sans_amelioration
+        )
+
+
+class SurveillancePlateau:
+    """
+    Thread qui arrête le solveur quand l'objectif stagne.
+
+    Le callback de solution n'est appelé qu'à chaque nouvelle solution: la
+    détection d'un plateau demande donc une vérification périodique séparée.
+    """
+
+    def __init__(self, solver, callback, politique, telemetrie=None, periode=1.0):
+        self.solver = solver
+        self.callback = callback
+        self.politique = politique
+        self.telemetrie = telemetrie
+        self.periode = periode
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._boucle, daemon=True)
+
+    def demarrer(self):
+        self._thread.start()
+
+    def _boucle(self):
+        while not self._arret.wait(self.periode):
+            derniere = self.callback.derniere_amelioration
+            if derniere is None:
+                continue  # Jamais d'arrêt avant la première solution
+            secondes = time.monotonic() - derniere
+            if self.politique.plateau_atteint(secondes):
+                print(
+                    f"⏹️ Aucune amélioration depuis {secondes:.0f}s, arrêt de la recherche"
+                )
+                if self.telemetrie is not None:
+                    self.telemetrie.evenement(
+                        "arret", raison="plateau", sans_amelioration=round(secondes, 3)
+                    )
+                self.solver.StopSearch()
+                return
+
+    def arreter(self):
+        self._arret.set()
+        self._thread.join()
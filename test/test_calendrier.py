@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+import holidays
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from calendrier import CalendrierAcademique
+from main import EmploiDuTemps
+
+SEMAINES_SEMESTRE = [37, 38, 39, 41, 42, 43, 45, 46, 47, 48, 50, 51, 1, 2, 3, 4, 5, 6]
+
+
+class TestCalendrierAcademique(unittest.TestCase):
+
+    def setUp(self):
+        self.calendrier = CalendrierAcademique(
+            "2025-09-09",
+            "2026-01-16",
+            jours_feries=holidays.France(years=[2025, 2026]),
+            semaines=SEMAINES_SEMESTRE,
+        )
+
+    def test_semaines_sur_deux_annees(self):
+        """Les semaines 1 à 6 du semestre tombent en 2026."""
+        self.assertEqual(self.calendrier.date(1, 0), date(2025, 12, 29))
+        self.assertEqual(self.calendrier.date(6, 4), date(2026, 2, 6))
+        self.assertEqual(self.calendrier.date(38, 0), date(2025, 9, 15))
+        self.assertEqual(self.calendrier.date_iso(2026, 2, 1), date(2026, 1, 5))
+        self.assertIsNone(self.calendrier.date_iso(2025, 2, 1))
+
+    def test_masques(self):
+        """Jours fériés et jours hors période ne sont pas ouvrables."""
+        # 11 novembre 2025: mardi de la semaine 46
+        self.assertTrue(self.calendrier.feries[SEMAINES_SEMESTRE.index(46), 1])
+        self.assertFalse(self.calendrier.est_ouvrable(46, 1))
+        # 1er janvier 2026: jeudi de la semaine 1
+        self.assertFalse(self.calendrier.est_ouvrable(1, 3))
+        # Avant date_debut et après date_fin
+        self.assertFalse(self.calendrier.est_ouvrable(37, 0))
+        self.assertTrue(self.calendrier.est_ouvrable(37, 1))
+        self.assertFalse(self.calendrier.est_ouvrable(4, 0))
+
+    def test_index_temps_dense(self):
+        """L'indice temporel numérote les jours ouvrables sans trou."""
+        index = self.calendrier.index_temps
+        valides = index[self.calendrier.ouvrable]
+        self.assertEqual(
+            valides.tolist(), list(range(self.calendrier.nb_jours_ouvrables))
+        )
+        self.assertTrue((index[~self.calendrier.ouvrable] == -1).all())
+
+    def test_parite(self):
+        self.assertTrue(self.calendrier.est_semaine_paire(38))
+        self.assertFalse(self.calendrier.est_semaine_paire(1))
+
+    def test_semaine_hors_periode(self):
+        with self.assertRaises(ValueError):
+            CalendrierAcademique("2025-09-01", "2025-09-30", semaines=[38, 53])
+
+    def test_emploi_du_temps_sans_dates(self):
+        """Sans dates explicites, l'année avance au passage de la semaine 52 à 1."""
+        scheduler = EmploiDuTemps(annee=2025, semaines=[51, 1, 2])
+        self.assertEqual(scheduler.calendrier[2][0].date(), date(2026, 1, 5))
+        self.assertEqual(scheduler.calendrier[51][0].date(), date(2025, 12, 15))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from classement import (
+    classer_seances,
+    compter_candidats,
+    variables_fixees_a_zero,
+)
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestClassement(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "AMPHI", 100, "amphi", disponibilite=disponibilite_complete()),
+        ]
+        lundi_matin = {
+            jour: {"matin": jour == "lundi", "apres_midi": False} for jour in JOURS
+        }
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=lundi_matin),
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        td = Cours("C1", "TD libre", self.enseignants[0], None, 120, 120, "TD")
+        td.ids_groupes = ["G1"]
+        cm = Cours("C2", "CM", self.enseignants[0], None, 120, 120, "CM")
+        cm.ids_groupes = ["G1", "G2"]
+        rare = Cours("C3", "TD contraint", self.enseignants[1], None, 120, 120, "TD")
+        rare.ids_groupes = ["G2"]
+        self.seances = generer_seance([td, cm, rare], self.groupes)
+
+    def test_ordre_sans_candidats(self):
+        """Enseignant le moins disponible d'abord, puis le CM multi-groupes."""
+        ordre = [s.cours.id_cours for s, _ in classer_seances(self.seances)]
+        self.assertEqual(ordre, ["C3", "C2", "C1"])
+
+    def test_candidats_prioritaires(self):
+        candidats = {s.id_seance: 10 for s in self.seances}
+        td = next(s for s in self.seances if s.cours.id_cours == "C1")
+        candidats[td.id_seance] = 1
+        classement = classer_seances(self.seances, candidats)
+        self.assertIs(classement[0][0], td)
+        self.assertEqual(classement[0][1]["candidats"], 1)
+
+    def test_candidats_apres_elagage(self):
+        """Les placements fixés à 0 par les contraintes ne sont pas comptés."""
+        scheduler = EmploiDuTemps(
+            annee=2025, semaines=[38], date_debut="2025-09-15", date_fin="2025-09-16"
+        )
+        model = cp_model.CpModel()
+        seance_vars = scheduler._creer_variables(model, self.seances, self.salles)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler._ajouter_contraintes(
+                model,
+                seance_vars,
+                self.seances,
+                self.salles,
+                self.enseignants,
+                self.groupes,
+            )
+        bruts = compter_candidats(seance_vars)
+        elagues = compter_candidats(seance_vars, model)
+        rare = next(s for s in self.seances if s.cours.id_cours == "C3")
+        # E2 n'est disponible que le lundi matin, le CM ne va qu'en amphi
+        self.assertLess(elagues[rare.id_seance], bruts[rare.id_seance] // 4)
+        self.assertTrue(all(elagues[s] < bruts[s] for s in bruts))
+
+        fixees = variables_fixees_a_zero(model)
+        solver = cp_model.CpSolver()
+        self.assertEqual(solver.Solve(model), cp_model.OPTIMAL)
+        self.assertTrue(
+            all(
+                solver.Value(v) == 0
+                for v in seance_vars.values()
+                if v.Index() in fixees
+            )
+        )
+
+        # Après élagage, la séance de E2 devient la plus contrainte
+        self.assertIs(classer_seances(self.seances, elagues)[0][0], rare)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, time
+
+from openpyxl import load_workbook
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from classeur import _nom_feuille, exporter_classeur
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+
+class TestClasseur(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [Salle(1, "A", 60), Salle(2, "B", 60)]
+        enseignants = [
+            Enseignant(1, "E1", "standard"),
+            Enseignant(2, "E2", "standard"),
+        ]
+        parent = Groupe("P", "Promo", 0)
+        self.groupes = [
+            parent,
+            Groupe("P1", "Promo 1", 10, id_parent="P"),
+            Groupe("P2", "Promo 2", 10, id_parent="P"),
+        ]
+        parent.sous_groupes = self.groupes[1:]
+        cm = Cours("CM", "Amphi", enseignants[0], None, 240, 120, "CM")
+        cm.ids_groupes = ["P"]
+        td = Cours("TD", "Atelier", enseignants[1], None, 120, 120, "TD")
+        td.ids_groupes = ["P1"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            seances = generer_seance([cm, td], self.groupes)
+        scheduler = EmploiDuTemps(
+            annee=2025, semaines=[38, 39], date_debut="2025-09-15"
+        )
+        scheduler._configurer_grille(seances)
+        # CM le lundi des deux semaines en salle A, TD le lundi de la semaine 38
+        # en salle B, au créneau suivant celui du CM
+        affectation = {
+            seances[0].id_seance: (1, 0, 0, 1),
+            seances[1].id_seance: (0, 0, 0, 1),
+            seances[2].id_seance: (0, 0, 1, 2),
+        }
+        self.solution = scheduler._construire_emploi_du_temps(
+            affectation, seances, self.salles
+        )
+        self.dossier = tempfile.TemporaryDirectory()
+        self.chemin = os.path.join(self.dossier.name, "edt.xlsx")
+        with contextlib.redirect_stdout(io.StringIO()):
+            exporter_classeur(self.solution, self.chemin, self.groupes)
+        self.classeur = load_workbook(self.chemin)
+
+    def tearDown(self):
+        self.classeur.close()
+        self.dossier.cleanup()
+
+    def lignes(self, feuille):
+        return list(self.classeur[feuille].iter_rows(min_row=2, values_only=True))
+
+    def test_feuilles(self):
+        self.assertEqual(
+            self.classeur.sheetnames,
+            [
+                "Semaine 38",
+                "Semaine 39",
+                "G Promo",
+                "G Promo 1",
+                "G Promo 2",
+                "E E1",
+                "E E2",
+                "Occupation salles",
+            ],
+        )
+        # Séances triées par date et heure; le sous-groupe voit le cours commun
+        semaine = self.lignes("Semaine 38")
+        self.assertEqual([ligne[5] for ligne in semaine], ["Amphi", "Atelier"])
+        self.assertEqual(semaine[0][:3], (datetime(2025, 9, 15), "Lundi", time(8)))
+        self.assertEqual(
+            [ligne[0].day for ligne in self.lignes("G Promo 1")], [15, 15, 22]
+        )
+        self.assertEqual(
+            [ligne[5] for ligne in self.lignes("G Promo 2")], ["Amphi"] * 2
+        )
+        self.assertEqual(len(self.lignes("E E2")), 1)
+
+    def test_styles_nommes(self):
+        """Les cellules mises en forme partagent les styles nommés du classeur."""
+        feuille = self.classeur["Semaine 38"]
+        self.assertEqual(feuille["A1"].style, "edt_entete")
+        self.assertEqual(feuille["A2"].style, "edt_date")
+        self.assertEqual(feuille["C2"].number_format, "HH:MM")
+        self.assertEqual(feuille["G2"].style, "edt_CM")
+        self.assertEqual(feuille["G3"].style, "edt_TD")
+        self.assertEqual(feuille.freeze_panes, "A2")
+        self.assertEqual(
+            sorted(self.classeur.named_styles),
+            sorted(
+                ["Normal", "edt_entete", "edt_date", "edt_heure", "edt_CM", "edt_TD"]
+            ),
+        )
+
+    def test_occupation(self):
+        """Une colonne par salle, une ligne par créneau d'affichage occupé."""
+        feuille = self.classeur["Occupation salles"]
+        self.assertEqual(
+            [c.value for c in feuille[1]], ["Date", "Jour", "Créneau", "A", "B"]
+        )
+        occupation = {
+            (ligne[0].day, ligne[2]): ligne[3:]
+            for ligne in self.lignes("Occupation salles")
+        }
+        debut_td = int(self.solution.table["debut"][2])
+        creneau_td = self.solution.creneaux_affichage[(debut_td - 8 * 60) // 120]
+        self.assertEqual(occupation[(15, "8h00")][0], "Amphi (Promo)")
+        self.assertEqual(occupation[(15, creneau_td)][1], "Atelier (Promo 1)")
+        self.assertEqual(occupation[(22, "8h00")], ("Amphi (Promo)", None))
+
+    def test_nom_feuille(self):
+        utilises = set()
+        nom = _nom_feuille("G M1/DASI [A]", utilises)
+        self.assertEqual(nom, "G M1_DASI _A_")
+        # Excel ne distingue pas la casse des noms de feuilles
+        doublon = _nom_feuille("g m1_dasi _a_", utilises)
+        self.assertEqual(doublon, "g m1_dasi _a_ (2)")
+        self.assertEqual(len(_nom_feuille("x" * 40, utilises)), 31)
+
+
+if __name__ == "__main__":
+    unittest.main()
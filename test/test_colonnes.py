@@ -0,0 +1,148 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from colonnes import (
+    COLONNES_ENSEIGNANTS,
+    ErreurDonnees,
+    charger_instance_colonnes,
+    charger_salles_colonnes,
+    disponibilite_depuis_masque,
+    lire_table,
+    masques_disponibilite,
+)
+from main import charger_cours, charger_enseignants, charger_groupes, charger_salles
+
+DONNEES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+)
+FICHIERS = ("salle.csv", "enseignants.csv", "groupe.csv", "cours.csv")
+
+try:
+    import pyarrow  # noqa: F401
+
+    PYARROW = True
+except ImportError:
+    PYARROW = False
+
+
+def attributs(objet):
+    """Attributs d'un objet du modèle, les objets liés remplacés par leur ID."""
+    resultat = {}
+    for nom, valeur in vars(objet).items():
+        if isinstance(valeur, list):
+            valeur = [getattr(v, "id", v) for v in valeur]
+        elif hasattr(valeur, "id"):
+            valeur = valeur.id
+        resultat[nom] = valeur
+    return resultat
+
+
+class TestColonnes(unittest.TestCase):
+
+    def setUp(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            salles = charger_salles(os.path.join(DONNEES, "salle.csv"))
+            enseignants = charger_enseignants(os.path.join(DONNEES, "enseignants.csv"))
+            groupes = charger_groupes(os.path.join(DONNEES, "groupe.csv"))
+            cours = charger_cours(
+                os.path.join(DONNEES, "cours.csv"), enseignants, groupes
+            )
+        self.attendu = (salles, enseignants, groupes, cours)
+
+    def verifier_identiques(self, obtenu):
+        for attendus, obtenus in zip(self.attendu, obtenu):
+            self.assertEqual(
+                [attributs(o) for o in obtenus], [attributs(o) for o in attendus]
+            )
+
+    def test_memes_objets_que_csv(self):
+        """Les chargeurs en colonnes produisent les objets des chargeurs CSV."""
+        self.verifier_identiques(
+            charger_instance_colonnes(
+                *(os.path.join(DONNEES, fichier) for fichier in FICHIERS)
+            )
+        )
+
+    def test_dataframes_types(self):
+        """Un DataFrame aux colonnes typées (comme Parquet) donne les mêmes objets."""
+        tables = [pd.read_csv(os.path.join(DONNEES, fichier)) for fichier in FICHIERS]
+        self.assertTrue(pd.api.types.is_integer_dtype(tables[0]["Lundi_Matin"]))
+        self.verifier_identiques(charger_instance_colonnes(*tables))
+
+    @unittest.skipUnless(PYARROW, "pyarrow non installé")
+    def test_parquet(self):
+        """Les tables Parquet donnent les mêmes objets."""
+        with tempfile.TemporaryDirectory() as dossier:
+            chemins = []
+            for fichier in FICHIERS:
+                chemin = os.path.join(dossier, fichier.replace(".csv", ".parquet"))
+                pd.read_csv(os.path.join(DONNEES, fichier)).to_parquet(chemin)
+                chemins.append(chemin)
+            self.verifier_identiques(charger_instance_colonnes(*chemins))
+
+    @unittest.skipIf(PYARROW, "pyarrow installé")
+    def test_parquet_sans_pyarrow(self):
+        """Sans pyarrow, lire un Parquet lève une ImportError explicite."""
+        with self.assertRaisesRegex(ImportError, "pyarrow"):
+            lire_table("salles.parquet")
+
+    def test_masques(self):
+        """Bit 2 * jour + période, et retour au dictionnaire de disponibilité."""
+        table = pd.DataFrame(
+            [[1, 0, 0, 0, 0, 0, 0, 0, 0, 1], [0, 1, 1, 1, 1, 1, 1, 1, 1, 1]],
+            columns=COLONNES_ENSEIGNANTS,
+        )
+        masques = masques_disponibilite(table, COLONNES_ENSEIGNANTS)
+        self.assertEqual(masques.tolist(), [0b1000000001, 0b1111111110])
+        disponibilite = disponibilite_depuis_masque(masques[1])
+        self.assertEqual(disponibilite["lundi"], {"matin": False, "apres_midi": True})
+        self.assertEqual(disponibilite["vendredi"], {"matin": True, "apres_midi": True})
+
+    def test_erreurs_signalees_ensemble(self):
+        """Types, doublons, disponibilités et références inconnues en une erreur."""
+        tables = [
+            pd.read_csv(
+                os.path.join(DONNEES, fichier), dtype=str, keep_default_na=False
+            )
+            for fichier in FICHIERS
+        ]
+        salles, enseignants, groupes, cours = tables
+        salles.loc[1, "id"] = salles.loc[0, "id"]
+        salles.loc[2, "effectif_max"] = "beaucoup"
+        enseignants.loc[0, "lundi_matin"] = "2"
+        groupes.loc[len(groupes)] = ["XX", "Groupe XX", "10", "INCONNU"]
+        cours.loc[0, "enseignant"] = "999"
+        cours.loc[1, "groupes"] = "DASI,FANTOME"
+
+        with self.assertRaises(ErreurDonnees) as contexte:
+            charger_instance_colonnes(salles, enseignants, groupes, cours)
+        erreurs = "\n".join(contexte.exception.erreurs)
+        self.assertEqual(len(contexte.exception.erreurs), 6)
+        for attendu in (
+            "salles: identifiant 1 en double",
+            "salles 3: effectif_max n'est pas un entier",
+            "enseignants 1: lundi_matin doit valoir 0 ou 1",
+            "groupes XX: groupe parent INCONNU inconnu",
+            "cours 1: enseignant 999 inconnu",
+            "cours 2: groupe FANTOME inconnu",
+        ):
+            self.assertIn(attendu, erreurs)
+
+    def test_colonne_manquante(self):
+        table = pd.read_csv(os.path.join(DONNEES, "salle.csv")).drop(
+            columns="Mardi_Matin"
+        )
+        with self.assertRaisesRegex(ErreurDonnees, "Mardi_Matin"):
+            charger_salles_colonnes(table)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import itertools
+import os
+import sys
+import unittest
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from conflits import graphe_conflits
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestGrapheConflits(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "LABO", 30, "labo", disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(3, "E3", "labo", disponibilite=disponibilite_complete()),
+            Enseignant(4, "E4", "labo", disponibilite=disponibilite_complete()),
+        ]
+        # G1 a deux sous-groupes; G2 est indépendant
+        self.sg1 = Groupe("G1A", "Groupe 1A", 12, id_parent="G1")
+        self.sg2 = Groupe("G1B", "Groupe 1B", 12, id_parent="G1")
+        g1 = Groupe("G1", "Groupe 1", 24, sous_groupes=[self.sg1, self.sg2])
+        self.groupes = [g1, self.sg1, self.sg2, Groupe("G2", "Groupe 2", 20)]
+
+        def cours(id_cours, enseignant, groupes, type_cours="TD"):
+            c = Cours(id_cours, id_cours, enseignant, None, 120, 120, type_cours)
+            c.ids_groupes = groupes
+            return c
+
+        self.seances = generer_seance(
+            [
+                cours("C1", self.enseignants[0], ["G1"], "CM"),
+                cours("C2", self.enseignants[1], ["G1A"]),
+                cours("C3", self.enseignants[1], ["G2"]),
+                cours("C4", self.enseignants[0], ["G1B"]),
+                # Deux enseignants différents, mais le seul labo est imposé
+                cours("C5", self.enseignants[2], ["G2"]),
+                cours("C6", self.enseignants[3], ["G1A"]),
+            ],
+            self.groupes,
+        )
+        self.ids = {s.cours.id_cours: s.id_seance for s in self.seances}
+
+    def _graphe(self):
+        return graphe_conflits(
+            self.seances, self.enseignants, self.groupes, self.salles
+        )
+
+    def _conflit(self, graphe, c1, c2):
+        return self.ids[c2] in graphe.voisins[self.ids[c1]]
+
+    def test_aretes(self):
+        graphe = self._graphe()
+        self.assertTrue(self._conflit(graphe, "C1", "C2"))  # parent / sous-groupe
+        self.assertTrue(self._conflit(graphe, "C2", "C3"))  # même enseignant
+        self.assertFalse(self._conflit(graphe, "C2", "C4"))  # sous-groupes frères
+        self.assertTrue(self._conflit(graphe, "C5", "C6"))  # même salle imposée
+        self.assertFalse(self._conflit(graphe, "C1", "C3"))
+
+    def test_cliques_couvrent_les_aretes(self):
+        graphe = self._graphe()
+        for clique in graphe.cliques:
+            for a, b in itertools.combinations(clique, 2):
+                self.assertIn(b, graphe.voisins[a])
+        for a, voisins in graphe.voisins.items():
+            for b in voisins:
+                self.assertTrue(any({a, b} <= clique for clique in graphe.cliques))
+        self.assertEqual(graphe.statistiques()["conflits_cliques"], len(graphe.cliques))
+
+    def test_cache(self):
+        self.assertIs(self._graphe(), self._graphe())
+
+    def test_meme_modele(self):
+        """Les cliques et les contraintes par ressource admettent les mêmes solutions."""
+
+        def nb_solutions(par_cliques):
+            scheduler = EmploiDuTemps(
+                annee=2025,
+                semaines=[38],
+                date_debut="2025-09-15",
+                date_fin="2025-09-15",
+                pas_creneau=120,
+                exclusivite_par_cliques=par_cliques,
+            )
+            model = cp_model.CpModel()
+            seance_vars = scheduler._creer_variables(model, self.seances, self.salles)
+            scheduler._ajouter_contraintes(
+                model,
+                seance_vars,
+                self.seances,
+                self.salles,
+                self.enseignants,
+                self.groupes,
+            )
+            solver = cp_model.CpSolver()
+            solver.parameters.enumerate_all_solutions = True
+            compteur = _Compteur()
+            solver.Solve(model, compteur)
+            return compteur.nb
+
+        nb = nb_solutions(False)
+        self.assertGreater(nb, 0)
+        self.assertEqual(nb_solutions(True), nb)
+
+
+class _Compteur(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self.nb = 0
+
+    def on_solution_callback(self):
+        self.nb += 1
+
+
+if __name__ == "__main__":
+    unittest.main()
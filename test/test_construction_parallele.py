@@ -0,0 +1,125 @@
+import os
+import sys
+import unittest
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from construction_parallele import _lots
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestConstructionParallele(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "B", 60, "Amphi", disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=disponibilite_complete()),
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        c1 = Cours("C1", "Cours 1", self.enseignants[0], None, 240, 120, "TD")
+        c1.ids_groupes = ["G1"]
+        c2 = Cours("C2", "Cours 2", self.enseignants[1], None, 120, 120, "CM")
+        c2.ids_groupes = ["G1", "G2"]
+        self.seances = generer_seance([c1, c2], self.groupes)
+
+    def construire(self, nb_processus, **options):
+        edt = EmploiDuTemps(
+            annee=2025,
+            semaines=[38],
+            date_debut="2025-09-15",
+            date_fin="2025-09-17",
+            nb_processus_construction=nb_processus,
+            **options,
+        )
+        model = cp_model.CpModel()
+        seance_vars = edt._creer_variables(model, self.seances, self.salles)
+        edt._ajouter_contraintes(
+            model,
+            seance_vars,
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+        )
+        return model
+
+    def test_meme_modele(self):
+        """Le modèle fusionné est identique au modèle construit séquentiellement."""
+        for options in (
+            {},
+            {"exclusivite_par_cliques": False},
+            {"contraintes_redondantes": ["minutes_groupe", "charge_enseignant"]},
+        ):
+            with self.subTest(**options):
+                sequentiel = self.construire(None, **options)
+                parallele = self.construire(3, **options)
+                self.assertGreater(len(parallele.Proto().constraints), 0)
+                self.assertEqual(parallele.Proto(), sequentiel.Proto())
+
+    def test_variables_auxiliaires_accessibles(self):
+        """Les variables fusionnées restent accessibles par leur indice."""
+        model = self.construire(2)
+        dernier = len(model.Proto().variables) - 1
+        self.assertEqual(model.GetIntVarFromProtoIndex(dernier).Index(), dernier)
+        self.assertEqual(model.NewBoolVar("x").Index(), dernier + 1)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 30
+        self.assertIn(solver.Solve(model), (cp_model.OPTIMAL, cp_model.FEASIBLE))
+
+    def test_api_ortools(self):
+        """
+        La fusion n'utilise que l'API publique de CpModel: clone() d'un modèle
+        lu depuis un proto et NewIntVarFromDomain. Un échec ici signale un
+        changement d'OR-Tools à reporter dans construction_parallele et dans
+        l'étape solve de pipeline.py.
+        """
+        source = cp_model.CpModel()
+        source.NewBoolVar("b")
+        source.NewIntVar(0, 9, "i")
+        lu = cp_model.CpModel()
+        lu.Proto().ParseFromString(source.Proto().SerializeToString())
+        model = lu.clone()
+        self.assertEqual(model.GetBoolVarFromProtoIndex(0).Name(), "b")
+        self.assertEqual(model.GetIntVarFromProtoIndex(1).Name(), "i")
+        with self.assertRaises(ValueError):
+            model.GetBoolVarFromProtoIndex(1)
+
+        variable = model.NewIntVarFromDomain(
+            cp_model.Domain.FromFlatIntervals([0, 1]), "aux"
+        )
+        self.assertEqual(variable.Index(), 2)
+        self.assertIs(model.GetBoolVarFromProtoIndex(2), variable)
+        self.assertEqual(list(model.Proto().variables[2].domain), [0, 1])
+
+    def test_lots(self):
+        """Les étapes locales restent seules et les lots sont contigus."""
+        etapes = [(str(k), None, (), k == 3) for k in range(7)]
+        blocs = _lots(etapes, 2)
+        self.assertEqual(
+            [(locale, [e[0] for e in lot]) for locale, lot in blocs],
+            [
+                (False, ["0"]),
+                (False, ["1", "2"]),
+                (True, ["3"]),
+                (False, ["4"]),
+                (False, ["5", "6"]),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
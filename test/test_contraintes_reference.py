@@ -0,0 +1,293 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from contraintes import CONTRAINTES_REDONDANTES, get_seance_order
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+# Grille de 30 minutes de 8h à 20h: pause cherchée entre 12h et 14h30,
+# l'après-midi commence à 13h
+PAUSE_DEBUT, PAUSE_FIN, FIN_MATIN = 8, 12, 10
+
+
+class Reference:
+    """
+    Règles des constructeurs de contraintes d'origine, vérifiées directement
+    sur une affectation {id_seance: (s_idx, j, cr_debut, salle_id)}, complète
+    ou partielle: chaque règle ne porte que sur les séances affectées.
+    """
+
+    def __init__(self, edt, seances, salles, groupes):
+        self.edt = edt
+        self.seances = seances
+        self.salles = {sa.id: sa for sa in salles}
+        self.duree = {s.id_seance: int(s.duree * 60 / 30) for s in seances}
+        sous_groupes = {
+            g.id_groupe: [sg.id_groupe for sg in g.sous_groupes]
+            for g in groupes
+            if getattr(g, "sous_groupes", None)
+        }
+        self.propres = {}
+        self.occupes = {}
+        for s in seances:
+            ids = [g.id_groupe for g in s.groupes]
+            self.propres[s.id_seance] = set(ids)
+            self.occupes[s.id_seance] = set(ids).union(
+                *(sous_groupes.get(g, []) for g in ids)
+            )
+
+    def domaine(self, s):
+        """Placements pour lesquels une variable était créée."""
+        effectif = sum(g.effectif for g in s.groupes)
+        duree = self.duree[s.id_seance]
+        return [
+            (s_idx, j, cr, sa.id)
+            for s_idx, semaine in enumerate(self.edt.SEMAINES)
+            for j in range(self.edt.NB_JOURS)
+            if self.edt.calendrier[semaine][j] is not None
+            for cr in range(self.edt.NB_CRENEAUX - duree + 1)
+            for sa in self.salles.values()
+            if sa.effectif_max >= effectif
+            and not (s.cours.type_cours == "TD" and sa.type_salle == "Amphi")
+        ]
+
+    def creneaux(self, s, placement):
+        return range(placement[2], placement[2] + self.duree[s.id_seance])
+
+    def unaire(self, s, placement):
+        s_idx, j, cr_debut, sa_id = placement
+        sa = self.salles[sa_id]
+        e = s.cours.enseignant
+        semaine = self.edt.SEMAINES[s_idx]
+        if not (e.semaine_paire if semaine % 2 == 0 else e.semaine_impaire):
+            return False
+        if any(
+            not e.est_disponible(JOURS[j], "matin" if cr < FIN_MATIN else "apres_midi")
+            for cr in self.creneaux(s, placement)
+        ):
+            return False
+        if (
+            s.type_seance == "TD"
+            and e.besoin_salle != "standard"
+            and sa.type_salle != e.besoin_salle
+        ):
+            return False
+        matin = cr_debut < FIN_MATIN
+        if not sa.est_disponible(JOURS[j], "matin" if matin else "apres_midi"):
+            return False
+        return not (matin and cr_debut + self.duree[s.id_seance] > FIN_MATIN)
+
+    def respecte(self, affectation):
+        seances = [s for s in self.seances if s.id_seance in affectation]
+        for s in seances:
+            if not self.unaire(s, affectation[s.id_seance]):
+                return False
+
+        # Exclusivité des enseignants, des groupes (et sous-groupes) et des salles
+        for i, s1 in enumerate(seances):
+            p1 = affectation[s1.id_seance]
+            for s2 in seances[i + 1 :]:
+                p2 = affectation[s2.id_seance]
+                if p1[:2] != p2[:2] or not set(self.creneaux(s1, p1)) & set(
+                    self.creneaux(s2, p2)
+                ):
+                    continue
+                if (
+                    s1.cours.enseignant.id == s2.cours.enseignant.id
+                    or self.occupes[s1.id_seance] & self.occupes[s2.id_seance]
+                    or p1[3] == p2[3]
+                ):
+                    return False
+
+        # Pause déjeuner: deux créneaux libres consécutifs, séances propres
+        occupation = {}
+        for s in seances:
+            p = affectation[s.id_seance]
+            entites = [("e", s.cours.enseignant.id)]
+            entites += [("g", g) for g in self.propres[s.id_seance]]
+            for entite in entites:
+                occupation.setdefault((entite, p[:2]), set()).update(
+                    self.creneaux(s, p)
+                )
+        for occupes in occupation.values():
+            if all(
+                start in occupes or start + 1 in occupes
+                for start in range(PAUSE_DEBUT, PAUSE_FIN)
+            ):
+                return False
+
+        # Ordre des séances d'un même cours
+        nb_creneaux = self.edt.NB_CRENEAUX
+        temps = {
+            s_id: (s_idx * self.edt.NB_JOURS + j) * nb_creneaux + cr
+            for s_id, (s_idx, j, cr, _) in affectation.items()
+        }
+        par_cours = {}
+        for s in sorted(seances, key=get_seance_order):
+            par_cours.setdefault(s.cours.id_cours, []).append(s.id_seance)
+        for ids in par_cours.values():
+            if any(temps[a] >= temps[b] for a, b in zip(ids, ids[1:])):
+                return False
+        return True
+
+    def solutions(self):
+        """Toutes les affectations complètes, par retour arrière."""
+        domaines = [(s.id_seance, self.domaine(s)) for s in self.seances]
+        resultats = set()
+
+        def explorer(indice, affectation):
+            if indice == len(domaines):
+                resultats.add(frozenset(affectation.items()))
+                return
+            s_id, domaine = domaines[indice]
+            for placement in domaine:
+                affectation[s_id] = placement
+                if self.respecte(affectation):
+                    explorer(indice + 1, affectation)
+                del affectation[s_id]
+
+        explorer(0, {})
+        return resultats
+
+
+class Collecteur(cp_model.CpSolverSolutionCallback):
+    """Projette chaque solution sur les variables de placement."""
+
+    def __init__(self, seance_vars):
+        super().__init__()
+        self.seance_vars = seance_vars
+        self.solutions = set()
+
+    def on_solution_callback(self):
+        self.solutions.add(
+            frozenset(
+                (cle[0], cle[1:])
+                for cle, var in self.seance_vars.items()
+                if self.Value(var)
+            )
+        )
+
+
+class TestContraintesReference(unittest.TestCase):
+    """
+    Le modèle construit par le module contraintes a exactement les solutions
+    des règles d'origine, sur de petites instances énumérées entièrement.
+    """
+
+    def _comparer(self, cours, groupes, salles, enseignants, date_debut, date_fin):
+        with contextlib.redirect_stdout(io.StringIO()):
+            seances = generer_seance(cours, groupes)
+            edt = EmploiDuTemps(
+                annee=2025,
+                semaines=[38, 39],
+                date_debut=date_debut,
+                date_fin=date_fin,
+            )
+            edt._configurer_grille(seances)
+            reference = Reference(edt, seances, salles, groupes)
+            attendues = reference.solutions()
+        self.assertGreater(len(attendues), 0)
+
+        for options in (
+            {},
+            {"exclusivite_par_cliques": False},
+            {"contraintes_redondantes": list(CONTRAINTES_REDONDANTES)},
+        ):
+            with self.subTest(**options), contextlib.redirect_stdout(io.StringIO()):
+                edt = EmploiDuTemps(
+                    annee=2025,
+                    semaines=[38, 39],
+                    date_debut=date_debut,
+                    date_fin=date_fin,
+                    **options,
+                )
+                model = cp_model.CpModel()
+                seance_vars = edt._creer_variables(model, seances, salles)
+                self.assertEqual(
+                    sorted(seance_vars),
+                    sorted(
+                        (s.id_seance,) + placement
+                        for s in seances
+                        for placement in reference.domaine(s)
+                    ),
+                )
+                edt._ajouter_contraintes(
+                    model, seance_vars, seances, salles, enseignants, groupes
+                )
+                solver = cp_model.CpSolver()
+                solver.parameters.enumerate_all_solutions = True
+                solver.parameters.num_workers = 1
+                collecteur = Collecteur(seance_vars)
+                statut = solver.Solve(model, collecteur)
+                self.assertEqual(statut, cp_model.OPTIMAL)
+                self.assertEqual(collecteur.solutions, attendues)
+
+    def test_exclusivite_pause_ordre(self):
+        """Chevauchements (sous-groupes compris), pause déjeuner et ordre."""
+        salles = [
+            Salle(1, "A", 30),
+            Salle(2, "B", 30, disponibilite={"lundi": {"matin": True}}),
+        ]
+        enseignants = [Enseignant(1, "E1", "standard"), Enseignant(2, "E2", "standard")]
+        promo = Groupe("P", "Promo", 10)
+        sous_groupe = Groupe("SG", "Sous-groupe", 10, id_parent="P")
+        promo.sous_groupes = [sous_groupe]
+        groupes = [promo, sous_groupe]
+        cm = Cours("C1", "Amphi", enseignants[0], None, 180, 180, "CM")
+        cm.ids_groupes = ["P"]
+        td = Cours("C2", "Atelier", enseignants[1], None, 60, 30, "TD")
+        td.ids_groupes = ["SG"]
+        self._comparer(
+            [cm, td], groupes, salles, enseignants, "2025-09-15", "2025-09-15"
+        )
+
+    def test_disponibilites(self):
+        """Parité des semaines, disponibilités, besoin de salle et capacité."""
+        salles = [
+            Salle(1, "A", 30),
+            Salle(
+                2,
+                "LABO",
+                30,
+                "labo",
+                disponibilite={
+                    "lundi": {"matin": True},
+                    "vendredi": {"matin": True, "apres_midi": True},
+                },
+            ),
+            Salle(3, "AMPHI", 100, "Amphi"),
+        ]
+        enseignants = [
+            Enseignant(1, "E1", "labo", semaine_impaire=False),
+            Enseignant(
+                2,
+                "E2",
+                "standard",
+                disponibilite={
+                    "lundi": {"matin": True, "apres_midi": True},
+                    "vendredi": {"apres_midi": True},
+                },
+            ),
+        ]
+        groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        labo = Cours("C1", "Labo", enseignants[0], None, 60, 60, "TD")
+        labo.ids_groupes = ["G1"]
+        cm = Cours("C2", "Amphi", enseignants[1], None, 60, 60, "CM")
+        cm.ids_groupes = ["G1", "G2"]
+        # Vendredi de la semaine 38 (paire) et lundi de la semaine 39 (impaire)
+        self._comparer(
+            [labo, cm], groupes, salles, enseignants, "2025-09-19", "2025-09-22"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import unittest
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from estimation import choisir_strategie, estimer_modele
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+def compter_termes(proto):
+    """Termes d'un modèle: variables des lignes, littéraux et conditions."""
+    termes = 0
+    for ct in proto.constraints:
+        contrainte = getattr(ct, ct.WhichOneof("constraint"))
+        if hasattr(contrainte, "literals"):
+            termes += len(contrainte.literals)
+        else:
+            termes += len(contrainte.vars)
+        termes += len(ct.enforcement_literal)
+    return termes
+
+
+class TestEstimation(unittest.TestCase):
+
+    def setUp(self):
+        matin = {jour: {"matin": True, "apres_midi": jour != "mardi"} for jour in JOURS}
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "B", 30, disponibilite=matin),
+            Salle(3, "AMPHI", 100, "Amphi", disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", semaine_impaire=False, disponibilite=matin),
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        cm = Cours("C1", "CM", self.enseignants[0], None, 240, 120, "CM")
+        cm.ids_groupes = ["G1", "G2"]
+        td = Cours("C2", "TD", self.enseignants[1], None, 360, 120, "TD")
+        td.ids_groupes = ["G1"]
+        self.seances = generer_seance([cm, td], self.groupes)
+        self.scheduler = EmploiDuTemps(
+            annee=2025,
+            semaines=[38, 39],
+            date_debut="2025-09-15",
+            date_fin="2025-09-26",
+        )
+
+    def test_estimation_proche_du_modele(self):
+        estimation = estimer_modele(
+            self.scheduler, self.seances, self.salles, self.enseignants, self.groupes
+        )["monolithique"]
+        model = cp_model.CpModel()
+        seance_vars = self.scheduler._creer_variables(model, self.seances, self.salles)
+        self.scheduler._ajouter_contraintes(
+            model,
+            seance_vars,
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+        )
+        proto = model.Proto()
+        self.assertEqual(estimation["variables"], len(proto.variables))
+        # Contraintes à 0,1 % près, termes à 0,2 % près sur cette petite instance
+        self.assertAlmostEqual(
+            estimation["contraintes"] / len(proto.constraints), 1, delta=0.001
+        )
+        self.assertAlmostEqual(
+            estimation["termes"] / compter_termes(proto), 1, delta=0.002
+        )
+
+    def test_choix_selon_budget(self):
+        estimations = {
+            "monolithique": {"memoire_mo": 900},
+            "salle_par_cours": {"memoire_mo": 200},
+            "hierarchique": {"memoire_mo": 50},
+        }
+        self.assertEqual(choisir_strategie(estimations, 1000), "monolithique")
+        self.assertEqual(choisir_strategie(estimations, 500), "salle_par_cours")
+        self.assertEqual(choisir_strategie(estimations, 100), "hierarchique")
+        self.assertEqual(choisir_strategie(estimations, 10), "hierarchique")
+
+    def test_generer_selon_budget(self):
+        edt = self.scheduler.generer_selon_budget(
+            self.seances, self.salles, self.enseignants, self.groupes, 1e-3
+        )
+        self.assertIsNotNone(edt)
+        self.assertEqual(self.scheduler.strategie_retenue, "hierarchique")
+        self.assertEqual(len(edt), len(self.seances))
+
+    def test_budget_hierarchique_salle_par_cours(self):
+        """Le choix de salle par cours n'empêche pas la résolution hiérarchique."""
+        self.scheduler.salle_par_cours = True
+        edt = self.scheduler.generer_selon_budget(
+            self.seances, self.salles, self.enseignants, self.groupes, 1e-3
+        )
+        self.assertIsNotNone(edt)
+        self.assertEqual(self.scheduler.strategie_retenue, "hierarchique")
+        self.assertEqual(len(edt), len(self.seances))
+        self.assertTrue(self.scheduler.salle_par_cours)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+import contextlib
+import filecmp
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+
+from dateutil.rrule import rrulestr
+
+from icalendar import Calendar
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flux_ics import (
+    ConvertisseurUTC,
+    detecter_series,
+    echapper,
+    evenements,
+    exporter_flux,
+    index_flux,
+    plier,
+)
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+DTSTAMP = "20250901T000000Z"
+
+
+class TestFormat(unittest.TestCase):
+
+    def test_echapper(self):
+        self.assertEqual(echapper("a, b; c\\d\ne"), "a\\, b\\; c\\\\d\\ne")
+
+    def test_plier(self):
+        """Lignes d'au plus 75 octets, sans couper un caractère accentué."""
+        ligne = "SUMMARY:" + "é" * 100
+        texte = plier(ligne)
+        morceaux = texte.split("\r\n")[:-1]
+        self.assertTrue(all(len(m.encode("utf-8")) <= 75 for m in morceaux))
+        self.assertEqual(morceaux[0] + "".join(m[1:] for m in morceaux[1:]), ligne)
+        self.assertEqual(plier("UID:x"), "UID:x\r\n")
+
+    def test_changement_d_heure(self):
+        """Le décalage UTC suit l'heure d'été, et n'est calculé qu'une fois par date."""
+        convertisseur = ConvertisseurUTC()
+        self.assertEqual(
+            convertisseur.utc(datetime(2025, 10, 24, 8, 30)), "20251024T063000Z"
+        )
+        self.assertEqual(
+            convertisseur.utc(datetime(2025, 10, 27, 8, 30)), "20251027T073000Z"
+        )
+        convertisseur.utc(datetime(2025, 10, 27, 14, 0))
+        self.assertEqual(
+            sorted(convertisseur._decalages), [date(2025, 10, 24), date(2025, 10, 27)]
+        )
+
+
+class TestFlux(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [Salle(1, "A", 60), Salle(2, "B", 60)]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard"),
+            Enseignant(2, "E2", "standard"),
+        ]
+        parent = Groupe("P", "Promo", 0)
+        self.groupes = [
+            parent,
+            Groupe("P1", "Promo 1", 10, id_parent="P"),
+            Groupe("P2", "Promo 2", 10, id_parent="P"),
+        ]
+        parent.sous_groupes = self.groupes[1:]
+        cm = Cours("CM", "Amphi", self.enseignants[0], None, 120, 120, "CM")
+        cm.ids_groupes = ["P"]
+        td = Cours("TD", "Atelier", self.enseignants[1], None, 120, 120, "TD")
+        td.ids_groupes = ["P1"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.seances = generer_seance([cm, td], self.groupes)
+        scheduler = EmploiDuTemps(annee=2025, semaines=[38], date_debut="2025-09-15")
+        scheduler._configurer_grille(self.seances)
+        affectation = {
+            s.id_seance: (0, k, 2 * k, 1 + k % 2) for k, s in enumerate(self.seances)
+        }
+        self.solution = scheduler._construire_emploi_du_temps(
+            affectation, self.seances, self.salles
+        )
+        self.dossier = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def test_heritage_des_groupes(self):
+        """Un sous-groupe reçoit les cours du parent; le parent ceux des sous-groupes."""
+        index = index_flux(self.solution, self.groupes)
+        cm, td = 0, 1
+        self.assertEqual(index[("groupes", "P")], [cm, td])
+        self.assertEqual(index[("groupes", "P1")], [cm, td])
+        self.assertEqual(index[("groupes", "P2")], [cm])
+        self.assertEqual(index[("enseignants", 2)], [td])
+        self.assertEqual(index[("salles", 1)], [cm])
+
+    def test_flux_paralleles_identiques(self):
+        """Les calendriers écrits par des processus sont ceux de l'écriture séquentielle."""
+        sequentiel = os.path.join(self.dossier.name, "seq")
+        parallele = os.path.join(self.dossier.name, "par")
+        with contextlib.redirect_stdout(io.StringIO()):
+            chemins = exporter_flux(
+                self.solution, self.groupes, sequentiel, dtstamp=DTSTAMP
+            )
+            exporter_flux(
+                self.solution, self.groupes, parallele, nb_processus=2, dtstamp=DTSTAMP
+            )
+        self.assertEqual(len(chemins), 3 + 2 + 2)
+        for chemin in chemins.values():
+            relatif = os.path.relpath(chemin, sequentiel)
+            self.assertTrue(
+                filecmp.cmp(chemin, os.path.join(parallele, relatif), shallow=False)
+            )
+
+        with open(chemins[("groupes", "P2")], "rb") as f:
+            calendrier = Calendar.from_ical(f.read())
+        self.assertEqual(str(calendrier["X-WR-CALNAME"]), "Groupe Promo 2")
+        (evenement,) = calendrier.walk("VEVENT")
+        self.assertEqual(str(evenement["LOCATION"]), "Salle A")
+        self.assertEqual(
+            evenement.decoded("DTSTART").isoformat(), "2025-09-15T06:00:00+00:00"
+        )
+
+    def test_export_incremental(self):
+        """Un second export ne réécrit que les calendriers touchés par un changement."""
+        dossier = os.path.join(self.dossier.name, "flux")
+        with contextlib.redirect_stdout(io.StringIO()):
+            chemins = exporter_flux(self.solution, self.groupes, dossier)
+        for chemin in chemins.values():
+            os.utime(chemin, ns=(0, 0))
+
+        # Nouveau DTSTAMP, même solution: rien n'est réécrit
+        with contextlib.redirect_stdout(io.StringIO()):
+            exporter_flux(self.solution, self.groupes, dossier, dtstamp=DTSTAMP)
+        self.assertTrue(all(os.stat(c).st_mtime_ns == 0 for c in chemins.values()))
+
+        # Le TD passe de la salle B à la salle A: la salle B disparaît
+        affectation = {
+            s.id_seance: (0, k, 2 * k, 1) for k, s in enumerate(self.seances)
+        }
+        solution = EmploiDuTemps(
+            annee=2025, semaines=[38], date_debut="2025-09-15"
+        )._construire_emploi_du_temps(affectation, self.seances, self.salles)
+        with contextlib.redirect_stdout(io.StringIO()):
+            exporter_flux(solution, self.groupes, dossier)
+        self.assertFalse(os.path.exists(chemins.pop(("salles", 2))))
+        reecrits = {
+            cle for cle, chemin in chemins.items() if os.stat(chemin).st_mtime_ns
+        }
+        self.assertEqual(
+            reecrits,
+            {("groupes", "P"), ("groupes", "P1"), ("enseignants", 2), ("salles", 1)},
+        )
+
+        with open(os.path.join(dossier, "manifeste.json"), encoding="utf-8") as f:
+            manifeste = json.load(f)
+        self.assertEqual(manifeste["version"], 2)
+        self.assertEqual(manifeste["fichiers"]["groupes/P.ics"]["version"], 2)
+        self.assertEqual(manifeste["fichiers"]["groupes/P2.ics"]["version"], 1)
+        self.assertEqual(manifeste["fichiers"]["salles/1.ics"]["evenements"], 2)
+        self.assertNotIn("salles/2.ics", manifeste["fichiers"])
+
+
+class TestRecurrences(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [Salle(1, "A", 60), Salle(2, "B", 60)]
+        enseignant = Enseignant(1, "E1", "standard")
+        self.groupes = [Groupe("P", "Promo", 20)]
+        cours = Cours("CM", "Amphi", enseignant, None, 480, 120, "CM")
+        cours.ids_groupes = ["P"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.seances = generer_seance([cours], self.groupes)
+        # Semaines 42 à 45: le changement d'heure a lieu le 26 octobre 2025
+        self.scheduler = EmploiDuTemps(
+            annee=2025, semaines=[42, 43, 44, 45], date_debut="2025-10-13"
+        )
+        self.scheduler._configurer_grille(self.seances)
+        # Mardi à 8h en salle A les semaines 42, 44 et 45; salle B en semaine 43
+        affectation = dict(
+            zip(
+                [s.id_seance for s in self.seances],
+                [(0, 1, 0, 1), (2, 1, 0, 1), (3, 1, 0, 1), (1, 1, 0, 2)],
+            )
+        )
+        self.solution = self.scheduler._construire_emploi_du_temps(
+            affectation, self.seances, self.salles
+        )
+
+    def test_series(self):
+        self.assertEqual(detecter_series(self.solution), [[0, 1, 2], [3]])
+        self.assertEqual(
+            detecter_series(self.solution, ecart_max=0), [[0], [1, 2], [3]]
+        )
+        index = index_flux(self.solution, self.groupes, detecter_series(self.solution))
+        self.assertEqual(index[("groupes", "P")], [0, 1])
+        self.assertEqual(index[("salles", 2)], [1])
+
+    def test_evenement_recurrent(self):
+        """Une série donne un VEVENT récurrent en heure locale, d'UID stable."""
+        series = detecter_series(self.solution)
+        blocs = evenements(self.solution, DTSTAMP, series=series)
+        self.assertEqual(blocs, evenements(self.solution, DTSTAMP, series=series))
+        self.assertEqual(len(blocs), 2)
+        serie = blocs[0]
+        self.assertIn("UID:R" + self.solution.cle(0) + "@ingemedia.fr\r\n", serie)
+        self.assertIn("DTSTART;TZID=Europe/Paris:20251014T080000\r\n", serie)
+        self.assertIn("RRULE:FREQ=WEEKLY;COUNT=4\r\n", serie)
+        self.assertIn("EXDATE;TZID=Europe/Paris:20251021T080000\r\n", serie)
+
+    def test_memes_occurrences(self):
+        """Les occurrences développées sont les séances, avant et après le changement d'heure."""
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "edt.ics")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.scheduler.exporter_vers_ics(self.solution, None, chemin)
+            with open(chemin, "rb") as f:
+                calendrier = Calendar.from_ical(f.read())
+
+        occurrences = []
+        for evenement in calendrier.walk("VEVENT"):
+            debut = evenement.decoded("DTSTART")
+            lieu = str(evenement["LOCATION"])
+            if "RRULE" not in evenement:
+                occurrences.append((debut.astimezone(timezone.utc), lieu))
+                continue
+            exclues = {d.dt for d in evenement["EXDATE"].dts}
+            regle = rrulestr(evenement["RRULE"].to_ical().decode(), dtstart=debut)
+            occurrences += [
+                (d.astimezone(timezone.utc), lieu) for d in regle if d not in exclues
+            ]
+
+        attendues = [
+            (datetime(2025, 10, 14, 6, tzinfo=timezone.utc), "Salle A"),
+            (datetime(2025, 10, 21, 6, tzinfo=timezone.utc), "Salle B"),
+            (datetime(2025, 10, 28, 7, tzinfo=timezone.utc), "Salle A"),
+            (datetime(2025, 11, 4, 7, tzinfo=timezone.utc), "Salle A"),
+        ]
+        self.assertEqual(sorted(occurrences), attendues)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grille import GrilleHoraire, HEURE_PLEINE
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestGrilleHoraire(unittest.TestCase):
+
+    def setUp(self):
+        self.enseignant = Enseignant(
+            1, "E1", "standard", disponibilite=disponibilite_complete()
+        )
+        self.groupes = [Groupe("G1", "Groupe 1", 20)]
+
+    def _seances(self, max_duration, debuts=None):
+        cours = Cours(
+            "C1", "Cours", self.enseignant, None, 2 * max_duration, max_duration, "TD"
+        )
+        cours.debuts = debuts
+        cours.ids_groupes = ["G1"]
+        return generer_seance([cours], self.groupes)
+
+    def test_grille_par_defaut(self):
+        """La grille par défaut reproduit les créneaux de 30 minutes historiques."""
+        grille = GrilleHoraire()
+        self.assertEqual(grille.nb_creneaux, 24)
+        self.assertEqual((grille.pause_debut, grille.pause_fin), (8, 12))
+        self.assertEqual(grille.fin_matin, 10)
+        self.assertEqual(grille.fin_souhaitee, 20)
+        self.assertEqual(grille.nb_creneaux_pause, 2)
+
+    def test_pas_automatique(self):
+        """Des séances de 2h donnent un pas d'une heure; une séance de 2h30, 30 min."""
+        self.assertEqual(GrilleHoraire.automatique(self._seances(120)).pas, 60)
+        self.assertEqual(GrilleHoraire.automatique(self._seances(150)).pas, 30)
+        # Une heure de début imposée à 10h30 force le pas de 30 minutes
+        seances = self._seances(120, debuts="8:00/10:30")
+        self.assertEqual(GrilleHoraire.automatique(seances).pas, 30)
+
+    def test_politiques_de_debut(self):
+        grille = GrilleHoraire(pas=30)
+        debuts = grille.creneaux_debut(5, "8:00/10:30/13:30/16:00")
+        self.assertEqual(
+            [grille.heure(cr) for cr in debuts], ["8:00", "10:30", "13:30", "16:00"]
+        )
+        heures_pleines = grille.creneaux_debut(4, HEURE_PLEINE)
+        self.assertTrue(all(grille.minutes(cr) % 60 == 0 for cr in heures_pleines))
+        self.assertEqual(grille.heure(heures_pleines[-1]), "18:00")
+        with self.assertRaises(ValueError):
+            GrilleHoraire(pas=60).creneaux_debut(2, "10:30")
+
+    def test_resolution_grille_automatique(self):
+        """Le modèle est résolu sur la grille d'une heure avec les heures imposées."""
+        salles = [Salle(1, "A", 30, disponibilite=disponibilite_complete())]
+        seances = self._seances(120, debuts="8:00/14:00/16:00")
+        scheduler = EmploiDuTemps(annee=2025, semaines=[38], pas_creneau="auto")
+        edt = scheduler.generer(seances, salles, [self.enseignant], self.groupes)
+
+        self.assertIsNotNone(edt)
+        self.assertEqual(scheduler.grille.pas, 60)
+        self.assertEqual(len(edt), 2)
+        for details in edt.values():
+            self.assertIn(details["heure_debut"], ["8:00", "14:00", "16:00"])
+            self.assertEqual(details["duree"], 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from hierarchique import ResolutionHierarchique
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+def journee_non_conclue(*args):
+    """Sous-problème arrêté par la limite de temps sans solution (UNKNOWN)."""
+    return cp_model.UNKNOWN, None
+
+
+class TestResolutionHierarchique(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "AMPHI", 100, "amphi", disponibilite=disponibilite_complete()),
+        ]
+        # E2 n'enseigne que le matin: trois séances de 2h ne tiennent pas dans une matinée
+        matin = {jour: {"matin": True, "apres_midi": False} for jour in JOURS}
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=matin),
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        cm = Cours("C1", "Cours magistral", self.enseignants[0], None, 300, 150, "CM")
+        cm.ids_groupes = ["G1", "G2"]
+        td = Cours("C2", "Travaux dirigés", self.enseignants[1], None, 360, 120, "TD")
+        td.ids_groupes = ["G1"]
+        self.seances = generer_seance([cm, td], self.groupes)
+        # Deux journées: lundi 15 et mardi 16 septembre 2025
+        self.scheduler = EmploiDuTemps(
+            annee=2025, semaines=[38], date_debut="2025-09-15", date_fin="2025-09-16"
+        )
+
+    def _verifier(self, affectation):
+        """Fige l'affectation dans le modèle complet: il doit rester réalisable."""
+        model = cp_model.CpModel()
+        seance_vars = self.scheduler._creer_variables(model, self.seances, self.salles)
+        self.scheduler._ajouter_contraintes(
+            model,
+            seance_vars,
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+        )
+        for (s_id, *placement), var in seance_vars.items():
+            model.Add(var == int(affectation[s_id] == tuple(placement)))
+        statut = cp_model.CpSolver().Solve(model)
+        self.assertEqual(statut, cp_model.OPTIMAL)
+
+    def test_affectation_complete_et_valide(self):
+        edt = self.scheduler.generer_hierarchique(
+            self.seances, self.salles, self.enseignants, self.groupes, nb_processus=2
+        )
+        self.assertIsNotNone(edt)
+        self.assertEqual(
+            set(self.scheduler.affectation), {s.id_seance for s in self.seances}
+        )
+        self._verifier(self.scheduler.affectation)
+
+    def test_coupe_journee_infaisable(self):
+        """Une coupe interdit au maître de reproduire la même journée."""
+        resolution = ResolutionHierarchique(
+            self.scheduler, self.seances, self.salles, self.enseignants, self.groupes
+        )
+        ids_td = {s.id_seance for s in self.seances if s.cours.id_cours == "C2"}
+        resolution.coupes.append(((0, 0), frozenset(ids_td)))
+        jours = resolution._resoudre_maitre()
+        self.assertIsNotNone(jours)
+        self.assertFalse(all(jours[s_id] == (0, 0) for s_id in ids_td))
+
+    def test_journee_non_conclue_sans_coupe(self):
+        """Une journée arrêtée par la limite de temps n'est jamais coupée."""
+        resolution = ResolutionHierarchique(
+            self.scheduler,
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+            temps_par_jour=1,
+            nb_processus=1,
+        )
+        with mock.patch("hierarchique._resoudre_journee", journee_non_conclue):
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertIsNone(resolution.executer(nb_iterations=2))
+        self.assertEqual(resolution.coupes, [])
+        # Chaque reprise double la limite de temps de la journée
+        self.assertTrue(resolution._temps_journees)
+        self.assertTrue(all(t >= 2 for t in resolution._temps_journees.values()))
+
+    def test_cours_commun_pause_sous_groupe(self):
+        """
+        Un cours commun peut occuper la pause d'un sous-groupe: la journée du
+        sous-groupe (1h de CM + 11h de TD) reste admise par le maître.
+        """
+        enseignants = [
+            Enseignant(i, f"E{i}", "standard", disponibilite=disponibilite_complete())
+            for i in (1, 2, 3)
+        ]
+        promo = Groupe("P", "Promo", 20)
+        sous_groupe = Groupe("SG", "Sous-groupe", 20, id_parent="P")
+        promo.sous_groupes = [sous_groupe]
+        cm = Cours("C1", "CM", enseignants[0], None, 60, 60, "CM")
+        cm.ids_groupes = ["P"]
+        matin = Cours("C2", "TD matin", enseignants[1], None, 240, 240, "TD")
+        matin.ids_groupes = ["SG"]
+        soir = Cours("C3", "TD soir", enseignants[2], None, 420, 420, "TD")
+        soir.ids_groupes = ["SG"]
+        groupes = [promo, sous_groupe]
+        with contextlib.redirect_stdout(io.StringIO()):
+            seances = generer_seance([cm, matin, soir], groupes)
+        scheduler = EmploiDuTemps(
+            annee=2025, semaines=[38], date_debut="2025-09-15", date_fin="2025-09-15"
+        )
+        resolution = ResolutionHierarchique(
+            scheduler, seances, self.salles, enseignants, groupes, nb_processus=1
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNotNone(resolution._resoudre_maitre())
+            edt = scheduler.generer_hierarchique(
+                seances, self.salles, enseignants, groupes, nb_processus=1
+            )
+        self.assertIsNotNone(edt)
+        self.assertEqual(len(scheduler.affectation), len(seances))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dépendances lourdes chargées seulement par la résolution et les exports
+MODULES_LOURDS = ("ortools", "numpy", "pandas", "icalendar", "pytz", "holidays")
+
+# Temps d'importation maximal (secondes): environ 50 ms mesurés, contre 400 ms
+# quand OR-Tools et pandas étaient importés par main
+TEMPS_MAX = 0.25
+
+SCRIPT = """
+import json, sys, time
+debut = time.perf_counter()
+import {module}
+duree = time.perf_counter() - debut
+print(json.dumps({{
+    "duree": duree,
+    "lourds": [m for m in {lourds!r} if m in sys.modules],
+    "stdout": sys.stdout is sys.__stdout__,
+    "stderr": sys.stderr is sys.__stderr__,
+}}))
+"""
+
+
+class TestImportation(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def importer(self, module):
+        """Importe `module` dans un nouvel interpréteur lancé dans un dossier vide."""
+        environnement = dict(os.environ, PYTHONPATH=RACINE)
+        sortie = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                SCRIPT.format(module=module, lourds=MODULES_LOURDS),
+            ],
+            cwd=self.dossier,
+            env=environnement,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(sortie.stdout)
+
+    def test_sans_effet_de_bord(self):
+        """Importer main ne crée pas de fichier log et ne remplace pas stdout/stderr."""
+        resultat = self.importer("main")
+        self.assertTrue(resultat["stdout"])
+        self.assertTrue(resultat["stderr"])
+        self.assertEqual(os.listdir(self.dossier), [])
+
+    def test_dependances_paresseuses(self):
+        """Les chargeurs et le pipeline s'importent sans les dépendances lourdes."""
+        for module in ("main", "pipeline", "benchmark"):
+            with self.subTest(module=module):
+                self.assertEqual(self.importer(module)["lourds"], [])
+
+    def test_temps_importation(self):
+        """Importer main reste rapide (meilleur de trois essais)."""
+        duree = min(self.importer("main")["duree"] for _ in range(3))
+        self.assertLess(duree, TEMPS_MAX)
+
+
+if __name__ == "__main__":
+    unittest.main()
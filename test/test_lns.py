@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from contraintes import evaluer_preferences
+from conflits import graphe_conflits
+from lns import RechercheLNS, Voisinage
+from paresseux import verifier_chevauchements
+from solution import charger_affectation
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestRechercheLNS(unittest.TestCase):
+
+    def setUp(self):
+        """Petite instance avec un CM qui devrait être placé en amphi."""
+        self.salles = [
+            Salle(1, "A", 50, disponibilite=disponibilite_complete()),
+            Salle(2, "AMPHI", 100, "amphi", disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=disponibilite_complete()),
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        cm = Cours("C1", "Cours magistral", self.enseignants[0], None, 300, 150, "CM")
+        cm.ids_groupes = ["G1", "G2"]
+        td = Cours("C2", "Travaux dirigés", self.enseignants[1], None, 360, 180, "TD")
+        td.ids_groupes = ["G1"]
+        self.cours = [cm, td]
+        self.seances = generer_seance(self.cours, self.groupes)
+        self.scheduler = EmploiDuTemps(annee=2025, semaines=[38, 39])
+
+    def test_voisinages_independants(self):
+        """Seuls les voisinages restreints à des semaines disjointes sont indépendants."""
+        v1 = Voisinage("semaine", 0, ["a"], semaines_autorisees={0})
+        v2 = Voisinage("semaine", 1, ["b"], semaines_autorisees={1})
+        v3 = Voisinage("enseignant", 1, ["c"])
+        self.assertTrue(v1.est_independant(v2))
+        self.assertFalse(v1.est_independant(v1))
+        self.assertFalse(v1.est_independant(v3))
+
+    def test_lns_ameliore_preferences(self):
+        """
+        La LNS ne dégrade jamais le coût, garde une affectation sans
+        chevauchement et écrit la meilleure solution sur disque. L'optimum
+        n'est pas exigé: il dépend du temps machine alloué aux sous-problèmes.
+        """
+        self.scheduler.generer(
+            self.seances, self.salles, self.enseignants, self.groupes
+        )
+        initiale = self.scheduler.affectation
+        cout_initial = evaluer_preferences(initiale, self.seances, self.salles)
+
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier = os.path.join(dossier, "lns.json")
+            lns = RechercheLNS(
+                self.scheduler,
+                self.seances,
+                self.salles,
+                self.enseignants,
+                self.groupes,
+                temps_par_voisinage=5,
+                nb_processus=2,
+                fichier_solution=fichier,
+            )
+            finale = lns.executer(initiale, nb_iterations=10, temps_total=60)
+
+            self.assertEqual(set(finale), set(initiale))
+            cout_final = evaluer_preferences(finale, self.seances, self.salles)
+            self.assertLessEqual(cout_final, cout_initial)
+            graphe = graphe_conflits(
+                self.seances, self.enseignants, self.groupes, self.salles
+            )
+            self.assertEqual(
+                verifier_chevauchements(
+                    finale,
+                    self.seances,
+                    graphe,
+                    self.scheduler.NB_JOURS,
+                    self.scheduler.NB_CRENEAUX,
+                    self.scheduler.grille,
+                ),
+                [],
+            )
+            self.assertEqual(
+                charger_affectation(fichier, self.scheduler.SEMAINES), finale
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
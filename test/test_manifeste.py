@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from manifeste import Manifeste, fichier_atomique, publier
+
+
+def ecrire(chemin, texte):
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write(texte)
+
+
+class TestManifeste(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_ecriture_atomique(self):
+        """Un bloc qui échoue ne laisse ni le fichier ni son temporaire."""
+        chemin = os.path.join(self.dossier, "a", "edt.ics")
+        with self.assertRaises(RuntimeError):
+            with fichier_atomique(chemin) as f:
+                f.write("début")
+                raise RuntimeError("échec")
+        self.assertEqual(os.listdir(os.path.dirname(chemin)), [])
+
+    def test_contenu_inchange(self):
+        """Un contenu identique n'est pas réécrit et garde sa version."""
+        chemin = os.path.join(self.dossier, "edt.html")
+
+        def exporter(texte):
+            manifeste = Manifeste(self.dossier)
+            with manifeste.ecrire("edt.html") as f:
+                f.write(texte)
+            manifeste.sauvegarder()
+            return Manifeste(self.dossier)
+
+        exporter("a")
+        os.utime(chemin, ns=(0, 0))
+        manifeste = exporter("a")
+        self.assertEqual(os.stat(chemin).st_mtime_ns, 0)
+        self.assertEqual(manifeste.version, 1)
+        self.assertEqual(manifeste.fichiers["edt.html"]["version"], 1)
+
+        manifeste = exporter("b")
+        self.assertNotEqual(os.stat(chemin).st_mtime_ns, 0)
+        self.assertEqual(manifeste.version, 2)
+        self.assertEqual(manifeste.fichiers["edt.html"]["version"], 2)
+        self.assertEqual(
+            sorted(os.listdir(self.dossier)), ["edt.html", "manifeste.json"]
+        )
+
+    def test_publier(self):
+        """Seuls les fichiers modifiés sont copiés; les flux disparus sont retirés."""
+        source = os.path.join(self.dossier, "export")
+        sortie = os.path.join(self.dossier, "sortie")
+        ecrire(os.path.join(source, "affectation.json"), "{}")
+        flux = Manifeste(os.path.join(source, "ics"))
+        for relatif in ("groupes/A.ics", "salles/1.ics", "salles/2.ics"):
+            ecrire(flux.chemin_fichier(relatif), relatif)
+            flux.noter(relatif, relatif, evenements=1)
+        flux.sauvegarder()
+
+        noms = ["affectation.json", "ics"]
+        self.assertEqual(len(publier(source, sortie, noms)), 4)
+        self.assertEqual(publier(source, sortie, noms), [])
+
+        # Même empreinte malgré un contenu différent (DTSTAMP): pas de copie
+        ecrire(flux.chemin_fichier("groupes/A.ics"), "DTSTAMP différent")
+        os.remove(flux.chemin_fichier("salles/2.ics"))
+        del flux.fichiers["salles/2.ics"]
+        flux.noter("salles/1.ics", "nouvelle", evenements=2)
+        flux.sauvegarder()
+        self.assertEqual(
+            publier(source, sortie, noms),
+            [os.path.join(sortie, "ics", "salles", "1.ics")],
+        )
+        self.assertFalse(os.path.exists(os.path.join(sortie, "ics", "salles", "2.ics")))
+
+        with open(os.path.join(sortie, "ics", "manifeste.json"), encoding="utf-8") as f:
+            manifeste = json.load(f)
+        self.assertEqual(manifeste["version"], 2)
+        self.assertEqual(
+            {relatif: e["version"] for relatif, e in manifeste["fichiers"].items()},
+            {"groupes/A.ics": 1, "salles/1.ics": 2},
+        )
+        self.assertEqual(manifeste["fichiers"]["salles/1.ics"]["evenements"], 2)
+        self.assertTrue(os.path.isfile(os.path.join(sortie, "manifeste.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import unittest
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from conflits import graphe_conflits
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from paresseux import verifier_chevauchements
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestGenerationParesseuse(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "B", 30, disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=disponibilite_complete()),
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        c1 = Cours("C1", "Cours 1", self.enseignants[0], None, 240, 120, "TD")
+        c1.ids_groupes = ["G1"]
+        c2 = Cours("C2", "Cours 2", self.enseignants[1], None, 240, 120, "TD")
+        c2.ids_groupes = ["G2"]
+        self.seances = generer_seance([c1, c2], self.groupes)
+        self.scheduler = EmploiDuTemps(
+            annee=2025, semaines=[38], date_debut="2025-09-15", date_fin="2025-09-16"
+        )
+
+    def test_verifier_chevauchements(self):
+        graphe = graphe_conflits(
+            self.seances, self.enseignants, self.groupes, self.salles
+        )
+        ids = [s.id_seance for s in self.seances]  # C1, C1, C2, C2
+        # Deux séances de C1 qui se chevauchent d'un créneau, C2 dans la même salle
+        affectation = {
+            ids[0]: (0, 0, 0, 1),
+            ids[1]: (0, 0, 3, 2),
+            ids[2]: (0, 0, 6, 2),
+            ids[3]: (0, 1, 0, 1),
+        }
+        violations = verifier_chevauchements(affectation, self.seances, graphe, 5, 24)
+        self.assertEqual(len(violations), 2)
+        self.assertEqual({v[0][0] for v in violations}, {"clique", "salle"})
+        self.assertEqual({v[1:] for v in violations}, {(0, 0, 3), (0, 0, 6)})
+
+        affectation[ids[1]] = (0, 0, 4, 2)
+        affectation[ids[2]] = (0, 0, 8, 2)
+        self.assertEqual(
+            verifier_chevauchements(affectation, self.seances, graphe, 5, 24), []
+        )
+
+    def test_solution_valide(self):
+        """La solution paresseuse respecte le modèle complet."""
+        edt = self.scheduler.generer_paresseux(
+            self.seances, self.salles, self.enseignants, self.groupes
+        )
+        self.assertIsNotNone(edt)
+        affectation = self.scheduler.affectation
+        self.assertEqual(set(affectation), {s.id_seance for s in self.seances})
+
+        model = cp_model.CpModel()
+        seance_vars = self.scheduler._creer_variables(model, self.seances, self.salles)
+        self.scheduler._ajouter_contraintes(
+            model,
+            seance_vars,
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+        )
+        for (s_id, *placement), var in seance_vars.items():
+            model.Add(var == int(affectation[s_id] == tuple(placement)))
+        self.assertEqual(cp_model.CpSolver().Solve(model), cp_model.OPTIMAL)
+
+    def test_grille_automatique(self):
+        """La grille automatique est configurée avant d'indexer les variables."""
+        scheduler = EmploiDuTemps(
+            annee=2025,
+            semaines=[38],
+            date_debut="2025-09-15",
+            date_fin="2025-09-16",
+            pas_creneau="auto",
+        )
+        edt = scheduler.generer_paresseux(
+            self.seances, self.salles, self.enseignants, self.groupes
+        )
+        self.assertIsNotNone(edt)
+        self.assertIsNotNone(scheduler.grille)
+        self.assertEqual(
+            set(scheduler.affectation), {s.id_seance for s in self.seances}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import Cache, Pipeline, analyser_arguments, empreinte, main
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_empreinte(self):
+        """L'empreinte ne dépend pas de l'ordre des clés, seulement des valeurs."""
+        self.assertEqual(empreinte({"a": 1, "b": [2]}), empreinte({"b": [2], "a": 1}))
+        self.assertNotEqual(empreinte({"a": 1}), empreinte({"a": 2}))
+
+    def test_ecriture_atomique(self):
+        """Une étape qui échoue ne laisse aucun résultat dans le cache."""
+        cache = Cache(self.dossier)
+        with self.assertRaises(RuntimeError):
+            with cache.ecrire("build", "cle") as temporaire:
+                open(os.path.join(temporaire, "modele.pb"), "wb").close()
+                raise RuntimeError("échec")
+        self.assertIsNone(cache.lire("build", "cle"))
+        self.assertEqual(os.listdir(os.path.join(self.dossier, "build")), [])
+
+        with cache.ecrire("build", "cle") as temporaire:
+            open(os.path.join(temporaire, "modele.pb"), "wb").close()
+        self.assertTrue(
+            os.path.isfile(os.path.join(cache.lire("build", "cle"), "modele.pb"))
+        )
+        self.assertIsNone(Cache(self.dossier, forcer=True).lire("build", "cle"))
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.arguments = [
+            "--donnees",
+            os.path.join(RACINE, "data"),
+            "--cours",
+            "2",
+            "--semaines",
+            "38",
+            "39",
+            "--date-debut",
+            "2025-09-15",
+            "--date-fin",
+            "2025-09-26",
+            "--temps-max",
+            "30",
+            "--workers",
+            "1",
+            "--checkpoint",
+            "",
+            "--telemetrie",
+            "",
+            "--cache",
+            os.path.join(self.dossier, "cache"),
+            "--sortie",
+            os.path.join(self.dossier, "sortie"),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def test_export_reutilise_le_cache(self):
+        """Changer les options d'export ne reconstruit ni ne résout le modèle."""
+        self.assertEqual(main(["export"] + self.arguments), 0)
+        sortie = os.path.join(self.dossier, "sortie")
+        self.assertEqual(
+            sorted(os.listdir(sortie)),
+            [
+                "affectation_septembre2025.json",
+                "emploi_du_temps_septembre2025.html",
+                "emploi_du_temps_septembre2025.ics",
+                "manifeste.json",
+                "visionneuse_septembre2025",
+            ],
+        )
+
+        with mock.patch(
+            "main.EmploiDuTemps._construire_modele", side_effect=AssertionError
+        ), mock.patch.object(Pipeline, "_resoudre_modele", side_effect=AssertionError):
+            code = main(
+                ["export"] + self.arguments + ["--formats", "ics", "--nom", "autre"]
+            )
+        self.assertEqual(code, 0)
+        self.assertIn("emploi_du_temps_autre.ics", os.listdir(sortie))
+
+    def test_export_a_jour(self):
+        """Relancer un export déjà à jour ne copie rien et réussit."""
+        arguments = ["export"] + self.arguments + ["--formats", "ics"]
+        self.assertEqual(main(arguments), 0)
+        pipeline = Pipeline(
+            analyser_arguments(arguments), Cache(os.path.join(self.dossier, "cache"))
+        )
+        sortie = io.StringIO()
+        with contextlib.redirect_stdout(sortie):
+            reussi, publies = pipeline.exporter()
+        self.assertTrue(reussi)
+        self.assertIn("déjà à jour", sortie.getvalue())
+        self.assertEqual(
+            publies,
+            [os.path.join(self.dossier, "sortie", "emploi_du_temps_septembre2025.ics")],
+        )
+        self.assertEqual(main(arguments), 0)
+
+    def test_options_de_modele(self):
+        """Une option de modèle change l'empreinte du modèle et de la solution."""
+        options = analyser_arguments(["build"] + self.arguments)
+        cache = Cache(options.cache)
+        cle, _ = Pipeline(options, cache).construire()
+
+        options = analyser_arguments(["build"] + self.arguments + ["--salle-par-cours"])
+        pipeline = Pipeline(options, cache)
+        cle_salle, dossier = pipeline.construire()
+        self.assertNotEqual(cle, cle_salle)
+        self.assertTrue(os.path.isfile(os.path.join(dossier, "modele.pb")))
+
+        _, affectation = pipeline.resoudre()
+        self.assertEqual(len(affectation), len(pipeline.charger()[1]["seances"]))
+        self.assertTrue(
+            all(placement[3] is not None for placement in affectation.values())
+        )
+
+    def test_base_sqlite(self):
+        """--base enregistre la solution une fois, même relue depuis le cache."""
+        from stockage import Stockage
+
+        base = os.path.join(self.dossier, "edt.sqlite")
+        for _ in range(2):
+            self.assertEqual(main(["solve"] + self.arguments + ["--base", base]), 0)
+        with Stockage(base) as stockage:
+            self.assertEqual(len(stockage.versions()), 1)
+            affectation = stockage.affectation()
+            self.assertEqual(len(affectation), 7)
+            self.assertEqual(len(stockage.seances_groupe("DASI")), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
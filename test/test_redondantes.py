@@ -0,0 +1,122 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+from ortools.sat.python import cp_model
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from contraintes import CONTRAINTES_REDONDANTES
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestContraintesRedondantes(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "AMPHI", 100, "amphi", disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete())
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        cm = Cours("C1", "Cours magistral", self.enseignants[0], None, 240, 120, "CM")
+        cm.ids_groupes = ["G1", "G2"]
+        td = Cours("C2", "Travaux dirigés", self.enseignants[0], None, 240, 120, "TD")
+        td.ids_groupes = ["G1"]
+        self.seances = generer_seance([cm, td], self.groupes)
+
+    def _scheduler(self, redondantes):
+        return EmploiDuTemps(
+            annee=2025,
+            semaines=[38],
+            date_debut="2025-09-15",
+            date_fin="2025-09-16",
+            contraintes_redondantes=redondantes,
+        )
+
+    def _statut(self, redondantes):
+        scheduler = self._scheduler(redondantes)
+        model = cp_model.CpModel()
+        seance_vars = scheduler._creer_variables(model, self.seances, self.salles)
+        scheduler._ajouter_contraintes(
+            model,
+            seance_vars,
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+        )
+        return cp_model.CpSolver().Solve(model), len(model.Proto().constraints)
+
+    def test_solutions_inchangees(self):
+        """Les contraintes redondantes ajoutent des lignes sans rendre le modèle infaisable."""
+        statut_sans, taille_sans = self._statut([])
+        statut_avec, taille_avec = self._statut(list(CONTRAINTES_REDONDANTES))
+        self.assertEqual(statut_sans, cp_model.OPTIMAL)
+        self.assertEqual(statut_avec, cp_model.OPTIMAL)
+        self.assertGreater(taille_avec, taille_sans)
+
+    def test_generer_avec_toutes(self):
+        scheduler = self._scheduler(list(CONTRAINTES_REDONDANTES))
+        edt = scheduler.generer(
+            self.seances, self.salles, self.enseignants, self.groupes
+        )
+        self.assertIsNotNone(edt)
+        self.assertEqual(len(edt), len(self.seances))
+
+    def test_minutes_groupe_sous_groupe(self):
+        """
+        Un cours commun peut occuper la pause d'un sous-groupe: la journée du
+        sous-groupe (1h de CM + 11h de TD) reste réalisable avec la ligne de
+        durée journalière, qui ne compte que les séances propres au groupe.
+        """
+        enseignants = [
+            Enseignant(i, f"E{i}", "standard", disponibilite=disponibilite_complete())
+            for i in (1, 2, 3)
+        ]
+        promo = Groupe("P", "Promo", 20)
+        sous_groupe = Groupe("SG", "Sous-groupe", 20, id_parent="P")
+        promo.sous_groupes = [sous_groupe]
+        cm = Cours("C1", "CM", enseignants[0], None, 60, 60, "CM")
+        cm.ids_groupes = ["P"]
+        matin = Cours("C2", "TD matin", enseignants[1], None, 240, 240, "TD")
+        matin.ids_groupes = ["SG"]
+        soir = Cours("C3", "TD soir", enseignants[2], None, 420, 420, "TD")
+        soir.ids_groupes = ["SG"]
+        groupes = [promo, sous_groupe]
+        with contextlib.redirect_stdout(io.StringIO()):
+            seances = generer_seance([cm, matin, soir], groupes)
+        for redondantes in ([], ["minutes_groupe"]):
+            scheduler = EmploiDuTemps(
+                annee=2025,
+                semaines=[38],
+                date_debut="2025-09-15",
+                date_fin="2025-09-15",
+                contraintes_redondantes=redondantes,
+            )
+            model = cp_model.CpModel()
+            with contextlib.redirect_stdout(io.StringIO()):
+                seance_vars = scheduler._creer_variables(model, seances, self.salles)
+                scheduler._ajouter_contraintes(
+                    model, seance_vars, seances, self.salles, enseignants, groupes
+                )
+            self.assertEqual(cp_model.CpSolver().Solve(model), cp_model.OPTIMAL)
+
+    def test_nom_inconnu(self):
+        with self.assertRaises(ValueError):
+            self._statut(["inexistante"])
+
+
+if __name__ == "__main__":
+    unittest.main()
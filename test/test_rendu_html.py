@@ -0,0 +1,80 @@
+import io
+import os
+import sys
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rendu_html import ecrire_page, ranger
+
+JOURS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi"]
+CRENEAUX = [f"{h}h00" for h in range(8, 20, 2)]
+
+
+def seance(id_seance, semaine, jour, date, creneau, heure_debut, groupe="G1"):
+    return {
+        "semaine": semaine,
+        "jour": jour,
+        "date": date,
+        "creneau": creneau,
+        "salle": "CO315",
+        "cours": f"Cours {id_seance}",
+        "seance": id_seance,
+        "enseignant": "E1",
+        "groupe": groupe,
+        "heure_debut": heure_debut,
+        "heure_fin": "12:00",
+        "duree": 120,
+        "type": "TD",
+    }
+
+
+class TestRenduHtml(unittest.TestCase):
+
+    def setUp(self):
+        self.emploi = {
+            "S1": seance("S1", 39, "Mardi", "2025-09-23", "10h00", "10:00"),
+            "S2": seance("S2", 38, "Lundi", "2025-09-15", "10h00", "10:30", "G1, G2"),
+            "S3": seance("S3", 38, "Lundi", "2025-09-15", "8h00", "8:00"),
+            "S4": seance("S4", 38, "Lundi", "2025-09-15", "10h00", "10:00"),
+        }
+
+    def test_ranger(self):
+        """Une case par (semaine, jour, créneau), dans l'ordre de l'emploi du temps."""
+        cases, dates, groupes, enseignants = ranger(self.emploi)
+        self.assertEqual(
+            [s["seance"] for s in cases[(38, "Lundi", "10h00")]], ["S2", "S4"]
+        )
+        self.assertEqual(
+            dates, {(39, "Mardi"): "2025-09-23", (38, "Lundi"): "2025-09-15"}
+        )
+        self.assertEqual(groupes, {"G1", "G2"})
+        self.assertEqual(enseignants, {"E1"})
+
+    def test_page(self):
+        """Semaines triées, séances dans leur ligne de créneau et leur colonne de jour."""
+        f = io.StringIO()
+        ecrire_page(f, self.emploi, JOURS, CRENEAUX)
+        page = f.getvalue()
+        self.assertLess(page.index("Semaine 38"), page.index("Semaine 39"))
+
+        semaine_38 = page[page.index("Semaine 38") : page.index("Semaine 39")]
+        self.assertIn("<th>Lundi<br>2025-09-15</th><th>Mardi</th>", semaine_38)
+        ligne_10h = semaine_38[
+            semaine_38.index("<td class='header'>10h00</td>") : semaine_38.index(
+                "<td class='header'>12h00</td>"
+            )
+        ]
+        cellules = ligne_10h.split("<td>")[1:]
+        self.assertEqual(len(cellules), len(JOURS))
+        self.assertLess(
+            cellules[0].index("Séance: S2"), cellules[0].index("Séance: S4")
+        )
+        self.assertTrue(all("class='event" not in c for c in cellules[1:]))
+        self.assertNotIn("Séance: S1", semaine_38)
+        self.assertIn("filterByGroupe(\\'G2\\')", page)
+        self.assertTrue(page.rstrip().endswith("</html>"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from solution import sauvegarder_affectation, charger_affectation
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestReparation(unittest.TestCase):
+
+    def setUp(self):
+        """Construit une petite instance: deux enseignants, deux groupes, une semaine."""
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "B", 30, disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=disponibilite_complete()),
+        ]
+        self.groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        self.cours = []
+        for id_cours, enseignant, id_groupe in [
+            ("C1", self.enseignants[0], "G1"),
+            ("C2", self.enseignants[1], "G2"),
+        ]:
+            c = Cours(id_cours, f"Cours {id_cours}", enseignant, None, 360, 180, "TD")
+            c.ids_groupes = [id_groupe]
+            self.cours.append(c)
+        self.seances = generer_seance(self.cours, self.groupes)
+        self.scheduler = EmploiDuTemps(annee=2025, semaines=[38])
+
+    def test_sauvegarde_affectation(self):
+        """L'affectation sauvegardée est relue à l'identique."""
+        edt = self.scheduler.generer(
+            self.seances, self.salles, self.enseignants, self.groupes
+        )
+        self.assertIsNotNone(edt)
+
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier = os.path.join(dossier, "affectation.json")
+            sauvegarder_affectation(
+                self.scheduler.affectation, self.scheduler.SEMAINES, fichier
+            )
+            self.assertEqual(
+                charger_affectation(fichier, self.scheduler.SEMAINES),
+                self.scheduler.affectation,
+            )
+            # Une semaine absente du planning est ignorée
+            self.assertEqual(charger_affectation(fichier, [39]), {})
+
+    def test_reparation_enseignant(self):
+        """Seules les séances de l'enseignant modifié sont déplacées."""
+        self.scheduler.generer(
+            self.seances, self.salles, self.enseignants, self.groupes
+        )
+        precedente = dict(self.scheduler.affectation)
+
+        # L'enseignant E1 devient indisponible les jours où il enseignait
+        jours_e1 = {
+            precedente[s.id_seance][1]
+            for s in self.seances
+            if s.cours.enseignant.id == 1
+        }
+        for j in jours_e1:
+            self.enseignants[0].disponibilite[JOURS[j]] = {
+                "matin": False,
+                "apres_midi": False,
+            }
+
+        edt = self.scheduler.reparer(
+            self.seances,
+            self.salles,
+            self.enseignants,
+            self.groupes,
+            precedente,
+            enseignants_modifies=[1],
+        )
+        self.assertIsNotNone(edt)
+
+        nouvelle = self.scheduler.affectation
+        for s in self.seances:
+            if s.cours.enseignant.id == 1:
+                self.assertNotIn(nouvelle[s.id_seance][1], jours_e1)
+            else:
+                self.assertEqual(nouvelle[s.id_seance], precedente[s.id_seance])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestSalleParCours(unittest.TestCase):
+
+    def setUp(self):
+        apres_midi = {jour: {"matin": False, "apres_midi": True} for jour in JOURS}
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=apres_midi),
+            Salle(2, "B", 30, disponibilite=apres_midi),
+            Salle(3, "AMPHI", 100, "Amphi", disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=disponibilite_complete()),
+        ]
+        self.groupes = [
+            Groupe("G1", "Groupe 1", 20),
+            Groupe("G2", "Groupe 2", 20),
+            Groupe("G3", "Groupe 3", 60),
+        ]
+        td1 = Cours("C1", "TD 1", self.enseignants[0], None, 360, 120, "TD")
+        td1.ids_groupes = ["G1"]
+        td2 = Cours("C2", "TD 2", self.enseignants[1], None, 360, 120, "TD")
+        td2.ids_groupes = ["G2"]
+        # 60 étudiants: seul l'amphi convient
+        cm = Cours("C3", "CM", self.enseignants[1], None, 240, 120, "CM")
+        cm.ids_groupes = ["G3"]
+        self.seances = generer_seance([td1, td2, cm], self.groupes)
+
+    def _scheduler(self):
+        return EmploiDuTemps(
+            annee=2025,
+            semaines=[38],
+            date_debut="2025-09-15",
+            date_fin="2025-09-16",
+            salle_par_cours=True,
+        )
+
+    def test_une_salle_par_cours(self):
+        scheduler = self._scheduler()
+        edt = scheduler.generer(
+            self.seances, self.salles, self.enseignants, self.groupes
+        )
+        self.assertIsNotNone(edt)
+        affectation = scheduler.affectation
+        self.assertEqual(set(affectation), {s.id_seance for s in self.seances})
+
+        salles_par_cours = {}
+        for s in self.seances:
+            salles_par_cours.setdefault(s.cours.id_cours, set()).add(
+                affectation[s.id_seance][3]
+            )
+        self.assertTrue(all(len(ids) == 1 for ids in salles_par_cours.values()))
+        self.assertEqual(salles_par_cours["C3"], {3})
+
+        # Aucune salle n'accueille deux séances qui se chevauchent; A et B l'après-midi
+        occupation = {}
+        for s in self.seances:
+            s_idx, j, cr_debut, salle_id = affectation[s.id_seance]
+            if salle_id in (1, 2):
+                self.assertGreaterEqual(cr_debut, scheduler.grille.fin_matin)
+            for cr in range(
+                cr_debut, cr_debut + scheduler.grille.duree_creneaux(s.duree)
+            ):
+                cle = (salle_id, s_idx, j, cr)
+                self.assertNotIn(cle, occupation)
+                occupation[cle] = s.id_seance
+
+    def test_sous_modeles_refuses(self):
+        with self.assertRaises(ValueError):
+            self._scheduler().generer_paresseux(
+                self.seances, self.salles, self.enseignants, self.groupes
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from solution import EcrivainAsynchrone, SolutionColonnaire, charger_affectation
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestPointDeReprise(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.fichier = os.path.join(self.dossier.name, "checkpoint.json")
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def test_ecrivain_garde_derniere_affectation(self):
+        """Seule la dernière affectation soumise se retrouve sur disque."""
+        ecrivain = EcrivainAsynchrone(self.fichier, [38, 39])
+        for cr in range(5):
+            ecrivain.soumettre({"S1": (1, 0, cr, 1)})
+        ecrivain.fermer()
+        self.assertEqual(
+            charger_affectation(self.fichier, [38, 39]), {"S1": (1, 0, 4, 1)}
+        )
+
+    def test_generer_avec_point_de_reprise(self):
+        """La résolution écrit la solution trouvée dans le fichier de reprise."""
+        salles = [Salle(1, "A", 30, disponibilite=disponibilite_complete())]
+        enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete())
+        ]
+        groupes = [Groupe("G1", "Groupe 1", 20)]
+        cours = Cours("C1", "Cours", enseignants[0], None, 360, 180, "TD")
+        cours.ids_groupes = ["G1"]
+        seances = generer_seance([cours], groupes)
+
+        scheduler = EmploiDuTemps(annee=2025, semaines=[38])
+        edt = scheduler.generer(
+            seances, salles, enseignants, groupes, fichier_checkpoint=self.fichier
+        )
+        self.assertIsNotNone(edt)
+        self.assertEqual(
+            charger_affectation(self.fichier, scheduler.SEMAINES),
+            scheduler.affectation,
+        )
+
+
+class TestSolutionColonnaire(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "A", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "B", 60, disponibilite=disponibilite_complete()),
+        ]
+        enseignant = Enseignant(7, "E1", "standard")
+        groupes = [Groupe("G1", "Groupe 1", 20), Groupe("G2", "Groupe 2", 20)]
+        c1 = Cours("C1", "Cours 1", enseignant, None, 240, 120, "TD")
+        c1.ids_groupes = ["G1"]
+        c2 = Cours("C2", "Cours 2", enseignant, None, 90, 90, "CM")
+        c2.ids_groupes = ["G1", "G2"]
+        self.seances = generer_seance([c1, c2], groupes)
+        self.scheduler = EmploiDuTemps(
+            annee=2025, semaines=[38, 39], date_debut="2025-09-15"
+        )
+        self.scheduler._configurer_grille(self.seances)
+        # S1 lundi 38 à 8h00, S2 mardi 39 à 8h30, S3 (CM) vendredi 38 à 9h00
+        self.affectation = {
+            self.seances[0].id_seance: (0, 0, 0, 1),
+            self.seances[1].id_seance: (1, 1, 1, 2),
+            self.seances[2].id_seance: (0, 4, 2, 2),
+        }
+        self.solution = self.scheduler._construire_emploi_du_temps(
+            self.affectation, self.seances, self.salles
+        )
+
+    def test_colonnes_typees(self):
+        """Indices entiers, clés étrangères et colonnes de dates."""
+        table = self.solution.table
+        self.assertIsInstance(self.solution, SolutionColonnaire)
+        self.assertEqual(table["seance"].tolist(), [0, 1, 2])
+        self.assertEqual(table["salle"].tolist(), [1, 2, 2])
+        self.assertEqual(table["enseignant"].tolist(), [7, 7, 7])
+        self.assertEqual(table["semaine"].tolist(), [38, 39, 38])
+        self.assertEqual(table["creneau"].tolist(), [0, 1, 2])
+        self.assertEqual(table["debut"].tolist(), [480, 510, 540])
+        self.assertEqual(table["fin"].tolist(), [600, 630, 630])
+        self.assertEqual(str(table["date"][1]), "2025-09-23")
+        self.assertEqual(str(table["fin_dt"][2]), "2025-09-19T10:30")
+        self.assertEqual(
+            list(self.solution.vers_dataframe().columns), list(table.dtype.names)
+        )
+
+    def test_vue_ancien_format(self):
+        """Les enregistrements de l'ancien format sont construits à la demande."""
+        self.assertIsNone(self.solution._index)
+        self.assertEqual(len(self.solution), 3)
+        cle = f"{self.seances[2].id_seance}_38_4"
+        self.assertEqual(
+            self.solution[cle],
+            {
+                "semaine": 38,
+                "jour": "Vendredi",
+                "date": "2025-09-19",
+                "creneau": "8h00",
+                "salle": "B",
+                "cours": "Cours 2",
+                "seance": self.seances[2].id_seance,
+                "enseignant": "E1",
+                "groupe": "Groupe 1, Groupe 2",
+                "heure_debut": "9:00",
+                "heure_fin": "10:30",
+                "duree": 90,
+                "type": "CM",
+            },
+        )
+        self.assertEqual(
+            list(self.solution),
+            [
+                f"{s.id_seance}_{sem}_{j}"
+                for s, sem, j in zip(self.seances, (38, 39, 38), (0, 1, 4))
+            ],
+        )
+        self.assertNotIn("inconnue", self.solution)
+        self.assertEqual(
+            dict(self.solution), {c: self.solution[c] for c in self.solution}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
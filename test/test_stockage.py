@@ -0,0 +1,187 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, charger_groupes, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from stockage import Stockage
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class TestStockage(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [
+            Salle(1, "CO315", 30, disponibilite=disponibilite_complete()),
+            Salle(2, "Amphi", 60, "Amphi", disponibilite=disponibilite_complete()),
+        ]
+        self.enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete()),
+            Enseignant(2, "E2", "standard", disponibilite=disponibilite_complete()),
+        ]
+        self.groupes = [Groupe("DEDI", "Master DEDI", 20), Groupe("CDE", "CDE", 20)]
+        c1 = Cours("C1", "Cours 1", self.enseignants[0], None, 240, 120, "TD")
+        c1.ids_groupes = ["DEDI"]
+        c2 = Cours("C2", "Cours 2", self.enseignants[1], None, 120, 120, "CM")
+        c2.ids_groupes = ["DEDI", "CDE"]
+        self.cours = [c1, c2]
+        self.seances = generer_seance(self.cours, self.groupes)
+
+        self.edt = EmploiDuTemps(
+            annee=2025,
+            semaines=[38, 39],
+            date_debut="2025-09-15",
+            date_fin="2025-09-26",
+        )
+        self.edt._configurer_grille(self.seances)
+        # Une séance par jour, en alternant les semaines et les salles
+        self.affectation = {
+            s.id_seance: (k % 2, k, 2 * k, 1 + k % 2)
+            for k, s in enumerate(self.seances)
+        }
+
+        self.base = Stockage(":memory:")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.base.enregistrer_instance(
+                self.salles, self.enseignants, self.groupes, self.cours, self.seances
+            )
+            self.version = self.base.enregistrer_version(
+                self.edt, self.affectation, self.seances, self.salles, cle="solve"
+            )
+
+    def tearDown(self):
+        self.base.fermer()
+
+    def test_instance(self):
+        """Les données et séances sont enregistrées, avec leurs groupes."""
+        compter = lambda requete: self.base.connexion.execute(requete).fetchone()[0]
+        self.assertEqual(compter("SELECT COUNT(*) FROM salles"), 2)
+        self.assertEqual(compter("SELECT COUNT(*) FROM cours_groupes"), 3)
+        self.assertEqual(compter("SELECT COUNT(*) FROM seances"), len(self.seances))
+
+    def test_requetes_identiques_a_l_emploi_du_temps(self):
+        """Les requêtes par salle, enseignant et groupe retrouvent les enregistrements."""
+        emploi = self.edt._construire_emploi_du_temps(
+            self.affectation, self.seances, self.salles
+        )
+        champs = ("semaine", "jour", "date", "salle", "seance", "groupe")
+        champs += ("enseignant", "heure_debut", "heure_fin", "duree", "type")
+
+        def attendus(filtre):
+            return sorted(
+                tuple(e[c] for c in champs) for e in emploi.values() if filtre(e)
+            )
+
+        def obtenus(enregistrements):
+            return sorted(tuple(e[c] for c in champs) for e in enregistrements)
+
+        self.assertEqual(
+            obtenus(self.base.seances_salle("CO315", semaine=38)),
+            attendus(lambda e: e["salle"] == "CO315" and e["semaine"] == 38),
+        )
+        self.assertEqual(
+            obtenus(self.base.seances_enseignant("E2")),
+            attendus(lambda e: e["enseignant"] == "E2"),
+        )
+        self.assertEqual(
+            obtenus(self.base.seances_groupe("DEDI")),
+            attendus(lambda e: "Master DEDI" in e["groupe"]),
+        )
+        self.assertEqual(len(self.base.seances_groupe("DEDI")), len(self.seances))
+        self.assertEqual(
+            self.base.seances_groupe("CDE", debut="2025-09-22", fin="2025-09-26"),
+            [],
+        )
+        self.assertEqual(self.base.seances_salle("CO315", semaine=50), [])
+
+    def test_index_utilises(self):
+        """Chaque requête passe par l'index (ressource, date) de sa table."""
+        for requete, index in (
+            (
+                "SELECT * FROM placements p WHERE p.id_salle = 1 "
+                "AND p.date BETWEEN '2025-09-15' AND '2025-09-19'",
+                "placements_salle_date",
+            ),
+            (
+                "SELECT * FROM placements p WHERE p.id_enseignant = 1 "
+                "AND p.date BETWEEN '2025-09-15' AND '2025-09-19'",
+                "placements_enseignant_date",
+            ),
+            (
+                "SELECT p.* FROM placements_groupes g JOIN placements p "
+                "USING (version, id_seance) WHERE g.id_groupe = 'DEDI' "
+                "AND g.date BETWEEN '2025-09-15' AND '2025-09-19'",
+                "placements_groupe_date",
+            ),
+        ):
+            plan = " ".join(
+                ligne[3]
+                for ligne in self.base.connexion.execute(
+                    "EXPLAIN QUERY PLAN " + requete
+                )
+            )
+            self.assertIn(index, plan)
+
+    def test_versions(self):
+        """Une clé déjà enregistrée n'ajoute pas de version; l'affectation est relue."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(
+                self.base.enregistrer_version(
+                    self.edt, self.affectation, self.seances, self.salles, cle="solve"
+                ),
+                self.version,
+            )
+            autre = dict(self.affectation)
+            premiere = self.seances[0].id_seance
+            autre[premiere] = (1, 4, 0, 2)
+            nouvelle = self.base.enregistrer_version(
+                self.edt, autre, self.seances, self.salles
+            )
+        self.assertEqual([v["id"] for v in self.base.versions()], [1, 2])
+        self.assertEqual(self.base.affectation(self.version), self.affectation)
+        self.assertEqual(self.base.affectation(), autre)
+        self.assertEqual(self.base.affectation(semaines=[39])[premiere], (0, 4, 0, 2))
+        self.assertNotIn(
+            premiere,
+            [e["seance"] for e in self.base.seances_salle(1, version=nouvelle)],
+        )
+
+    def test_hierarchie_groupes(self):
+        """Un sous-groupe retrouve les CM de son parent (data/groupe.csv)."""
+        racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            groupes = charger_groupes(os.path.join(racine, "data", "groupe.csv"))
+        cm = Cours("CM", "Cours DEDI", self.enseignants[0], None, 120, 120, "CM")
+        cm.ids_groupes = ["DEDI"]
+        td = Cours("TD", "TD DEDI A", self.enseignants[1], None, 120, 120, "TD")
+        td.ids_groupes = ["DEDI_1"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            seances = generer_seance([cm, td], groupes)
+        affectation = {s.id_seance: (0, k, 0, 1 + k % 2) for k, s in enumerate(seances)}
+        base = Stockage(":memory:")
+        with contextlib.redirect_stdout(io.StringIO()):
+            base.enregistrer_version(
+                self.edt, affectation, seances, self.salles, groupes
+            )
+
+        def cours(id_groupe):
+            return sorted(e["cours"] for e in base.seances_groupe(id_groupe))
+
+        self.assertEqual(cours("DEDI_1"), ["Cours DEDI", "TD DEDI A"])
+        self.assertEqual(cours("DEDI_2"), ["Cours DEDI"])
+        self.assertEqual(cours("DEDI"), ["Cours DEDI", "TD DEDI A"])
+        self.assertEqual(cours("CDE_1"), [])
+        base.fermer()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from telemetrie import PolitiqueArret, SurveillancePlateau, ecart_relatif
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def disponibilite_complete():
+    return {jour: {"matin": True, "apres_midi": True} for jour in JOURS}
+
+
+class SolveurFactice:
+    def __init__(self):
+        self.arrete = False
+
+    def StopSearch(self):
+        self.arrete = True
+
+
+class CallbackFactice:
+    def __init__(self, derniere_amelioration):
+        self.derniere_amelioration = derniere_amelioration
+
+
+class TestTelemetrie(unittest.TestCase):
+
+    def test_ecart_relatif(self):
+        self.assertEqual(ecart_relatif(10, 10), 0)
+        self.assertAlmostEqual(ecart_relatif(10, 9), 0.1)
+        self.assertEqual(ecart_relatif(0, 0), 0)
+
+    def test_arret_sur_plateau(self):
+        """Le solveur est arrêté après la durée de plateau, jamais avant la première solution."""
+        politique = PolitiqueArret(sans_amelioration=0.05)
+
+        solveur = SolveurFactice()
+        surveillance = SurveillancePlateau(
+            solveur, CallbackFactice(None), politique, periode=0.01
+        )
+        surveillance.demarrer()
+        time.sleep(0.2)
+        surveillance.arreter()
+        self.assertFalse(solveur.arrete)
+
+        solveur = SolveurFactice()
+        surveillance = SurveillancePlateau(
+            solveur, CallbackFactice(time.monotonic()), politique, periode=0.01
+        )
+        surveillance.demarrer()
+        time.sleep(0.2)
+        surveillance.arreter()
+        self.assertTrue(solveur.arrete)
+
+    def test_flux_jsonl(self):
+        """La résolution écrit un événement de début, de solution et de fin."""
+        salles = [Salle(1, "A", 30, disponibilite=disponibilite_complete())]
+        enseignants = [
+            Enseignant(1, "E1", "standard", disponibilite=disponibilite_complete())
+        ]
+        groupes = [Groupe("G1", "Groupe 1", 20)]
+        cours = Cours("C1", "Cours", enseignants[0], None, 360, 180, "TD")
+        cours.ids_groupes = ["G1"]
+        seances = generer_seance([cours], groupes)
+
+        with tempfile.TemporaryDirectory() as dossier:
+            fichier = os.path.join(dossier, "telemetrie.jsonl")
+            scheduler = EmploiDuTemps(annee=2025, semaines=[38])
+            edt = scheduler.generer(
+                seances,
+                salles,
+                enseignants,
+                groupes,
+                avec_preferences=True,
+                fichier_telemetrie=fichier,
+                politique_arret=PolitiqueArret(sans_amelioration=30, ecart_max=1.0),
+            )
+            self.assertIsNotNone(edt)
+
+            with open(fichier, encoding="utf-8") as f:
+                evenements = [json.loads(ligne) for ligne in f]
+
+        types = [e["evenement"] for e in evenements]
+        self.assertEqual(types[0], "debut")
+        self.assertEqual(types[-1], "fin")
+        self.assertIn("solution", types)
+        # Aucun nombre de workers imposé: CP-SAT le choisit lui-même
+        self.assertEqual(evenements[0]["workers"], 0)
+        solution = next(e for e in evenements if e["evenement"] == "solution")
+        for champ in ("horodatage", "ecoule", "objectif", "borne", "ecart"):
+            self.assertIn(champ, solution)
+        self.assertEqual(evenements[-1]["statut"], "OPTIMAL")
+
+
+if __name__ == "__main__":
+    unittest.main()
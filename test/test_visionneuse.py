@@ -0,0 +1,144 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Ajout du répertoire parent au chemin pour l'importation
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import EmploiDuTemps, generer_seance
+from model import Salle, Enseignant, Groupe, Cours
+from visionneuse import donnees_visionneuse, exporter_visionneuse
+
+JOURS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi"]
+CRENEAUX = [f"{h}h00" for h in range(8, 20, 2)]
+
+
+def lire_jsonp(chemin, fonction):
+    with open(chemin, encoding="utf-8") as f:
+        texte = f.read()
+    return json.loads(f"[{texte[len(fonction) + 1 : -3]}]")
+
+
+class TestVisionneuse(unittest.TestCase):
+
+    def setUp(self):
+        self.salles = [Salle(1, "CO315", 30), Salle(2, "CO503", 30)]
+        enseignants = [Enseignant(1, "E1", "standard"), Enseignant(2, "E2", "standard")]
+        # Un nom de groupe peut contenir ", ": l'identité vient de l'ID
+        groupes = [Groupe("A", "A", 20), Groupe("B", "B, bis", 20)]
+        cours = []
+        for numero, (enseignant, type_cours, ids_groupes) in enumerate(
+            [
+                (0, "CM", ["A"]),
+                (0, "CM", ["A", "B"]),
+                (1, "TD", ["B"]),
+                (1, "TD", ["A"]),
+            ],
+            start=1,
+        ):
+            c = Cours(
+                f"C{numero}",
+                f"Cours {numero}",
+                enseignants[enseignant],
+                None,
+                120,
+                120,
+                type_cours,
+            )
+            c.ids_groupes = ids_groupes
+            cours.append(c)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.seances = generer_seance(cours, groupes)
+        self.ids = [s.id_seance for s in self.seances]
+        self.edt = EmploiDuTemps(
+            annee=2025,
+            semaines=[38, 39],
+            date_debut="2025-09-15",
+            date_fin="2025-09-26",
+        )
+        self.edt._configurer_grille(self.seances)
+        # Créneaux de 30 minutes à partir de 8h
+        self.affectation = {
+            self.ids[0]: (1, 1, 4, 1),  # semaine 39, mardi 10:00
+            self.ids[1]: (0, 0, 5, 1),  # semaine 38, lundi 10:30
+            self.ids[2]: (0, 0, 0, 1),  # semaine 38, lundi 8:00
+            self.ids[3]: (0, 3, 12, 1),  # semaine 38, jeudi 14:00
+        }
+        self.dossier = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def solution(self):
+        return self.edt._construire_emploi_du_temps(
+            self.affectation, self.seances, self.salles
+        )
+
+    def exporter(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return exporter_visionneuse(self.solution(), self.dossier, JOURS, CRENEAUX)
+
+    def test_index_inverses(self):
+        """Séances par jour et heure, index par groupe, enseignant et type."""
+        index, fragments = donnees_visionneuse(self.solution(), JOURS, CRENEAUX)
+        self.assertEqual(index["groupes"], ["A", "B, bis"])
+        self.assertEqual(index["enseignants"], ["E1", "E2"])
+        self.assertEqual(index["semaines_groupes"], {0: [38, 39], 1: [38]})
+        self.assertEqual(
+            index["semaines"][0],
+            {"semaine": 38, "debut": "2025-09-15", "fin": "2025-09-18", "seances": 3},
+        )
+
+        semaine = fragments[38]
+        self.assertEqual(
+            [s["s"] for s in semaine["seances"]],
+            [self.ids[2], self.ids[1], self.ids[3]],
+        )
+        self.assertEqual(semaine["seances"][1]["g"], [0, 1])
+        self.assertEqual(semaine["seances"][1]["d"], "10:30")
+        self.assertEqual(semaine["seances"][1]["c"], 1)
+        self.assertEqual(semaine["groupes"], {0: [1, 2], 1: [0, 1]})
+        self.assertEqual(semaine["enseignants"], {0: [1], 1: [0, 2]})
+        self.assertEqual(semaine["types"], {"CM": [1], "TD": [0, 2]})
+        self.assertEqual(semaine["dates"], {0: "2025-09-15", 3: "2025-09-18"})
+
+    def test_export(self):
+        """Un fragment par semaine; seul le fragment modifié est réécrit."""
+        self.assertEqual(
+            sorted(self.exporter()),
+            [
+                "donnees/index.js",
+                "donnees/semaine-38.js",
+                "donnees/semaine-39.js",
+                "index.html",
+            ],
+        )
+        semaine, fragment = lire_jsonp(
+            os.path.join(self.dossier, "donnees", "semaine-39.js"), "EDT.semaine"
+        )
+        self.assertEqual(semaine, 39)
+        self.assertEqual(fragment["seances"][0]["s"], self.ids[0])
+        (index,) = lire_jsonp(
+            os.path.join(self.dossier, "donnees", "index.js"), "EDT.index"
+        )
+        self.assertEqual([s["semaine"] for s in index["semaines"]], [38, 39])
+
+        # Une séance de la semaine 38 change de salle: seul son fragment est réécrit
+        self.affectation[self.ids[2]] = (0, 0, 0, 2)
+        self.assertEqual(self.exporter(), ["donnees/semaine-38.js"])
+
+        # La semaine 39 disparaît: son fragment est supprimé
+        del self.affectation[self.ids[0]]
+        self.exporter()
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.dossier, "donnees"))),
+            ["index.js", "semaine-38.js"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,360 @@
+"""
+Visionneuse HTML de l'emploi du temps pilotée par les données.
+
+La page (index.html) ne contient aucune séance: elle charge
+donnees/index.js (semaines, listes des groupes, enseignants et types, et
+pour chacun les semaines où il a cours), puis le fragment
+donnees/semaine-<n>.js de la semaine affichée, à la demande. Chaque fragment
+porte ses index inversés (groupe, enseignant, type -> positions des
+séances): un filtre est une intersection de listes, et seule la semaine
+visible est rendue.
+
+Les fichiers de données sont du JSON passé à une fonction (EDT.index,
+EDT.semaine) et chargés par des balises <script>: la visionneuse fonctionne
+ouverte directement depuis le disque, sans serveur. Ils sont écrits par un
+manifeste.Manifeste: une semaine inchangée n'est pas réécrite.
+"""
+
+import json
+import time
+
+from manifeste import Manifeste
+
+PAGE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Emploi du temps IngeMedia</title>
+<style>
+    body { font-family: Arial, sans-serif; margin: 20px; }
+    .calendar { width: 100%; border-collapse: collapse; table-layout: fixed; }
+    .calendar th { background-color: #4CAF50; color: white; padding: 8px; text-align: center; }
+    .calendar td { border: 1px solid #ddd; padding: 8px; height: 100px; vertical-align: top; }
+    .calendar td.header { background-color: #f5f5f5; width: 70px; }
+    .event { margin-bottom: 5px; padding: 5px; border-radius: 4px; overflow: hidden; }
+    .CM { background-color: #e3f2fd; }
+    .TD { background-color: #fff9c4; }
+    .filters { margin-bottom: 20px; }
+    .filters label { margin-right: 15px; }
+    button, select { padding: 5px 10px; margin-right: 5px; }
+    @media print {
+        .filters { display: none; }
+        .calendar { font-size: 10px; }
+        .event { page-break-inside: avoid; }
+    }
+</style>
+</head>
+<body>
+<h1>Emploi du temps IngeMedia</h1>
+<div class="filters">
+    <button id="precedente">&larr;</button>
+    <select id="semaine"></select>
+    <button id="suivante">&rarr;</button>
+    <label>Type <select id="type"><option value="">Tous</option></select></label>
+    <label>Groupe <select id="groupe"><option value="">Tous les groupes</option></select></label>
+    <label>Enseignant <select id="enseignant"><option value="">Tous les enseignants</option></select></label>
+    <span id="compte"></span>
+</div>
+<table class="calendar"><thead id="entete"></thead><tbody id="grille"></tbody></table>
+<script>
+const EDT = (function () {
+    const FILTRES = [["type", "types"], ["groupe", "groupes"], ["enseignant", "enseignants"]];
+    const semaines = {};
+    const chargements = {};
+    let index = null;
+    const $ = id => document.getElementById(id);
+
+    function echapper(texte) {
+        return String(texte).replace(/[&<>"']/g, c => ({
+            "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"
+        })[c]);
+    }
+
+    function remplir(select, libelles) {
+        libelles.forEach((libelle, i) => select.add(new Option(libelle, i)));
+    }
+
+    // Positions communes à des listes triées (la plus courte est parcourue)
+    function intersection(listes) {
+        listes.sort((a, b) => a.length - b.length);
+        let resultat = listes[0];
+        for (let k = 1; k < listes.length; k++) {
+            const autre = new Set(listes[k]);
+            resultat = resultat.filter(i => autre.has(i));
+        }
+        return resultat;
+    }
+
+    function charger(semaine) {
+        if (chargements[semaine]) return;
+        chargements[semaine] = true;
+        const script = document.createElement("script");
+        script.src = "donnees/semaine-" + semaine + ".js";
+        document.head.appendChild(script);
+    }
+
+    function carte(s) {
+        const groupes = s.g.map(g => echapper(index.groupes[g])).join(", ");
+        return "<div class='event " + echapper(s.t) + "'><strong>" + s.d + "-" + s.f +
+            "</strong>: " + echapper(s.n) + "<br><small>Séance: " + echapper(s.s) +
+            "<br>" + echapper(s.t) + " - " + echapper(s.r) + "<br>" +
+            echapper(index.enseignants[s.e]) + "<br>Groupe: " + groupes + "</small></div>";
+    }
+
+    function afficher() {
+        const semaine = Number($("semaine").value);
+        const donnees = semaines[semaine];
+        if (!donnees) {
+            charger(semaine);
+            return;
+        }
+        let entete = "<tr><th>Heure</th>";
+        index.jours.forEach((jour, j) => {
+            const date = donnees.dates[j];
+            entete += "<th>" + echapper(jour) + (date ? "<br>" + date : "") + "</th>";
+        });
+        $("entete").innerHTML = entete + "</tr>";
+
+        const listes = [];
+        for (const [id, cle] of FILTRES) {
+            const valeur = $(id).value;
+            if (valeur !== "") listes.push(donnees[cle][valeur] || []);
+        }
+        const visibles = listes.length ? intersection(listes) : donnees.seances.map((_, i) => i);
+        const cases = index.creneaux.map(() => index.jours.map(() => []));
+        for (const i of visibles) {
+            const s = donnees.seances[i];
+            cases[s.c][s.j].push(carte(s));
+        }
+        $("grille").innerHTML = cases.map((ligne, c) =>
+            "<tr><td class='header'>" + index.creneaux[c] + "</td>" +
+            ligne.map(contenu => "<td>" + contenu.join("") + "</td>").join("") + "</tr>"
+        ).join("");
+
+        let compte = visibles.length + " séance(s)";
+        const groupe = $("groupe").value, enseignant = $("enseignant").value;
+        if (!visibles.length && (groupe !== "" || enseignant !== "")) {
+            const avec = (groupe !== "" ? index.semaines_groupes[groupe] : null) ||
+                index.semaines_enseignants[enseignant] || [];
+            compte += avec.length ? " - semaines avec cours : " + avec.join(", ") : "";
+        }
+        $("compte").textContent = compte;
+    }
+
+    function decaler(pas) {
+        const select = $("semaine");
+        const position = select.selectedIndex + pas;
+        if (position >= 0 && position < select.options.length) {
+            select.selectedIndex = position;
+            afficher();
+        }
+    }
+
+    return {
+        index: function (donnees) {
+            index = donnees;
+            const select = $("semaine");
+            const aujourdhui = new Date().toISOString().slice(0, 10);
+            index.semaines.forEach(s => {
+                select.add(new Option("Semaine " + s.semaine + " (" + s.debut + ")", s.semaine));
+                if (s.debut <= aujourdhui && aujourdhui <= s.fin) select.value = s.semaine;
+            });
+            for (const [id, cle] of FILTRES) {
+                if (cle === "types") {
+                    index.types.forEach(t => $(id).add(new Option(t, t)));
+                } else {
+                    remplir($(id), index[cle]);
+                }
+                $(id).onchange = afficher;
+            }
+            select.onchange = afficher;
+            $("precedente").onclick = () => decaler(-1);
+            $("suivante").onclick = () => decaler(1);
+            if (index.semaines.length) afficher();
+        },
+        semaine: function (semaine, donnees) {
+            semaines[semaine] = donnees;
+            if (Number($("semaine").value) === semaine) afficher();
+        }
+    };
+})();
+</script>
+<script src="donnees/index.js"></script>
+</body>
+</html>
+"""
+
+
+def _heure(minutes):
+    """Heure affichée "8:30" de minutes depuis minuit."""
+    return f"{minutes // 60}:{minutes % 60:02d}"
+
+
+def _jsonp(fonction, *arguments):
+    """Appel JavaScript `fonction(arguments...)`, arguments en JSON compact."""
+    texte = ",".join(
+        json.dumps(a, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        for a in arguments
+    )
+    return f"{fonction}({texte});\n"
+
+
+def donnees_visionneuse(solution, jours, creneaux):
+    """
+    Données de la visionneuse, en une passe sur les colonnes de la solution.
+
+    Args:
+        solution: solution.SolutionColonnaire
+        jours: Noms des jours en colonnes ("Lundi"...), dans l'ordre de la
+               colonne `jour` de la table
+        creneaux: Créneaux d'affichage de deux heures à partir de 8h ("8h00"...);
+                  les séances hors de ces créneaux ne sont pas affichées, comme
+                  dans la page HTML
+
+    Returns:
+        tuple: (index, fragments) avec index le contenu de donnees/index.js et
+               fragments {semaine: contenu de donnees/semaine-<n>.js}. Une
+               séance d'un fragment est {"j": jour, "c": créneau, "d": début,
+               "f": fin, "n": cours, "s": séance, "t": type, "r": salle,
+               "e": enseignant, "g": [groupes]}, jours, créneaux, enseignants
+               et groupes étant des positions dans les listes de l'index.
+    """
+    table = solution.table
+    lignes_seance = table["seance"].tolist()
+    salles = table["salle"].tolist()
+    semaines = table["semaine"].tolist()
+    jours_lignes = table["jour"].tolist()
+    debuts = table["debut"].tolist()
+    fins = table["fin"].tolist()
+    dates = [str(d) for d in table["date"].tolist()]
+
+    # Lignes affichées, groupes et enseignants identifiés par leur ID
+    par_semaine = {}
+    groupes_vus = {}
+    enseignants_vus = {}
+    types = set()
+    for i, k in enumerate(lignes_seance):
+        c = (debuts[i] - 8 * 60) // 120
+        if jours_lignes[i] >= len(jours) or not 0 <= c < len(creneaux):
+            continue
+        par_semaine.setdefault(semaines[i], []).append((jours_lignes[i], c, i))
+        seance = solution.seances[k]
+        for g in seance.groupes:
+            groupes_vus.setdefault(g.id_groupe, g.nom)
+        enseignant = seance.cours.enseignant
+        enseignants_vus.setdefault(enseignant.id, enseignant.nom.strip())
+        types.add(seance.cours.type_cours)
+
+    ids_groupes = sorted(groupes_vus, key=lambda g: (groupes_vus[g], str(g)))
+    ids_enseignants = sorted(
+        enseignants_vus, key=lambda e: (enseignants_vus[e], str(e))
+    )
+    numero_groupe = {g: n for n, g in enumerate(ids_groupes)}
+    numero_enseignant = {e: n for n, e in enumerate(ids_enseignants)}
+
+    fragments = {}
+    resume = []
+    semaines_groupes = {}
+    semaines_enseignants = {}
+    for semaine in sorted(par_semaine):
+        lignes = sorted(
+            par_semaine[semaine],
+            key=lambda l: (
+                l[0],
+                debuts[l[2]],
+                solution.seances[lignes_seance[l[2]]].id_seance,
+            ),
+        )
+        fragment = {
+            "dates": {},
+            "seances": [],
+            "groupes": {},
+            "enseignants": {},
+            "types": {},
+        }
+        for position, (j, c, i) in enumerate(lignes):
+            seance = solution.seances[lignes_seance[i]]
+            cours = seance.cours
+            fragment["dates"].setdefault(j, dates[i])
+            g = [numero_groupe[groupe.id_groupe] for groupe in seance.groupes]
+            e = numero_enseignant[cours.enseignant.id]
+            t = cours.type_cours
+            fragment["seances"].append(
+                {
+                    "j": j,
+                    "c": c,
+                    "d": _heure(debuts[i]),
+                    "f": _heure(fins[i]),
+                    "n": cours.nom,
+                    "s": seance.id_seance,
+                    "t": t,
+                    "r": solution.salles[salles[i]].nom,
+                    "e": e,
+                    "g": g,
+                }
+            )
+            # Index inversés: positions croissantes dans "seances"
+            for numero in dict.fromkeys(g):
+                fragment["groupes"].setdefault(numero, []).append(position)
+            fragment["enseignants"].setdefault(e, []).append(position)
+            fragment["types"].setdefault(t, []).append(position)
+        for numero in fragment["groupes"]:
+            semaines_groupes.setdefault(numero, []).append(semaine)
+        for numero in fragment["enseignants"]:
+            semaines_enseignants.setdefault(numero, []).append(semaine)
+        dates_semaine = sorted(fragment["dates"].values())
+        resume.append(
+            {
+                "semaine": semaine,
+                "debut": dates_semaine[0],
+                "fin": dates_semaine[-1],
+                "seances": len(lignes),
+            }
+        )
+        fragments[semaine] = fragment
+
+    index = {
+        "jours": list(jours),
+        "creneaux": list(creneaux),
+        "semaines": resume,
+        "groupes": [groupes_vus[g] for g in ids_groupes],
+        "enseignants": [enseignants_vus[e] for e in ids_enseignants],
+        "types": sorted(types),
+        "semaines_groupes": semaines_groupes,
+        "semaines_enseignants": semaines_enseignants,
+    }
+    return index, fragments
+
+
+def exporter_visionneuse(solution, dossier, jours, creneaux):
+    """
+    Écrit la visionneuse d'une solution.SolutionColonnaire: `dossier`/index.html,
+    `dossier`/donnees/index.js et un `dossier`/donnees/semaine-<n>.js par
+    semaine. Seuls les fichiers modifiés sont réécrits; les semaines disparues
+    sont supprimées.
+
+    Returns:
+        list: Chemins relatifs des fichiers réécrits
+    """
+    debut = time.perf_counter()
+    index, fragments = donnees_visionneuse(solution, jours, creneaux)
+    manifeste = Manifeste(dossier)
+    contenus = {"index.html": PAGE, "donnees/index.js": _jsonp("EDT.index", index)}
+    for semaine, fragment in fragments.items():
+        contenus[f"donnees/semaine-{semaine}.js"] = _jsonp(
+            "EDT.semaine", semaine, fragment
+        )
+    for relatif, contenu in contenus.items():
+        with manifeste.ecrire(relatif) as f:
+            f.write(contenu)
+    manifeste.retirer_absents(contenus)
+    ecrits = list(manifeste.ecrits)
+    manifeste.sauvegarder()
+
+    print(
+        f"Visionneuse exportée vers {dossier} ({len(fragments)} semaines, "
+        f"{sum(s['seances'] for s in index['semaines'])} séances, "
+        f"{len(ecrits)} fichiers réécrits) en {time.perf_counter() - debut:.2f}s"
+    )
+    return ecrits